@@ -58,6 +58,7 @@ class LogEntryViewSet(AbstractBaseViewSet):
     search_fields = ["user", "ip_address", "model_name", "operation", "status"]
     ordering_fields = ["timestamp", "id", "status"]
     ordering = ["-timestamp"]
+    keyset_ordering = ("-timestamp", "-id")
 
 
 # -----------------------------------------------------------------------------
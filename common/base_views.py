@@ -2,15 +2,18 @@ from django.core.files.uploadedfile import InMemoryUploadedFile
 from rest_framework.exceptions import PermissionDenied
 from rest_framework.viewsets import ModelViewSet
 
+from common.pagination import KeysetPaginationMixin
 from common.utils.logging_helper import log_action
 
 # common/base_views.py
-class AbstractBaseViewSet(ModelViewSet):
+class AbstractBaseViewSet(KeysetPaginationMixin, ModelViewSet):
     """
     Gelişmiş Soyut ViewSet Sınıfı:
     - Kullanıcının `selectedSite` alanına göre işlemler yapmasını sağlar.
     - CRUD işlemleri sırasında loglama yapılır.
     - Yeni kayıt oluştururken site bilgisi `selectedSite` üzerinden otomatik atanır.
+    - Liste servislerinde `?pagination=cursor` ile keyset (cursor) sayfalama kullanılabilir;
+      varsayılan sıralama `keyset_ordering` (createdAt, id) alanlarıdır.
     """
 
     def validate_user_site(self):
@@ -0,0 +1,92 @@
+import statistics
+import time
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from common.pagination import KeysetPagination
+
+
+class Command(BaseCommand):
+    help = ('Derin bir sayfanın offset (sayfa numarası) ve keyset (cursor) sayfalama ile okunma sürelerini '
+            'karşılaştırır.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--model', default='soloblog.VisitorAnalytics', help='app_label.ModelAdı')
+        parser.add_argument('--ordering', default='id',
+                            help='Virgülle ayrılmış sıralama alanları (son alan benzersiz olmalı), ör. -createdAt,-id')
+        parser.add_argument('--page', type=int, default=1000, help='Okunacak sayfa numarası.')
+        parser.add_argument('--page-size', type=int, default=20, help='Sayfa boyutu.')
+        parser.add_argument('--repeat', type=int, default=20, help='Her yöntem için tekrar sayısı.')
+        parser.add_argument('--site', type=int, help='Site ID\'sine göre filtreleme.')
+
+    def handle(self, *args, **options):
+        try:
+            model = apps.get_model(options['model'])
+        except (LookupError, ValueError) as exc:
+            raise CommandError(f"Model bulunamadı: {options['model']}") from exc
+
+        ordering = tuple(field.strip() for field in options['ordering'].split(',') if field.strip())
+        queryset = model.objects.all()
+        if options['site']:
+            queryset = queryset.filter(site_id=options['site'])
+
+        page, page_size = options['page'], options['page_size']
+        offset = (page - 1) * page_size
+        if offset and not queryset.order_by(*ordering)[offset - 1:offset].exists():
+            raise CommandError(f"{page}. sayfa için yeterli kayıt yok.")
+
+        factory = APIRequestFactory()
+
+        offset_paginator = PageNumberPagination()
+        offset_paginator.page_size = page_size
+        offset_request = Request(factory.get('/', {'page': page}))
+
+        # Bir önceki sayfanın son kaydından cursor oluşturulur (istemcinin `next` bağlantısını izlemesiyle aynı)
+        keyset_paginator = KeysetPagination(ordering=ordering, page_size=page_size)
+        keyset_params = {'pagination': 'cursor'}
+        if offset:
+            last = queryset.order_by(*ordering).values(*[field.lstrip('-') for field in ordering])[offset - 1]
+            keyset_params['cursor'] = keyset_paginator.encode_cursor([last[field.lstrip('-')] for field in ordering])
+        keyset_request = Request(factory.get('/', keyset_params))
+
+        offset_ids = [obj.pk for obj in offset_paginator.paginate_queryset(
+            queryset.order_by(*ordering), offset_request
+        )]
+        keyset_ids = [obj.pk for obj in keyset_paginator.paginate_queryset(queryset, keyset_request)]
+        if offset_ids != keyset_ids:
+            self.stderr.write(self.style.WARNING("Uyarı: iki yöntemin döndürdüğü kayıtlar farklı."))
+
+        offset_times = self._measure(
+            lambda: list(offset_paginator.paginate_queryset(queryset.order_by(*ordering), offset_request)),
+            options['repeat'],
+        )
+        keyset_times = self._measure(
+            lambda: keyset_paginator.paginate_queryset(queryset, keyset_request),
+            options['repeat'],
+        )
+
+        self.stdout.write(f"Model: {model._meta.label}, sıralama: {', '.join(ordering)}, sayfa: {page}, "
+                          f"sayfa boyutu: {page_size}")
+        self._report('Offset (COUNT + OFFSET)', offset_times)
+        self._report('Keyset (cursor)', keyset_times)
+        self.stdout.write(self.style.SUCCESS(
+            f"Medyan oran (offset / keyset): {statistics.median(offset_times) / statistics.median(keyset_times):.1f}"
+        ))
+
+    @staticmethod
+    def _measure(func, repeat):
+        timings = []
+        for _ in range(max(1, repeat)):
+            started = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - started) * 1000)
+        return timings
+
+    def _report(self, label, timings):
+        timings = sorted(timings)
+        p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+        self.stdout.write(f"{label:<24}: medyan {statistics.median(timings):.2f} ms, p95 {p95:.2f} ms")
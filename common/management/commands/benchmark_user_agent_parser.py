@@ -0,0 +1,74 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from common.utils.user_agent_parser import UserAgentParser, classify_user_agent
+
+SAMPLE_USER_AGENTS = [
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 '
+    'Safari/537.36 Edg/124.0.2478.51',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 '
+    'Safari/537.36 OPR/109.0.0.0',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.4 '
+    'Safari/605.1.15',
+    'Mozilla/5.0 (X11; Linux x86_64; rv:125.0) Gecko/20100101 Firefox/125.0',
+    'Mozilla/5.0 (iPhone; CPU iPhone OS 17_4 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.4 '
+    'Mobile/15E148 Safari/604.1',
+    'Mozilla/5.0 (iPad; CPU OS 17_4 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) CriOS/124.0.6367.88 '
+    'Mobile/15E148 Safari/604.1',
+    'Mozilla/5.0 (Linux; Android 14; SM-S918B) AppleWebKit/537.36 (KHTML, like Gecko) SamsungBrowser/24.0 '
+    'Chrome/117.0.0.0 Mobile Safari/537.36',
+    'Mozilla/5.0 (Linux; Android 13; Pixel 7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Mobile '
+    'Safari/537.36',
+    'Mozilla/5.0 (Linux; Android 13; SM-X700) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Linux; Android 12; wv) AppleWebKit/537.36 (KHTML, like Gecko) Version/4.0 Chrome/120.0.0.0 '
+    'Mobile Safari/537.36',
+    'Mozilla/5.0 (Windows NT 6.1; WOW64; Trident/7.0; rv:11.0) like Gecko',
+    'Mozilla/5.0 (X11; CrOS x86_64 14541.0.0) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (compatible; Googlebot/2.1; +http://www.google.com/bot.html)',
+    'curl/8.5.0',
+]
+
+
+class Command(BaseCommand):
+    help = 'User-Agent ayrıştırıcısının sınıflandırma sonuçlarını, gecikmesini ve önbellek isabet oranını ölçer.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--calls', type=int, default=200000, help='Toplam ayrıştırma çağrısı sayısı.')
+        parser.add_argument('--distinct', type=int, default=2000,
+                            help='Farklı UA metni sayısı (örnek UA\'lara sürüm eki eklenerek üretilir).')
+        parser.add_argument('--cache-size', type=int, default=10000, help='Önbellek boyutu.')
+
+    def handle(self, *args, **options):
+        for user_agent in SAMPLE_USER_AGENTS:
+            info = classify_user_agent(user_agent)
+            self.stdout.write(f"{info.browser:<20} {info.operating_system:<14} {info.device_type:<8} {user_agent[:70]}")
+
+        population = [
+            f"{random.choice(SAMPLE_USER_AGENTS)} build/{index}" for index in range(options['distinct'])
+        ]
+        workload = [random.choice(population) for _ in range(options['calls'])]
+
+        started = time.perf_counter()
+        for user_agent in workload:
+            classify_user_agent(user_agent)
+        uncached = time.perf_counter() - started
+
+        parser = UserAgentParser(max_size=options['cache_size'])
+        started = time.perf_counter()
+        for user_agent in workload:
+            parser.parse(user_agent)
+        cached = time.perf_counter() - started
+
+        stats = parser.stats()
+        self.stdout.write("")
+        self.stdout.write(f"Önbelleksiz : {options['calls'] / uncached:,.0f} çağrı/sn")
+        self.stdout.write(
+            f"Önbellekli  : {options['calls'] / cached:,.0f} çağrı/sn, ortalama {stats['avg_latency_us']:.2f} µs, "
+            f"en yüksek {stats['max_latency_us']:.1f} µs"
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Önbellek isabet oranı: %{stats['hit_rate'] * 100:.1f} ({stats['hits']} isabet, {stats['misses']} ıska)"
+        ))
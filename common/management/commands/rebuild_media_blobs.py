@@ -0,0 +1,127 @@
+import os
+from collections import Counter
+from datetime import timedelta
+
+from django.apps import apps
+from django.core.files.storage import FileSystemStorage
+from django.core.management.base import BaseCommand
+from django.db import models, transaction
+from django.utils import timezone
+
+from common.models import MediaBlob
+from common.storage import ContentAddressedStorage, content_storage
+
+
+class Command(BaseCommand):
+    help = ('İçerik adresli depolamadaki dosyaların referans sayılarını veritabanındaki dosya alanlarından yeniden '
+            'hesaplar. Kaydı olmayan dosyalara kayıt açılır; hiçbir kayıtta kullanılmayan dosyalar ve '
+            'kayıtları silinir. Son `--grace-seconds` içinde yazılan dosyalar ve güncellenen kayıtlar (henüz '
+            'commit edilmemiş yüklemeler) silinmez; silmeden önce kayıt kilitlenip referanslar yeniden kontrol '
+            'edilir.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Değişiklik yapmadan yalnızca raporlar.')
+        parser.add_argument(
+            '--grace-seconds', type=int, default=3600,
+            help='Bu süreden yeni dosyalar referanssız olsa da silinmez (varsayılan: 3600).',
+        )
+
+    def handle(self, *args, **options):
+        storage = content_storage()
+        if not isinstance(storage, ContentAddressedStorage):
+            self.stdout.write("İçerik adresli depolama kapalı (CONTENT_STORAGE['ENABLED']).")
+            return
+        dry_run = options['dry_run']
+        # Referanslar tek seferde okunur; bu sırada yazılan dosyaların kaydı henüz commit edilmemiş olabilir
+        cutoff = timezone.now() - timedelta(seconds=options['grace_seconds'])
+
+        references = Counter()
+        self.reference_fields = []
+        for model in apps.get_models():
+            for field in model._meta.get_fields():
+                if not isinstance(field, models.FileField) or field.storage is not storage:
+                    continue
+                self.reference_fields.append((model, field.attname))
+                names = model._default_manager.filter(
+                    **{f"{field.attname}__startswith": f"{storage.prefix}/"}
+                ).values_list(field.attname, flat=True)
+                field_references = Counter(names)
+                references.update(field_references)
+                self.stdout.write(f"{model._meta.label}.{field.name}: {sum(field_references.values())} referans")
+
+        blobs = {blob.name: blob for blob in MediaBlob.objects.all()}
+        fixed = created = removed = 0
+        with transaction.atomic():
+            for name, blob in blobs.items():
+                count = references.get(name, 0)
+                if count == 0:
+                    if blob.updatedAt > cutoff or self._is_recent(storage, name, cutoff):
+                        continue
+                    if not dry_run:
+                        # Aynı içeriği yükleyen eş zamanlı bir istek kaydı kilitlemiş olabilir; kilit alındıktan
+                        # sonra kayıt ve referanslar yeniden okunur
+                        blob = MediaBlob.objects.select_for_update().filter(pk=blob.pk).first()
+                        if blob is None or blob.updatedAt > cutoff or self._is_referenced(name):
+                            continue
+                        blob.delete()
+                    removed += 1
+                elif blob.refCount != count:
+                    fixed += 1
+                    if not dry_run:
+                        MediaBlob.objects.filter(pk=blob.pk).update(refCount=count)
+            for name, count in references.items():
+                if name in blobs:
+                    continue
+                created += 1
+                if not dry_run:
+                    size = storage.size(name) if storage.exists(name) else 0
+                    MediaBlob.objects.create(
+                        name=name, hash=os.path.splitext(os.path.basename(name))[0], size=size, refCount=count
+                    )
+
+        # Kaydı silinmiş veya hiç kaydedilmemiş (ör. geri alınan transaction) dosyalar
+        orphans = [
+            name for name in self._walk(storage, storage.prefix)
+            if name not in references and not self._is_recent(storage, name, cutoff)
+        ]
+        deleted = 0
+        for name in orphans:
+            if dry_run:
+                deleted += 1
+                continue
+            with transaction.atomic():
+                # Kaydı olan (ör. tarama sırasında yüklenen) veya artık referans verilen dosyalar korunur
+                if MediaBlob.objects.select_for_update().filter(name=name).exists() or self._is_referenced(name):
+                    continue
+                FileSystemStorage.delete(storage, name)
+            deleted += 1
+
+        missing = [name for name in references if not storage.exists(name)]
+        prefix = "[dry-run] " if dry_run else ""
+        self.stdout.write(f"{prefix}Düzeltilen sayaç: {fixed}, eklenen kayıt: {created}, silinen kayıt: {removed}, "
+                          f"silinen sahipsiz dosya: {deleted}")
+        if missing:
+            self.stderr.write(self.style.WARNING(f"Referansı olup diskte bulunmayan dosya: {len(missing)}"))
+            for name in missing[:20]:
+                self.stderr.write(f"  {name}")
+        self.stdout.write(self.style.SUCCESS("Tamamlandı."))
+
+    def _is_referenced(self, name):
+        return any(
+            model._default_manager.filter(**{attname: name}).exists() for model, attname in self.reference_fields
+        )
+
+    def _is_recent(self, storage, name, cutoff):
+        try:
+            return storage.get_modified_time(name) > cutoff
+        except FileNotFoundError:
+            return False
+
+    def _walk(self, storage, path):
+        if not storage.exists(path):
+            return
+        directories, files = storage.listdir(path)
+        for name in files:
+            yield f"{path}/{name}"
+        for directory in directories:
+            yield from self._walk(storage, f"{path}/{directory}")
@@ -0,0 +1,17 @@
+# Generated by Django 5.1.3 on 2026-10-18 01:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0003_alter_customuser_isindividual'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='logentry',
+            index=models.Index(fields=['site', 'timestamp', 'id'], name='common_logentry_site_ts_idx'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.1.3 on 2026-10-18 01:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0004_logentry_site_ts_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SlugCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scope', models.CharField(help_text="Slug'ın benzersiz olması gereken kapsam, ör. 'soloblog.article:3'", max_length=100)),
+                ('base', models.CharField(help_text='Sayı eki olmadan taban slug', max_length=255)),
+                ('lastSuffix', models.IntegerField(default=-1, help_text="Verilen son ek (0: taban slug'ın kendisi, -1: henüz verilmedi)")),
+                ('createdAt', models.DateTimeField(auto_now_add=True)),
+                ('updatedAt', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'unique_together': {('scope', 'base')},
+            },
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.1.3 on 2026-10-18 01:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0005_slug_counter'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MediaBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(help_text="Depolamadaki yol, ör. 'cas/ab/cd/<sha256>.jpg'", max_length=255, unique=True)),
+                ('hash', models.CharField(db_index=True, help_text='İçeriğin SHA-256 özeti', max_length=64)),
+                ('size', models.BigIntegerField(default=0, help_text='Dosya boyutu (bayt)')),
+                ('refCount', models.PositiveIntegerField(default=0, help_text='Dosyayı kullanan kayıt sayısı')),
+                ('createdAt', models.DateTimeField(auto_now_add=True)),
+                ('updatedAt', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
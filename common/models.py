@@ -97,6 +97,12 @@ class LogEntry(models.Model):
         help_text="İşlem zamanı"
     )
 
+    class Meta:
+        indexes = [
+            # Hash zincirindeki son kaydın bulunması ve liste servisindeki keyset (cursor) sayfalama için
+            models.Index(fields=["site", "timestamp", "id"], name="common_logentry_site_ts_idx"),
+        ]
+
     def save(self, *args, **kwargs):
         """
         Hash zincirini oluştur ve kaydet.
@@ -140,6 +146,33 @@ class LogEntry(models.Model):
         return None
 
 
+class SlugCounter(models.Model):
+    """
+    Benzersiz slug üretimi için kapsam (model + site) ve taban slug başına verilen son sayı eki.
+    Satır kilitlenerek artırıldığından eş zamanlı kayıtlar aynı eki alamaz (bkz. common.utils.slug_allocator).
+    """
+    scope = models.CharField(
+        max_length=100,
+        help_text="Slug'ın benzersiz olması gereken kapsam, ör. 'soloblog.article:3'"
+    )
+    base = models.CharField(
+        max_length=255,
+        help_text="Sayı eki olmadan taban slug"
+    )
+    lastSuffix = models.IntegerField(
+        default=-1,
+        help_text="Verilen son ek (0: taban slug'ın kendisi, -1: henüz verilmedi)"
+    )
+    createdAt = models.DateTimeField(auto_now_add=True)
+    updatedAt = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('scope', 'base')
+
+    def __str__(self):
+        return f"{self.scope} {self.base} ({self.lastSuffix})"
+
+
 class WhatsAppSettings(AbstractBaseModel):
     apiUrl = models.URLField(
         max_length=500,
@@ -464,3 +497,23 @@ class CustomUser(AbstractUser):
 
     def __str__(self):
         return self.username
+
+
+class MediaBlob(models.Model):
+    """
+    İçerik adresli depolamadaki (bkz. common.storage.ContentAddressedStorage) tek bir dosya ve onu kullanan
+    dosya alanı sayısı. Dosya, son referans silindiğinde fiziksel olarak silinir.
+    """
+    name = models.CharField(
+        max_length=255,
+        unique=True,
+        help_text="Depolamadaki yol, ör. 'cas/ab/cd/<sha256>.jpg'"
+    )
+    hash = models.CharField(max_length=64, db_index=True, help_text="İçeriğin SHA-256 özeti")
+    size = models.BigIntegerField(default=0, help_text="Dosya boyutu (bayt)")
+    refCount = models.PositiveIntegerField(default=0, help_text="Dosyayı kullanan kayıt sayısı")
+    createdAt = models.DateTimeField(auto_now_add=True)
+    updatedAt = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} ({self.refCount})"
@@ -0,0 +1,198 @@
+# common/pagination.py
+"""
+Keyset (cursor) sayfalama.
+
+Offset sayfalama her istekte `COUNT(*)` çalıştırır ve derin sayfalarda `OFFSET n` kadar satırı tarayıp atar;
+sayfa numarası büyüdükçe yanıt süresi doğrusal olarak artar. Keyset sayfalamada ise bir önceki sayfanın son
+kaydının sıralama değerleri opak bir cursor olarak istemciye verilir ve sonraki sayfa
+`WHERE (createdAt, id) > (son_createdAt, son_id) ORDER BY createdAt, id LIMIT n` şeklinde, indeks üzerinden
+doğrudan okunur. Toplam kayıt sayısı hesaplanmaz.
+
+Kullanım:
+- İstek bazında: `?pagination=cursor` (sonraki sayfalar için yanıt içindeki `next` bağlantısı kullanılır).
+- ViewSet bazında: `pagination_mode = 'cursor'`.
+"""
+import base64
+import datetime
+import json
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+PAGINATION_QUERY_PARAM = 'pagination'
+CURSOR_PAGINATION = 'cursor'
+
+
+class KeysetPagination(BasePagination):
+    """
+    Sıralama alanlarının son değerlerini taşıyan opak cursor ile sayfalama.
+
+    `ordering` içindeki son alan benzersiz olmalıdır (ör. 'id'); eşit değerli kayıtlar arasında sırayı o belirler.
+    Sıralama alanları NULL değer içermemelidir.
+    """
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    page_size = api_settings.PAGE_SIZE or 20
+    max_page_size = 100
+    invalid_cursor_message = 'Geçersiz cursor.'
+
+    def __init__(self, ordering=('createdAt', 'id'), page_size=None):
+        self.ordering = tuple(ordering)
+        if page_size is not None:
+            self.page_size = page_size
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.limit = self.get_page_size(request)
+        ordering = self.get_ordering(request, view)
+
+        queryset = queryset.order_by(*ordering)
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded:
+            queryset = queryset.filter(self.build_filter(queryset.model, ordering, self.decode_cursor(encoded)))
+
+        # Bir fazla kayıt okunarak sonraki sayfanın olup olmadığı COUNT çalıştırmadan anlaşılır
+        results = list(queryset[:self.limit + 1])
+        self.has_next = len(results) > self.limit
+        results = results[:self.limit]
+
+        self.next_cursor = None
+        if self.has_next:
+            last = results[-1]
+            self.next_cursor = self.encode_cursor([
+                self._get_value(last, field.lstrip('-')) for field in ordering
+            ])
+        return results
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_next_link(self):
+        if not self.next_cursor:
+            return None
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, PAGINATION_QUERY_PARAM, CURSOR_PAGINATION)
+        return replace_query_param(url, self.cursor_query_param, self.next_cursor)
+
+    def get_previous_link(self):
+        return None
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def get_ordering(self, request, view):
+        """
+        `?ordering=` parametresi view'in `ordering_fields` listesindeyse onu, değilse varsayılan sıralamayı kullanır.
+        Benzersizliği garanti etmek için sona ilk alanla aynı yönde 'id' eklenir.
+        """
+        requested = request.query_params.get(api_settings.ORDERING_PARAM)
+        allowed = set(getattr(view, 'ordering_fields', None) or ())
+        if requested and allowed:
+            fields = [field.strip() for field in requested.split(',') if field.strip()]
+            if fields and all(field.lstrip('-') in allowed for field in fields):
+                tiebreaker = '-id' if fields[0].startswith('-') else 'id'
+                return tuple(field for field in fields if field.lstrip('-') != 'id') + (tiebreaker,)
+        return self.ordering
+
+    @staticmethod
+    def build_filter(model, ordering, values):
+        """
+        `(a, b, c) > (x, y, z)` karşılaştırmasını karışık sıralama yönlerini de destekleyecek şekilde Q nesnesine açar:
+        a > x OR (a = x AND b > y) OR (a = x AND b = y AND c > z)
+        """
+        if len(values) != len(ordering):
+            raise NotFound(KeysetPagination.invalid_cursor_message)
+
+        try:
+            values = [
+                model._meta.get_field(field.lstrip('-')).to_python(value) for field, value in zip(ordering, values)
+            ]
+        except (DjangoValidationError, LookupError, ValueError):
+            raise NotFound(KeysetPagination.invalid_cursor_message)
+
+        condition = Q()
+        equal = Q()
+        for field, value in zip(ordering, values):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            condition |= equal & Q(**{f'{name}__{lookup}': value})
+            equal &= Q(**{name: value})
+        return condition
+
+    @staticmethod
+    def encode_cursor(values):
+        # DjangoJSONEncoder tarihleri milisaniyeye yuvarlar; aynı milisaniyedeki kayıtların atlanmaması / tekrar
+        # dönmemesi için tarih değerleri mikrosaniye hassasiyetiyle yazılır
+        values = [value.isoformat() if isinstance(value, datetime.datetime) else value for value in values]
+        payload = json.dumps(values, cls=DjangoJSONEncoder, separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+    @staticmethod
+    def decode_cursor(encoded):
+        try:
+            padded = encoded + '=' * (-len(encoded) % 4)
+            values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8'))
+        except (TypeError, ValueError, UnicodeError):
+            raise NotFound(KeysetPagination.invalid_cursor_message)
+        if not isinstance(values, list):
+            raise NotFound(KeysetPagination.invalid_cursor_message)
+        return values
+
+    @staticmethod
+    def _get_value(instance, field):
+        if isinstance(instance, dict):
+            return instance[field]
+        return getattr(instance, field)
+
+
+def wants_cursor_pagination(request, view=None):
+    """
+    İstek veya view keyset sayfalama istiyorsa True döner.
+    """
+    if request is not None and request.query_params.get(PAGINATION_QUERY_PARAM) == CURSOR_PAGINATION:
+        return True
+    return getattr(view, 'pagination_mode', None) == CURSOR_PAGINATION
+
+
+class KeysetPaginationMixin:
+    """
+    ViewSet'lere opsiyonel keyset sayfalama ekler.
+
+    - `pagination_mode = 'cursor'` ile tüm liste istekleri keyset sayfalama kullanır.
+    - Varsayılan ('page') modda `?pagination=cursor` parametresi ile istek bazında açılır.
+    - `keyset_ordering` indeksli bir sıralama olmalıdır; son alan benzersiz (id) olmalıdır.
+    """
+    pagination_mode = 'page'
+    keyset_ordering = ('createdAt', 'id')
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator'):
+            if wants_cursor_pagination(getattr(self, 'request', None), self):
+                self._paginator = KeysetPagination(ordering=self.keyset_ordering)
+            else:
+                return super().paginator
+        return self._paginator
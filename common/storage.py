@@ -0,0 +1,125 @@
+"""
+İçerik adresli (content-addressed) dosya depolama.
+
+Yüklenen dosyanın adı yerine içeriğinin SHA-256 özeti kullanılır: `cas/ab/cd/<sha256>.<uzantı>`. Aynı dosya
+birden çok makaleye, reklama veya siteye yüklendiğinde diske bir kez yazılır. Her yol için `MediaBlob` satırında
+referans sayısı tutulur:
+
+- `save()` her çağrıda sayacı bir artırır; dosya yalnızca ilk referansta yazılır.
+- `delete()` sayacı bir azaltır; mevcut `post_delete` / `pre_save` sinyalleri değişmeden `FieldFile.delete()`
+  çağırmaya devam eder, dosya yalnızca son referans silindiğinde (transaction tamamlandıktan sonra) kaldırılır.
+- İçerik adresli olmayan eski yollar (ör. `advertisements/reklam.jpg`) eskisi gibi doğrudan silinir.
+
+Sayaçlar bir transaction geri alınınca dosya yazılmış ama referansı kaydedilmemiş kalabilir; bu durumlar
+`rebuild_media_blobs` komutuyla veritabanındaki referanslardan yeniden hesaplanır ve sahipsiz dosyalar temizlenir.
+
+Ayarlar `settings.CONTENT_STORAGE` sözlüğünden okunur. `ENABLED` False ise alanlar varsayılan depolamayı kullanır.
+"""
+import hashlib
+import os
+
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage, default_storage
+from django.db import IntegrityError, transaction
+
+DEFAULTS = {
+    'ENABLED': True,
+    'PREFIX': 'cas',
+}
+
+
+def get_content_storage_settings():
+    return {**DEFAULTS, **getattr(settings, 'CONTENT_STORAGE', {})}
+
+
+def file_digest(content):
+    """
+    Dosyanın SHA-256 özetini ve boyutunu parça parça okuyarak hesaplar; dosya konumu başa alınır.
+    """
+    digest = hashlib.sha256()
+    size = 0
+    for chunk in content.chunks():
+        digest.update(chunk)
+        size += len(chunk)
+    content.seek(0)
+    return digest.hexdigest(), size
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    Dosyaları içerik özetine göre adlandıran ve referans sayan FileSystemStorage.
+    """
+
+    def __init__(self, prefix=None, **kwargs):
+        super().__init__(**kwargs)
+        self.prefix = (prefix or get_content_storage_settings()['PREFIX']).strip('/')
+
+    def blob_name(self, digest, name):
+        ext = os.path.splitext(name)[1].lower()
+        return f"{self.prefix}/{digest[:2]}/{digest[2:4]}/{digest}{ext}"
+
+    def is_blob(self, name):
+        return bool(name) and name.startswith(f"{self.prefix}/")
+
+    def _save(self, name, content):
+        from common.models import MediaBlob
+
+        digest, size = file_digest(content)
+        name = self.blob_name(digest, name)
+        with transaction.atomic():
+            blob = MediaBlob.objects.select_for_update().filter(name=name).first()
+            if blob is None:
+                try:
+                    with transaction.atomic():
+                        blob = MediaBlob.objects.create(name=name, hash=digest, size=size)
+                except IntegrityError:
+                    # Aynı içerik aynı anda başka bir süreçte yüklendi
+                    blob = MediaBlob.objects.select_for_update().get(name=name)
+            # Satır kilitliyken yalnızca bu süreç dosyayı yazabilir; sahipsiz kalmış bir dosya varsa yeniden kullanılır
+            if not self.exists(name):
+                written = super()._save(name, content)
+                if written != name:
+                    super().delete(written)
+            blob.refCount += 1
+            blob.save(update_fields=['refCount', 'updatedAt'])
+        return name
+
+    def delete(self, name):
+        from common.models import MediaBlob
+
+        if not self.is_blob(name):
+            return super().delete(name)
+        with transaction.atomic():
+            blob = MediaBlob.objects.select_for_update().filter(name=name).first()
+            if blob is None:
+                return
+            if blob.refCount > 1:
+                blob.refCount -= 1
+                blob.save(update_fields=['refCount', 'updatedAt'])
+                return
+            blob.delete()
+            # Silme geri alınırsa dosya kaybolmasın diye fiziksel silme commit sonrasına bırakılır
+            transaction.on_commit(lambda: self._delete_unreferenced(name))
+
+    def _delete_unreferenced(self, name):
+        from common.models import MediaBlob
+
+        # Bu arada aynı içerik yeniden yüklendiyse dosya korunur
+        if not MediaBlob.objects.filter(name=name).exists():
+            super().delete(name)
+
+
+_content_storage = None
+
+
+def content_storage():
+    """
+    Dosya alanlarında `storage=content_storage` olarak kullanılır. `CONTENT_STORAGE['ENABLED']` False ise
+    varsayılan depolama döner.
+    """
+    global _content_storage
+    if not get_content_storage_settings()['ENABLED']:
+        return default_storage
+    if _content_storage is None:
+        _content_storage = ContentAddressedStorage()
+    return _content_storage
@@ -1,3 +1,72 @@
-from django.test import TestCase
+import json
 
-# Create your tests here.
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from common.utils.user_agent_parser import DEVICE_BOT, DEVICE_MOBILE, classify_user_agent
+from middleware.soloadmin.request_validator import ValidateRequestMiddleware
+
+
+class UserAgentBotDetectionTests(SimpleTestCase):
+    """
+    Bot kuralının arama motoru botlarını yakalaması ve "bot" ile biten cihaz adlarını bot saymaması.
+    """
+
+    def test_crawlers_are_bots(self):
+        for user_agent in (
+            "Mozilla/5.0 (compatible; Googlebot/2.1; +http://www.google.com/bot.html)",
+            "Mozilla/5.0 (compatible; bingbot/2.0; +http://www.bing.com/bingbot.htm)",
+            "Slackbot-LinkExpanding 1.0 (+https://api.slack.com/robots)",
+            "Mozilla/5.0 (compatible;PetalBot;+https://webmaster.petalsearch.com/site/petalbot)",
+        ):
+            with self.subTest(user_agent=user_agent):
+                self.assertEqual(classify_user_agent(user_agent).device_type, DEVICE_BOT)
+
+    def test_cubot_phone_is_not_a_bot(self):
+        for user_agent in (
+            "Mozilla/5.0 (Linux; Android 10; CUBOT X30 Build/QP1A.190711.020) AppleWebKit/537.36 "
+            "(KHTML, like Gecko) Chrome/120.0.0.0 Mobile Safari/537.36",
+            "Mozilla/5.0 (Linux; Android 13; Cubot_KingKong_9 Build/TP1A.220624.014) AppleWebKit/537.36 "
+            "(KHTML, like Gecko) Chrome/119.0.0.0 Mobile Safari/537.36",
+        ):
+            with self.subTest(user_agent=user_agent):
+                info = classify_user_agent(user_agent)
+                self.assertEqual(info.device_type, DEVICE_MOBILE)
+                self.assertEqual(info.browser, "Google Chrome")
+
+
+@override_settings(REQUEST_LIMITS={'MAX_BODY_SIZE': 1024, 'ROUTES': {'/api/upload/': 4096}})
+class ValidateRequestMiddlewareTests(SimpleTestCase):
+    """
+    Body boyutunun body okunmadan `Content-Length` başlığından denetlenmesi.
+    """
+
+    def setUp(self):
+        self.factory = RequestFactory(HTTP_X_REQUESTED_WITH='XMLHttpRequest', HTTP_AUTHORIZATION='Bearer test')
+        self.middleware = ValidateRequestMiddleware(lambda request: HttpResponse('ok'))
+
+    def post(self, path, content_length, **extra):
+        request = self.factory.post(
+            path, data=b'{}', content_type='application/json', CONTENT_LENGTH=str(content_length), **extra
+        )
+        return self.middleware(request)
+
+    def test_body_within_limit_is_accepted(self):
+        self.assertEqual(self.post('/api/items/', 1024).status_code, 200)
+
+    def test_body_over_default_limit_is_rejected(self):
+        response = self.post('/api/items/', 1025)
+        self.assertEqual(response.status_code, 413)
+        self.assertIn("MB", json.loads(response.content)['error'])
+
+    def test_route_limit_overrides_default(self):
+        self.assertEqual(self.post('/api/upload/images/', 4096).status_code, 200)
+        self.assertEqual(self.post('/api/upload/images/', 4097).status_code, 413)
+
+    def test_chunked_body_without_content_length_is_rejected(self):
+        response = self.post('/api/items/', '', HTTP_TRANSFER_ENCODING='chunked')
+        self.assertEqual(response.status_code, 411)
+
+    def test_get_request_is_not_checked(self):
+        request = self.factory.get('/api/items/', CONTENT_LENGTH='999999')
+        self.assertEqual(self.middleware(request).status_code, 200)
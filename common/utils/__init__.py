@@ -1,6 +1,7 @@
 from common.utils_core import paginate_or_default
 from .hash_key_manager import HashKeyManager
+from .redis_client import get_redis_client
 from .user_info_extractor import UserInfoExtractor
 
 
-__all__ = ["paginate_or_default", "HashKeyManager", "UserInfoExtractor"]
+__all__ = ["paginate_or_default", "HashKeyManager", "UserInfoExtractor", "get_redis_client"]
@@ -0,0 +1,27 @@
+import threading
+
+try:
+    import redis
+except ImportError:  # redis paketi kurulu değilse Redis tabanlı özellikler kullanılamaz
+    redis = None
+
+_clients = {}
+_lock = threading.Lock()
+
+
+def get_redis_client(url):
+    """
+    Verilen URL için süreç (process) başına tek bir Redis istemcisi döner.
+    İstemciler bağlantı havuzu kullandığı için thread'ler arasında paylaşılabilir.
+    """
+    if redis is None:
+        raise RuntimeError("Redis kullanabilmek için 'redis' paketi kurulmalıdır.")
+
+    client = _clients.get(url)
+    if client is None:
+        with _lock:
+            client = _clients.get(url)
+            if client is None:
+                client = redis.Redis.from_url(url)
+                _clients[url] = client
+    return client
@@ -0,0 +1,154 @@
+"""
+Bir kapsam (ör. site) içinde benzersiz slug üretimi.
+
+Eski yöntem `while Model.objects.filter(slug=...).exists()` ile `-1`, `-2`, ... eklerini tek tek deniyordu; benzer
+başlıklı N kayıt için N sorgu (toplamda karesel) çalışıyordu. Burada kapsam + taban slug başına verilen son ek
+`SlugCounter` tablosunda tutulur:
+
+- Taban slug boştaysa tek bir indeksli eşitlik sorgusuyla doğrulanıp doğrudan kullanılır; sayaç yalnızca çakışma
+  olduğunda devreye girer ve çakışmayan başlıklar için sayaç satırı oluşturulmaz.
+- Bir taban slug ilk kez çakıştığında mevcut kayıtlardan en büyük ek tek bir önek sorgusuyla bulunur ve sayaç
+  bu değerle oluşturulur.
+- Sonraki isteklerde sayaç satırı kilitlenerek (SELECT ... FOR UPDATE) bir artırılır; eş zamanlı kayıtlar aynı eki
+  alamaz. Sayaç kısa bir transaction içinde artırıldığından kilit, kaydın kendisi yazılana kadar tutulmaz.
+- Elle verilmiş ve sayacın önüne geçmiş slug'larla (ör. "baslik-5") çakışma ihtimaline karşı aday slug tek bir
+  indeksli eşitlik sorgusuyla doğrulanır; çakışırsa bir sonraki ek alınır.
+"""
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils.text import slugify
+
+from common.models import SlugCounter
+
+# Taban slug, "-" + en fazla 10 basamaklı ek için yer bırakılarak kısaltılır
+SUFFIX_RESERVE = 11
+
+
+def build_base_slug(value, max_length, allow_unicode=False, fallback='item'):
+    """
+    Değerden, sayı eki için yer bırakılmış taban slug üretir.
+    """
+    base = slugify(value or '', allow_unicode=allow_unicode)
+    base = base[:max(1, max_length - SUFFIX_RESERVE)].strip('-_')
+    return base or fallback
+
+
+def _scope_key(model, filters):
+    parts = ','.join(f"{name}={value}" for name, value in sorted(filters.items()))
+    return f"{model._meta.label_lower}:{parts}"[:100]
+
+
+def _last_used_suffix(queryset, field, base):
+    """
+    Tabanı kullanan mevcut slug'lardaki en büyük eki döner (taban slug'ın kendisi 0, hiç yoksa -1).
+    """
+    last = -1
+    prefix = f"{base}-"
+    taken = queryset.filter(Q(**{field: base}) | Q(**{f"{field}__startswith": prefix})).values_list(field, flat=True)
+    for slug in taken:
+        if slug == base:
+            last = max(last, 0)
+        elif slug[len(prefix):].isdigit():
+            last = max(last, int(slug[len(prefix):]))
+    return last
+
+
+def _next_suffix(scope, base, seed):
+    with transaction.atomic():
+        counter = SlugCounter.objects.select_for_update().filter(scope=scope, base=base).first()
+        if counter is None:
+            try:
+                with transaction.atomic():
+                    counter = SlugCounter.objects.create(scope=scope, base=base, lastSuffix=seed())
+            except IntegrityError:
+                # Aynı anda başka bir süreç sayacı oluşturdu
+                counter = SlugCounter.objects.select_for_update().get(scope=scope, base=base)
+        counter.lastSuffix += 1
+        counter.save(update_fields=['lastSuffix', 'updatedAt'])
+    return counter.lastSuffix
+
+
+def allocate_slug(instance, value, field='slug', scope=(), allow_unicode=False):
+    """
+    Kayıt için benzersiz bir slug döner.
+
+    Kayıtta slug zaten varsa ve kapsamda başka bir kayıtta kullanılmıyorsa olduğu gibi korunur; kullanılıyorsa
+    o slug taban alınarak ek verilir. Slug boşsa `value` değerinden üretilir.
+
+    Args:
+        instance (Model): Slug'ı atanacak kayıt.
+        value (str): Slug boşsa kaynak metin (ör. başlık).
+        field (str): Slug alanının adı.
+        scope (tuple): Benzersizliğin geçerli olduğu alanlar, ör. `('site',)`. Boşsa tüm tabloda benzersizdir.
+        allow_unicode (bool): Unicode karakterlere izin verilip verilmeyeceği.
+    """
+    model = type(instance)
+    max_length = model._meta.get_field(field).max_length
+    filters = {}
+    for name in scope:
+        attname = model._meta.get_field(name).attname
+        filters[attname] = getattr(instance, attname)
+    queryset = model._default_manager.filter(**filters)
+
+    def is_taken(slug):
+        return queryset.filter(**{field: slug}).exclude(pk=instance.pk).exists()
+
+    current = getattr(instance, field)
+    if current:
+        if not is_taken(current):
+            return current
+        base = build_base_slug(current, max_length, allow_unicode, model._meta.model_name)
+    else:
+        base = build_base_slug(value, max_length, allow_unicode, model._meta.model_name)
+    if base != current and not is_taken(base):
+        return base
+
+    scope_key = _scope_key(model, filters)
+    while True:
+        suffix = _next_suffix(scope_key, base, lambda: _last_used_suffix(queryset, field, base))
+        candidate = base if suffix == 0 else f"{base}-{suffix}"
+        if not is_taken(candidate):
+            return candidate
+
+
+def allocate_slugs(instances, values, field='slug', scope=(), allow_unicode=False):
+    """
+    Henüz kaydedilmemiş kayıtlara (ör. `bulk_create` öncesi) toplu olarak benzersiz slug atar.
+
+    Aday slug'lardan hangilerinin kullanıldığı kapsam başına tek bir `IN` sorgusuyla bulunur; boştaki adaylar
+    doğrudan atanır, yalnızca çakışanlar için sayaçtan ek alınır. Eş zamanlı bir kayıt aynı slug'ı alırsa
+    `bulk_create` benzersizlik kısıtından IntegrityError verir; çağıran taraf işlemi tekrarlayabilir.
+
+    Args:
+        instances (list): Aynı modelden kayıtlar.
+        values (list): Her kayıt için slug boşsa kullanılacak kaynak metin.
+    """
+    if not instances:
+        return
+    model = type(instances[0])
+    max_length = model._meta.get_field(field).max_length
+    attnames = [model._meta.get_field(name).attname for name in scope]
+
+    groups = {}
+    for instance, value in zip(instances, values):
+        key = tuple(getattr(instance, attname) for attname in attnames)
+        current = getattr(instance, field)
+        base = current or build_base_slug(value, max_length, allow_unicode, model._meta.model_name)
+        groups.setdefault(key, []).append((instance, base))
+
+    for key, items in groups.items():
+        filters = dict(zip(attnames, key))
+        queryset = model._default_manager.filter(**filters)
+        taken = set(queryset.filter(**{f"{field}__in": {base for _, base in items}}).values_list(field, flat=True))
+        scope_key = _scope_key(model, filters)
+        for instance, base in items:
+            if base in taken:
+                base = build_base_slug(base, max_length, allow_unicode, model._meta.model_name)
+            candidate = base
+            while candidate in taken:
+                suffix = _next_suffix(scope_key, base, lambda: _last_used_suffix(queryset, field, base))
+                candidate = base if suffix == 0 else f"{base}-{suffix}"
+                if candidate not in taken and queryset.filter(**{field: candidate}).exists():
+                    taken.add(candidate)
+            taken.add(candidate)
+            setattr(instance, field, candidate)
@@ -0,0 +1,178 @@
+"""
+User-Agent başlığından tarayıcı, işletim sistemi ve cihaz türünü çıkaran kural tabanlı ayrıştırıcı.
+
+Kurallar önceden derlenmiş düzenli ifadelerden oluşur ve sırayla denenir; ilk eşleşen kural kazanır.
+Sıra önemlidir: Edge/Opera/Samsung gibi Chromium tabanlı tarayıcılar UA içinde "Chrome" da taşıdığı için
+Chrome kuralından önce, iOS ("like Mac OS X") Mac'ten önce, Android ise Linux'tan önce gelir.
+
+Aynı UA metinleri çok sık tekrarlandığından sonuçlar, UA'nın blake2b özeti ile anahtarlanan sınırlı bir
+LRU/TTL önbellekte tutulur.
+"""
+import hashlib
+import re
+import threading
+import time
+from collections import namedtuple
+
+from django.conf import settings
+
+from common.utils.ttl_cache import TTLCache
+
+UNKNOWN_BROWSER = "Bilinmeyen Tarayıcı"
+UNKNOWN_OS = "Bilinmeyen İşletim Sistemi"
+
+DEVICE_DESKTOP = 'desktop'
+DEVICE_MOBILE = 'mobile'
+DEVICE_TABLET = 'tablet'
+DEVICE_BOT = 'bot'
+DEVICE_UNKNOWN = 'unknown'
+
+# Çok uzun (ör. kötü niyetli) UA metinlerinde düzenli ifade maliyetini sınırlamak için
+MAX_USER_AGENT_LENGTH = 512
+
+UserAgentInfo = namedtuple('UserAgentInfo', ['browser', 'operating_system', 'device_type'])
+
+
+def _compile(rules):
+    return tuple((re.compile(pattern, re.IGNORECASE), value) for pattern, value in rules)
+
+
+# "bot" ayrı bir kelime olarak veya bir adın sonunda sürüm / ayraçla (Googlebot/, Slackbot-) aranır;
+# böylece "CUBOT X30" gibi cihaz adları bot sayılmaz
+BOT_RULES = _compile([
+    (r'(?:^|[^a-z])bot\b|[a-z]bot[/;)+-]|crawl|spider|slurp|bingpreview|facebookexternalhit|headlesschrome|'
+     r'curl/|wget/|python-requests|okhttp|go-http-client|java/', 'Bot'),
+])
+
+BROWSER_RULES = _compile([
+    (r'\bEdg(?:e|A|iOS)?/', "Microsoft Edge"),
+    (r'\bOPR/|\bOPT/|\bOpera\b', "Opera"),
+    (r'\bSamsungBrowser/', "Samsung Internet"),
+    (r'\bYaBrowser/', "Yandex Browser"),
+    (r'\bUCBrowser/', "UC Browser"),
+    (r'\bVivaldi/', "Vivaldi"),
+    (r'\bFirefox/|\bFxiOS/', "Mozilla Firefox"),
+    (r'\bCriOS/', "Google Chrome"),
+    (r'\bMSIE |\bTrident/', "Internet Explorer"),
+    (r'; wv\)', "Android WebView"),
+    (r'\bChrome/|\bChromium/', "Google Chrome"),
+    (r'\bVersion/[\d.]+.*\bSafari/|\b(?:iPhone|iPad|iPod).*AppleWebKit', "Apple Safari"),
+])
+
+OS_RULES = _compile([
+    (r'Windows Phone', "Windows Phone"),
+    (r'Windows', "Windows"),
+    (r'iPhone|iPad|iPod', "iOS"),
+    (r'Android', "Android"),
+    (r'CrOS', "Chrome OS"),
+    (r'Macintosh|Mac OS X', "Mac OS"),
+    (r'Linux|X11', "Linux"),
+])
+
+DEVICE_RULES = _compile([
+    (r'iPad|Tablet|Kindle|Silk/|PlayBook|Android(?!.*Mobile)', DEVICE_TABLET),
+    (r'Mobi|iPhone|iPod|Windows Phone|BlackBerry|Opera Mini|IEMobile', DEVICE_MOBILE),
+])
+
+
+def _match(rules, user_agent, default):
+    for pattern, value in rules:
+        if pattern.search(user_agent):
+            return value
+    return default
+
+
+def classify_user_agent(user_agent):
+    """
+    Önbellek kullanmadan UA metnini sınıflandırır.
+    """
+    user_agent = (user_agent or '')[:MAX_USER_AGENT_LENGTH]
+    if not user_agent:
+        return UserAgentInfo(UNKNOWN_BROWSER, UNKNOWN_OS, DEVICE_UNKNOWN)
+
+    if _match(BOT_RULES, user_agent, None):
+        return UserAgentInfo('Bot', _match(OS_RULES, user_agent, UNKNOWN_OS), DEVICE_BOT)
+
+    browser = _match(BROWSER_RULES, user_agent, UNKNOWN_BROWSER)
+    operating_system = _match(OS_RULES, user_agent, UNKNOWN_OS)
+    device_type = _match(DEVICE_RULES, user_agent, None)
+    if device_type is None:
+        device_type = DEVICE_DESKTOP if operating_system != UNKNOWN_OS else DEVICE_UNKNOWN
+    return UserAgentInfo(browser, operating_system, device_type)
+
+
+class UserAgentParser:
+    """
+    Önbellekli UA ayrıştırıcı. Çağrı başına gecikme ve önbellek isabet oranı ölçülür.
+    """
+
+    def __init__(self, max_size=10000, ttl=3600):
+        self.cache = TTLCache(max_size=max_size, ttl=ttl)
+        self.calls = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self._lock = threading.Lock()
+
+    def parse(self, user_agent):
+        started = time.perf_counter_ns()
+        key = hashlib.blake2b((user_agent or '').encode('utf-8', 'replace'), digest_size=16).digest()
+        info = self.cache.get(key)
+        if info is None:
+            info = classify_user_agent(user_agent)
+            self.cache.set(key, info)
+        elapsed = time.perf_counter_ns() - started
+
+        with self._lock:
+            self.calls += 1
+            self.total_ns += elapsed
+            if elapsed > self.max_ns:
+                self.max_ns = elapsed
+        return info
+
+    def stats(self):
+        """
+        Çağrı sayısı, ortalama/en yüksek gecikme (mikrosaniye) ve önbellek istatistiklerini döner.
+        """
+        return {
+            'calls': self.calls,
+            'avg_latency_us': self.total_ns / self.calls / 1000 if self.calls else 0.0,
+            'max_latency_us': self.max_ns / 1000,
+            **self.cache.stats(),
+        }
+
+    def reset_stats(self):
+        with self._lock:
+            self.calls = 0
+            self.total_ns = 0
+            self.max_ns = 0
+        self.cache.clear()
+
+
+_default_parser = None
+_default_parser_lock = threading.Lock()
+
+
+def get_user_agent_parser():
+    """
+    Süreç genelinde paylaşılan UserAgentParser örneğini döner (`settings.USER_AGENT_CACHE` ile ayarlanır).
+    """
+    global _default_parser
+    if _default_parser is None:
+        with _default_parser_lock:
+            if _default_parser is None:
+                options = getattr(settings, 'USER_AGENT_CACHE', {})
+                _default_parser = UserAgentParser(
+                    max_size=options.get('MAX_SIZE', 10000),
+                    ttl=options.get('TTL', 3600),
+                )
+    return _default_parser
+
+
+def parse_user_agent(user_agent):
+    """
+    UA metnini paylaşılan önbellekli ayrıştırıcı ile sınıflandırır.
+
+    Returns:
+        UserAgentInfo: (browser, operating_system, device_type)
+    """
+    return get_user_agent_parser().parse(user_agent)
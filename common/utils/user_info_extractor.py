@@ -1,3 +1,6 @@
+from common.utils.user_agent_parser import parse_user_agent
+
+
 class UserInfoExtractor:
     """
     Kullanıcı bilgilerini HTTP isteklerinden çıkaran yardımcı sınıf.
@@ -15,12 +18,14 @@ class UserInfoExtractor:
         if x_forwarded_for:
             ip_address = x_forwarded_for.split(',')[0]
 
+        user_agent_info = parse_user_agent(user_agent)
         return {
             "user_agent": user_agent,
             "ip_address": ip_address,
             "username": request.user.username if request.user.is_authenticated else "Anonim",
-            "browser": UserInfoExtractor.get_browser_info(user_agent),
-            "operating_system": UserInfoExtractor.get_os_info(user_agent),
+            "browser": user_agent_info.browser,
+            "operating_system": user_agent_info.operating_system,
+            "device_type": user_agent_info.device_type,
         }
 
     @staticmethod
@@ -28,31 +33,18 @@ class UserInfoExtractor:
         """
         Tarayıcı bilgilerini analiz eder.
         """
-        if 'Chrome' in user_agent:
-            return "Google Chrome"
-        elif 'Firefox' in user_agent:
-            return "Mozilla Firefox"
-        elif 'Safari' in user_agent:
-            return "Apple Safari"
-        elif 'Edge' in user_agent:
-            return "Microsoft Edge"
-        elif 'MSIE' in user_agent or 'Trident' in user_agent:
-            return "Internet Explorer"
-        return "Bilinmeyen Tarayıcı"
+        return parse_user_agent(user_agent).browser
 
     @staticmethod
     def get_os_info(user_agent):
         """
         İşletim sistemi bilgilerini analiz eder.
         """
-        if 'Windows' in user_agent:
-            return "Windows"
-        elif 'Macintosh' in user_agent or 'Mac OS X' in user_agent:
-            return "Mac OS"
-        elif 'Linux' in user_agent:
-            return "Linux"
-        elif 'Android' in user_agent:
-            return "Android"
-        elif 'iPhone' in user_agent or 'iPad' in user_agent:
-            return "iOS"
-        return "Bilinmeyen İşletim Sistemi"
+        return parse_user_agent(user_agent).operating_system
+
+    @staticmethod
+    def get_device_type(user_agent):
+        """
+        Cihaz türünü (desktop, mobile, tablet, bot) analiz eder.
+        """
+        return parse_user_agent(user_agent).device_type
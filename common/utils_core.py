@@ -1,30 +1,64 @@
 # common/utils_core.py
 
 from django.core.paginator import Paginator
+from django.db.models import QuerySet
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+from common.pagination import KeysetPagination, wants_cursor_pagination
+
+
+def _serialize(items, serializer_class):
+    """
+    Serializer verilmemişse (ör. rapor servislerinin ürettiği sözlük listeleri) veriyi olduğu gibi döner.
+    """
+    if serializer_class is None:
+        return list(items)
+    return serializer_class(items, many=True).data
+
+
+def _get_paginator(view, queryset, request):
+    """
+    Kullanılacak sayfalama sınıfını belirler:
+    - İstek veya view keyset (cursor) sayfalama istiyorsa ve veri bir QuerySet ise KeysetPagination,
+    - view'in kendi sayfalama nesnesi varsa o,
+    - aksi halde DRF ayarlarındaki varsayılan sayfalama sınıfı.
+    """
+    if isinstance(queryset, QuerySet) and wants_cursor_pagination(request, view):
+        return KeysetPagination(ordering=getattr(view, 'keyset_ordering', KeysetPagination().ordering))
+
+    paginator = getattr(view, 'paginator', None)
+    if isinstance(paginator, KeysetPagination) and not isinstance(queryset, QuerySet):
+        paginator = None
+    if paginator is None and api_settings.DEFAULT_PAGINATION_CLASS is not None:
+        paginator = api_settings.DEFAULT_PAGINATION_CLASS()
+    return paginator
+
 
 def paginate_or_default(queryset, serializer_class, request, default_limit=20):
     """
     Sayfalama mekanizmasını kullan veya varsayılan olarak belirli bir limit kadar kayıt döndür.
 
+    `?pagination=cursor` parametresi (veya view'de `pagination_mode = 'cursor'`) ile QuerySet'ler keyset
+    sayfalama ile döndürülür; bu modda toplam kayıt sayısı hesaplanmaz.
+
     Args:
-        queryset (QuerySet): Filtrelenmiş sorgu seti.
-        serializer_class (Serializer): DRF Serializer sınıfı.
+        queryset (QuerySet | list): Filtrelenmiş sorgu seti veya liste.
+        serializer_class (Serializer | None): DRF Serializer sınıfı. None ise veri olduğu gibi döndürülür.
         request (Request): HTTP isteği.
         default_limit (int): Sayfalama olmadığında dönecek kayıt sayısı.
 
     Returns:
         Response: Sayfalı veya varsayılan limitli bir yanıt.
     """
-    # DRF'nin sayfalama mekanizmasını kullan
-    view = request.parser_context['view']  # DRF view instance
-    page = view.paginate_queryset(queryset)
-    if page is not None:
-        serializer = serializer_class(page, many=True)
-        return view.get_paginated_response(serializer.data)
+    view = request.parser_context.get('view') if request.parser_context else None
+    paginator = _get_paginator(view, queryset, request)
+    if paginator is not None:
+        page = paginator.paginate_queryset(queryset, request, view=view)
+        if page is not None:
+            return paginator.get_paginated_response(_serialize(page, serializer_class))
 
     # Eğer sayfalama devrede değilse varsayılan limit kadar döndür
     paginator = Paginator(queryset, default_limit)
     first_page = paginator.page(1)
-    serializer = serializer_class(first_page.object_list, many=True)
-    return Response(serializer.data)
+    return Response(_serialize(first_page.object_list, serializer_class))
@@ -2,11 +2,17 @@
 Bu middleware, dinamik CORS (Cross-Origin Resource Sharing) kurallarını uygulamak için kullanılır.
 Site tablosundan alınan domainler baz alınarak gelen isteklerin `Origin` header'ı kontrol edilir ve
 izin verilen domainler için CORS ayarları yanıt başlıklarına eklenir.
+
+İzinli origin'ler süreç içi, önceden hesaplanmış bir eşleştiriciden okunur (bkz. `soloaccounting.cors_origins`);
+Site değiştiğinde tüm süreçlerde yenilenir. Preflight yanıtları `Access-Control-Max-Age` ile tarayıcıda önbelleğe
+alınabilir.
 """
 
-from django.contrib.sites.models import Site
 from django.http import JsonResponse
-from django.core.cache import cache
+from django.utils.cache import patch_vary_headers
+
+from soloaccounting.cors_origins import get_cors_settings, is_origin_allowed
+
 
 class DynamicCorsMiddleware:
     """Dinamik CORS ayarlarını uygulayan middleware."""
@@ -15,6 +21,14 @@ class DynamicCorsMiddleware:
         Middleware başlatılırken çağrılır.
         """
         self.get_response = get_response
+        options = get_cors_settings()
+        self.headers = {
+            "Access-Control-Allow-Methods": options['ALLOW_METHODS'],
+            "Access-Control-Allow-Headers": options['ALLOW_HEADERS'],
+        }
+        if options['ALLOW_CREDENTIALS']:
+            self.headers["Access-Control-Allow-Credentials"] = "true"
+        self.max_age = options['MAX_AGE']
 
     def __call__(self, request):
         """
@@ -24,46 +38,30 @@ class DynamicCorsMiddleware:
         if request.method == 'OPTIONS':
             response = JsonResponse({'detail': 'CORS preflight response'}, status=200)
             origin = request.headers.get('Origin', '')  # Origin başlığını al
-            if origin in self.get_allowed_domains():  # Eğer origin izinli domainler arasında ise
-                response["Access-Control-Allow-Origin"] = origin
-                response["Access-Control-Allow-Methods"] = "GET, POST, PUT, DELETE, OPTIONS"
-                response["Access-Control-Allow-Headers"] = "Authorization, Content-Type"
-                response["Access-Control-Allow-Credentials"] = "true"
+            if origin and is_origin_allowed(origin):  # Eğer origin izinli domainler arasında ise
+                self.add_cors_headers(response, origin)
+                if self.max_age:
+                    # Tarayıcı aynı preflight'ı bu süre boyunca tekrar göndermez
+                    response["Access-Control-Max-Age"] = str(self.max_age)
+            patch_vary_headers(response, ('Origin',))
             return response
 
         # Normal istekler için işlemi bir sonraki aşamaya geçir
-        return self.get_response(request)
+        return self.process_response(request, self.get_response(request))
 
     def process_response(self, request, response):
         """
         Yanıt başlıklarına CORS ayarlarını ekler.
         """
         origin = request.headers.get('Origin', '')  # Origin başlığını al
-        if origin and origin in self.get_allowed_domains():  # Eğer origin izinli domainler arasında ise
-            response["Access-Control-Allow-Origin"] = origin
-            response["Access-Control-Allow-Methods"] = "GET, POST, PUT, DELETE, OPTIONS"
-            response["Access-Control-Allow-Headers"] = "Authorization, Content-Type"
-            response["Access-Control-Allow-Credentials"] = "true"
+        if origin and is_origin_allowed(origin):  # Eğer origin izinli domainler arasında ise
+            self.add_cors_headers(response, origin)
+        if origin:
+            # Yanıt origin'e göre değiştiğinden ara önbellekler origin başına ayrı saklamalıdır
+            patch_vary_headers(response, ('Origin',))
         return response
 
-    def get_allowed_domains(self):
-        """
-        İzin verilen domainleri alır ve cache'de tutar.
-        """
-        # Cache'te izinli domainleri kontrol et
-        allowed_domains = cache.get('allowed_domains')
-        if not allowed_domains:
-            # Site tablosundan domainleri çek
-            domains = Site.objects.values_list('domain', flat=True)
-            allowed_domains = set()
-            for domain in domains:
-                # HTTPS ve HTTP versiyonlarını ekle
-                allowed_domains.add(f"https://{domain}")
-                allowed_domains.add(f"http://{domain}")
-                # www olmayan versiyonları da desteklemek için ekle
-                if not domain.startswith("www."):
-                    allowed_domains.add(f"https://www.{domain}")
-                    allowed_domains.add(f"http://www.{domain}")
-            # Cache'e domainleri 1 saat boyunca kaydet
-            cache.set('allowed_domains', allowed_domains, timeout=3600)  # 1 saat süre
-        return allowed_domains
+    def add_cors_headers(self, response, origin):
+        response["Access-Control-Allow-Origin"] = origin
+        for header, value in self.headers.items():
+            response[header] = value
@@ -1,11 +1,18 @@
 """
 Bu middleware, gelen istekler için genel bir hız sınırlandırması (rate limit) uygular.
-İstekler belirli bir oranı aşarsa (örneğin dakikada 25 istek), yanıt olarak HTTP 429 (Too Many Requests) döndürür.
+İstekler, `settings.RATE_LIMITING['POLICIES']` içinde tanımlı kurallardan birini aşarsa (örneğin IP başına dakikada
+25 istek) yanıt olarak HTTP 429 (Too Many Requests) döndürür. `blacklist` işaretli bir kuralı aşan IP kara listeye
+alınır ve HTTP 403 döner.
+
+Uyan tüm kurallar tek bir çağrıyla değerlendirilir (bkz. `soloaccounting.rate_limiting`); yanıtlara
+`X-RateLimit-*` başlıkları eklenir.
 """
 
-from django_ratelimit.exceptions import Ratelimited
-from django_ratelimit.core import is_ratelimited
-from django.http import JsonResponse
+from django.http import HttpResponseForbidden, JsonResponse
+
+from middleware.soloadmin.ip_blocking import blacklist_ip, get_client_ip
+from soloaccounting.rate_limiting import get_rate_limit_settings, get_rate_limiter, rate_limit_headers
+from soloaccounting.site_resolver import resolve_site
 
 
 class GlobalRateLimitMiddleware:
@@ -16,31 +23,41 @@ class GlobalRateLimitMiddleware:
         Middleware başlatılırken çağrılır.
         """
         self.get_response = get_response
+        self.enabled = get_rate_limit_settings()['ENABLED']
 
     def __call__(self, request):
         """
         Her istek için çağrılır ve hız sınırlandırması kontrolü yapar.
         """
-        try:
-            # İsteklerin IP adresine göre dakikada 25 istekle sınırlanması
-            if is_ratelimited(
-                    request,
-                    group='global',  # Rate limit grubunun adı
-                    key='ip',  # IP adresine göre sınırlandır
-                    rate='25/m',  # Dakikada 25 istek sınırı
-                    method=['GET', 'POST']  # Yalnızca GET ve POST istekleri için geçerli
-            ):
+        if not self.enabled:
+            return self.get_response(request)
+
+        # SiteMiddleware'den önce çalışabildiği için site, host adından (önbellekten) çözülür
+        site = getattr(request, 'site', None)
+        if site is None:
+            resolved = resolve_site(request.get_host())
+            site = resolved.site if resolved is not None else None
+
+        client_ip = get_client_ip(request)
+        result = get_rate_limiter().check(request, client_ip, site)
+        if result is None:
+            return self.get_response(request)
+
+        if not result.allowed:
+            if result.policy.blacklist:
+                # Kara liste kuralını aşan IP'yi kara listeye ekle
+                blacklist_ip(client_ip)
+                response = HttpResponseForbidden("Aşırı istek nedeniyle IP'niz kara listeye alınmıştır.")
+            else:
                 # Limit aşımı durumunda özel hata yanıtı döndür
-                return JsonResponse(
+                response = JsonResponse(
                     {'error': 'Rate limit exceeded. Please try again later.'},
                     status=429  # HTTP 429: Too Many Requests
                 )
-        except Ratelimited:
-            # Rate limit durumu yakalandığında hata yanıtı döndür
-            return JsonResponse(
-                {'error': 'Rate limit exceeded. Please try again later.'},
-                status=429
-            )
-
-        # Sınırı aşmayan isteği bir sonraki aşamaya geçir
-        return self.get_response(request)
+        else:
+            # Sınırı aşmayan isteği bir sonraki aşamaya geçir
+            response = self.get_response(request)
+
+        for header, value in rate_limit_headers(result).items():
+            response[header] = value
+        return response
@@ -1,10 +1,41 @@
 """
 Bu middleware, gelen isteklerin body boyutunu ve gerekli header içeriklerini kontrol eder.
 Eğer kontrol başarısız olursa, isteğe izin verilmez ve bir hata yanıtı döndürülür.
+
+Body boyutu, body belleğe okunmadan kontrol edilir:
+- `Content-Length` başlığı rotanın sınırını aşıyorsa istek hiç okunmadan HTTP 413 ile reddedilir.
+- `Content-Length` olmadan gönderilen (`Transfer-Encoding: chunked`) istekler HTTP 411 ile reddedilir. Django ve
+  DRF eksik `Content-Length` değerini 0 kabul ettiğinden bu isteklerin body'si zaten hiç ayrıştırılmaz.
+- Sınırlar rotaya (yol önekine) göre `settings.REQUEST_LIMITS['ROUTES']` ile büyütülebilir (ör. medya yüklemeleri).
+  Body okunmadığından çok megabaytlık dosyalar Django'nun upload handler'larıyla geçici dosyaya akıtılır
+  (`FILE_UPLOAD_MAX_MEMORY_SIZE` üzerindekiler) ve bellekte ikinci bir kopyası oluşmaz.
 """
 
+from django.conf import settings
 from django.http import JsonResponse
-from django.urls import resolve
+
+from middleware.soloadmin.ip_blocking import is_admin_path
+
+DEFAULTS = {
+    'MAX_BODY_SIZE': 1024 * 1024,  # Varsayılan en fazla body boyutu: 1 MB
+    'ROUTES': {},  # Yol öneki -> en fazla body boyutu (bayt); en uzun eşleşen önek kullanılır
+    'EXCLUDED_PATHS': ['/api/token/', '/api/token/refresh/'],
+    'REQUIRED_HEADERS': ['X-Requested-With', 'Authorization'],
+}
+
+BODY_METHODS = ('POST', 'PUT', 'PATCH')
+
+
+def get_request_limit_settings():
+    return {**DEFAULTS, **getattr(settings, 'REQUEST_LIMITS', {})}
+
+
+def _payload_too_large(limit):
+    return JsonResponse(
+        {"error": f"İstek boyutu {limit / (1024 * 1024):g} MB'ı geçemez."},
+        status=413  # HTTP 413: Payload Too Large
+    )
+
 
 class ValidateRequestMiddleware:
     """Gelen isteğin body ve header içeriklerini kontrol eden middleware."""
@@ -13,35 +44,53 @@ class ValidateRequestMiddleware:
         Middleware başlatılırken çağrılır.
         """
         self.get_response = get_response
+        self.options = get_request_limit_settings()
+        # En uzun önek önce denenir
+        self.routes = sorted(self.options['ROUTES'].items(), key=lambda item: -len(item[0]))
+        self.excluded_paths = frozenset(self.options['EXCLUDED_PATHS'])
+
+    def get_body_limit(self, path):
+        """
+        Yola uygulanacak en fazla body boyutunu döner.
+        """
+        for prefix, limit in self.routes:
+            if path.startswith(prefix):
+                return limit
+        return self.options['MAX_BODY_SIZE']
 
     def __call__(self, request):
         """
         Her istek için çağrılır ve aşağıdaki kontroller uygulanır:
         - Admin paneli isteklerini hariç tutar.
-        - İstek boyutunu kontrol eder.
+        - İstek boyutunu body'yi okumadan kontrol eder.
         - Zorunlu header içeriklerini kontrol eder.
         """
         # Admin paneli isteklerini hariç tut
-        if resolve(request.path).app_name == 'admin':
+        if is_admin_path(request.path):
             return self.get_response(request)
 
         # Belirli endpoint'leri hariç tut
-        EXCLUDED_PATHS = ['/api/token/', '/api/token/refresh/']
-        if request.path in EXCLUDED_PATHS:
+        if request.path in self.excluded_paths:
             return self.get_response(request)
 
         # İstek Boyutunu Kontrol Et
-        MAX_BODY_SIZE = 1024 * 1024  # Maksimum body boyutu: 1 MB
-        if request.method in ['POST', 'PUT', 'PATCH'] and len(request.body) > MAX_BODY_SIZE:
-            # Eğer body boyutu 1 MB'ı aşarsa hata döndür
-            return JsonResponse(
-                {"error": "İstek boyutu 1 MB'ı geçemez."},
-                status=413  # HTTP 413: Payload Too Large
-            )
+        if request.method in BODY_METHODS:
+            limit = self.get_body_limit(request.path)
+            try:
+                content_length = int(request.META.get('CONTENT_LENGTH') or 0)
+            except ValueError:
+                content_length = 0
+            if content_length > limit:
+                # Body hiç okunmadan reddedilir
+                return _payload_too_large(limit)
+            if not content_length and 'chunked' in request.headers.get('Transfer-Encoding', '').lower():
+                return JsonResponse(
+                    {"error": "İstek body'si için Content-Length başlığı zorunludur."},
+                    status=411  # HTTP 411: Length Required
+                )
 
         # Zorunlu Header Kontrolü
-        REQUIRED_HEADERS = ['X-Requested-With', 'Authorization']  # İstenen header listesi
-        missing_headers = [header for header in REQUIRED_HEADERS if header not in request.headers]
+        missing_headers = [header for header in self.options['REQUIRED_HEADERS'] if header not in request.headers]
         if missing_headers:
             # Eksik header varsa hata döndür
             return JsonResponse(
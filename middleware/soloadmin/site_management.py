@@ -1,27 +1,30 @@
 # middleware/soloadmin/site_management.py
 """
 Bu middleware, gelen HTTP isteğinin host adını kullanarak Django'nun Site modelinden ilgili site nesnesini belirler.
-Eğer bir eşleşme bulunursa, isteğe (request) `site` ve varsa ilişkili `module` bilgilerini ekler.
-Bu sayede, farklı sitelere özel işlem yapma imkanı sağlar.
+Eğer bir eşleşme bulunursa, isteğe (request) `site`, varsa ilişkili `module` ve `ExtendedSite` bayraklarını
+(`site_flags`) ekler. Bu sayede, farklı sitelere özel işlem yapma imkanı sağlar.
+
+Çözümleme süreç içi önbellekten yapılır (bkz. `soloaccounting.site_resolver`); istek başına veritabanı sorgusu
+çalışmaz.
 """
-from django.contrib.sites.models import Site
+from soloaccounting.site_resolver import resolve_site
+
 
 class SiteMiddleware:
     def __init__(self, get_response):
         self.get_response = get_response  # Django'nun isteği işleme bağlantı noktası
 
     def __call__(self, request):
-        # Host adını al ve port bilgisi varsa çıkar
-        host = request.get_host().split(':')[0]
-        try:
-            # Host adına uygun Site nesnesini al
-            site = Site.objects.get(domain=host)
-            request.site = site  # İstek nesnesine Site bilgisi ekle
-            # İlgili modül bilgisi varsa isteğe ekle
-            request.module = site.module.module if hasattr(site, 'module') else None
-        except Site.DoesNotExist:
+        # Host adına uygun site bilgisini önbellekten al (port bilgisi çözümleyicide atılır)
+        resolved = resolve_site(request.get_host())
+        if resolved is not None:
+            request.site = resolved.site  # İstek nesnesine Site bilgisi ekle
+            request.module = resolved.module
+            request.site_flags = resolved.flags
+        else:
             # Site bulunamazsa isteğe None ekle
             request.site = None
             request.module = None
+            request.site_flags = None
         # İsteği bir sonraki aşamaya gönder
         return self.get_response(request)
@@ -1,5 +1,3 @@
-import os
-
 from django import forms
 from django.conf import settings
 from django.contrib import admin
@@ -9,7 +7,7 @@ from django.urls import path
 from django.utils.timezone import localtime
 
 from .forms import CustomAdminAuthenticationForm
-from .models import ExtendedSite
+from .models import ExtendedSite, release_logo
 from .models import SiteUrun, Blacklist, Menu, Product, Category, Currency
 
 
@@ -207,15 +205,6 @@ class SiteUrunAdmin(admin.ModelAdmin):
     urun_list.short_description = "Ürünler"
 
 
-def safe_remove(file_path):
-    """
-    Dosyayı güvenli bir şekilde siler. Dosya mevcut değilse hata vermez.
-    """
-    if os.path.exists(file_path):
-        os.remove(file_path)
-        print(f"Silindi: {file_path}")
-
-
 class SiteAdminForm(forms.ModelForm):
     """
     Site admini için form.
@@ -237,7 +226,7 @@ class SiteAdminForm(forms.ModelForm):
             extended_site = getattr(self.instance, "extended_site", None)
             if extended_site and not logo and extended_site.logo:
                 # Logo temizlenmişse fiziksel dosyayı sil
-                safe_remove(extended_site.logo.path)
+                release_logo(extended_site.logo)
                 extended_site.logo = None  # Veritabanındaki logo alanını temizle
                 extended_site.save()  # Değişiklikleri kaydet
 
@@ -258,7 +247,7 @@ class SiteAdminForm(forms.ModelForm):
             extended_site = getattr(self.instance, "extended_site", None)
             if extended_site and not logo and extended_site.logo:
                 # Logo temizlenmişse fiziksel dosyayı sil
-                safe_remove(extended_site.logo.path)
+                release_logo(extended_site.logo)
                 extended_site.logo = None  # Veritabanındaki logo alanını temizle
                 extended_site.save()  # Değişiklikleri kaydet
 
@@ -356,10 +345,11 @@ class SiteAdmin(admin.ModelAdmin):
 
         if "logo" in form.cleaned_data:
             if not form.cleaned_data["logo"]:
-                if extended_site.logo:
-                    safe_remove(extended_site.logo.path)
+                release_logo(extended_site.logo)
                 extended_site.logo = None
             else:
+                if extended_site.logo != form.cleaned_data["logo"]:
+                    release_logo(extended_site.logo)
                 extended_site.logo = form.cleaned_data["logo"]
 
         extended_site.save()
@@ -374,13 +364,13 @@ class BlacklistAdmin(admin.ModelAdmin):
     """
     Karalisteye alınan IP adreslerini yönetir.
     """
-    list_display = ("ip_address", "reason", "added_on", "is_active")
+    list_display = ("ip_address", "prefix_length", "reason", "added_on", "is_active")
     list_filter = ("is_active", "added_on")
     search_fields = ("ip_address", "reason")
     fieldsets = (
         (None, {
-            "fields": ("ip_address", "reason", "is_active"),
-            "description": "Karalisteye alınacak IP adresi ve nedeni."
+            "fields": ("ip_address", "prefix_length", "reason", "is_active"),
+            "description": "Karalisteye alınacak IP adresi (veya önek uzunluğuyla CIDR aralığı) ve nedeni."
         }),
         ("Tarih Bilgileri", {
             "fields": ("added_on",),
@@ -0,0 +1,262 @@
+# soloaccounting/cors_origins.py
+"""
+Dinamik CORS için izinli origin eşleştiricisi (`DynamicCorsMiddleware` tarafından kullanılır).
+
+Eskiden izinli origin kümesi, önbellekteki kaydın süresi (1 saat) dolduğunda Site tablosunun tamamından yeniden
+kuruluyordu; süreç içi (LocMem) önbellekte her worker aynı anda veritabanına gidiyordu. Burada:
+
+- Her site için http/https ve www'lu/www'suz origin'ler bir kez hesaplanıp `frozenset` içinde tutulur; `WILDCARD`
+  açıksa sitelerin tüm alt alan adları da (ör. `https://blog.example.com`) izinlidir. `EXTRA_ORIGINS` ile ek
+  origin'ler veya `https://*.example.com` biçiminde joker kalıplar tanımlanabilir. Eşleştirme kümede tek arama ve
+  joker kalıplar için host adının etiket sayısı kadar küme aramasıdır.
+- Site kaydedildiğinde / silindiğinde (sinyal `soloaccounting.models` içindedir) önbellekteki sürüm anahtarı
+  artırılır. Süreçler sürümü en fazla `VERSION_CHECK_SECONDS` aralıkla okur.
+- Kurulan origin listesi sürüm numarasıyla önbelleğe en fazla `CACHE_TIMEOUT` süreyle yazılır. Liste yoksa yeniden
+  üretim tek uçuşludur (single-flight): kilidi (`cache.add`) alan tek thread (paylaşılan önbellekte tek süreç)
+  veritabanını okur, diğerleri bu sırada beklemeden eski eşleştiriciyi kullanmaya devam eder. Hiç eşleştiricisi
+  olmayan süreç en fazla `LOCK_WAIT_SECONDS` bekler.
+- Sürüm anahtarı ve liste ancak önbellek paylaşılıyorsa (Redis, Memcached) diğer süreçlere ulaşır. Varsayılan
+  süreç içi (LocMem) önbellekte sürüm yalnızca değişikliği yapan süreçte artar; bu yüzden her süreç eşleştiricisini
+  sürümden bağımsız olarak `CACHE_TIMEOUT` saniyede bir yeniden kurar ve yeni / değişen site domain'leri diğer
+  worker'lara en geç bu süre sonunda yansır.
+
+Ayarlar `settings.DYNAMIC_CORS` sözlüğünden okunur.
+"""
+import threading
+import time
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.contrib.sites.models import Site
+from django.core.cache import cache
+from django.db import transaction
+
+DEFAULTS = {
+    'WILDCARD': False,  # Site domain'lerinin tüm alt alan adlarına izin ver
+    'EXTRA_ORIGINS': [],  # Ek origin'ler veya "https://*.example.com" kalıpları
+    'VERSION_KEY': 'cors_origins:version',
+    'CACHE_PREFIX': 'cors_origins',
+    'VERSION_CHECK_SECONDS': 1,
+    'CACHE_TIMEOUT': 60,  # Origin listesinin ve süreç içi eşleştiricinin en uzun ömrü (saniye)
+    'LOCK_TIMEOUT': 30,  # Yeniden üretim kilidinin en uzun süresi
+    'LOCK_WAIT_SECONDS': 2,  # Eşleştiricisi olmayan sürecin başka sürecin üretimini bekleme süresi
+    'MAX_AGE': 86400,  # Preflight yanıtının tarayıcıda önbellekte tutulma süresi (Access-Control-Max-Age)
+    'ALLOW_METHODS': 'GET, POST, PUT, DELETE, OPTIONS',
+    'ALLOW_HEADERS': 'Authorization, Content-Type',
+    'ALLOW_CREDENTIALS': True,
+}
+
+SCHEMES = ('https', 'http')
+
+
+def get_cors_settings():
+    return {**DEFAULTS, **getattr(settings, 'DYNAMIC_CORS', {})}
+
+
+def _parse_origin(origin):
+    """
+    Origin'i (şema, host, port) olarak döner; geçersizse None.
+    """
+    try:
+        parts = urlsplit(origin.strip().lower())
+        port = parts.port
+    except ValueError:
+        return None
+    if parts.scheme not in SCHEMES or not parts.hostname or parts.path not in ('', '/'):
+        return None
+    return parts.scheme, parts.hostname.rstrip('.'), port
+
+
+def build_origin_rules(domains, wildcard=False, extra_origins=()):
+    """
+    Site domain'lerinden izinli origin'leri ve joker kalıpları hesaplar.
+
+    Returns:
+        dict: `origins` (tam origin'ler) ve `wildcards` ("şema://alan" biçiminde, alt alan adlarına izin verilenler).
+    """
+    origins = set()
+    wildcards = set()
+    for domain in domains:
+        domain = domain.strip().lower().rstrip('.')
+        if not domain:
+            continue
+        hosts = {domain, domain[4:]} if domain.startswith('www.') else {domain, f"www.{domain}"}
+        for scheme in SCHEMES:
+            for host in hosts:
+                origins.add(f"{scheme}://{host}")
+            if wildcard:
+                wildcards.add(f"{scheme}://{domain[4:] if domain.startswith('www.') else domain}")
+    for origin in extra_origins:
+        origin = origin.strip().lower().rstrip('/')
+        if '://*.' in origin:
+            scheme, suffix = origin.split('://*.', 1)
+            wildcards.add(f"{scheme}://{suffix}")
+        elif origin:
+            origins.add(origin)
+    return {'origins': sorted(origins), 'wildcards': sorted(wildcards)}
+
+
+class OriginMatcher:
+    """
+    Önceden hesaplanmış, değişmez origin eşleştiricisi.
+    """
+    __slots__ = ('origins', 'wildcards')
+
+    def __init__(self, origins=(), wildcards=()):
+        self.origins = frozenset(origins)
+        self.wildcards = frozenset(wildcards)
+
+    def __contains__(self, origin):
+        if not origin:
+            return False
+        if origin in self.origins:
+            return True
+        parsed = _parse_origin(origin)
+        if parsed is None:
+            return False
+        scheme, host, port = parsed
+        normalized = f"{scheme}://{host}" if port is None else f"{scheme}://{host}:{port}"
+        if normalized in self.origins:
+            return True
+        if not self.wildcards or port is not None:
+            return False
+        # Alt alan adları: "a.b.example.com" için "b.example.com", "example.com", ... denenir
+        labels = host.split('.')
+        return any(f"{scheme}://{'.'.join(labels[index:])}" in self.wildcards for index in range(1, len(labels)))
+
+
+class CorsOriginCache:
+    """
+    Süreç içi eşleştirici, paylaşılan sürüm anahtarı ve tek uçuşlu yeniden üretim.
+    """
+
+    def __init__(self, options=None):
+        self.options = options or get_cors_settings()
+        self._lock = threading.Lock()
+        self._matcher = None
+        self._version = None
+        self._checked_at = 0.0
+        self._loaded_at = 0.0
+
+    def _data_key(self, version):
+        return f"{self.options['CACHE_PREFIX']}:data:{version}"
+
+    def _lock_key(self, version):
+        return f"{self.options['CACHE_PREFIX']}:lock:{version}"
+
+    def _shared_version(self):
+        key = self.options['VERSION_KEY']
+        version = cache.get(key)
+        if version is None:
+            cache.add(key, time.time_ns(), None)
+            version = cache.get(key)
+        return version
+
+    def build(self):
+        """
+        Origin listesini veritabanından hesaplar.
+        """
+        return build_origin_rules(
+            Site.objects.values_list('domain', flat=True),
+            wildcard=self.options['WILDCARD'],
+            extra_origins=self.options['EXTRA_ORIGINS'],
+        )
+
+    def _install(self, version, rules):
+        matcher = OriginMatcher(rules['origins'], rules['wildcards'])
+        self._matcher, self._version, self._loaded_at = matcher, version, time.monotonic()
+        return matcher
+
+    def _regenerate(self, version):
+        """
+        Sürümün origin listesini önbellekten alır; yoksa tek bir süreç / thread üretir. Üretimi başka biri yapıyorsa
+        eski eşleştirici döner (hiç yoksa bir süre beklenir).
+        """
+        rules = cache.get(self._data_key(version))
+        if rules is not None:
+            return self._install(version, rules)
+
+        lock_key = self._lock_key(version)
+        if cache.add(lock_key, 1, self.options['LOCK_TIMEOUT']):
+            try:
+                rules = self.build()
+                cache.set(self._data_key(version), rules, self.options['CACHE_TIMEOUT'])
+            finally:
+                cache.delete(lock_key)
+            return self._install(version, rules)
+
+        if self._matcher is not None:
+            return self._matcher
+        deadline = time.monotonic() + self.options['LOCK_WAIT_SECONDS']
+        while time.monotonic() < deadline:
+            time.sleep(0.05)
+            rules = cache.get(self._data_key(version))
+            if rules is not None:
+                return self._install(version, rules)
+        # Üreten süreç zamanında bitiremedi; kilit olmadan kendimiz üretiriz
+        return self._install(version, self.build())
+
+    def get_matcher(self):
+        """
+        Güncel eşleştiriciyi döner. Yenileme sırasında diğer thread'ler beklemeden eski eşleştiriciyi kullanır.
+        """
+        now = time.monotonic()
+        matcher = self._matcher
+        if matcher is not None and now - self._checked_at < self.options['VERSION_CHECK_SECONDS']:
+            return matcher
+        if not self._lock.acquire(blocking=matcher is None):
+            return matcher
+        try:
+            if self._matcher is not None and self._checked_at > now:
+                # Kilit beklenirken başka bir thread yeniledi
+                return self._matcher
+            version = self._shared_version()
+            expired = time.monotonic() - self._loaded_at >= self.options['CACHE_TIMEOUT']
+            if self._matcher is None or version != self._version or expired:
+                self._regenerate(version)
+            self._checked_at = time.monotonic()
+            return self._matcher
+        finally:
+            self._lock.release()
+
+    def is_allowed(self, origin):
+        return origin in self.get_matcher()
+
+
+_origin_cache = None
+_origin_cache_lock = threading.Lock()
+
+
+def get_cors_origin_cache():
+    """
+    Süreç başına tek CorsOriginCache örneğini döner.
+    """
+    global _origin_cache
+    if _origin_cache is None:
+        with _origin_cache_lock:
+            if _origin_cache is None:
+                _origin_cache = CorsOriginCache()
+    return _origin_cache
+
+
+def is_origin_allowed(origin):
+    return get_cors_origin_cache().is_allowed(origin)
+
+
+def _bump_version():
+    key = get_cors_settings()['VERSION_KEY']
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), None)
+    if _origin_cache is not None:
+        # Bu süreç bir sonraki istekte yeni sürümü hemen görsün
+        _origin_cache._checked_at = 0.0
+
+
+def invalidate_cors_origins():
+    """
+    Origin eşleştiricilerini geçersiz kılar (sürüm anahtarı transaction sonrasında artırılır). Önbellek
+    paylaşılmıyorsa diğer süreçler değişikliği `CACHE_TIMEOUT` sonunda görür.
+    """
+    transaction.on_commit(_bump_version)
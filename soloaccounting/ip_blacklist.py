@@ -0,0 +1,293 @@
+# soloaccounting/ip_blacklist.py
+"""
+IP kara listesi (`BlockIPMiddleware` tarafından kullanılır).
+
+Eskiden her istekte tüm aktif kara liste kayıtları veritabanından okunup liste üzerinde doğrusal arama yapılıyordu.
+Burada:
+
+- Aktif kayıtlar ilk kullanımda tek sorguyla süreç içi bir `IPBlacklist` kopyasına yüklenir. Tekil IPv4 adresleri
+  bir kümede tutulur (O(1) arama); CIDR aralıkları ve IPv6 adresleri önek uzunluğuna göre gruplanmış tam sayı
+  kümelerinde tutulur. Bir adres için her farklı önek uzunluğunda tek bir maske + küme araması yapılır; kayıt sayısı
+  arama süresini etkilemez.
+- Blacklist kaydedildiğinde / silindiğinde (sinyaller `soloaccounting.models` içindedir) paylaşılan önbellekteki
+  sürüm anahtarı artırılır. Her süreç sürümü en fazla `VERSION_CHECK_SECONDS` aralıkla okur ve sürüm değiştiyse
+  kopyayı yeniden yükler.
+- Önbellek süreç içi (LocMem) olduğunda sürüm anahtarı yalnızca değişikliği yapan süreçte artar. Bu yüzden kopya,
+  sürümden bağımsız olarak en fazla `MAX_AGE_SECONDS` saniyede bir yeniden yüklenir: paylaşılan önbellek yoksa
+  admin panelinden kaldırılan veya başka bir worker'ın eklediği IP'ler diğer süreçlere en geç bu süre sonunda yansır.
+- Hız sınırını aşan IP (bkz. `soloaccounting.rate_limiting`, `blacklist` işaretli kurallar) yerel kopyaya hemen
+  eklenir; `Blacklist` satırı istek thread'inde değil arka plan yazma thread'inde toplu olarak yazılır ve ardından
+  sürüm artırılarak diğer süreçlere duyurulur.
+
+Ayarlar `settings.IP_BLACKLIST` sözlüğünden okunur.
+"""
+import atexit
+import ipaddress
+import logging
+import os
+import queue
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections, transaction
+
+from soloaccounting.models import Blacklist
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'VERSION_KEY': 'ip_blacklist:version',
+    'VERSION_CHECK_SECONDS': 1,  # Paylaşılan sürüm anahtarının en fazla hangi sıklıkla okunacağı
+    'MAX_AGE_SECONDS': 60,  # Sürüm değişmese de kopyanın yeniden yükleneceği süre (None: sadece sürümle)
+    'REASON': 'Aşırı istek',  # Otomatik eklenen kayıtların nedeni
+    'WRITE_QUEUE_SIZE': 10000,  # Yazılmayı bekleyen en fazla kayıt; doluysa yeni kayıtlar yalnızca yerelde engellenir
+    'WRITE_BATCH_SIZE': 500,
+}
+
+
+def get_blacklist_settings():
+    return {**DEFAULTS, **getattr(settings, 'IP_BLACKLIST', {})}
+
+
+class IPBlacklist:
+    """
+    Değişmez kara liste kopyası. Yeniden yüklemede bütün olarak değiştirildiğinden okuma kilitsizdir.
+    """
+    __slots__ = ('addresses', 'masks')
+
+    def __init__(self, entries=()):
+        """
+        Args:
+            entries: (ip_address, prefix_length) çiftleri; prefix_length None ise tekil adres.
+        """
+        addresses = set()
+        networks = {}
+        for address, prefix_length in entries:
+            if prefix_length is None and ':' not in address:
+                # İstemci IPv4 adresleri her zaman kanonik biçimde geldiğinden metin kümesi yeterlidir
+                addresses.add(address)
+                continue
+            try:
+                network = ipaddress.ip_network(
+                    address if prefix_length is None else f"{address}/{prefix_length}", strict=False
+                )
+            except ValueError:
+                logger.warning("Geçersiz kara liste kaydı atlandı: %s/%s", address, prefix_length)
+                continue
+            if network.version == 4 and network.num_addresses == 1:
+                addresses.add(str(network.network_address))
+                continue
+            networks.setdefault((network.version, network.prefixlen), set()).add(int(network.network_address))
+        self.addresses = frozenset(addresses)
+        masks = {}
+        for (version, prefix_length), members in sorted(networks.items(), key=lambda item: -len(item[1])):
+            bits = 32 if version == 4 else 128
+            mask = ((1 << prefix_length) - 1) << (bits - prefix_length)
+            masks.setdefault(version, []).append((mask, frozenset(members)))
+        self.masks = {version: tuple(items) for version, items in masks.items()}
+
+    def __len__(self):
+        return len(self.addresses) + sum(len(members) for items in self.masks.values() for _, members in items)
+
+    def __contains__(self, ip):
+        if ip in self.addresses:
+            return True
+        if not self.masks:
+            return False
+        try:
+            address = ipaddress.ip_address(ip)
+        except ValueError:
+            return False
+        if address.version == 6 and address.ipv4_mapped is not None:
+            address = address.ipv4_mapped
+            if str(address) in self.addresses:
+                return True
+        value = int(address)
+        for mask, members in self.masks.get(address.version, ()):
+            if value & mask in members:
+                return True
+        return False
+
+
+def _active_entries():
+    queryset = Blacklist.objects.filter(is_active=True).values_list('ip_address', 'prefix_length')
+    return queryset.iterator(chunk_size=5000)
+
+
+def _shared_version(key):
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key)
+    return version
+
+
+class IPGuard:
+    """
+    Süreç içi kara liste kopyası ve kara liste yazma kuyruğu.
+    """
+
+    def __init__(self, options=None):
+        self.options = options or get_blacklist_settings()
+        self._lock = threading.Lock()
+        self._blacklist = None
+        self._blocked = frozenset()  # Kopya yeniden yüklenene kadar yerelde engellenen IP'ler
+        self._version = None
+        self._checked_at = 0.0
+        self._loaded_at = 0.0
+        self._queue = queue.Queue(maxsize=self.options['WRITE_QUEUE_SIZE'])
+        self._thread = None
+        self._stopped = threading.Event()
+
+    def load(self, version=None, entries=None):
+        """
+        Aktif kara liste kayıtlarını tek sorguyla yükler (`entries` verilirse veritabanına gidilmez).
+        """
+        blacklist = IPBlacklist(_active_entries() if entries is None else entries)
+        with self._lock:
+            self._blacklist = blacklist
+            self._blocked = frozenset()
+            self._version = version
+            self._checked_at = self._loaded_at = time.monotonic()
+        return blacklist
+
+    def _current(self):
+        now = time.monotonic()
+        if self._blacklist is not None and now - self._checked_at < self.options['VERSION_CHECK_SECONDS']:
+            return self._blacklist
+        self._checked_at = now
+        version = _shared_version(self.options['VERSION_KEY'])
+        max_age = self.options['MAX_AGE_SECONDS']
+        if self._blacklist is None or version != self._version or (max_age and now - self._loaded_at >= max_age):
+            return self.load(version)
+        return self._blacklist
+
+    def is_blocked(self, ip):
+        """
+        IP adresi kara listedeyse (tekil adres veya CIDR aralığı) True döner.
+        """
+        if not ip:
+            return False
+        return ip in self._blocked or ip in self._current()
+
+    def block(self, ip, reason=None):
+        """
+        IP'yi bu süreçte hemen engeller ve `Blacklist` kaydını arka planda yazılmak üzere kuyruğa ekler.
+        """
+        with self._lock:
+            if ip in self._blocked:
+                return
+            self._blocked = self._blocked | {ip}
+        self._ensure_writer()
+        try:
+            self._queue.put_nowait((ip, reason or self.options['REASON']))
+        except queue.Full:
+            logger.warning("Kara liste yazma kuyruğu dolu, %s yalnızca bu süreçte engellendi.", ip)
+
+    def flush(self, first=None):
+        """
+        Kuyrukta bekleyen kayıtları toplu olarak yazar. Önceden pasif hale getirilmiş kayıtlar yeniden etkinleştirilir.
+
+        Returns:
+            int: Yazılan kayıt sayısı.
+        """
+        pending = dict([first]) if first is not None else {}
+        while len(pending) < self.options['WRITE_BATCH_SIZE']:
+            try:
+                ip, reason = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            pending.setdefault(ip, reason)
+        if not pending:
+            return 0
+        try:
+            Blacklist.objects.bulk_create(
+                [Blacklist(ip_address=ip, reason=reason, is_active=True) for ip, reason in pending.items()],
+                update_conflicts=True, unique_fields=['ip_address'], update_fields=['reason', 'is_active'],
+            )
+        except Exception:
+            logger.exception("%s kara liste kaydı yazılamadı.", len(pending))
+            return 0
+        # bulk_create sinyal göndermediğinden sürüm burada artırılır
+        _bump_version()
+        return len(pending)
+
+    def _ensure_writer(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='ip-blacklist-writer', daemon=True)
+                self._thread.start()
+                atexit.register(self.shutdown)
+
+    def _run(self):
+        while not self._stopped.is_set():
+            try:
+                item = self._queue.get(timeout=1)
+            except queue.Empty:
+                continue
+            try:
+                while self.flush(item):
+                    item = None
+            finally:
+                close_old_connections()
+
+    def shutdown(self, timeout=5):
+        """
+        Yazma thread'ini durdurur ve kuyrukta kalan kayıtları yazar.
+        """
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        try:
+            while self.flush():
+                pass
+        finally:
+            close_old_connections()
+
+    def reset(self):
+        """
+        Süreç içi kopyayı boşaltır; sonraki istekte yeniden yüklenir.
+        """
+        with self._lock:
+            self._blacklist = None
+            self._blocked = frozenset()
+
+
+_guard = None
+_guard_pid = None
+_guard_lock = threading.Lock()
+
+
+def get_ip_guard():
+    """
+    Süreç başına tek IPGuard örneğini döner. Fork sonrası her süreç kendi örneğini (ve yazma thread'ini) oluşturur.
+    """
+    global _guard, _guard_pid
+    pid = os.getpid()
+    if _guard is None or _guard_pid != pid:
+        with _guard_lock:
+            if _guard is None or _guard_pid != pid:
+                _guard, _guard_pid = IPGuard(), pid
+    return _guard
+
+
+def _bump_version():
+    key = get_blacklist_settings()['VERSION_KEY']
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), None)
+    if _guard is not None:
+        _guard.reset()
+
+
+def invalidate_ip_blacklist():
+    """
+    Tüm süreçlerdeki kara liste kopyalarını geçersiz kılar (paylaşılan sürüm anahtarı transaction sonrasında artırılır).
+    """
+    transaction.on_commit(_bump_version)
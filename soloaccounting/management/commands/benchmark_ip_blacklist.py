@@ -0,0 +1,90 @@
+import ipaddress
+import random
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand
+
+from soloaccounting.ip_blacklist import IPBlacklist, IPGuard, get_blacklist_settings
+
+
+def _random_ipv4():
+    return str(ipaddress.IPv4Address(random.randint(0x01000000, 0xDFFFFFFF)))
+
+
+def _build_entries(count, network_ratio, ipv6_ratio):
+    """
+    Tekil IPv4 adresleri, IPv4 CIDR aralıkları (/16 - /28) ve IPv6 /64 aralıklarından oluşan kayıtlar üretir.
+    """
+    entries = []
+    for _ in range(count):
+        roll = random.random()
+        if roll < ipv6_ratio:
+            entries.append((str(ipaddress.IPv6Address(random.getrandbits(64) << 64)), 64))
+        elif roll < ipv6_ratio + network_ratio:
+            entries.append((_random_ipv4(), random.choice((16, 20, 24, 24, 24, 28))))
+        else:
+            entries.append((_random_ipv4(), None))
+    return entries
+
+
+class Command(BaseCommand):
+    help = ('BlockIPMiddleware\'ın istek başına ek yükünü ölçer: eski doğrusal liste araması ile süreç içi kara liste '
+            'kopyası. Veritabanına yazmaz.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--entries', type=int, default=100000, help='Kara listedeki kayıt sayısı.')
+        parser.add_argument('--lookups', type=int, default=200000, help='Yeni yöntemde yapılacak arama sayısı.')
+        parser.add_argument('--legacy-lookups', type=int, default=500,
+                            help='Eski doğrusal aramada yapılacak arama sayısı (her arama tüm listeyi tarar).')
+        parser.add_argument('--network-ratio', type=float, default=0.1, help='CIDR aralığı olan kayıtların oranı.')
+        parser.add_argument('--ipv6-ratio', type=float, default=0.01, help='IPv6 /64 aralığı olan kayıtların oranı.')
+        parser.add_argument('--hit-ratio', type=float, default=0.05,
+                            help='Aramalardan kara listedeki adreslere denk gelenlerin oranı.')
+        parser.add_argument('--requests', type=int, default=20000, help='Middleware ölçümündeki istek sayısı.')
+
+    def handle(self, *args, **options):
+        random.seed(42)
+        entries = _build_entries(options['entries'], options['network_ratio'], options['ipv6_ratio'])
+        single_ips = [address for address, prefix_length in entries if prefix_length is None]
+        workload = [
+            random.choice(single_ips) if random.random() < options['hit_ratio'] else _random_ipv4()
+            for _ in range(options['lookups'])
+        ]
+
+        tracemalloc.start()
+        started = time.perf_counter()
+        blacklist = IPBlacklist(entries)
+        build_elapsed = time.perf_counter() - started
+        memory, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        self.stdout.write(
+            f"Kopya oluşturma : {len(blacklist):,} kayıt, {build_elapsed * 1000:.0f} ms, ~{memory / 1024 / 1024:.1f} MB, "
+            f"{sum(len(items) for items in blacklist.masks.values())} farklı önek uzunluğu"
+        )
+
+        # 1) Eski yöntem: her istekte aktif adres listesi üzerinde doğrusal arama (veritabanı sorgusu hariç)
+        legacy = list(single_ips)
+        started = time.perf_counter()
+        for ip in workload[:options['legacy_lookups']]:
+            ip in legacy
+        legacy_us = (time.perf_counter() - started) / options['legacy_lookups'] * 1e6
+
+        # 2) Yeni yöntem: süreç içi kopya
+        started = time.perf_counter()
+        hits = sum(1 for ip in workload if ip in blacklist)
+        lookup_us = (time.perf_counter() - started) / len(workload) * 1e6
+        self.stdout.write(f"Doğrusal arama  : {legacy_us:,.1f} µs/istek (+ her istekte tüm kara listeyi okuyan sorgu)")
+        self.stdout.write(f"Kopya araması   : {lookup_us:,.2f} µs/istek ({hits:,} eşleşme, CIDR dahil)")
+
+        # 3) Middleware'in kara liste kontrolü (sürüm denetimi dahil)
+        guard = IPGuard({**get_blacklist_settings(), 'VERSION_CHECK_SECONDS': 10 ** 9})
+        guard.load(entries=entries)
+        clients = [_random_ipv4() for _ in range(1000)]
+        started = time.perf_counter()
+        for index in range(options['requests']):
+            guard.is_blocked(clients[index % len(clients)])
+        total_us = (time.perf_counter() - started) / options['requests'] * 1e6
+        self.stdout.write(self.style.SUCCESS(
+            f"İstek başına toplam ek yük: {total_us:,.1f} µs ({options['entries']:,} kayıtlı kara liste)"
+        ))
@@ -0,0 +1,106 @@
+import random
+import time
+from datetime import datetime, timedelta
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.test import RequestFactory
+
+from soloaccounting.rate_limiting import build_rate_limiter, get_rate_limit_settings, rate_limit_headers
+
+try:
+    from django_ratelimit.core import is_ratelimited
+except ImportError:  # pragma: no cover
+    is_ratelimited = None
+
+
+def _legacy_request_log(client_ip):
+    """
+    Eski BlockIPMiddleware sayacı: IP başına zaman damgası listesi okunur, süzülür ve geri yazılır.
+    """
+    now = datetime.now()
+    key = f"benchmark_rate_limiting:requests_{client_ip}"
+    request_times = [req for req in cache.get(key, []) if now - req <= timedelta(minutes=1)]
+    request_times.append(now)
+    cache.set(key, request_times, timeout=60)
+    return len(request_times)
+
+
+class Command(BaseCommand):
+    help = ('Eski hız sınırlandırma yığınının (django_ratelimit 25/dk + BlockIPMiddleware zaman damgası listesi) ve '
+            'RATE_LIMITING kurallarıyla çalışan GCRA motorunun istek başına gecikmesini ölçer.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=20000, help='Her yöntem için istek sayısı.')
+        parser.add_argument('--clients', type=int, default=500, help='İstekleri gönderen farklı IP sayısı.')
+        parser.add_argument('--backend', choices=['memory', 'redis'], default=None,
+                            help='Motor backend\'i; verilmezse RATE_LIMITING ayarı kullanılır.')
+
+    def _measure(self, requests, handler):
+        latencies = []
+        for request in requests:
+            started = time.perf_counter()
+            handler(request)
+            latencies.append(time.perf_counter() - started)
+        latencies.sort()
+        return {
+            'avg_us': sum(latencies) / len(latencies) * 1e6,
+            'p50_us': latencies[len(latencies) // 2] * 1e6,
+            'p99_us': latencies[int(len(latencies) * 0.99)] * 1e6,
+        }
+
+    def _report(self, label, stats):
+        self.stdout.write(
+            f"{label:<34} ortalama {stats['avg_us']:8.1f} µs  p50 {stats['p50_us']:8.1f} µs  "
+            f"p99 {stats['p99_us']:8.1f} µs"
+        )
+
+    def handle(self, *args, **options):
+        factory = RequestFactory()
+        clients = [
+            f"10.{index // 65536 % 256}.{index // 256 % 256}.{index % 256}" for index in range(options['clients'])
+        ]
+        requests = []
+        for _ in range(options['requests']):
+            request = factory.get('/api/soloblog/articles/', REMOTE_ADDR=random.choice(clients))
+            request.user = AnonymousUser()
+            requests.append(request)
+
+        if is_ratelimited is not None:
+            def legacy(request):
+                is_ratelimited(request, group='global', key='ip', rate='25/m', method=['GET', 'POST'],
+                               increment=True)
+                _legacy_request_log(request.META['REMOTE_ADDR'])
+
+            self._report("Eski yığın (2 sınırlayıcı)", self._measure(requests, legacy))
+            cache.delete_many([f"benchmark_rate_limiting:requests_{client_ip}" for client_ip in clients])
+        else:
+            self.stdout.write(self.style.WARNING("django_ratelimit kurulu değil, eski yığın ölçülmedi."))
+
+        limiter_options = {**get_rate_limit_settings(), 'KEY_PREFIX': 'benchmark_rl'}
+        if options['backend']:
+            limiter_options['BACKEND'] = options['backend']
+        try:
+            limiter = build_rate_limiter(limiter_options)
+        except RuntimeError as exc:
+            raise CommandError(str(exc))
+        if not limiter.policies:
+            raise CommandError("RATE_LIMITING['POLICIES'] içinde en az bir kural tanımlanmalıdır.")
+
+        def engine(request):
+            result = limiter.check(request, request.META['REMOTE_ADDR'])
+            if result is not None:
+                rate_limit_headers(result)
+
+        self._report(f"GCRA motoru ({limiter_options['BACKEND']}, {len(limiter.policies)} kural)",
+                     self._measure(requests, engine))
+
+        denied = 0
+        for request in requests[:2000]:
+            result = limiter.check(request, request.META['REMOTE_ADDR'])
+            denied += result is not None and not result.allowed
+        self.stdout.write(self.style.SUCCESS(
+            f"Motor, her istekte uyan tüm kuralları tek backend çağrısıyla değerlendirdi "
+            f"(ölçümden sonra tekrar gönderilen 2000 istekte {denied} red)."
+        ))
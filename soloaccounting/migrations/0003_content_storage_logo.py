@@ -0,0 +1,20 @@
+# Generated by Django 5.1.3 on 2026-10-18 01:52
+
+import common.storage
+import soloaccounting.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('soloaccounting', '0002_delete_usersite'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='extendedsite',
+            name='logo',
+            field=models.ImageField(default='logos/default_logo.webp', help_text='Site için bir logo yükleyin. Görüntü otomatik olarak 48x48 piksel ve kare formatına uygun hale getirilir.', storage=common.storage.content_storage, upload_to=soloaccounting.models.logo_upload_path, verbose_name='Site Logosu'),
+        ),
+    ]
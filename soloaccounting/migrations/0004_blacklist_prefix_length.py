@@ -0,0 +1,18 @@
+# Generated by Django 5.1.3 on 2026-10-18 02:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('soloaccounting', '0003_content_storage_logo'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blacklist',
+            name='prefix_length',
+            field=models.PositiveSmallIntegerField(blank=True, help_text='Boş bırakılırsa yalnızca IP adresi engellenir; doldurulursa adresle başlayan CIDR aralığı (ör. 24 -> 203.0.113.0/24) engellenir.', null=True),
+        ),
+    ]
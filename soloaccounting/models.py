@@ -28,10 +28,14 @@ from django.contrib.auth.models import AbstractUser
 from django.contrib.auth.models import User
 from django.contrib.postgres.fields import ArrayField
 from django.contrib.sites.models import Site
+from django.core.exceptions import ValidationError
 from django.db import models
-from django.utils.text import slugify
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 
 from common.models import AbstractBaseModel
+from common.storage import content_storage
+from common.utils.slug_allocator import allocate_slug
 
 ALLOWED_FORMATS = ["JPEG", "JPG", "PNG", "WEBP"]
 
@@ -47,12 +51,16 @@ def logo_upload_path(instance, filename):
     return os.path.join(directory, unique_filename)
 
 
-def safe_remove(file_path):
+DEFAULT_LOGO = "logos/default_logo.webp"
+
+
+def release_logo(logo):
     """
-    Dosyayı güvenli bir şekilde siler. Dosya mevcut değilse hata vermez.
+    Logo dosyasının referansını bırakır. Logolar içerik adresli depolamada tutulduğundan aynı dosyayı kullanan
+    başka siteler varsa dosya silinmez; varsayılan logo hiçbir zaman silinmez.
     """
-    if os.path.exists(file_path):
-        os.remove(file_path)
+    if logo and logo.name != DEFAULT_LOGO:
+        logo.delete(save=False)
 
 
 class ExtendedSite(models.Model):
@@ -95,9 +103,10 @@ class ExtendedSite(models.Model):
     )
     logo = models.ImageField(
         upload_to=logo_upload_path,
+        storage=content_storage,
         verbose_name="Site Logosu",
         help_text="Site için bir logo yükleyin. Görüntü otomatik olarak 48x48 piksel ve kare formatına uygun hale getirilir.",
-        default="logos/default_logo.webp"
+        default=DEFAULT_LOGO
     )
 
     class Meta:
@@ -109,10 +118,9 @@ class ExtendedSite(models.Model):
 
     def delete(self, *args, **kwargs):
         """
-        Model silindiğinde logo dosyasını da fiziksel olarak siler.
+        Model silindiğinde logo dosyasının referansını bırakır (son referanssa dosya silinir).
         """
-        if self.logo:
-            safe_remove(self.logo.path)  # Dosya fiziksel olarak silinir
+        release_logo(self.logo)
         super().delete(*args, **kwargs)
 
     def save_model(self, request, obj, form, change):
@@ -129,7 +137,7 @@ class ExtendedSite(models.Model):
         # Logo kontrolü: Eğer logo temizlenmişse fiziksel ve veritabanı kaydını temizle
         if "logo" in form.cleaned_data:
             if not form.cleaned_data["logo"]:  # Logo alanı temizlenmişse
-                safe_remove(extended_site.logo.path)
+                release_logo(extended_site.logo)
                 extended_site.logo = None
             else:
                 extended_site.logo = form.cleaned_data["logo"]
@@ -137,6 +145,28 @@ class ExtendedSite(models.Model):
         extended_site.save()
 
 
+@receiver(post_save, sender=Site)
+@receiver(post_delete, sender=Site)
+@receiver(post_save, sender=ExtendedSite)
+@receiver(post_delete, sender=ExtendedSite)
+def invalidate_site_resolver_cache(sender, instance, **kwargs):
+    """
+    Site veya bayrakları değiştiğinde tüm süreçlerdeki host -> site önbelleğini geçersiz kılar.
+    """
+    from soloaccounting.site_resolver import invalidate_site_resolver
+    invalidate_site_resolver()
+
+
+@receiver(post_save, sender=Site)
+@receiver(post_delete, sender=Site)
+def invalidate_cors_origins_cache(sender, instance, **kwargs):
+    """
+    Site eklendiğinde, domain'i değiştiğinde veya silindiğinde izinli CORS origin'lerini geçersiz kılar.
+    """
+    from soloaccounting.cors_origins import invalidate_cors_origins
+    invalidate_cors_origins()
+
+
 class Currency(models.Model):
     code = models.CharField(
         max_length=10,
@@ -218,8 +248,7 @@ class Category(models.Model):
         return self.name
 
     def save(self, *args, **kwargs):
-        if not self.slug:
-            self.slug = slugify(self.name)
+        self.slug = allocate_slug(self, self.name)
         super(Category, self).save(*args, **kwargs)
 
 
@@ -316,8 +345,7 @@ class Product(models.Model):
             return self.price
 
     def save(self, *args, **kwargs):
-        if not self.slug:
-            self.slug = slugify(self.name)
+        self.slug = allocate_slug(self, self.name)
         super(Product, self).save(*args, **kwargs)
 
 
@@ -390,11 +418,42 @@ class SiteUrun(models.Model):
 # middleware ile ip kontrolü
 class Blacklist(models.Model):
     ip_address = models.GenericIPAddressField(unique=True)
+    prefix_length = models.PositiveSmallIntegerField(
+        null=True, blank=True,
+        help_text="Boş bırakılırsa yalnızca IP adresi engellenir; doldurulursa adresle başlayan CIDR aralığı "
+                  "(ör. 24 -> 203.0.113.0/24) engellenir."
+    )
     added_on = models.DateTimeField(auto_now_add=True)
     reason = models.CharField(max_length=255, default="Şüpheli davranış")
     is_active = models.BooleanField(default=True)
 
     # createdAt = models.DateTimeField(auto_now_add=True, verbose_name="Oluşturulma Tarihi")
 
+    def clean(self):
+        super().clean()
+        if self.prefix_length is not None and self.ip_address:
+            max_length = 32 if ':' not in self.ip_address else 128
+            if self.prefix_length > max_length:
+                raise ValidationError({'prefix_length': f"Önek uzunluğu en fazla {max_length} olabilir."})
+
+    @property
+    def network(self):
+        """
+        Kaydın engellediği adres veya CIDR aralığı (ör. "203.0.113.0/24").
+        """
+        if self.prefix_length is None:
+            return self.ip_address
+        return f"{self.ip_address}/{self.prefix_length}"
+
     def __str__(self):
-        return f"{self.ip_address} - {self.reason} - {'Aktif' if self.is_active else 'Pasif'}"
+        return f"{self.network} - {self.reason} - {'Aktif' if self.is_active else 'Pasif'}"
+
+
+@receiver(post_save, sender=Blacklist)
+@receiver(post_delete, sender=Blacklist)
+def invalidate_ip_blacklist_cache(sender, instance, **kwargs):
+    """
+    Kara liste değiştiğinde tüm süreçlerdeki süreç içi kara liste kopyasını geçersiz kılar.
+    """
+    from soloaccounting.ip_blacklist import invalidate_ip_blacklist
+    invalidate_ip_blacklist()
@@ -0,0 +1,329 @@
+# soloaccounting/rate_limiting.py
+"""
+Tek bir hız sınırlandırma (rate limiting) motoru.
+
+Eskiden `GlobalRateLimitMiddleware` (django_ratelimit, IP başına 25/dk) ve `BlockIPMiddleware` (IP başına 100/dk,
+aşanı kara listeye alır) her istekte ayrı ayrı önbellek okuma / yazması yapıyordu. Burada:
+
+- Kurallar `settings.RATE_LIMITING['POLICIES']` içinde bildirimsel olarak tanımlanır: hangi yollara (önek), hangi
+  HTTP metotlarına ve hangi sitelere uygulanacağı (`paths`, `exclude_paths`, `methods`, `sites`), hangi kimliğe göre
+  sayılacağı (`ip`, `user`, `user_or_ip`, `site` veya bunların listesi), hızı (`"25/m"`, `"100/5m"`) ve anlık
+  yığılma payı (`burst`). `blacklist` işaretli bir kuralı aşan IP kara listeye alınır.
+- Sınırlandırma GCRA (Generic Cell Rate Algorithm) ile yapılır: her anahtar için yalnızca "teorik varış zamanı" (TAT)
+  tutulur. Bu bir token bucket'a denktir ama tek bir sayı sakladığından okuma + yazma tek adımda yapılabilir.
+- `redis` backend'inde bir isteğe uyan tüm kurallar tek bir Lua script çağrısıyla (tek round trip) atomik olarak
+  değerlendirilir; zaman Redis sunucusundan alındığından sunucular arası saat farkı sonucu etkilemez.
+- `memory` backend'i süreç içidir; her süreç kendi sayacını tuttuğundan sınırlar yaklaşıktır (çok süreçli
+  kurulumlarda süreç sayısı kadar gevşer). Geliştirme ortamı içindir.
+- Kurallar birbirinden bağımsız sayılır: bir kuralın reddetmesi diğer kuralların sayacını durdurmaz (ör. genel
+  sınırı aşan istemcinin kara liste kuralındaki sayacı artmaya devam eder).
+
+`axes` yalnızca başarısız giriş denemelerini sayan bir kilitleme mekanizması olduğundan bu motorun dışında kalır.
+
+Ayarlar `settings.RATE_LIMITING` sözlüğünden okunur.
+"""
+import logging
+import math
+import os
+import re
+import threading
+import time
+from collections import namedtuple
+
+from django.conf import settings
+
+from common.utils import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'ENABLED': True,
+    'BACKEND': 'memory',  # 'memory' veya 'redis'
+    'REDIS_URL': 'redis://127.0.0.1:6379/4',
+    'KEY_PREFIX': 'rl',
+    'LOCAL_MAX_KEYS': 100000,  # memory backend'inde tutulacak en fazla anahtar
+    'FAIL_OPEN': True,  # Redis erişilemezse istekler sınırlanmadan geçer
+    'POLICIES': [],
+}
+
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+RATE_PATTERN = re.compile(r'^\s*(\d+)\s*/\s*(\d*)\s*([smhd])\s*$')
+
+RateLimitResult = namedtuple('RateLimitResult', ['allowed', 'policy', 'limit', 'remaining', 'retry_after', 'reset'])
+
+
+def get_rate_limit_settings():
+    return {**DEFAULTS, **getattr(settings, 'RATE_LIMITING', {})}
+
+
+def parse_rate(rate):
+    """
+    `"25/m"`, `"100/5m"` biçimindeki hızı (istek sayısı, saniye) olarak döner.
+    """
+    match = RATE_PATTERN.match(rate or '')
+    if match is None:
+        raise ValueError(f"Geçersiz hız tanımı: {rate!r}")
+    count, multiplier, unit = match.groups()
+    return int(count), int(multiplier or 1) * PERIODS[unit]
+
+
+class RatePolicy:
+    """
+    Bildirimsel bir hız sınırı kuralı.
+    """
+    KEY_TYPES = ('ip', 'user', 'user_or_ip', 'site')
+
+    def __init__(self, name, rate, key='ip', burst=None, paths=None, exclude_paths=None, methods=None, sites=None,
+                 blacklist=False):
+        self.name = name
+        self.limit, self.period = parse_rate(rate)
+        if self.limit < 1:
+            raise ValueError(f"{name}: hız en az 1 istek olmalıdır.")
+        self.burst = burst or self.limit
+        self.keys = (key,) if isinstance(key, str) else tuple(key)
+        unknown = set(self.keys) - set(self.KEY_TYPES)
+        if unknown:
+            raise ValueError(f"{name}: geçersiz anahtar türü {sorted(unknown)}")
+        self.paths = tuple(paths or ())
+        self.exclude_paths = tuple(exclude_paths or ())
+        self.methods = frozenset(method.upper() for method in methods) if methods else None
+        self.sites = frozenset(str(site) for site in sites) if sites else None
+        self.blacklist = blacklist
+        # GCRA: her istek TAT'ı `interval` kadar ileri iter; TAT, şimdiden en fazla `tolerance` ileride olabilir
+        self.interval = self.period / self.limit
+        self.tolerance = self.interval * self.burst
+
+    @classmethod
+    def from_dict(cls, options):
+        return cls(**options)
+
+    def matches(self, path, method, site):
+        if self.methods is not None and method not in self.methods:
+            return False
+        if self.paths and not path.startswith(self.paths):
+            return False
+        if self.exclude_paths and path.startswith(self.exclude_paths):
+            return False
+        if self.sites is not None:
+            return site is not None and (str(site.id) in self.sites or site.domain in self.sites)
+        return True
+
+    def identity(self, request, ip, site):
+        """
+        Kuralın sayacını belirleyen kimlik; kimlik çıkarılamıyorsa (ör. `user` kuralında anonim istek) None.
+        """
+        user = getattr(request, 'user', None)
+        authenticated = user is not None and user.is_authenticated
+        parts = []
+        for key in self.keys:
+            if key == 'ip':
+                value = ip
+            elif key == 'user':
+                value = f"u{user.pk}" if authenticated else None
+            elif key == 'user_or_ip':
+                value = f"u{user.pk}" if authenticated else ip
+            else:
+                value = f"s{site.id}" if site is not None else None
+            if not value:
+                return None
+            parts.append(value)
+        return ':'.join(parts)
+
+
+class LocalRateLimitBackend:
+    """
+    Süreç içi GCRA sayaçları (geliştirme ortamı ve tek süreçli kurulumlar için).
+    """
+
+    def __init__(self, max_keys=DEFAULTS['LOCAL_MAX_KEYS']):
+        self.max_keys = max_keys
+        self._tats = {}
+        self._lock = threading.Lock()
+
+    def _prune(self, now):
+        self._tats = {key: tat for key, tat in self._tats.items() if tat > now}
+        if len(self._tats) >= self.max_keys:
+            # Tümü hâlâ geçerliyse en eski yarısı atılır (sınır bu anahtarlar için gevşer)
+            keep = sorted(self._tats.items(), key=lambda item: item[1])[len(self._tats) // 2:]
+            self._tats = dict(keep)
+
+    def check(self, items, now=None):
+        """
+        Args:
+            items: (anahtar, interval, tolerance) üçlüleri.
+
+        Returns:
+            list: Her anahtar için (izin verildi mi, kalan, tekrar deneme saniyesi, sıfırlanma saniyesi).
+        """
+        now = time.time() if now is None else now
+        results = []
+        with self._lock:
+            if len(self._tats) >= self.max_keys:
+                self._prune(now)
+            for key, interval, tolerance in items:
+                tat = max(self._tats.get(key, now), now)
+                new_tat = tat + interval
+                allow_at = new_tat - tolerance
+                if now < allow_at:
+                    results.append((False, 0, allow_at - now, tat - now))
+                else:
+                    self._tats[key] = new_tat
+                    results.append((True, int((now - allow_at) / interval), 0.0, new_tat - now))
+        return results
+
+
+class RedisRateLimitBackend:
+    """
+    Redis üzerinde paylaşılan GCRA sayaçları. Tüm anahtarlar tek bir Lua script çağrısıyla değerlendirilir.
+    TAT değerleri mikrosaniye olarak saklanır ve sayaç dolduğunda (PX) kendiliğinden silinir.
+    """
+    SCRIPT = """
+        local clock = redis.call('TIME')
+        local now = tonumber(clock[1]) * 1000000 + tonumber(clock[2])
+        local result = {}
+        for index, key in ipairs(KEYS) do
+            local interval = tonumber(ARGV[index * 2 - 1])
+            local tolerance = tonumber(ARGV[index * 2])
+            local tat = tonumber(redis.call('GET', key)) or now
+            if tat < now then
+                tat = now
+            end
+            local new_tat = tat + interval
+            local allow_at = new_tat - tolerance
+            if now < allow_at then
+                result[#result + 1] = 0
+                result[#result + 1] = 0
+                result[#result + 1] = allow_at - now
+                result[#result + 1] = tat - now
+            else
+                redis.call('SET', key, string.format('%.0f', new_tat), 'PX', math.ceil((new_tat - now) / 1000))
+                result[#result + 1] = 1
+                result[#result + 1] = math.floor((now - allow_at) / interval)
+                result[#result + 1] = 0
+                result[#result + 1] = new_tat - now
+            end
+        end
+        return result
+    """
+
+    def __init__(self, url):
+        self.client = get_redis_client(url)
+        self._script = self.client.register_script(self.SCRIPT)
+
+    def check(self, items, now=None):
+        keys = [key for key, _, _ in items]
+        args = []
+        for _, interval, tolerance in items:
+            args.extend((int(interval * 1e6), int(tolerance * 1e6)))
+        values = self._script(keys=keys, args=args)
+        return [
+            (bool(values[i]), int(values[i + 1]), values[i + 2] / 1e6, values[i + 3] / 1e6)
+            for i in range(0, len(values), 4)
+        ]
+
+
+class RateLimiter:
+    """
+    Kuralları isteğe uygular ve en kısıtlayıcı sonucu döner.
+    """
+
+    def __init__(self, backend, policies, prefix=DEFAULTS['KEY_PREFIX'], fail_open=True):
+        self.backend = backend
+        self.policies = tuple(policies)
+        self.prefix = prefix
+        self.fail_open = fail_open
+
+    def check(self, request, ip, site=None, now=None):
+        """
+        İsteğe uyan tüm kuralları tek backend çağrısıyla değerlendirir.
+
+        Returns:
+            RateLimitResult | None: Reddedildiyse reddeden kural, aksi halde kalan hakkı en az olan kural;
+            hiçbir kural uymuyorsa None.
+        """
+        path, method = request.path, request.method
+        matched = []
+        items = []
+        for policy in self.policies:
+            if not policy.matches(path, method, site):
+                continue
+            identity = policy.identity(request, ip, site)
+            if identity is None:
+                continue
+            matched.append(policy)
+            items.append((f"{self.prefix}:{policy.name}:{identity}", policy.interval, policy.tolerance))
+        if not items:
+            return None
+        try:
+            outcomes = self.backend.check(items, now)
+        except Exception:
+            if not self.fail_open:
+                raise
+            logger.warning("Hız sınırı kontrol edilemedi, istek sınırlanmadan geçiriliyor.", exc_info=True)
+            return None
+
+        result = None
+        for policy, (allowed, remaining, retry_after, reset) in zip(matched, outcomes):
+            candidate = RateLimitResult(allowed, policy, policy.burst, remaining, retry_after, reset)
+            if result is None or _more_restrictive(candidate, result):
+                result = candidate
+        return result
+
+
+def _more_restrictive(candidate, current):
+    if candidate.allowed != current.allowed:
+        return not candidate.allowed
+    if not candidate.allowed:
+        # Kara liste kuralı, genel sınırdan önce raporlanır
+        if candidate.policy.blacklist != current.policy.blacklist:
+            return candidate.policy.blacklist
+        return candidate.retry_after > current.retry_after
+    return candidate.remaining < current.remaining
+
+
+def rate_limit_headers(result):
+    """
+    `X-RateLimit-*` ve gerekiyorsa `Retry-After` yanıt başlıklarını döner.
+    """
+    headers = {
+        'X-RateLimit-Limit': str(result.limit),
+        'X-RateLimit-Remaining': str(max(result.remaining, 0)),
+        'X-RateLimit-Reset': str(math.ceil(result.reset)),
+        'X-RateLimit-Policy': result.policy.name,
+    }
+    if not result.allowed:
+        headers['Retry-After'] = str(max(1, math.ceil(result.retry_after)))
+    return headers
+
+
+def build_rate_limiter(options=None):
+    """
+    Ayarlara göre yeni bir RateLimiter oluşturur.
+    """
+    options = options or get_rate_limit_settings()
+    if options['BACKEND'] == 'redis':
+        backend = RedisRateLimitBackend(options['REDIS_URL'])
+    elif options['BACKEND'] == 'memory':
+        backend = LocalRateLimitBackend(options['LOCAL_MAX_KEYS'])
+    else:
+        raise ValueError(f"Geçersiz hız sınırı backend'i: {options['BACKEND']}")
+    policies = [RatePolicy.from_dict(policy) for policy in options['POLICIES']]
+    return RateLimiter(backend, policies, prefix=options['KEY_PREFIX'], fail_open=options['FAIL_OPEN'])
+
+
+_limiter = None
+_limiter_pid = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter():
+    """
+    Süreç başına tek RateLimiter örneğini döner. Fork sonrası her süreç kendi örneğini oluşturur.
+    """
+    global _limiter, _limiter_pid
+    pid = os.getpid()
+    if _limiter is None or _limiter_pid != pid:
+        with _limiter_lock:
+            if _limiter is None or _limiter_pid != pid:
+                _limiter, _limiter_pid = build_rate_limiter(), pid
+    return _limiter
@@ -0,0 +1,217 @@
+# soloaccounting/site_resolver.py
+"""
+Host adından siteye çözümleme önbelleği (`SiteMiddleware` tarafından kullanılır).
+
+Eskiden her istekte `Site.objects.get(domain=host)` çalışıyordu. Burada:
+
+- Tüm siteler, `ExtendedSite` bayraklarıyla birlikte ilk kullanımda tek sorguyla süreç içi bir sözlüğe
+  (domain -> site) yüklenir; sonraki istekler veritabanına gitmez.
+- Host adı küçük harfe çevrilir, port ve sondaki nokta atılır; `STRIP_WWW` açıksa "www." önekli ve öneksiz adlar aynı
+  siteye çözülür. `ALIASES` ile ek alan adları bir sitenin domain'ine yönlendirilebilir.
+- Site veya ExtendedSite kaydedildiğinde / silindiğinde (sinyaller `soloaccounting.models` içindedir) paylaşılan
+  önbellekteki sürüm anahtarı artırılır. Her süreç sürümü en fazla `VERSION_CHECK_SECONDS` aralıkla okur ve sürüm
+  değiştiyse sözlüğü yeniden yükler.
+- Önbellek süreç içi (LocMem) olduğunda sürüm anahtarı yalnızca değişikliği yapan süreçte artar; diğer worker'lar
+  değişikliği göremez. Bu yüzden sözlük, sürümden bağımsız olarak en fazla `MAX_AGE_SECONDS` saniyede bir yeniden
+  yüklenir: paylaşılan önbellek (Redis, Memcached) yoksa yeniden adlandırılan, pasifleştirilen veya silinen siteler
+  diğer süreçlere en geç bu süre sonunda yansır.
+- Sözlükte olmayan bir host (ör. henüz sürüm değişikliğini görmemiş süreçte yeni eklenen site) bir kez veritabanında
+  aranır; bulunamazsa `NEGATIVE_TTL` süresince negatif önbellekte tutulur. Böylece rastgele host adı gönderen
+  tarayıcılar (scanner) veritabanına sürekli sorgu gönderemez.
+
+Çözümlenen `Site` nesneleri istekler arasında paylaşılır; yalnızca okunmalıdır.
+
+Ayarlar `settings.SITE_RESOLVER` sözlüğünden okunur.
+"""
+import threading
+import time
+from collections import namedtuple
+
+from django.conf import settings
+from django.contrib.sites.models import Site
+from django.core.cache import cache
+from django.db import transaction
+
+DEFAULTS = {
+    'ENABLED': True,
+    'STRIP_WWW': True,
+    'ALIASES': {},  # Ek alan adı -> sitenin domain'i
+    'VERSION_KEY': 'site_resolver:version',
+    'VERSION_CHECK_SECONDS': 1,  # Paylaşılan sürüm anahtarının en fazla hangi sıklıkla okunacağı
+    'MAX_AGE_SECONDS': 30,  # Sürüm değişmese de sözlüğün yeniden yükleneceği süre (None: sadece sürümle)
+    'NEGATIVE_TTL': 60,  # Bilinmeyen host'un negatif önbellekte tutulma süresi (saniye)
+    'NEGATIVE_MAX_ENTRIES': 10000,
+}
+
+SITE_FLAGS = ('isActive', 'isOurSite', 'showPopupAd', 'isDefault')
+
+ResolvedSite = namedtuple('ResolvedSite', ['site', 'module', 'flags'])
+
+
+def get_resolver_settings():
+    return {**DEFAULTS, **getattr(settings, 'SITE_RESOLVER', {})}
+
+
+def normalize_host(host):
+    """
+    Host adını karşılaştırma için normalize eder: küçük harf, port ve sondaki nokta olmadan.
+    """
+    host = (host or '').strip().lower()
+    if host.startswith('['):
+        # IPv6 adresi: [::1]:8000
+        host = host[1:host.find(']')] if ']' in host else host
+    else:
+        host = host.rsplit(':', 1)[0] if host.count(':') == 1 else host
+    return host.rstrip('.')
+
+
+def _resolved(site):
+    extended = getattr(site, 'extended_site', None)
+    flags = {flag: getattr(extended, flag) for flag in SITE_FLAGS} if extended is not None else None
+    module = site.module.module if hasattr(site, 'module') else None
+    return ResolvedSite(site, module, flags)
+
+
+def _sites_queryset():
+    return Site.objects.select_related('extended_site')
+
+
+class SiteResolver:
+    """
+    Süreç içi host -> site sözlüğü. Sözlük her yeniden yüklemede bütün olarak değiştirildiğinden okuma kilitsizdir.
+    """
+
+    def __init__(self, options=None):
+        self.options = options or get_resolver_settings()
+        self._lock = threading.Lock()
+        self._sites = None
+        self._version = None
+        self._checked_at = 0.0
+        self._loaded_at = 0.0
+        self._negative = {}
+
+    def _variants(self, host):
+        yield host
+        if self.options['STRIP_WWW']:
+            yield host[4:] if host.startswith('www.') else f"www.{host}"
+
+    def _lookup(self, sites, host):
+        host = self.options['ALIASES'].get(host, host)
+        for variant in self._variants(host):
+            resolved = sites.get(variant)
+            if resolved is not None:
+                return resolved
+        return None
+
+    def load(self, version=None):
+        """
+        Tüm siteleri tek sorguyla yükler.
+        """
+        sites = {normalize_host(site.domain): _resolved(site) for site in _sites_queryset()}
+        with self._lock:
+            self._sites = sites
+            self._version = version
+            self._loaded_at = time.monotonic()
+            self._negative = {}
+        return sites
+
+    def _shared_version(self):
+        key = self.options['VERSION_KEY']
+        version = cache.get(key)
+        if version is None:
+            cache.add(key, time.time_ns(), None)
+            version = cache.get(key)
+        return version
+
+    def _current_sites(self):
+        now = time.monotonic()
+        if self._sites is not None and now - self._checked_at < self.options['VERSION_CHECK_SECONDS']:
+            return self._sites
+        self._checked_at = now
+        version = self._shared_version()
+        max_age = self.options['MAX_AGE_SECONDS']
+        if self._sites is None or version != self._version or (max_age and now - self._loaded_at >= max_age):
+            return self.load(version)
+        return self._sites
+
+    def resolve(self, host):
+        """
+        Host adına karşılık gelen `ResolvedSite` nesnesini, bulunamazsa None döner.
+        """
+        host = normalize_host(host)
+        if not host:
+            return None
+        sites = self._current_sites()
+        resolved = self._lookup(sites, host)
+        if resolved is not None:
+            return resolved
+
+        expires = self._negative.get(host)
+        if expires is not None and expires > time.monotonic():
+            return None
+        # Sözlükte yoksa bir kez veritabanına bakılır (sürüm değişikliği henüz görülmemiş olabilir)
+        target = self.options['ALIASES'].get(host, host)
+        site = _sites_queryset().filter(domain__in=list(self._variants(target))).first()
+        if site is not None:
+            resolved = _resolved(site)
+            with self._lock:
+                if self._sites is not None:
+                    self._sites = {**self._sites, normalize_host(site.domain): resolved}
+            return resolved
+        with self._lock:
+            if len(self._negative) >= self.options['NEGATIVE_MAX_ENTRIES']:
+                self._negative = {}
+            self._negative[host] = time.monotonic() + self.options['NEGATIVE_TTL']
+        return None
+
+    def reset(self):
+        """
+        Süreç içi sözlüğü boşaltır; sonraki istekte yeniden yüklenir.
+        """
+        with self._lock:
+            self._sites = None
+            self._negative = {}
+
+
+_resolver = None
+_resolver_lock = threading.Lock()
+
+
+def get_site_resolver():
+    """
+    Süreç başına tek SiteResolver örneğini döner.
+    """
+    global _resolver
+    if _resolver is None:
+        with _resolver_lock:
+            if _resolver is None:
+                _resolver = SiteResolver()
+    return _resolver
+
+
+def resolve_site(host):
+    """
+    Host adını siteye çözümler. `ENABLED` kapalıysa her istekte veritabanından okunur.
+    """
+    options = get_resolver_settings()
+    if not options['ENABLED']:
+        site = _sites_queryset().filter(domain=normalize_host(host)).first()
+        return _resolved(site) if site is not None else None
+    return get_site_resolver().resolve(host)
+
+
+def _bump_version():
+    key = get_resolver_settings()['VERSION_KEY']
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), None)
+    if _resolver is not None:
+        _resolver.reset()
+
+
+def invalidate_site_resolver():
+    """
+    Tüm süreçlerdeki site sözlüklerini geçersiz kılar (paylaşılan sürüm anahtarı transaction sonrasında artırılır).
+    """
+    transaction.on_commit(_bump_version)
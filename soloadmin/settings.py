@@ -294,6 +294,178 @@ ADMIN_INDEX_TITLE = "Hoş Geldiniz! Solofor Yönetim Paneli"
 # Kullanıcı Modeli
 AUTH_USER_MODEL = 'common.CustomUser'
 
+# Ziyaretçi İstatistikleri Toplu Kayıt (Ingestion) Ayarları
+VISITOR_INGESTION = {
+    'BACKEND': config('VISITOR_INGESTION_BACKEND', default='memory'),  # 'memory' veya 'redis'
+    'BATCH_SIZE': config('VISITOR_INGESTION_BATCH_SIZE', default=500, cast=int),  # Tek INSERT'te yazılacak kayıt
+    'FLUSH_INTERVAL_MS': config('VISITOR_INGESTION_FLUSH_INTERVAL_MS', default=1000, cast=int),
+    'MAX_BUFFER_SIZE': config('VISITOR_INGESTION_MAX_BUFFER_SIZE', default=50000, cast=int),  # Backpressure sınırı
+    'REDIS_URL': config('VISITOR_INGESTION_REDIS_URL', default='redis://127.0.0.1:6379/2'),
+    'REDIS_KEY': 'soloblog:visitor_hits',
+    'AUTOSTART': config('VISITOR_INGESTION_AUTOSTART', default=True, cast=bool),  # Süreç içi flusher thread'i
+    'ENRICHERS': [  # Yazma anında çalışacak zenginleştirme fonksiyonları (dotted path)
+        'soloblog.analytics.enrichers.user_agent_enricher',
+        'soloblog.analytics.enrichers.geoip_enricher',
+        'soloblog.analytics.enrichers.referer_enricher',
+    ],
+}
+
+# Anlık (Real-time) Ziyaretçi Sayaçları Ayarları
+VISITOR_REALTIME = {
+    'ENABLED': config('VISITOR_REALTIME_ENABLED', default=True, cast=bool),
+    'BACKEND': config('VISITOR_REALTIME_BACKEND', default='memory'),  # 'memory' (geliştirme) veya 'redis'
+    'REDIS_URL': config('VISITOR_REALTIME_REDIS_URL', default='redis://127.0.0.1:6379/3'),
+    'KEY_PREFIX': 'soloblog:rt',
+    'BUCKET_SECONDS': 10,  # Ziyaret sayacı dilim süresi
+    'SLOW_BUCKET_SECONDS': 60,  # Makale ve tekil ziyaretçi dilim süresi
+}
+
+# Makale Okunma Sayacı (Write-behind) Ayarları
+ARTICLE_VIEW_COUNTER = {
+    'BACKEND': config('ARTICLE_VIEW_COUNTER_BACKEND', default='memory'),  # 'memory' veya 'redis'
+    'SHARDS': 16,  # memory backend'inde kilit çekişmesini azaltmak için sayaç parçası sayısı
+    'FLUSH_INTERVAL_MS': config('ARTICLE_VIEW_COUNTER_FLUSH_INTERVAL_MS', default=5000, cast=int),
+    'FLUSH_BATCH_SIZE': 500,  # Tek UPDATE ile yazılacak en fazla makale sayısı
+    'REDIS_URL': config('ARTICLE_VIEW_COUNTER_REDIS_URL', default='redis://127.0.0.1:6379/2'),
+    'REDIS_KEY': 'soloblog:article_views',
+    'AUTOSTART': config('ARTICLE_VIEW_COUNTER_AUTOSTART', default=True, cast=bool),  # Süreç içi yazma thread'i
+}
+
+# Makale Tam Metin Arama Ayarları
+ARTICLE_SEARCH = {
+    # Dil kodu -> PostgreSQL metin arama yapılandırması (LANGUAGES listesindeki diller)
+    'CONFIGS': {'en': 'english', 'tr': 'turkish', 'de': 'german', 'fr': 'french', 'nl': 'dutch', 'ar': 'arabic'},
+    'DEFAULT_CONFIG': 'simple',
+    'HEADLINE_MAX_WORDS': 35,  # Vurgulanmış özetin en fazla kelime sayısı
+    'FALLBACK_MAX_RESULTS': 500,  # PostgreSQL dışındaki veritabanlarında dönecek en fazla sonuç
+}
+
+# Toplu Makale İçe Aktarma Ayarları
+ARTICLE_IMPORT = {
+    'CHUNK_SIZE': config('ARTICLE_IMPORT_CHUNK_SIZE', default=500, cast=int),  # Tek transaction'daki makale sayısı
+    'IMAGE_WORKERS': config('ARTICLE_IMPORT_IMAGE_WORKERS', default=4, cast=int),  # Resim işleme thread sayısı
+    'RUNNER': config('ARTICLE_IMPORT_RUNNER', default='thread'),  # API işleri için 'thread' veya 'celery'
+    # Bu süredir ilerlemeyen çalışan iş (ör. web süreci öldü) `resume` ile devralınabilir
+    'STALE_AFTER_SECONDS': config('ARTICLE_IMPORT_STALE_AFTER_SECONDS', default=15 * 60, cast=int),
+}
+
+# Host -> Site Çözümleme Önbelleği Ayarları (SiteMiddleware)
+SITE_RESOLVER = {
+    'STRIP_WWW': config('SITE_RESOLVER_STRIP_WWW', default=True, cast=bool),  # www. önekli/öneksiz aynı site
+    'VERSION_CHECK_SECONDS': config('SITE_RESOLVER_VERSION_CHECK_SECONDS', default=1, cast=int),
+    # LocMem önbellekte diğer süreçler sürüm değişikliğini görmez; sözlük en geç bu sürede yeniden yüklenir
+    'MAX_AGE_SECONDS': config('SITE_RESOLVER_MAX_AGE_SECONDS', default=30, cast=int),
+    'NEGATIVE_TTL': config('SITE_RESOLVER_NEGATIVE_TTL', default=60, cast=int),  # Bilinmeyen host'lar (saniye)
+}
+
+# IP Kara Listesi Ayarları (BlockIPMiddleware)
+IP_BLACKLIST = {
+    'VERSION_CHECK_SECONDS': config('IP_BLACKLIST_VERSION_CHECK_SECONDS', default=1, cast=int),
+    # LocMem önbellekte diğer süreçler sürüm değişikliğini görmez; kopya en geç bu sürede yeniden yüklenir
+    'MAX_AGE_SECONDS': config('IP_BLACKLIST_MAX_AGE_SECONDS', default=60, cast=int),
+}
+
+# Hız Sınırlandırma Ayarları (GlobalRateLimitMiddleware)
+RATE_LIMITING = {
+    'ENABLED': config('RATE_LIMITING_ENABLED', default=True, cast=bool),
+    'BACKEND': config('RATE_LIMITING_BACKEND', default='memory'),  # 'memory' (süreç içi, yaklaşık) veya 'redis'
+    'REDIS_URL': config('RATE_LIMITING_REDIS_URL', default='redis://127.0.0.1:6379/4'),
+    # Uyan tüm kurallar birlikte uygulanır; `key`: 'ip', 'user', 'user_or_ip', 'site' veya bunların listesi
+    'POLICIES': [
+        {'name': 'auth', 'rate': '10/m', 'key': 'ip', 'paths': ['/api/token/'], 'methods': ['POST']},
+        {'name': 'global', 'rate': '25/m', 'key': 'ip', 'methods': ['GET', 'POST']},
+        # Aşan IP kara listeye alınır; admin istekleri sayılmaz
+        {'name': 'ip-blacklist', 'rate': '100/m', 'key': 'ip', 'exclude_paths': ['/admin/'], 'blacklist': True},
+    ],
+}
+
+# Dinamik CORS Ayarları (DynamicCorsMiddleware)
+DYNAMIC_CORS = {
+    'WILDCARD': config('DYNAMIC_CORS_WILDCARD', default=False, cast=bool),  # Sitelerin alt alan adlarına da izin ver
+    'EXTRA_ORIGINS': config('DYNAMIC_CORS_EXTRA_ORIGINS', default='',
+                            cast=lambda v: [s.strip() for s in v.split(',') if s.strip()]),  # "https://*.ornek.com"
+    'MAX_AGE': config('DYNAMIC_CORS_MAX_AGE', default=86400, cast=int),  # Preflight önbellek süresi (saniye)
+    # LocMem önbellekte diğer süreçler sürüm değişikliğini görmez; origin listesi en geç bu sürede yeniden kurulur
+    'CACHE_TIMEOUT': config('DYNAMIC_CORS_CACHE_TIMEOUT', default=60, cast=int),
+}
+
+# İstek Boyutu Sınırları (ValidateRequestMiddleware)
+REQUEST_LIMITS = {
+    'MAX_BODY_SIZE': config('REQUEST_MAX_BODY_SIZE', default=1024 * 1024, cast=int),  # Varsayılan: 1 MB
+    'ROUTES': {  # Yol öneki -> en fazla body boyutu; dosyalar FILE_UPLOAD_MAX_MEMORY_SIZE üzerinde geçici dosyaya akar
+        '/api/soloblog/image/': config('REQUEST_MAX_IMAGE_UPLOAD_SIZE', default=20 * 1024 * 1024, cast=int),
+        '/api/soloblog/article-import/': config('REQUEST_MAX_IMPORT_UPLOAD_SIZE', default=200 * 1024 * 1024,
+                                                cast=int),
+    },
+}
+
+# Kategori Ağacı Önbellek Ayarları
+CATEGORY_TREE = {
+    'CACHE_TIMEOUT': config('CATEGORY_TREE_CACHE_TIMEOUT', default=3600, cast=int),  # Saniye
+}
+
+# Site Bootstrap Belgesi Önbellek Ayarları (blog ön yüzü yerleşim verileri)
+SITE_BOOTSTRAP = {
+    'CACHE_TIMEOUT': config('SITE_BOOTSTRAP_CACHE_TIMEOUT', default=86400, cast=int),  # Saniye
+    'MAX_AGE': config('SITE_BOOTSTRAP_MAX_AGE', default=0, cast=int),  # Tarayıcı / CDN Cache-Control max-age
+}
+
+# Blog Sayfa Önbelleği Ayarları (stale-while-revalidate)
+PAGE_CACHE = {
+    'ENABLED': config('PAGE_CACHE_ENABLED', default=True, cast=bool),
+    'FRESH_SECONDS': config('PAGE_CACHE_FRESH_SECONDS', default=300, cast=int),
+    'STALE_SECONDS': config('PAGE_CACHE_STALE_SECONDS', default=3600, cast=int),  # Bayat kopyanın sunulabileceği ek süre
+    'STATS_FLUSH_SECONDS': config('PAGE_CACHE_STATS_FLUSH_SECONDS', default=60, cast=int),
+}
+
+# Yorum Moderasyonu Ayarları
+COMMENT_MODERATION = {
+    'BATCH_SIZE': config('COMMENT_MODERATION_BATCH_SIZE', default=2000, cast=int),  # Grup başına yorum
+    'MAX_BULK_IDS': config('COMMENT_MODERATION_MAX_BULK_IDS', default=10000, cast=int),  # Toplu istekte en fazla ID
+}
+
+# İçerik Adresli Medya Depolama Ayarları (resimler, reklamlar, logolar)
+CONTENT_STORAGE = {
+    'ENABLED': config('CONTENT_STORAGE_ENABLED', default=True, cast=bool),  # False: dosya adına göre depolama
+    'PREFIX': config('CONTENT_STORAGE_PREFIX', default='cas'),  # MEDIA_ROOT altındaki dizin
+}
+
+# Resim Türevi (Rendition) Ayarları
+IMAGE_RENDITIONS = {
+    'RUNNER': config('IMAGE_RENDITIONS_RUNNER', default='pool'),  # 'pool' veya 'worker' (yönetim komutu)
+    'WORKERS': config('IMAGE_RENDITIONS_WORKERS', default=2, cast=int),  # Process havuzundaki süreç sayısı
+    'BATCH_SIZE': config('IMAGE_RENDITIONS_BATCH_SIZE', default=32, cast=int),  # Tek seferde sahiplenilen türev
+    # Site bazında türev tanımları, ör. {3: {'hero': {'SIZE': (1920, 1080), 'FORMATS': ('avif', 'jpeg')}}}
+    'SITE_RENDITIONS': {},
+}
+
+# Yönlendiren (Referer) Kaynak Ayarları
+VISITOR_REFERERS = {
+    'TOP_K': config('VISITOR_REFERERS_TOP_K', default=100, cast=int),  # Kapanan günlerde site başına saklanan kaynak
+    'CACHE_SIZE': config('VISITOR_REFERERS_CACHE_SIZE', default=50000, cast=int),  # Süreç içi kaynak ID önbelleği
+    'STORE_RAW_URL': config('VISITOR_REFERERS_STORE_RAW_URL', default=True, cast=bool),  # Ham URL'yi de sakla
+}
+
+# Yerel GeoIP (MaxMind .mmdb) Veritabanı Ayarları
+GEOIP = {
+    'DATABASE_PATH': config('GEOIP_DATABASE_PATH', default=str(BASE_DIR / 'geoip' / 'GeoLite2-City.mmdb')),
+    'CACHE_SIZE': config('GEOIP_CACHE_SIZE', default=100000, cast=int),  # Önbellekte tutulacak /24 - /48 önek sayısı
+    'LANGUAGE': config('GEOIP_LANGUAGE', default='en'),  # Ülke/şehir adlarının dili
+}
+
+# User-Agent Ayrıştırıcı Önbellek Ayarları
+USER_AGENT_CACHE = {
+    'MAX_SIZE': config('USER_AGENT_CACHE_MAX_SIZE', default=10000, cast=int),  # Süreç başına tutulacak UA sayısı
+    'TTL': config('USER_AGENT_CACHE_TTL', default=3600, cast=int),  # Saniye
+}
+
+# Ziyaretçi İstatistikleri Aylık Bölümleme (PostgreSQL Partitioning) Ayarları
+VISITOR_ANALYTICS_PARTITIONS = {
+    'MONTHS_AHEAD': config('VISITOR_PARTITION_MONTHS_AHEAD', default=3, cast=int),  # Önceden oluşturulacak ay
+    'RETENTION_MONTHS': config('VISITOR_PARTITION_RETENTION_MONTHS', default=13, cast=int),  # Ham veri saklama süresi
+    'ARCHIVE_DIR': config('VISITOR_PARTITION_ARCHIVE_DIR', default=str(BASE_DIR / 'archives' / 'visitor_analytics')),
+}
+
 # reCAPTCHA v3 configuration (using your keys from .env)
 RECAPTCHA_PUBLIC_KEY = config('RECAPTCHA_PUBLIC_KEY', default='').strip()
 RECAPTCHA_PRIVATE_KEY = config('RECAPTCHA_PRIVATE_KEY', default='').strip()
@@ -393,6 +565,11 @@ LOGGING = {
             'level': 'INFO',
             'propagate': False,
         },
+        'soloblog': {
+            'handlers': ['console', 'file', 'error_file'],
+            'level': 'INFO',
+            'propagate': False,
+        },
         'django.db.backends': {
             'handlers': ['db_file'],
             'level': 'DEBUG',
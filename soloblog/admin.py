@@ -1,8 +1,9 @@
 from django.contrib import admin
 from django.utils.html import format_html
 
-from .models import Category, Article, Image, Comment, PopupAd, VisitorAnalytics, SiteSettings, HomePageSettings, \
-    FooterSettings, Menu
+from .models import Category, Article, Image, ImageRendition, Comment, PopupAd, VisitorAnalytics, SiteSettings, \
+    HomePageSettings, FooterSettings, Menu, PageCacheStat
+from .moderation import approve_comments, reject_comments
 
 
 class ImageInline(admin.TabularInline):
@@ -39,11 +40,12 @@ class CategoryAdmin(admin.ModelAdmin):
 @admin.register(Article)
 class ArticleAdmin(admin.ModelAdmin):
     list_display = (
-        'title', 'category', 'featured', 'slider', 'active', 'publicationDate', 'counter', 'article_image_preview')
+        'title', 'category', 'featured', 'slider', 'active', 'publicationDate', 'counter', 'approvedCommentCount',
+        'averageRating', 'article_image_preview')
     list_filter = ('site',)
     search_fields = ('title', 'slug', 'content', 'meta', 'metaDescription')
     prepopulated_fields = {'slug': ('title',)}
-    readonly_fields = ('site', 'counter', 'article_image_preview')
+    readonly_fields = ('site', 'counter', 'approvedCommentCount', 'averageRating', 'article_image_preview')
     date_hierarchy = 'publicationDate'
     inlines = [ImageInline, CommentInline]  # Resim ve yorumlar burada ilişkilendiriliyor
 
@@ -63,11 +65,21 @@ class PopupAdAdmin(admin.ModelAdmin):
     filter_horizontal = ('sites',)  # Many-to-Many alanı için yatay seçim arayüzü
 
 
+class ImageRenditionInline(admin.TabularInline):
+    model = ImageRendition
+    extra = 0
+    fields = ('name', 'format', 'status', 'file', 'width', 'height', 'attempts', 'lastError')
+    readonly_fields = fields
+    can_delete = False
+
+
 @admin.register(Image)
 class ImageAdmin(admin.ModelAdmin):
     list_display = ('article', 'imagePath', 'resizedImage', 'createdAt', 'updatedAt')
     search_fields = ('article__title', 'imagePath')
     list_filter = ('article',)
+    readonly_fields = ('contentHash',)
+    inlines = [ImageRenditionInline]
 
 
 @admin.register(Comment)
@@ -75,13 +87,33 @@ class CommentAdmin(admin.ModelAdmin):
     list_display = ('article', 'firstName', 'lastName', 'email', 'approved', 'rating', 'ip', 'createdAt')
     list_filter = ('approved', 'rating', 'article')
     search_fields = ('firstName', 'lastName', 'email', 'phoneNumber', 'content')
-    actions = ['approve_comments']
+    actions = ['approve_comments', 'reject_comments']
+
+    @staticmethod
+    def _ids_by_site(queryset):
+        groups = {}
+        for comment_id, site_id in queryset.values_list('id', 'site_id'):
+            groups.setdefault(site_id, []).append(comment_id)
+        return groups
 
     def approve_comments(self, request, queryset):
-        queryset.update(approved=True)
+        # Makale yorum sayaçları onayla aynı transaction içinde güncellenir
+        approved = sum(approve_comments(site_id, ids) for site_id, ids in self._ids_by_site(queryset).items())
+        self.message_user(request, f"{approved} yorum onaylandı.")
 
     approve_comments.short_description = "Seçilen yorumları onayla"
 
+    def reject_comments(self, request, queryset):
+        deleted = sum(reject_comments(site_id, ids) for site_id, ids in self._ids_by_site(queryset).items())
+        self.message_user(request, f"{deleted} yorum reddedildi ve silindi.")
+
+    reject_comments.short_description = "Seçilen yorumları reddet (sil)"
+
+    def delete_queryset(self, request, queryset):
+        # Toplu silmede de onaylı yorumlar makale sayaçlarından düşülür
+        for site_id, ids in self._ids_by_site(queryset).items():
+            reject_comments(site_id, ids)
+
 
 class VisitorAnalyticsAdmin(admin.ModelAdmin):
     """
@@ -341,3 +373,27 @@ class MenuAdmin(admin.ModelAdmin):
             "description": "Bu menünün bağlı olduğu site bilgisi."
         }),
     )
+
+
+@admin.register(PageCacheStat)
+class PageCacheStatAdmin(admin.ModelAdmin):
+    """
+    description: Sayfa önbelleğinin günlük isabet / ıskalama sayıları (salt okunur).
+    """
+    list_display = ("day", "site", "pageType", "hits", "staleHits", "misses", "hit_ratio")
+    list_filter = ("pageType", "day", "site")
+    date_hierarchy = "day"
+    ordering = ("-day", "site", "pageType")
+    readonly_fields = ("site", "pageType", "day", "hits", "staleHits", "misses", "createdAt", "updatedAt")
+
+    def hit_ratio(self, obj):
+        total = obj.hits + obj.staleHits + obj.misses
+        return f"%{100 * (obj.hits + obj.staleHits) / total:.1f}" if total else "-"
+
+    hit_ratio.short_description = "İsabet Oranı"
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
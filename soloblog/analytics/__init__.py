@@ -0,0 +1,4 @@
+# soloblog/analytics/__init__.py
+"""
+VisitorAnalytics için raporlama ve veri işleme altyapısı.
+"""
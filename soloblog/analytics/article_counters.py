@@ -0,0 +1,399 @@
+# soloblog/analytics/article_counters.py
+"""
+Makale okunma sayacı (`Article.counter`) için write-behind (geciktirilmiş yazma) servisi.
+
+Her okunmada makale satırını güncellemek en çok okunan satırlarda kilit çekişmesine yol açar. Bunun yerine
+artışlar önce bellekte (shard'lara bölünmüş sayaçlar) veya Redis'te (HINCRBY) biriktirilir; arka plan thread'i
+ya da Celery görevi belirli aralıklarla biriken değerleri tek bir toplu UPDATE ile yazar:
+
+    UPDATE soloblog_article SET counter = counter + CASE id WHEN 1 THEN 5 WHEN 7 THEN 2 ... END WHERE id IN (...)
+
+Okuma sırasında veritabanındaki değere henüz yazılmamış (bekleyen) artışlar eklenir.
+
+- `memory` backend'inde süreç çökerse son yazmadan sonraki artışlar kaybolur; kayıp penceresi en fazla
+  `FLUSH_INTERVAL_MS` + yazma süresi kadardır (`stats()` ile ölçülür).
+- `redis` backend'inde artışlar süreçler arasında paylaşılır ve süreç çökmelerinden etkilenmez.
+
+Ayarlar `settings.ARTICLE_VIEW_COUNTER` sözlüğünden okunur.
+"""
+import atexit
+import itertools
+import logging
+import os
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import Case, F, IntegerField, Value, When
+
+from common.utils import get_redis_client
+from soloblog.models import Article
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'BACKEND': 'memory',
+    'SHARDS': 16,
+    'FLUSH_INTERVAL_MS': 5000,
+    'FLUSH_BATCH_SIZE': 500,  # Tek UPDATE ile yazılacak en fazla makale sayısı
+    'REDIS_URL': 'redis://127.0.0.1:6379/2',
+    'REDIS_KEY': 'soloblog:article_views',
+    'AUTOSTART': True,
+}
+
+
+def get_counter_settings():
+    """
+    Varsayılan değerlerle birleştirilmiş makale sayacı ayarlarını döner.
+    """
+    return {**DEFAULTS, **getattr(settings, 'ARTICLE_VIEW_COUNTER', {})}
+
+
+class _Shard:
+    __slots__ = ('lock', 'counts', 'increments')
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counts = Counter()
+        self.increments = 0
+
+
+class ShardedCounterStore:
+    """
+    Süreç içi, shard'lara bölünmüş sayaç deposu. Her thread kendi shard'ını kullandığından
+    artışlar tek bir global kilit için yarışmaz.
+
+    Shard indeksi thread'e ilk kullanımda sırayla atanır; `threading.get_ident()` hizalı adresler olduğundan
+    (düşük bitleri sıfır) doğrudan mod almak tüm thread'leri aynı shard'a düşürür.
+    """
+
+    def __init__(self, shards=DEFAULTS['SHARDS']):
+        self._shards = [_Shard() for _ in range(max(1, shards))]
+        self._next_index = itertools.count()
+        self._local = threading.local()
+
+    def _shard(self):
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = self._local.shard = self._shards[next(self._next_index) % len(self._shards)]
+        return shard
+
+    def incr(self, article_id, amount=1):
+        shard = self._shard()
+        with shard.lock:
+            shard.counts[article_id] += amount
+            shard.increments += amount
+
+    def increments(self):
+        return sum(shard.increments for shard in self._shards)
+
+    def pending(self, article_ids):
+        article_ids = set(article_ids)
+        result = Counter()
+        for shard in self._shards:
+            with shard.lock:
+                for article_id in article_ids & shard.counts.keys():
+                    result[article_id] += shard.counts[article_id]
+        return result
+
+    def pending_total(self):
+        total = 0
+        for shard in self._shards:
+            with shard.lock:
+                total += sum(shard.counts.values())
+        return total
+
+    def take(self):
+        """
+        Bekleyen tüm artışları depodan alır (shard'lar tek tek boşaltılır).
+        """
+        result = Counter()
+        for shard in self._shards:
+            with shard.lock:
+                result.update(shard.counts)
+                shard.counts.clear()
+        return result
+
+    def restore(self, deltas):
+        shard = self._shard()
+        with shard.lock:
+            shard.counts.update(deltas)
+
+
+class RedisCounterStore:
+    """
+    Redis hash'i üzerinde paylaşılan sayaç deposu. Bekleyen artışlar Lua script'i ile atomik olarak
+    okunup silinir; böylece aynı artış iki kez yazılamaz.
+    """
+    TAKE_SCRIPT = """
+        local items = redis.call('HGETALL', KEYS[1])
+        if #items > 0 then
+            redis.call('DEL', KEYS[1])
+        end
+        return items
+    """
+
+    def __init__(self, url, key):
+        self.key = key
+        self.client = get_redis_client(url)
+        self._take = self.client.register_script(self.TAKE_SCRIPT)
+        self._increments = 0
+        self._lock = threading.Lock()
+
+    def incr(self, article_id, amount=1):
+        self.client.hincrby(self.key, article_id, amount)
+        with self._lock:
+            self._increments += amount
+
+    def increments(self):
+        """
+        Bu süreçte yapılan artış sayısı.
+        """
+        return self._increments
+
+    def pending(self, article_ids):
+        article_ids = list(article_ids)
+        if not article_ids:
+            return Counter()
+        values = self.client.hmget(self.key, article_ids)
+        return Counter({
+            article_id: int(value) for article_id, value in zip(article_ids, values) if value is not None
+        })
+
+    def pending_total(self):
+        return sum(int(value) for value in self.client.hvals(self.key))
+
+    def take(self):
+        items = self._take(keys=[self.key])
+        return Counter({int(items[i]): int(items[i + 1]) for i in range(0, len(items), 2)})
+
+    def restore(self, deltas):
+        pipe = self.client.pipeline(transaction=False)
+        for article_id, delta in deltas.items():
+            pipe.hincrby(self.key, article_id, delta)
+        pipe.execute()
+
+
+def apply_deltas(deltas, batch_size=DEFAULTS['FLUSH_BATCH_SIZE']):
+    """
+    Artışları `counter = counter + CASE ... END` şeklinde, her `batch_size` makale için tek bir UPDATE ile yazar.
+    Kilitlerin her zaman aynı sırayla alınması (deadlock önleme) için makaleler ID sırasıyla güncellenir.
+
+    Returns:
+        int: Güncellenen makale sayısı.
+    """
+    article_ids = sorted(article_id for article_id, delta in deltas.items() if delta)
+    updated = 0
+    for start in range(0, len(article_ids), batch_size):
+        chunk = article_ids[start:start + batch_size]
+        delta = Case(
+            *[When(id=article_id, then=Value(deltas[article_id])) for article_id in chunk],
+            default=Value(0),
+            output_field=IntegerField(),
+        )
+        updated += Article.objects.filter(id__in=chunk).update(counter=F('counter') + delta)
+    return updated
+
+
+class ArticleViewCounter:
+    """
+    Makale okunmalarını biriktiren ve periyodik olarak veritabanına yazan servis.
+    """
+
+    def __init__(self, store, flush_interval_ms=DEFAULTS['FLUSH_INTERVAL_MS'],
+                 flush_batch_size=DEFAULTS['FLUSH_BATCH_SIZE']):
+        self.store = store
+        self.flush_interval = flush_interval_ms / 1000
+        self.flush_batch_size = flush_batch_size
+        self._flush_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+        self._started_at = time.monotonic()
+        self._metrics_lock = threading.Lock()
+        self._flushes = 0
+        self._flushed_views = 0
+        self._flush_failures = 0
+        self._last_flush_at = None
+        self._last_flush_ms = 0.0
+        self._last_flush_articles = 0
+        self._max_flush_ms = 0.0
+
+    def incr(self, article_id, amount=1):
+        """
+        Makalenin okunma sayısını bekleyen artışlara ekler (veritabanına yazmaz).
+        """
+        self.store.incr(article_id, amount)
+
+    def get_pending(self, article_ids):
+        """
+        Henüz yazılmamış artışları `article_id -> artış` olarak döner.
+        """
+        return self.store.pending(article_ids)
+
+    def flush(self):
+        """
+        Bekleyen artışları veritabanına yazar. Yazma başarısız olursa artışlar depoya geri konur.
+
+        Returns:
+            int: Yazılan toplam okunma sayısı.
+        """
+        with self._flush_lock:
+            started = time.perf_counter()
+            deltas = self.store.take()
+            if not deltas:
+                self._record_flush(started, 0, 0)
+                return 0
+            try:
+                with transaction.atomic():
+                    articles = apply_deltas(deltas, batch_size=self.flush_batch_size)
+            except Exception:
+                # Veritabanı erişilemiyorsa artışları kaybetmemek için depoya geri koy
+                self.store.restore(deltas)
+                with self._metrics_lock:
+                    self._flush_failures += 1
+                logger.exception("Makale okunma sayıları yazılamadı, %s makalenin artışı geri alındı.", len(deltas))
+                return 0
+            views = sum(deltas.values())
+            self._record_flush(started, articles, views)
+            return views
+
+    def _record_flush(self, started, articles, views):
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        with self._metrics_lock:
+            self._flushes += 1
+            self._flushed_views += views
+            self._last_flush_at = time.monotonic()
+            self._last_flush_ms = elapsed_ms
+            self._last_flush_articles = articles
+            self._max_flush_ms = max(self._max_flush_ms, elapsed_ms)
+
+    def stats(self):
+        """
+        Sayaç metriklerini döner:
+        - `increments_per_second`: servis başladığından beri saniyedeki ortalama artış,
+        - `pending`: henüz yazılmamış okunma sayısı,
+        - `seconds_since_flush`: son yazmadan bu yana geçen süre (süreç çökerse kaybolabilecek artışların yaşı),
+        - `crash_loss_window_seconds`: en kötü durumda kaybolabilecek artışların zaman penceresi
+          (yazma aralığı + en uzun yazma süresi).
+        """
+        now = time.monotonic()
+        increments = self.store.increments()
+        with self._metrics_lock:
+            uptime = max(now - self._started_at, 1e-9)
+            return {
+                'increments': increments,
+                'increments_per_second': increments / uptime,
+                'pending': self.store.pending_total(),
+                'flushes': self._flushes,
+                'flush_failures': self._flush_failures,
+                'flushed_views': self._flushed_views,
+                'flush_interval_seconds': self.flush_interval,
+                'last_flush_ms': self._last_flush_ms,
+                'last_flush_articles': self._last_flush_articles,
+                'max_flush_ms': self._max_flush_ms,
+                'seconds_since_flush': now - self._last_flush_at if self._last_flush_at is not None else None,
+                'crash_loss_window_seconds': self.flush_interval + self._max_flush_ms / 1000,
+            }
+
+    def start(self):
+        """
+        Arka plan yazma thread'ini başlatır ve süreç kapanırken bekleyen artışları yazacak hook'u kaydeder.
+        """
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name='article-view-flusher', daemon=True)
+        self._thread.start()
+        atexit.register(self.shutdown)
+
+    def shutdown(self, timeout=10):
+        """
+        Yazma thread'ini durdurur ve bekleyen artışları yazar.
+        """
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        try:
+            views = self.flush()
+            if views:
+                logger.info("Kapanışta %s makale okunması veritabanına yazıldı.", views)
+        finally:
+            close_old_connections()
+
+    def _run(self):
+        while not self._stopped.wait(self.flush_interval):
+            try:
+                self.flush()
+            finally:
+                close_old_connections()
+
+
+_counter = None
+_counter_pid = None
+_counter_lock = threading.Lock()
+
+
+def build_article_counter(options=None):
+    """
+    Ayarlara göre yeni bir ArticleViewCounter oluşturur (yazma thread'i başlatılmaz).
+    """
+    options = options or get_counter_settings()
+    if options['BACKEND'] == 'redis':
+        store = RedisCounterStore(options['REDIS_URL'], options['REDIS_KEY'])
+    elif options['BACKEND'] == 'memory':
+        store = ShardedCounterStore(options['SHARDS'])
+    else:
+        raise ValueError(f"Geçersiz makale sayacı backend'i: {options['BACKEND']}")
+    return ArticleViewCounter(
+        store, flush_interval_ms=options['FLUSH_INTERVAL_MS'], flush_batch_size=options['FLUSH_BATCH_SIZE']
+    )
+
+
+def get_article_counter():
+    """
+    Süreç başına tek ArticleViewCounter örneğini döner. Fork sonrası her süreç kendi sayacını oluşturur.
+    """
+    global _counter, _counter_pid
+    pid = os.getpid()
+    if _counter is None or _counter_pid != pid:
+        with _counter_lock:
+            if _counter is None or _counter_pid != pid:
+                options = get_counter_settings()
+                counter = build_article_counter(options)
+                if options['AUTOSTART']:
+                    counter.start()
+                _counter, _counter_pid = counter, pid
+    return _counter
+
+
+def record_article_view(article_id, amount=1):
+    """
+    Makale okunmasını write-behind sayaca ekler. Sayaç hataları isteği engellememesi için loglanıp yutulur.
+    """
+    try:
+        get_article_counter().incr(article_id, amount)
+    except Exception:
+        logger.warning("Makale okunma sayacı güncellenemedi.", exc_info=True)
+
+
+def get_pending_views(article_ids):
+    """
+    Makalelerin henüz veritabanına yazılmamış okunma sayılarını döner. Sayaç erişilemezse boş sonuç döner.
+    """
+    try:
+        return get_article_counter().get_pending(article_ids)
+    except Exception:
+        logger.warning("Bekleyen makale okunma sayıları okunamadı.", exc_info=True)
+        return Counter()
+
+
+def flush_article_views():
+    """
+    Bekleyen okunma sayılarını hemen yazar (ör. Redis deposunu boşaltan Celery görevi için).
+
+    Returns:
+        int: Yazılan toplam okunma sayısı.
+    """
+    return get_article_counter().flush()
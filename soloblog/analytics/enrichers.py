@@ -0,0 +1,60 @@
+# soloblog/analytics/enrichers.py
+"""
+Ziyaret kayıtları veritabanına yazılmadan hemen önce, parça (batch) halinde çalışan zenginleştirme adımları.
+Her fonksiyon ziyaret sözlüklerinin listesini alır ve eksik alanları yerinde (in-place) doldurur.
+`settings.VISITOR_INGESTION['ENRICHERS']` listesine dotted path olarak eklenir.
+"""
+from common.utils.user_agent_parser import parse_user_agent
+from soloblog.analytics.geoip import get_geoip_resolver
+from soloblog.analytics.referers import get_referer_interner, get_referer_settings, normalize_referer
+
+
+def user_agent_enricher(hits):
+    """
+    Tarayıcı, işletim sistemi ve cihaz türü gönderilmemiş kayıtları UA metninden doldurur.
+    """
+    for hit in hits:
+        if hit.get('browser') and hit.get('operating_system') and hit.get('device_type'):
+            continue
+        info = parse_user_agent(hit.get('user_agent'))
+        hit['browser'] = hit.get('browser') or info.browser
+        hit['operating_system'] = hit.get('operating_system') or info.operating_system
+        hit['device_type'] = hit.get('device_type') or info.device_type
+
+
+def geoip_enricher(hits):
+    """
+    Ülke/şehir gönderilmemiş kayıtları yerel GeoIP veritabanından doldurur.
+    Veritabanı kullanılamıyorsa hiçbir şey yapmaz.
+    """
+    resolver = get_geoip_resolver()
+    if resolver is None:
+        return
+    for hit in hits:
+        if hit.get('country') and hit.get('city'):
+            continue
+        country, city = resolver.lookup(hit.get('ip_address'))
+        hit['country'] = hit.get('country') or country
+        hit['city'] = hit.get('city') or city
+
+
+def referer_enricher(hits):
+    """
+    Yönlendiren URL'yi alan adı + yol olarak normalize edip RefererSource ID'sini atar.
+    Parçadaki tüm kaynaklar tek seferde çözülür; `STORE_RAW_URL` kapalıysa ham URL saklanmaz.
+    """
+    keys = {}
+    for hit in hits:
+        referer = hit.get('referer')
+        if referer and hit.get('referer_source_id') is None and referer not in keys:
+            keys[referer] = normalize_referer(referer)
+    resolved = get_referer_interner().resolve(key for key in keys.values() if key is not None)
+
+    store_raw_url = get_referer_settings()['STORE_RAW_URL']
+    for hit in hits:
+        referer = hit.get('referer')
+        if referer and hit.get('referer_source_id') is None:
+            key = keys[referer]
+            hit['referer_source_id'] = resolved[key] if key is not None else None
+        if not store_raw_url:
+            hit['referer'] = None
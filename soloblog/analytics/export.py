@@ -0,0 +1,130 @@
+# soloblog/analytics/export.py
+"""
+VisitorAnalytics kayıtlarının CSV veya NDJSON olarak akış (streaming) halinde dışa aktarılması.
+
+Kayıtlar `values_list().iterator(chunk_size=...)` ile okunur (PostgreSQL'de sunucu taraflı cursor); model nesnesi
+ya da ModelSerializer oluşturulmaz. Satırlar parça parça metne çevrilip üretildiğinden (generator) bellek
+kullanımı tarih aralığından bağımsız olarak sabit kalır.
+"""
+import csv
+import zlib
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from soloblog.models import VisitorAnalytics
+
+EXPORT_FORMATS = ('csv', 'ndjson')
+DEFAULT_CHUNK_SIZE = 2000
+
+# (dışa aktarılan sütun adı, model alanı) - sütun adları liste servisindeki alan adlarıyla aynıdır
+EXPORT_COLUMNS = (
+    ('id', 'id'),
+    ('site', 'site_id'),
+    ('visit_type', 'visit_type'),
+    ('article', 'article_id'),
+    ('ip_address', 'ip_address'),
+    ('user_agent', 'user_agent'),
+    ('referer', 'referer'),
+    ('visit_date', 'visit_date'),
+    ('country', 'country'),
+    ('city', 'city'),
+    ('device_type', 'device_type'),
+    ('operating_system', 'operating_system'),
+    ('browser', 'browser'),
+    ('session_duration', 'session_duration'),
+    ('is_bounce', 'is_bounce'),
+    ('createdAt', 'createdAt'),
+    ('updatedAt', 'updatedAt'),
+)
+EXPORT_HEADER = tuple(column for column, _ in EXPORT_COLUMNS)
+EXPORT_FIELDS = tuple(field for _, field in EXPORT_COLUMNS)
+
+
+def filter_visitor_analytics(queryset, site_id=None, visit_type=None, start_date=None, end_date=None):
+    """
+    Ziyaretçi kayıtlarını liste servisi ile aynı kurallara göre filtreler
+    (tarih aralığı yalnızca başlangıç ve bitiş birlikte verildiğinde uygulanır).
+    """
+    if site_id:
+        queryset = queryset.filter(site_id=site_id)
+    if visit_type:
+        queryset = queryset.filter(visit_type=visit_type)
+    if start_date and end_date:
+        queryset = queryset.filter(visit_date__range=[start_date, end_date])
+    return queryset
+
+
+def iter_rows(queryset=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Kayıtları ID sırasıyla tuple olarak, `chunk_size` büyüklüğündeki parçalar halinde okur.
+    """
+    queryset = VisitorAnalytics.objects.all() if queryset is None else queryset
+    return queryset.order_by('id').values_list(*EXPORT_FIELDS).iterator(chunk_size=chunk_size)
+
+
+class _LineBuffer:
+    """
+    csv.writer'ın yazdığı satırı biriktirmeden geri döndüren dosya benzeri nesne.
+    """
+
+    def write(self, value):
+        return value
+
+
+def iter_csv(rows, rows_per_chunk=500):
+    """
+    Satırları başlık satırıyla birlikte CSV metin parçaları olarak üretir.
+    """
+    writer = csv.writer(_LineBuffer())
+    yield writer.writerow(EXPORT_HEADER)
+    lines = []
+    for row in rows:
+        lines.append(writer.writerow(row))
+        if len(lines) >= rows_per_chunk:
+            yield ''.join(lines)
+            lines = []
+    if lines:
+        yield ''.join(lines)
+
+
+def iter_ndjson(rows, rows_per_chunk=500):
+    """
+    Her satırı ayrı bir JSON nesnesi olarak (satır sonu ile ayrılmış) metin parçaları halinde üretir.
+    """
+    encoder = DjangoJSONEncoder(ensure_ascii=False, separators=(',', ':'))
+    lines = []
+    for row in rows:
+        lines.append(encoder.encode(dict(zip(EXPORT_HEADER, row))))
+        lines.append('\n')
+        if len(lines) >= rows_per_chunk * 2:
+            yield ''.join(lines)
+            lines = []
+    if lines:
+        yield ''.join(lines)
+
+
+def iter_gzip(chunks, level=6):
+    """
+    Metin parçalarını gzip formatında sıkıştırılmış bayt parçalarına çevirir.
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode('utf-8'))
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def stream_export(queryset=None, file_format='csv', gzip=False, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Filtrelenmiş kayıtları istenen formatta parça parça üretir.
+
+    Returns:
+        generator: gzip=False ise str, gzip=True ise bytes parçaları.
+    """
+    if file_format not in EXPORT_FORMATS:
+        raise ValueError(f"Geçersiz dışa aktarma formatı: {file_format}")
+
+    rows = iter_rows(queryset, chunk_size=chunk_size)
+    chunks = iter_csv(rows) if file_format == 'csv' else iter_ndjson(rows)
+    return iter_gzip(chunks) if gzip else chunks
@@ -0,0 +1,211 @@
+# soloblog/analytics/geoip.py
+"""
+Ziyaretçi IP adreslerinden ülke/şehir bilgisini yerel, bellek eşlemeli (memory-mapped) MaxMind DB
+(GeoLite2-City / GeoIP2-City .mmdb) dosyası üzerinden çözer. Ağ çağrısı yapılmaz.
+
+Aynı ağdaki ziyaretçiler büyük oranda aynı konuma çözüldüğünden sonuçlar IPv4 için /24, IPv6 için /48
+önekine göre önbelleğe alınır.
+
+`maxminddb` paketi kurulu değilse veya veritabanı dosyası bulunamazsa çözümleme devre dışı kalır.
+"""
+import ipaddress
+import logging
+import os
+import threading
+
+from django.conf import settings
+from django.db import transaction
+
+from common.utils.ttl_cache import TTLCache
+from soloblog.models import AnalyticsWatermark, VisitorAnalytics
+
+try:
+    import maxminddb
+except ImportError:  # maxminddb kurulu değilse GeoIP zenginleştirmesi yapılmaz
+    maxminddb = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'DATABASE_PATH': os.path.join(settings.BASE_DIR, 'geoip', 'GeoLite2-City.mmdb'),
+    'CACHE_SIZE': 100000,
+    'LANGUAGE': 'en',
+}
+
+COUNTRY_MAX_LENGTH = VisitorAnalytics._meta.get_field('country').max_length
+CITY_MAX_LENGTH = VisitorAnalytics._meta.get_field('city').max_length
+
+GEOIP_BACKFILL_WATERMARK_NAME = 'geoip_backfill'
+DEFAULT_BACKFILL_CHUNK_SIZE = 10000
+
+
+def get_geoip_settings():
+    """
+    Varsayılan değerlerle birleştirilmiş GeoIP ayarlarını döner.
+    """
+    return {**DEFAULTS, **getattr(settings, 'GEOIP', {})}
+
+
+def ip_prefix(ip_address):
+    """
+    IP adresinin önbellek anahtarı olarak kullanılan önekini döner (IPv4 /24, IPv6 /48).
+    Geçersiz adresler için None döner.
+    """
+    try:
+        address = ipaddress.ip_address(ip_address)
+    except ValueError:
+        return None
+    if address.version == 4:
+        return address.packed[:3]
+    return address.packed[:6]
+
+
+class GeoIPResolver:
+    """
+    MaxMind DB okuyucusu üzerinde önek bazlı önbellekli konum çözümleyici.
+    """
+
+    def __init__(self, database_path, cache_size=DEFAULTS['CACHE_SIZE'], language=DEFAULTS['LANGUAGE']):
+        self.reader = maxminddb.open_database(database_path, maxminddb.MODE_MMAP)
+        self.language = language
+        self.cache = TTLCache(max_size=cache_size)
+
+    def lookup(self, ip_address):
+        """
+        IP adresinin `(ülke, şehir)` bilgisini döner; bulunamazsa `(None, None)`.
+        """
+        prefix = ip_prefix(ip_address)
+        if prefix is None:
+            return None, None
+
+        location = self.cache.get(prefix)
+        if location is None:
+            location = self._resolve(ip_address)
+            self.cache.set(prefix, location)
+        return location
+
+    def _resolve(self, ip_address):
+        if not ipaddress.ip_address(ip_address).is_global:
+            return None, None
+        try:
+            record = self.reader.get(ip_address)
+        except ValueError:
+            return None, None
+        if not record:
+            return None, None
+
+        country = self._name(record.get('country'))
+        city = self._name(record.get('city'))
+        return (
+            country[:COUNTRY_MAX_LENGTH] if country else None,
+            city[:CITY_MAX_LENGTH] if city else None,
+        )
+
+    def _name(self, section):
+        if not section:
+            return None
+        names = section.get('names') or {}
+        return names.get(self.language) or names.get('en') or section.get('iso_code')
+
+    def close(self):
+        self.reader.close()
+
+
+_resolver = None
+_resolver_loaded = False
+_resolver_lock = threading.Lock()
+
+
+def get_geoip_resolver():
+    """
+    Süreç genelinde paylaşılan GeoIPResolver örneğini döner. Veritabanı kullanılamıyorsa None döner.
+    """
+    global _resolver, _resolver_loaded
+    if not _resolver_loaded:
+        with _resolver_lock:
+            if not _resolver_loaded:
+                _resolver = _open_resolver()
+                _resolver_loaded = True
+    return _resolver
+
+
+def _open_resolver():
+    options = get_geoip_settings()
+    if maxminddb is None:
+        logger.warning("maxminddb paketi kurulu değil, GeoIP zenginleştirmesi devre dışı.")
+        return None
+    if not os.path.exists(options['DATABASE_PATH']):
+        logger.warning("GeoIP veritabanı bulunamadı: %s", options['DATABASE_PATH'])
+        return None
+    return GeoIPResolver(options['DATABASE_PATH'], cache_size=options['CACHE_SIZE'], language=options['LANGUAGE'])
+
+
+def backfill_geoip(chunk_size=DEFAULT_BACKFILL_CHUNK_SIZE, max_rows=None, restart=False, progress=None):
+    """
+    Ülke bilgisi boş olan geçmiş VisitorAnalytics kayıtlarını ID sırasıyla parça parça doldurur.
+
+    Kaldığı yer `AnalyticsWatermark` ('geoip_backfill') üzerinde tutulur; yarıda kesilirse bir sonraki
+    çalıştırmada kaldığı ID'den devam eder. Her parçada yalnızca ID, IP ve tarih okunur; güncellemeler
+    aynı konuma çözülen kayıtlar için tek UPDATE ile yapılır. Daha önce rollup'a işlenmiş kayıtların ülke/şehir
+    dağılımı için işlem sonrası rollup tabloları yeniden oluşturulmalıdır (`rollup_visitor_analytics --rebuild`).
+
+    Args:
+        chunk_size (int): Her adımda okunacak kayıt sayısı.
+        max_rows (int): Bu çalıştırmada işlenecek en fazla kayıt sayısı (None ise sınırsız).
+        restart (bool): İşaretçiyi sıfırlayıp baştan başlar.
+        progress (callable): Her parçadan sonra `(son_id, işlenen, güncellenen)` ile çağrılır.
+
+    Returns:
+        tuple: (işlenen kayıt sayısı, güncellenen kayıt sayısı)
+    """
+    resolver = get_geoip_resolver()
+    if resolver is None:
+        raise RuntimeError("GeoIP veritabanı kullanılamıyor.")
+
+    if restart:
+        AnalyticsWatermark.objects.filter(name=GEOIP_BACKFILL_WATERMARK_NAME).delete()
+
+    # Çalışma sırasında eklenen yeni kayıtlar ingestion aşamasında zenginleştirildiği için üst sınır sabitlenir
+    until_id = VisitorAnalytics.objects.order_by('-id').values_list('id', flat=True).first() or 0
+    processed = updated = 0
+
+    while max_rows is None or processed < max_rows:
+        watermark, _ = AnalyticsWatermark.objects.get_or_create(name=GEOIP_BACKFILL_WATERMARK_NAME)
+        if watermark.lastId >= until_id:
+            break
+
+        limit = chunk_size if max_rows is None else min(chunk_size, max_rows - processed)
+        rows = list(
+            VisitorAnalytics.objects.filter(
+                id__gt=watermark.lastId, id__lte=until_id, country__isnull=True
+            ).order_by('id').values_list('id', 'ip_address', 'visit_date')[:limit]
+        )
+        if not rows:
+            watermark.lastId = until_id
+            watermark.save(update_fields=['lastId', 'updatedAt'])
+            break
+
+        groups = {}
+        for row_id, ip_address, visit_date in rows:
+            location = resolver.lookup(ip_address)
+            if location[0] is None and location[1] is None:
+                continue
+            groups.setdefault(location, []).append((row_id, visit_date))
+
+        with transaction.atomic():
+            for (country, city), items in groups.items():
+                # Tarih aralığı, bölümlenmiş tabloda sadece ilgili bölümlerin taranmasını sağlar
+                dates = [visit_date for _, visit_date in items]
+                updated += VisitorAnalytics.objects.filter(
+                    id__in=[row_id for row_id, _ in items],
+                    visit_date__range=(min(dates), max(dates)),
+                ).update(country=country, city=city)
+            watermark.lastId = rows[-1][0]
+            watermark.lastVisitDate = rows[-1][2]
+            watermark.save(update_fields=['lastId', 'lastVisitDate', 'updatedAt'])
+
+        processed += len(rows)
+        if progress:
+            progress(watermark.lastId, processed, updated)
+
+    return processed, updated
@@ -0,0 +1,394 @@
+# soloblog/analytics/ingestion.py
+"""
+VisitorAnalytics için tamponlu (buffered) ve toplu (batch) kayıt altyapısı.
+
+Her ziyaret isteği yolunda ayrı bir INSERT/transaction açmak yerine ziyaret (hit) bilgileri önce bir tampona
+eklenir; tampon N kayda ulaştığında veya T milisaniyede bir arka plan thread'i tarafından tek bir
+`bulk_create` ile veritabanına yazılır.
+
+- `memory` tamponu süreç içidir (deque), `redis` tamponu birden fazla süreç/sunucu arasında paylaşılır.
+- Tampon dolduğunda (backpressure) çağıran thread bir parçayı kendisi yazar; yine de yer açılmazsa
+  `BufferFull` hatası fırlatılır.
+- Süreç kapanırken (atexit) tampondaki kayıtlar veritabanına boşaltılır.
+- Yazma sırasında bağlantı / operasyonel bir veritabanı hatası olursa parça tampona geri alınır. Diğer hatalarda
+  (ör. hatalı bir zenginleştirme adımı) parça aynı hatayla sonsuza kadar tekrar denenip arkasındaki kayıtları
+  bekletmesin diye bırakılır; kayıtlar JSON olarak `<modül>.dead_letter` logger'ına yazılır.
+- `is_bounce` ve zenginleştirme (enrichment) adımları yazma anında tüm parça için tek seferde hesaplanır.
+
+Ayarlar `settings.VISITOR_INGESTION` sözlüğünden okunur.
+"""
+import atexit
+import json
+import logging
+import os
+import threading
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import DataError, IntegrityError, InterfaceError, OperationalError, close_old_connections, \
+    transaction
+from django.utils.dateparse import parse_datetime
+from django.utils.module_loading import import_string
+
+from common.utils import get_redis_client
+from soloblog.analytics.article_counters import record_article_view
+from soloblog.analytics.realtime import track_hit
+from soloblog.models import VisitorAnalytics
+
+logger = logging.getLogger(__name__)
+# Yazılamayıp bırakılan ziyaret kayıtları (gerekirse buradan tekrar yüklenebilir)
+dead_letter_logger = logging.getLogger(f'{__name__}.dead_letter')
+
+DEFAULTS = {
+    'BACKEND': 'memory',
+    'BATCH_SIZE': 500,
+    'FLUSH_INTERVAL_MS': 1000,
+    'MAX_BUFFER_SIZE': 50000,
+    'REDIS_URL': 'redis://127.0.0.1:6379/2',
+    'REDIS_KEY': 'soloblog:visitor_hits',
+    'AUTOSTART': True,
+    'ENRICHERS': [],
+}
+
+# Tampona eklenen ziyaret sözlüğünün alanları (VisitorAnalytics alan adlarıyla aynı)
+HIT_FIELDS = (
+    'site_id', 'visit_type', 'article_id', 'ip_address', 'user_agent', 'referer', 'referer_source_id', 'visit_date',
+    'country', 'city', 'device_type', 'operating_system', 'browser', 'session_duration',
+)
+
+
+class BufferFull(Exception):
+    """
+    Tampon dolu ve boşaltılamıyor; çağıran tarafın isteği geri çevirmesi beklenir.
+    """
+
+
+def get_ingestion_settings():
+    """
+    Varsayılan değerlerle birleştirilmiş ingestion ayarlarını döner.
+    """
+    return {**DEFAULTS, **getattr(settings, 'VISITOR_INGESTION', {})}
+
+
+class MemoryHitBuffer:
+    """
+    Süreç içi tampon. Sadece bu süreçteki flusher thread'i tarafından boşaltılır.
+    """
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._items = []
+        self._lock = threading.Lock()
+
+    def push(self, hit):
+        """
+        Kaydı tampona ekler. Tampon doluysa 0, değilse yeni tampon uzunluğunu döner.
+        """
+        with self._lock:
+            if len(self._items) >= self.max_size:
+                return 0
+            self._items.append(hit)
+            return len(self._items)
+
+    def pop_batch(self, size):
+        with self._lock:
+            batch = self._items[:size]
+            del self._items[:size]
+            return batch
+
+    def requeue(self, hits):
+        """
+        Yazılamayan kayıtları sıralarını koruyarak tamponun başına geri koyar.
+        """
+        with self._lock:
+            self._items[:0] = hits
+
+    def __len__(self):
+        return len(self._items)
+
+
+class RedisHitBuffer:
+    """
+    Redis listesi üzerinde paylaşılan tampon. Ekleme ve parça okuma işlemleri Lua script'leri ile
+    atomik olarak yapılır; böylece birden fazla süreç aynı kaydı iki kez yazamaz.
+    """
+    PUSH_SCRIPT = """
+        if redis.call('LLEN', KEYS[1]) >= tonumber(ARGV[1]) then
+            return 0
+        end
+        return redis.call('RPUSH', KEYS[1], ARGV[2])
+    """
+    POP_SCRIPT = """
+        local items = redis.call('LRANGE', KEYS[1], 0, tonumber(ARGV[1]) - 1)
+        if #items > 0 then
+            redis.call('LTRIM', KEYS[1], #items, -1)
+        end
+        return items
+    """
+
+    def __init__(self, url, key, max_size):
+        self.key = key
+        self.max_size = max_size
+        self.client = get_redis_client(url)
+        self._push = self.client.register_script(self.PUSH_SCRIPT)
+        self._pop = self.client.register_script(self.POP_SCRIPT)
+
+    def push(self, hit):
+        payload = json.dumps(hit, cls=DjangoJSONEncoder)
+        return self._push(keys=[self.key], args=[self.max_size, payload])
+
+    def pop_batch(self, size):
+        return [self._decode(item) for item in self._pop(keys=[self.key], args=[size])]
+
+    def requeue(self, hits):
+        payloads = [json.dumps(hit, cls=DjangoJSONEncoder) for hit in hits]
+        if payloads:
+            self.client.lpush(self.key, *reversed(payloads))
+
+    def __len__(self):
+        return self.client.llen(self.key)
+
+    @staticmethod
+    def _decode(payload):
+        hit = json.loads(payload)
+        if hit.get('visit_date'):
+            hit['visit_date'] = parse_datetime(hit['visit_date'])
+        return hit
+
+
+class HitIngestor:
+    """
+    Ziyaret kayıtlarını tampona alan ve parçalar halinde veritabanına yazan sınıf.
+    """
+
+    def __init__(self, buffer, batch_size=DEFAULTS['BATCH_SIZE'], flush_interval_ms=DEFAULTS['FLUSH_INTERVAL_MS'],
+                 enrichers=None):
+        self.buffer = buffer
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000
+        # Her biri ziyaret sözlükleri listesini yerinde (in-place) güncelleyen çağrılabilir nesneler
+        self.enrichers = list(enrichers or [])
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def submit(self, hit):
+        """
+        Ziyaret kaydını tampona ekler.
+
+        Raises:
+            BufferFull: Tampon dolu ve bir parça yazıldıktan sonra da yer açılamadıysa.
+        """
+        length = self.buffer.push(hit)
+        if not length:
+            # Backpressure: flusher yetişemiyorsa isteği yapan thread bir parçayı kendisi yazar
+            self.flush_batch()
+            length = self.buffer.push(hit)
+            if not length:
+                raise BufferFull("Ziyaretçi tamponu dolu.")
+        if length >= self.batch_size:
+            self._wakeup.set()
+
+    def flush_batch(self):
+        """
+        Tampondan en fazla `batch_size` kaydı alıp veritabanına yazar.
+
+        Returns:
+            int: Tampondan alınan kayıt sayısı.
+        """
+        with self._flush_lock:
+            hits = self.buffer.pop_batch(self.batch_size)
+            if not hits:
+                return 0
+            try:
+                self.write(hits)
+            except (OperationalError, InterfaceError):
+                # Veritabanı erişilemiyorsa kayıtları kaybetmemek için tampona geri koy
+                self.buffer.requeue(hits)
+                logger.exception("Ziyaretçi kayıtları yazılamadı, %s kayıt tampona geri alındı.", len(hits))
+                return 0
+            except Exception:
+                # Tekrar denemek aynı hatayı verir; parça bırakılır ki arkasındaki kayıtlar beklemesin
+                logger.exception("Ziyaretçi kayıtları yazılamadı, %s kayıt bırakıldı (dead letter).", len(hits))
+                self.dead_letter(hits)
+            return len(hits)
+
+    @staticmethod
+    def dead_letter(hits):
+        """
+        Yazılamayan kayıtları JSON satırları olarak dead letter logger'ına yazar.
+        """
+        for hit in hits:
+            try:
+                dead_letter_logger.error(json.dumps(hit, cls=DjangoJSONEncoder))
+            except (TypeError, ValueError):
+                dead_letter_logger.error(repr(hit))
+
+    def drain(self):
+        """
+        Tampon boşalana kadar yazar.
+
+        Returns:
+            int: Yazılan kayıt sayısı.
+        """
+        total = 0
+        while True:
+            count = self.flush_batch()
+            if not count:
+                return total
+            total += count
+
+    def write(self, hits):
+        """
+        Ziyaret sözlüklerini tek bir `bulk_create` ile yazar. Parçada geçersiz bir kayıt varsa
+        (ör. silinmiş makale) kayıtlar tek tek yazılır ve hatalı olanlar atlanır.
+        """
+        rows = self.build_rows(hits)
+        try:
+            with transaction.atomic():
+                VisitorAnalytics.objects.bulk_create(rows, batch_size=self.batch_size)
+            return len(rows)
+        except (IntegrityError, DataError):
+            logger.warning("Toplu ziyaretçi kaydı başarısız oldu, kayıtlar tek tek yazılıyor.")
+
+        written = 0
+        for row in rows:
+            row.pk = None
+            try:
+                with transaction.atomic():
+                    row.save(force_insert=True)
+                written += 1
+            except (IntegrityError, DataError):
+                logger.warning("Geçersiz ziyaretçi kaydı atlandı: site=%s article=%s", row.site_id, row.article_id)
+        return written
+
+    def build_rows(self, hits):
+        """
+        Zenginleştirme adımlarını çalıştırır ve `is_bounce` değerini tüm parça için hesaplayarak
+        kaydedilmeye hazır VisitorAnalytics nesnelerini döner.
+        """
+        for enrich in self.enrichers:
+            enrich(hits)
+
+        threshold = VisitorAnalytics.BOUNCE_THRESHOLD_SECONDS
+        durations = [hit.get('session_duration') for hit in hits]
+        bounces = [duration is not None and duration < threshold for duration in durations]
+
+        return [
+            VisitorAnalytics(is_bounce=is_bounce, **{field: hit.get(field) for field in HIT_FIELDS if field in hit})
+            for hit, is_bounce in zip(hits, bounces)
+        ]
+
+    def start(self):
+        """
+        Arka plan flusher thread'ini başlatır ve süreç kapanırken tamponu boşaltacak hook'u kaydeder.
+        """
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name='visitor-hit-flusher', daemon=True)
+        self._thread.start()
+        atexit.register(self.shutdown)
+
+    def shutdown(self, timeout=10):
+        """
+        Flusher thread'ini durdurur ve tamponda kalan kayıtları yazar.
+        """
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        try:
+            count = self.drain()
+            if count:
+                logger.info("Kapanışta %s ziyaretçi kaydı veritabanına yazıldı.", count)
+        finally:
+            close_old_connections()
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                # Tam dolu parçalar bitene kadar beklemeden yazmaya devam et
+                while self.flush_batch() >= self.batch_size and not self._stopped.is_set():
+                    pass
+            finally:
+                close_old_connections()
+
+
+_ingestor = None
+_ingestor_pid = None
+_ingestor_lock = threading.Lock()
+
+
+def build_ingestor(options=None):
+    """
+    Ayarlara göre yeni bir HitIngestor oluşturur (flusher thread'i başlatılmaz).
+    """
+    options = options or get_ingestion_settings()
+    if options['BACKEND'] == 'redis':
+        buffer = RedisHitBuffer(options['REDIS_URL'], options['REDIS_KEY'], options['MAX_BUFFER_SIZE'])
+    elif options['BACKEND'] == 'memory':
+        buffer = MemoryHitBuffer(options['MAX_BUFFER_SIZE'])
+    else:
+        raise ValueError(f"Geçersiz ingestion backend: {options['BACKEND']}")
+    return HitIngestor(
+        buffer,
+        batch_size=options['BATCH_SIZE'],
+        flush_interval_ms=options['FLUSH_INTERVAL_MS'],
+        enrichers=[import_string(path) for path in options['ENRICHERS']],
+    )
+
+
+def get_ingestor():
+    """
+    Süreç başına tek HitIngestor örneğini döner. Fork sonrası (ör. gunicorn worker'ları) her süreç
+    kendi tamponunu ve flusher thread'ini oluşturur.
+    """
+    global _ingestor, _ingestor_pid
+    pid = os.getpid()
+    if _ingestor is None or _ingestor_pid != pid:
+        with _ingestor_lock:
+            if _ingestor is None or _ingestor_pid != pid:
+                options = get_ingestion_settings()
+                ingestor = build_ingestor(options)
+                if options['AUTOSTART']:
+                    ingestor.start()
+                _ingestor, _ingestor_pid = ingestor, pid
+    return _ingestor
+
+
+def record_hit(hit):
+    """
+    Tek bir ziyaret kaydını tampona ekler; anlık sayaçlara ve makale okunma sayacına işler.
+    `visit_date` verilmemişse ziyaret anı kullanılır.
+
+    Raises:
+        BufferFull: Tampon dolu ise.
+    """
+    hit.setdefault('visit_date', VisitorAnalytics._meta.get_field('visit_date').get_default())
+    get_ingestor().submit(hit)
+    track_hit(hit)
+    if hit.get('article_id'):
+        record_article_view(hit['article_id'])
+
+
+def flush_pending(max_batches=None):
+    """
+    Tampondaki kayıtları yazar (ör. Redis tamponunu boşaltan Celery görevi için).
+
+    Returns:
+        int: Yazılan kayıt sayısı.
+    """
+    ingestor = get_ingestor()
+    if max_batches is None:
+        return ingestor.drain()
+    total = 0
+    for _ in range(max_batches):
+        count = ingestor.flush_batch()
+        if not count:
+            break
+        total += count
+    return total
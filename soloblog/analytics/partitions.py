@@ -0,0 +1,222 @@
+# soloblog/analytics/partitions.py
+"""
+VisitorAnalytics tablosunun `visit_date` alanına göre aylık bölümlenmesi (PostgreSQL declarative partitioning).
+
+- `ensure_partitions`: içinde bulunulan ay ve sonraki N ay için bölümleri önceden oluşturur.
+- `archive_partitions`: saklama süresini (retention) aşan bölümleri ana tablodan ayırır (DETACH),
+  gzip ile sıkıştırılmış CSV dosyasına aktarır ve siler.
+
+Tablo bölümlenmemişse (ör. SQLite ile geliştirme ortamı) işlemler hiçbir şey yapmaz.
+"""
+import datetime
+import gzip
+import logging
+import os
+import re
+
+from django.conf import settings
+from django.db import connection, transaction
+
+from soloblog.analytics.rollups import get_settled_id
+from soloblog.models import VisitorAnalytics
+
+logger = logging.getLogger(__name__)
+
+PARENT_TABLE = VisitorAnalytics._meta.db_table
+DEFAULT_PARTITION = f"{PARENT_TABLE}_default"
+PARTITION_NAME_RE = re.compile(rf"^{PARENT_TABLE}_p(\d{{4}})(\d{{2}})$")
+
+DEFAULTS = {
+    'MONTHS_AHEAD': 3,
+    'RETENTION_MONTHS': 13,
+    'ARCHIVE_DIR': os.path.join(settings.BASE_DIR, 'archives', 'visitor_analytics'),
+}
+
+
+def get_partition_settings():
+    """
+    Varsayılan değerlerle birleştirilmiş bölümleme ayarlarını döner.
+    """
+    return {**DEFAULTS, **getattr(settings, 'VISITOR_ANALYTICS_PARTITIONS', {})}
+
+
+def month_start(value):
+    """
+    Verilen tarihin içinde bulunduğu ayın başlangıcını (UTC) döner.
+    """
+    if isinstance(value, datetime.datetime):
+        value = value.astimezone(datetime.timezone.utc).date()
+    return datetime.datetime(value.year, value.month, 1, tzinfo=datetime.timezone.utc)
+
+
+def add_months(value, months):
+    """
+    Ay başlangıcına `months` ay ekler (negatif olabilir).
+    """
+    index = value.year * 12 + value.month - 1 + months
+    return value.replace(year=index // 12, month=index % 12 + 1)
+
+
+def partition_name(month):
+    return f"{PARENT_TABLE}_p{month:%Y%m}"
+
+
+def is_partitioned():
+    """
+    VisitorAnalytics tablosunun bölümlenmiş (partitioned) olup olmadığını döner.
+    """
+    if connection.vendor != 'postgresql':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_partitioned_table pt JOIN pg_class c ON c.oid = pt.partrelid "
+            "WHERE c.relname = %s AND pg_table_is_visible(c.oid)",
+            [PARENT_TABLE]
+        )
+        return cursor.fetchone() is not None
+
+
+def list_partitions():
+    """
+    Mevcut aylık bölümleri `(ay başlangıcı, tablo adı)` olarak, eskiden yeniye sıralı döner.
+    Varsayılan (default) bölüm listeye dahil edilmez.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT child.relname FROM pg_inherits i "
+            "JOIN pg_class parent ON parent.oid = i.inhparent "
+            "JOIN pg_class child ON child.oid = i.inhrelid "
+            "WHERE parent.relname = %s AND pg_table_is_visible(parent.oid)",
+            [PARENT_TABLE]
+        )
+        names = [row[0] for row in cursor.fetchall()]
+
+    partitions = []
+    for name in names:
+        match = PARTITION_NAME_RE.match(name)
+        if match:
+            month = datetime.datetime(int(match.group(1)), int(match.group(2)), 1, tzinfo=datetime.timezone.utc)
+            partitions.append((month, name))
+    return sorted(partitions)
+
+
+def ensure_partitions(months_ahead=None, now=None):
+    """
+    İçinde bulunulan ay ile sonraki `months_ahead` ay için eksik bölümleri oluşturur.
+
+    Returns:
+        list: Oluşturulan bölüm tablolarının adları.
+    """
+    if not is_partitioned():
+        return []
+
+    months_ahead = get_partition_settings()['MONTHS_AHEAD'] if months_ahead is None else months_ahead
+    current = month_start(now or datetime.datetime.now(datetime.timezone.utc))
+    existing = {name for _, name in list_partitions()}
+
+    created = []
+    quote = connection.ops.quote_name
+    for offset in range(months_ahead + 1):
+        month = add_months(current, offset)
+        name = partition_name(month)
+        if name in existing:
+            continue
+        # Varsayılan bölümde bu aralığa düşen kayıt varsa PostgreSQL bölüm oluşturmayı reddeder;
+        # bu durumda hata loglanır ve diğer aylara devam edilir.
+        try:
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute(
+                    f"CREATE TABLE {quote(name)} PARTITION OF {quote(PARENT_TABLE)} "
+                    f"FOR VALUES FROM (%s) TO (%s)",
+                    [month, add_months(month, 1)]
+                )
+        except Exception:
+            logger.exception("Ziyaretçi bölümü oluşturulamadı: %s", name)
+            continue
+        created.append(name)
+        logger.info("Ziyaretçi bölümü oluşturuldu: %s", name)
+    return created
+
+
+def archive_partitions(retention_months=None, archive_dir=None, drop=True, now=None, dry_run=False):
+    """
+    Saklama süresini aşan aylık bölümleri ana tablodan ayırır, `<archive_dir>/<bölüm>.csv.gz` dosyasına
+    aktarır ve (drop=True ise) siler.
+
+    Henüz rollup tablolarına işlenmemiş kayıt içeren bölümler atlanır; böylece arşivlenen ham veriler
+    raporlarda kaybolmaz.
+
+    Returns:
+        list: Arşivlenen (veya dry_run ise arşivlenecek) bölüm tablolarının adları.
+    """
+    if not is_partitioned():
+        return []
+
+    options = get_partition_settings()
+    retention_months = options['RETENTION_MONTHS'] if retention_months is None else retention_months
+    archive_dir = archive_dir or options['ARCHIVE_DIR']
+    cutoff = add_months(month_start(now or datetime.datetime.now(datetime.timezone.utc)), -retention_months)
+    rollup_watermark = get_settled_id()
+
+    archived = []
+    quote = connection.ops.quote_name
+    for month, name in list_partitions():
+        if add_months(month, 1) > cutoff:
+            break
+
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT EXISTS (SELECT 1 FROM {quote(name)} WHERE id > %s)", [rollup_watermark])
+            if cursor.fetchone()[0]:
+                logger.warning("%s bölümünde rollup'a işlenmemiş kayıtlar var, arşivleme atlandı.", name)
+                continue
+
+        if dry_run:
+            archived.append(name)
+            continue
+
+        # DETACH kısa bir kilitle ayrı çalışır; dışa aktarma sırasında yeni kayıtların yazılması engellenmez
+        with connection.cursor() as cursor:
+            cursor.execute(f"ALTER TABLE {quote(PARENT_TABLE)} DETACH PARTITION {quote(name)}")
+
+        try:
+            path = _export_table(name, archive_dir)
+        except Exception:
+            # Dışa aktarma başarısız olursa bölüm tekrar bağlanır, veri sorgulanabilir kalır
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"ALTER TABLE {quote(PARENT_TABLE)} ATTACH PARTITION {quote(name)} FOR VALUES FROM (%s) TO (%s)",
+                    [month, add_months(month, 1)]
+                )
+            raise
+        logger.info("Ziyaretçi bölümü arşivlendi: %s -> %s", name, path)
+
+        if drop:
+            with connection.cursor() as cursor:
+                cursor.execute(f"DROP TABLE {quote(name)}")
+        archived.append(name)
+    return archived
+
+
+def _export_table(table, archive_dir):
+    """
+    Tabloyu COPY ile gzip sıkıştırılmış CSV dosyasına aktarır. Dosya önce geçici adla yazılır,
+    tamamlandığında yeniden adlandırılır.
+    """
+    os.makedirs(archive_dir, exist_ok=True)
+    path = os.path.join(archive_dir, f"{table}.csv.gz")
+    tmp_path = f"{path}.tmp"
+    sql = f"COPY {connection.ops.quote_name(table)} TO STDOUT WITH (FORMAT csv, HEADER true)"
+
+    with connection.cursor() as cursor, gzip.open(tmp_path, 'wb') as output:
+        raw_cursor = cursor.cursor
+        if hasattr(raw_cursor, 'copy_expert'):
+            # psycopg2
+            raw_cursor.copy_expert(sql, output)
+        else:
+            # psycopg (3)
+            with raw_cursor.copy(sql) as copy:
+                for data in copy:
+                    output.write(data)
+
+    os.replace(tmp_path, path)
+    return path
@@ -0,0 +1,277 @@
+# soloblog/analytics/realtime.py
+"""
+Site başına anlık (real-time) ziyaretçi sayaçları: son 1, 5 ve 60 dakikadaki ziyaret ve tekil ziyaretçi sayıları
+ile en çok okunan makaleler.
+
+Sayaçlar halka tampon (ring buffer) mantığıyla zaman dilimlerine (bucket) bölünür; her ziyaret yalnızca içinde
+bulunulan dilimi günceller (O(1)), pencere değeri son N dilim toplanarak okunur. Süresi geçen dilimler
+Redis'te TTL ile, bellekte ise aynı halka yuvası yeniden kullanılırken sıfırlanarak temizlenir.
+Ana veritabanına hiç sorgu gönderilmez.
+
+- `redis` backend'i tüm süreç/sunucular arasında paylaşılır: ziyaret sayısı için INCR, makaleler için
+  ZINCRBY, tekil ziyaretçiler için PFADD (HyperLogLog) tek bir pipeline ile gönderilir.
+- `memory` backend'i süreç içidir ve geliştirme ortamı içindir.
+
+Ayarlar `settings.VISITOR_REALTIME` sözlüğünden okunur.
+"""
+import logging
+import os
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+
+from common.utils import get_redis_client
+from soloblog.analytics.uniques import visitor_key
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'ENABLED': True,
+    'BACKEND': 'memory',
+    'REDIS_URL': 'redis://127.0.0.1:6379/3',
+    'KEY_PREFIX': 'soloblog:rt',
+    'BUCKET_SECONDS': 10,  # Ziyaret sayacı dilim süresi
+    'SLOW_BUCKET_SECONDS': 60,  # Makale ve tekil ziyaretçi dilim süresi
+}
+
+# Pencere adı -> saniye
+WINDOWS = {'1m': 60, '5m': 300, '60m': 3600}
+ONLINE_WINDOW = '5m'
+MAX_WINDOW_SECONDS = max(WINDOWS.values())
+
+
+def get_realtime_settings():
+    """
+    Varsayılan değerlerle birleştirilmiş anlık sayaç ayarlarını döner.
+    """
+    return {**DEFAULTS, **getattr(settings, 'VISITOR_REALTIME', {})}
+
+
+def _bucket_count(window_seconds, bucket_seconds):
+    return max(1, -(-window_seconds // bucket_seconds))
+
+
+class _Ring:
+    """
+    Sabit boyutlu halka tampon. Her yuva, ait olduğu dilim numarasını (epoch) ve değerini tutar;
+    yuva başka bir dilim için tekrar kullanılırken eski değer atılır.
+    """
+    __slots__ = ('size', 'epochs', 'values', 'factory')
+
+    def __init__(self, size, factory):
+        self.size = size
+        self.epochs = [-1] * size
+        self.values = [None] * size
+        self.factory = factory
+
+    def slot(self, epoch):
+        index = epoch % self.size
+        if self.epochs[index] != epoch:
+            self.epochs[index] = epoch
+            self.values[index] = self.factory()
+        return index
+
+    def window(self, newest, span):
+        """
+        Son `span` dilimin (geçerli olanlarının) değerlerini döner.
+        """
+        values = []
+        for epoch in range(newest - span + 1, newest + 1):
+            index = epoch % self.size
+            if self.epochs[index] == epoch:
+                values.append(self.values[index])
+        return values
+
+
+class LocalRealtimeCounter:
+    """
+    Süreç içi anlık sayaç (geliştirme ortamı için).
+    """
+
+    def __init__(self, bucket_seconds=DEFAULTS['BUCKET_SECONDS'], slow_bucket_seconds=DEFAULTS['SLOW_BUCKET_SECONDS']):
+        self.bucket_seconds = bucket_seconds
+        self.slow_bucket_seconds = slow_bucket_seconds
+        self._hit_slots = _bucket_count(MAX_WINDOW_SECONDS, bucket_seconds)
+        self._slow_slots = _bucket_count(MAX_WINDOW_SECONDS, slow_bucket_seconds)
+        self._sites = {}
+        self._lock = threading.Lock()
+
+    def _rings(self, site_id):
+        rings = self._sites.get(site_id)
+        if rings is None:
+            rings = self._sites[site_id] = (
+                _Ring(self._hit_slots, int),
+                _Ring(self._slow_slots, Counter),
+                _Ring(self._slow_slots, set),
+            )
+        return rings
+
+    def track(self, site_id, visitor, article_id=None, now=None):
+        now = time.time() if now is None else now
+        epoch = int(now // self.bucket_seconds)
+        slow_epoch = int(now // self.slow_bucket_seconds)
+        with self._lock:
+            hits, articles, visitors = self._rings(site_id)
+            hits.values[hits.slot(epoch)] += 1
+            visitors.values[visitors.slot(slow_epoch)].add(visitor)
+            if article_id is not None:
+                articles.values[articles.slot(slow_epoch)][article_id] += 1
+
+    def snapshot(self, site_id, top_window=ONLINE_WINDOW, top=10, now=None):
+        now = time.time() if now is None else now
+        epoch = int(now // self.bucket_seconds)
+        slow_epoch = int(now // self.slow_bucket_seconds)
+        windows = {}
+        with self._lock:
+            hits, articles, visitors = self._rings(site_id)
+            for name, seconds in WINDOWS.items():
+                unique = set()
+                for bucket in visitors.window(slow_epoch, _bucket_count(seconds, self.slow_bucket_seconds)):
+                    unique.update(bucket)
+                windows[name] = {
+                    'hits': sum(hits.window(epoch, _bucket_count(seconds, self.bucket_seconds))),
+                    'visitors': len(unique),
+                }
+            article_counts = Counter()
+            for bucket in articles.window(slow_epoch, _bucket_count(WINDOWS[top_window], self.slow_bucket_seconds)):
+                article_counts.update(bucket)
+        return windows, article_counts.most_common(top)
+
+
+class RedisRealtimeCounter:
+    """
+    Redis üzerinde paylaşılan anlık sayaç. Her dilim ayrı bir anahtardır ve en uzun pencere kadar yaşar.
+    """
+
+    def __init__(self, url, prefix=DEFAULTS['KEY_PREFIX'], bucket_seconds=DEFAULTS['BUCKET_SECONDS'],
+                 slow_bucket_seconds=DEFAULTS['SLOW_BUCKET_SECONDS']):
+        self.client = get_redis_client(url)
+        self.prefix = prefix
+        self.bucket_seconds = bucket_seconds
+        self.slow_bucket_seconds = slow_bucket_seconds
+
+    def _key(self, site_id, kind, epoch):
+        return f"{self.prefix}:{site_id}:{kind}:{epoch}"
+
+    def track(self, site_id, visitor, article_id=None, now=None):
+        now = time.time() if now is None else now
+        epoch = int(now // self.bucket_seconds)
+        slow_epoch = int(now // self.slow_bucket_seconds)
+        hit_ttl = MAX_WINDOW_SECONDS + self.bucket_seconds
+        slow_ttl = MAX_WINDOW_SECONDS + self.slow_bucket_seconds
+
+        pipe = self.client.pipeline(transaction=False)
+        hit_key = self._key(site_id, 'h', epoch)
+        pipe.incr(hit_key)
+        pipe.expire(hit_key, hit_ttl)
+        unique_key = self._key(site_id, 'v', slow_epoch)
+        pipe.pfadd(unique_key, visitor)
+        pipe.expire(unique_key, slow_ttl)
+        if article_id is not None:
+            article_key = self._key(site_id, 'a', slow_epoch)
+            pipe.zincrby(article_key, 1, article_id)
+            pipe.expire(article_key, slow_ttl)
+        pipe.execute()
+
+    def snapshot(self, site_id, top_window=ONLINE_WINDOW, top=10, now=None):
+        now = time.time() if now is None else now
+        epoch = int(now // self.bucket_seconds)
+        slow_epoch = int(now // self.slow_bucket_seconds)
+
+        # En uzun penceredeki tüm ziyaret dilimleri tek MGET ile okunur; kısa pencereler bu listenin sonudur
+        hit_span = _bucket_count(MAX_WINDOW_SECONDS, self.bucket_seconds)
+        hit_keys = [self._key(site_id, 'h', e) for e in range(epoch - hit_span + 1, epoch + 1)]
+        visitor_keys = {
+            name: [
+                self._key(site_id, 'v', e)
+                for e in range(slow_epoch - _bucket_count(seconds, self.slow_bucket_seconds) + 1, slow_epoch + 1)
+            ]
+            for name, seconds in WINDOWS.items()
+        }
+        article_span = _bucket_count(WINDOWS[top_window], self.slow_bucket_seconds)
+        article_keys = [self._key(site_id, 'a', e) for e in range(slow_epoch - article_span + 1, slow_epoch + 1)]
+        union_key = f"{self.prefix}:{site_id}:top:{os.getpid()}:{threading.get_ident()}"
+
+        pipe = self.client.pipeline(transaction=False)
+        pipe.mget(hit_keys)
+        for keys in visitor_keys.values():
+            pipe.pfcount(*keys)
+        pipe.zunionstore(union_key, article_keys)
+        pipe.zrevrange(union_key, 0, top - 1, withscores=True)
+        pipe.delete(union_key)
+        results = pipe.execute()
+
+        hit_values = [int(value) if value else 0 for value in results[0]]
+        windows = {}
+        for offset, name in enumerate(WINDOWS):
+            span = _bucket_count(WINDOWS[name], self.bucket_seconds)
+            windows[name] = {'hits': sum(hit_values[-span:]), 'visitors': results[1 + offset]}
+        top_articles = [(int(member), int(score)) for member, score in results[1 + len(WINDOWS) + 1]]
+        return windows, top_articles
+
+
+def build_realtime_counter(options=None):
+    options = options or get_realtime_settings()
+    if options['BACKEND'] == 'redis':
+        return RedisRealtimeCounter(
+            options['REDIS_URL'], prefix=options['KEY_PREFIX'],
+            bucket_seconds=options['BUCKET_SECONDS'], slow_bucket_seconds=options['SLOW_BUCKET_SECONDS'],
+        )
+    if options['BACKEND'] == 'memory':
+        return LocalRealtimeCounter(
+            bucket_seconds=options['BUCKET_SECONDS'], slow_bucket_seconds=options['SLOW_BUCKET_SECONDS'],
+        )
+    raise ValueError(f"Geçersiz anlık sayaç backend'i: {options['BACKEND']}")
+
+
+_counter = None
+_counter_lock = threading.Lock()
+
+
+def get_realtime_counter():
+    """
+    Süreç başına tek anlık sayaç örneğini döner.
+    """
+    global _counter
+    if _counter is None:
+        with _counter_lock:
+            if _counter is None:
+                _counter = build_realtime_counter()
+    return _counter
+
+
+def track_hit(hit):
+    """
+    Ziyareti anlık sayaçlara işler. Sayaç hataları ziyaret kaydını engellememesi için loglanıp yutulur.
+    """
+    options = get_realtime_settings()
+    if not options['ENABLED'] or not hit.get('site_id'):
+        return
+    try:
+        get_realtime_counter().track(
+            hit['site_id'],
+            visitor_key(hit.get('ip_address'), hit.get('user_agent')),
+            article_id=hit.get('article_id'),
+        )
+    except Exception:
+        logger.warning("Anlık ziyaretçi sayacı güncellenemedi.", exc_info=True)
+
+
+def get_realtime_stats(site_id, top_window=ONLINE_WINDOW, top=10):
+    """
+    Sitenin anlık ziyaret istatistiklerini döner.
+
+    Returns:
+        dict: `windows` (pencere -> {'hits', 'visitors'}), `online_visitors` (son 5 dakikadaki tekil ziyaretçi)
+            ve `top_articles` (`top_window` penceresinde en çok ziyaret edilen `(article_id, hits)` çiftleri).
+    """
+    if top_window not in WINDOWS:
+        raise ValueError(f"Geçersiz pencere: {top_window}")
+    windows, top_articles = get_realtime_counter().snapshot(site_id, top_window=top_window, top=top)
+    return {
+        'windows': windows,
+        'online_visitors': windows[ONLINE_WINDOW]['visitors'],
+        'top_articles': top_articles,
+    }
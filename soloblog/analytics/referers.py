@@ -0,0 +1,238 @@
+# soloblog/analytics/referers.py
+"""
+Yönlendiren (referer) URL'lerin normalize edilmesi, sözlük tablosuna (RefererSource) bir kez yazılması (interning)
+ve site başına günlük en çok ziyaret getiren kaynakların (top-K) artımlı olarak tutulması.
+
+URL'ler alan adı + yol olarak gruplanır: alan adı küçük harfe çevrilir, "www." öneki, port, sorgu parametreleri
+ve parça (#) atılır; böylece `https://www.google.com/search?q=a` ve `http://google.com/search?q=b` aynı kaynağa
+sayılır. Günlük sayımlar rollup işlemiyle aynı transaction içinde güncellenir. Kapanan günlerde sadece en çok
+ziyaret getiren K kaynak saklanır; herhangi bir tarih aralığının sıralaması bu günlük listeler toplanarak üretilir.
+"""
+import re
+import threading
+from collections import Counter
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from common.utils.ttl_cache import TTLCache
+from soloblog.analytics.uniques import period_start, visit_day
+from soloblog.models import AnalyticsWatermark, RefererDailyCount, RefererSource
+
+REFERER_TRIM_WATERMARK_NAME = 'referer_topk'
+
+DEFAULTS = {
+    'TOP_K': 100,  # Kapanan günlerde site başına saklanacak kaynak sayısı
+    'CACHE_SIZE': 50000,  # Süreç başına önbellekte tutulacak (alan adı, yol) -> ID eşleşmesi
+    'STORE_RAW_URL': True,  # False ise ham URL VisitorAnalytics.referer alanına yazılmaz
+}
+
+DOMAIN_MAX_LENGTH = RefererSource._meta.get_field('domain').max_length
+PATH_MAX_LENGTH = RefererSource._meta.get_field('path').max_length
+LOOKUP_CHUNK_SIZE = 200
+
+_REPEATED_SLASHES = re.compile(r'/{2,}')
+_HAS_NETLOC = re.compile(r'^([a-zA-Z][a-zA-Z0-9+.-]*:)?//')
+
+
+def get_referer_settings():
+    """
+    Varsayılan değerlerle birleştirilmiş referer ayarlarını döner.
+    """
+    return {**DEFAULTS, **getattr(settings, 'VISITOR_REFERERS', {})}
+
+
+def normalize_referer(url):
+    """
+    URL'yi `(alan adı, yol)` çiftine çevirir. Boş veya çözümlenemeyen URL'ler için None döner.
+    """
+    if not url:
+        return None
+    url = url.strip()
+    if not _HAS_NETLOC.match(url):
+        url = '//' + url
+    try:
+        parts = urlsplit(url)
+        host = parts.hostname
+    except ValueError:
+        return None
+    host = (host or '').rstrip('.')
+    if not host:
+        return None
+    if host.startswith('www.'):
+        host = host[4:]
+    path = _REPEATED_SLASHES.sub('/', parts.path).rstrip('/')
+    return host[:DOMAIN_MAX_LENGTH], path[:PATH_MAX_LENGTH]
+
+
+def referer_label(domain, path):
+    return f"{domain}{path}"
+
+
+class RefererInterner:
+    """
+    `(alan adı, yol)` çiftlerini RefererSource ID'lerine çevirir; olmayanları toplu olarak oluşturur.
+    Sonuçlar süreç içi LRU önbellekte tutulur, böylece sık görülen kaynaklar için veritabanına gidilmez.
+    """
+
+    def __init__(self, max_size=DEFAULTS['CACHE_SIZE']):
+        self.cache = TTLCache(max_size=max_size)
+
+    def resolve(self, keys):
+        """
+        Returns:
+            dict: `(alan adı, yol) -> RefererSource ID`.
+        """
+        resolved = {}
+        missing = set()
+        for key in set(keys):
+            source_id = self.cache.get(key)
+            if source_id is None:
+                missing.add(key)
+            else:
+                resolved[key] = source_id
+        if not missing:
+            return resolved
+
+        found = self._lookup(missing)
+        new = missing - found.keys()
+        if new:
+            # Aynı anda başka bir süreç de oluşturabilir; çakışmalar yok sayılıp ID'ler yeniden okunur
+            RefererSource.objects.bulk_create(
+                [RefererSource(domain=domain, path=path) for domain, path in new],
+                ignore_conflicts=True,
+                batch_size=500,
+            )
+            found.update(self._lookup(new))
+
+        resolved.update(found)
+        # Transaction geri alınırsa önbellekte var olmayan ID'ler kalmaması için commit sonrasında önbelleğe yazılır
+        transaction.on_commit(lambda: self._remember(found))
+        return resolved
+
+    def _remember(self, found):
+        for key, source_id in found.items():
+            self.cache.set(key, source_id)
+
+    @staticmethod
+    def _lookup(keys):
+        keys = list(keys)
+        found = {}
+        for start in range(0, len(keys), LOOKUP_CHUNK_SIZE):
+            condition = Q()
+            for domain, path in keys[start:start + LOOKUP_CHUNK_SIZE]:
+                condition |= Q(domain=domain, path=path)
+            for source_id, domain, path in RefererSource.objects.filter(condition).values_list('id', 'domain', 'path'):
+                found[(domain, path)] = source_id
+        return found
+
+
+_interner = None
+_interner_lock = threading.Lock()
+
+
+def get_referer_interner():
+    """
+    Süreç genelinde paylaşılan RefererInterner örneğini döner.
+    """
+    global _interner
+    if _interner is None:
+        with _interner_lock:
+            if _interner is None:
+                _interner = RefererInterner(max_size=get_referer_settings()['CACHE_SIZE'])
+    return _interner
+
+
+def build_referer_counts(rows):
+    """
+    `(site_id, visit_date, referer_source_id, referer)` satırlarından `(site_id, gün, kaynak ID) -> sayı` üretir.
+    Kaynağı atanmamış (ör. eski veya doğrudan API ile yazılmış) kayıtların URL'leri bu sırada normalize edilir.
+    Kaynak ID'si None olan anahtarlar doğrudan ziyaretlerdir.
+    """
+    rows = list(rows)
+    keys = {}
+    for _, _, source_id, referer in rows:
+        if source_id is None and referer and referer not in keys:
+            keys[referer] = normalize_referer(referer)
+    resolved = get_referer_interner().resolve(key for key in keys.values() if key is not None)
+
+    counts = Counter()
+    for site_id, visit_date, source_id, referer in rows:
+        if source_id is None and referer:
+            key = keys[referer]
+            source_id = resolved[key] if key is not None else None
+        counts[(site_id, visit_day(visit_date), source_id)] += 1
+    return counts
+
+
+def merge_referer_counts(counts):
+    """
+    Günlük sayımları mevcut satırlara ekler, olmayanları toplu olarak oluşturur.
+    Çağıran tarafın transaction içinde olması beklenir.
+    """
+    if not counts:
+        return
+
+    site_ids = {site_id for site_id, _, _ in counts}
+    days = {day for _, day, _ in counts}
+    existing = {
+        (row.site_id, row.day, row.source_id): row
+        for row in RefererDailyCount.objects.filter(site_id__in=site_ids, day__in=days)
+    }
+
+    now = timezone.now()
+    to_update = []
+    to_create = []
+    for (site_id, day, source_id), delta in counts.items():
+        row = existing.get((site_id, day, source_id))
+        if row is not None:
+            row.count += delta
+            row.updatedAt = now
+            to_update.append(row)
+        else:
+            to_create.append(RefererDailyCount(site_id=site_id, day=day, source_id=source_id, count=delta))
+
+    RefererDailyCount.objects.bulk_update(to_update, ['count', 'updatedAt'], batch_size=1000)
+    RefererDailyCount.objects.bulk_create(to_create, batch_size=1000)
+
+
+def trim_closed_days(closed_before, touched_days=(), top_k=None):
+    """
+    `closed_before` gününden önceki (artık yeni kayıt beklenmeyen) günlerde site başına en çok ziyaret getiren
+    `top_k` kaynak dışındaki satırları siler. Doğrudan ziyaret satırı her zaman saklanır.
+
+    Daha önce kırpılmış günler tekrar taranmaz; sadece yeni kapanan günler ve geç gelen kayıtların dokunduğu
+    günler (`touched_days`) işlenir. Çağıran tarafın transaction içinde olması beklenir.
+
+    Returns:
+        int: Silinen satır sayısı.
+    """
+    top_k = get_referer_settings()['TOP_K'] if top_k is None else top_k
+    watermark, _ = AnalyticsWatermark.objects.select_for_update().get_or_create(name=REFERER_TRIM_WATERMARK_NAME)
+    trimmed_until = visit_day(watermark.lastVisitDate) if watermark.lastVisitDate else None
+
+    days = {day for day in touched_days if day < closed_before}
+    if trimmed_until is None or trimmed_until < closed_before:
+        newly_closed = RefererDailyCount.objects.filter(day__lt=closed_before)
+        if trimmed_until is not None:
+            newly_closed = newly_closed.filter(day__gte=trimmed_until)
+        days.update(newly_closed.values_list('day', flat=True).distinct())
+
+    deleted = 0
+    if days:
+        crowded = RefererDailyCount.objects.filter(
+            day__in=days, source__isnull=False
+        ).values('site_id', 'day').annotate(total=Count('id')).filter(total__gt=top_k)
+        for group in crowded:
+            surplus = list(RefererDailyCount.objects.filter(
+                site_id=group['site_id'], day=group['day'], source__isnull=False
+            ).order_by('-count', 'id').values_list('id', flat=True)[top_k:])
+            deleted += RefererDailyCount.objects.filter(id__in=surplus).delete()[0]
+
+    if trimmed_until is None or trimmed_until < closed_before:
+        watermark.lastVisitDate = period_start(closed_before, 'daily')
+        watermark.save(update_fields=['lastVisitDate', 'updatedAt'])
+    return deleted
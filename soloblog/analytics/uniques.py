@@ -0,0 +1,164 @@
+# soloblog/analytics/uniques.py
+"""
+Site başına günlük tekil ziyaretçi taslaklarının (HyperLogLog) oluşturulması ve birleştirilmesi.
+
+Ziyaretçi kimliği IP adresi ile User-Agent metninin birleşimidir. Taslaklar rollup işlemiyle aynı transaction
+içinde güncellenir; böylece rollup işaretçisine kadar olan tüm kayıtlar taslaklara da işlenmiş olur.
+"""
+import datetime
+
+from django.utils import timezone
+
+from soloblog.analytics.hyperloglog import HyperLogLog
+from soloblog.models import VisitorUniqueSketch
+
+# Tekil ziyaretçi raporunda desteklenen zaman dilimleri (taslaklar günlük tutulduğu için saatlik yoktur)
+UNIQUE_TIME_FRAMES = ('daily', 'weekly', 'monthly', 'yearly')
+
+
+def visitor_key(ip_address, user_agent):
+    return f"{ip_address}|{user_agent or ''}"
+
+
+def visit_day(visit_date):
+    """
+    Ziyaret tarihinin UTC gününü döner.
+    """
+    return visit_date.astimezone(datetime.timezone.utc).date()
+
+
+def period_start(day, time_frame):
+    """
+    Günün ilgili rapor dönemindeki başlangıcını (UTC, datetime) döner. Haftalar pazartesi başlar.
+    """
+    if time_frame == 'weekly':
+        day = day - datetime.timedelta(days=day.weekday())
+    elif time_frame == 'monthly':
+        day = day.replace(day=1)
+    elif time_frame == 'yearly':
+        day = day.replace(month=1, day=1)
+    elif time_frame != 'daily':
+        raise ValueError(f"Geçersiz zaman dilimi: {time_frame}")
+    return datetime.datetime(day.year, day.month, day.day, tzinfo=datetime.timezone.utc)
+
+
+def build_day_sketches(rows):
+    """
+    `(site_id, visit_date, ip_address, user_agent)` satırlarından `(site_id, gün) -> HyperLogLog` sözlüğü üretir.
+    """
+    sketches = {}
+    for site_id, visit_date, ip_address, user_agent in rows:
+        key = (site_id, visit_day(visit_date))
+        sketch = sketches.get(key)
+        if sketch is None:
+            sketch = sketches[key] = HyperLogLog()
+        sketch.add(visitor_key(ip_address, user_agent))
+    return sketches
+
+
+def merge_day_sketches(sketches):
+    """
+    Yeni taslakları veritabanındaki günlük taslaklarla birleştirir; olmayanları oluşturur.
+    Çağıran tarafın transaction içinde olması beklenir.
+    """
+    if not sketches:
+        return
+
+    site_ids = {site_id for site_id, _ in sketches}
+    days = {day for _, day in sketches}
+    existing = {
+        (sketch.site_id, sketch.day): sketch
+        for sketch in VisitorUniqueSketch.objects.filter(site_id__in=site_ids, day__in=days)
+    }
+
+    now = timezone.now()
+    to_update = []
+    to_create = []
+    for (site_id, day), sketch in sketches.items():
+        stored = existing.get((site_id, day))
+        if stored is not None:
+            stored.registers = HyperLogLog.from_bytes(stored.registers).update(sketch).to_bytes()
+            stored.updatedAt = now
+            to_update.append(stored)
+        else:
+            to_create.append(VisitorUniqueSketch(site_id=site_id, day=day, registers=sketch.to_bytes()))
+
+    VisitorUniqueSketch.objects.bulk_update(to_update, ['registers', 'updatedAt'], batch_size=500)
+    VisitorUniqueSketch.objects.bulk_create(to_create, batch_size=500)
+
+
+def iter_day_sketches(site_ids=None, since=None):
+    """
+    Günlük taslakları `(site_id, gün, HyperLogLog)` olarak sırayla okur; bellekte sıkıştırılmamış olarak yalnızca
+    o anki taslak tutulur.
+
+    Args:
+        site_ids (list): Sadece bu sitelerin taslakları (None ise tüm siteler).
+        since (date): Bu günden (dahil) itibaren.
+    """
+    sketches = VisitorUniqueSketch.objects.all()
+    if site_ids is not None:
+        sketches = sketches.filter(site_id__in=site_ids)
+    if since is not None:
+        sketches = sketches.filter(day__gte=since)
+    for site_id, day, registers in sketches.values_list('site_id', 'day', 'registers').iterator(chunk_size=500):
+        yield site_id, day, HyperLogLog.from_bytes(registers)
+
+
+class PeriodSketches:
+    """
+    Günlük taslakları tek geçişte birden fazla rapor dönemine (ve istenirse tüm sitelerin birleşimine) dağıtır.
+    Böylece aynı istekteki günlük / haftalık / aylık / yıllık raporlar için taslaklar bir kez okunur.
+    """
+
+    def __init__(self, time_frames, start=None, per_site=True, combined=False):
+        """
+        Args:
+            time_frames (list): UNIQUE_TIME_FRAMES içindeki zaman dilimleri.
+            start (datetime): Her zaman diliminde bu tarihin dahil olduğu dönemden itibaren.
+            per_site (bool): Site bazlı dönemler tutulsun mu?
+            combined (bool): Sitelerin birleşiminden oluşan dönemler tutulsun mu?
+        """
+        self.starts = {
+            time_frame: period_start(visit_day(start), time_frame) if start is not None else None
+            for time_frame in time_frames
+        }
+        self.merged = {
+            (time_frame, is_combined): {}
+            for time_frame in time_frames
+            for is_combined, enabled in ((False, per_site), (True, combined)) if enabled
+        }
+
+    @property
+    def earliest_start(self):
+        """
+        Okunması gereken ilk gün: en geniş zaman diliminin başlangıcı (başlangıç verilmediyse None).
+        """
+        starts = [value for value in self.starts.values() if value is not None]
+        return min(starts).date() if len(starts) == len(self.starts) and starts else None
+
+    def add(self, site_id, day, sketch):
+        """
+        Günlük taslağı ilgili tüm dönemlere ekler; verilen taslak değiştirilmez.
+        """
+        for (time_frame, is_combined), merged in self.merged.items():
+            period = period_start(day, time_frame)
+            start = self.starts[time_frame]
+            if start is not None and period < start:
+                continue
+            key = (None if is_combined else site_id, period)
+            if key in merged:
+                merged[key].update(sketch)
+            else:
+                merged[key] = HyperLogLog(sketch.registers)
+
+    def report(self, time_frame, combined=False):
+        """
+        Returns:
+            list: Döneme göre sıralı `{'site_id', 'period', 'count'}` sözlükleri (combined ise `site_id` None).
+        """
+        merged = self.merged[(time_frame, combined)]
+        return [
+            {'site_id': site_id, 'period': period, 'count': sketch.count()}
+            for (site_id, period), sketch in sorted(merged.items(), key=lambda item: (item[0][1], item[0][0] or 0))
+        ]
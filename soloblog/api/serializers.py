@@ -1,9 +1,14 @@
 from django.utils.formats import date_format
 from rest_framework import serializers
 
-from common.base_serializer import BaseOnlyDateSerializer
-from soloblog.models import Category, Article, Image, Comment, PopupAd, Advertisement, VisitorAnalytics, SiteSettings, \
-    FooterSettings, Menu, HomePageSettings
+from common.base_serializer import BaseDateTimeSerializer, BaseOnlyDateSerializer
+from soloblog.analytics.article_counters import get_pending_views
+from soloblog.importer import detect_format
+from soloblog.models import ArticleImportJob, Category, Article, Image, Comment, PopupAd, Advertisement, \
+    VisitorAnalytics, SiteSettings, FooterSettings, Menu, HomePageSettings
+from soloblog.moderation import get_moderation_settings
+from soloblog.renditions import get_rendition_settings, rendition_urls
+from soloblog.search import article_headline
 
 
 class VisitorAnalyticsSerializer(serializers.ModelSerializer):
@@ -14,7 +19,26 @@ class VisitorAnalyticsSerializer(serializers.ModelSerializer):
             'visit_date', 'country', 'city', 'device_type', 'operating_system',
             'browser', 'session_duration', 'is_bounce', 'createdAt', 'updatedAt'
         ]
-        read_only_fields = ['id', 'is_bounce', 'createdAt', 'updatedAt']
+        read_only_fields = ['id', 'visit_date', 'is_bounce', 'createdAt', 'updatedAt']
+
+
+class VisitorHitSerializer(serializers.Serializer):
+    """
+    Tampona alınacak tek bir ziyaret (hit) kaydı. Veritabanı sorgusu yapmamak için ilişkiler ID olarak alınır;
+    geçersiz ID'li kayıtlar yazma anında atlanır.
+    """
+    site = serializers.IntegerField(source='site_id', min_value=1)
+    visit_type = serializers.ChoiceField(choices=VisitorAnalytics.VISIT_TYPE_CHOICES)
+    article = serializers.IntegerField(source='article_id', min_value=1, required=False, allow_null=True)
+    ip_address = serializers.IPAddressField(required=False)
+    user_agent = serializers.CharField(required=False, allow_blank=True)
+    referer = serializers.URLField(max_length=200, required=False, allow_null=True, allow_blank=True)
+    country = serializers.CharField(max_length=100, required=False, allow_null=True)
+    city = serializers.CharField(max_length=100, required=False, allow_null=True)
+    device_type = serializers.CharField(max_length=50, required=False, allow_null=True)
+    operating_system = serializers.CharField(max_length=50, required=False, allow_null=True)
+    browser = serializers.CharField(max_length=50, required=False, allow_null=True)
+    session_duration = serializers.IntegerField(min_value=0, required=False, allow_null=True)
 
 
 class AdvertisementSerializer(serializers.ModelSerializer):
@@ -45,13 +69,83 @@ class CommentSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'ip', 'createdAt', 'updatedAt', 'site']
 
 
+class CommentBulkModerationSerializer(serializers.Serializer):
+    """
+    Toplu onay / ret isteği: yorum ID'leri.
+    """
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=get_moderation_settings()['MAX_BULK_IDS'],
+    )
+
+
 class ImageSerializer(serializers.ModelSerializer):
+    """
+    Resim ve hazır türevleri. Türevler arka planda üretildiğinden yeni yüklenen resimlerde `renditions` boş
+    olabilir; `resizedImage` eski kayıtlarda dosya alanından, yenilerde `LEGACY_RENDITION` türevinden gelir.
+    """
+    renditions = serializers.SerializerMethodField()
+
     class Meta:
         model = Image
         fields = [
-            'id', 'site', 'article', 'imagePath', 'resizedImage', 'createdAt', 'updatedAt'
+            'id', 'site', 'article', 'imagePath', 'resizedImage', 'renditions', 'contentHash', 'createdAt',
+            'updatedAt'
         ]
-        read_only_fields = ['id', 'resizedImage', 'createdAt', 'updatedAt']
+        read_only_fields = ['id', 'resizedImage', 'contentHash', 'createdAt', 'updatedAt']
+
+    def get_renditions(self, obj):
+        return rendition_urls(obj)
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        if not data.get('resizedImage'):
+            name, fmt = get_rendition_settings()['LEGACY_RENDITION']
+            legacy = data['renditions'].get(name, {}).get(fmt)
+            if legacy:
+                request = self.context.get('request')
+                data['resizedImage'] = request.build_absolute_uri(legacy['url']) if request else legacy['url']
+        return data
+
+
+class ArticleImportJobSerializer(BaseDateTimeSerializer):
+    """
+    Toplu makale içe aktarma işi. Yalnızca kaynak dosya ve varsayılan kategori yazılabilir;
+    diğer alanlar işin ilerleme durumunu gösterir.
+    """
+    progress = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ArticleImportJob
+        fields = [
+            'id', 'site', 'sourceFile', 'sourceFormat', 'defaultCategory', 'status', 'progress',
+            'processedRecords', 'importedArticles', 'importedComments', 'importedImages', 'skippedRecords',
+            'processedImages', 'failedImages', 'errors', 'lastError', 'startedAt', 'finishedAt',
+            'createdAt', 'updatedAt'
+        ]
+        read_only_fields = [field for field in fields if field not in ('sourceFile', 'defaultCategory')]
+
+    def get_progress(self, obj):
+        """
+        Resim aşamasında işlenen resim oranı (0-1); kayıt aşamasında toplam kayıt bilinmediğinden None.
+        """
+        if obj.status == 'completed':
+            return 1.0
+        if obj.status == 'processing_images' and obj.importedImages:
+            return round((obj.processedImages + obj.failedImages) / obj.importedImages, 4)
+        return None
+
+    def validate_sourceFile(self, value):
+        if detect_format(value.name) is None:
+            raise serializers.ValidationError("Dosya .ndjson, .jsonl veya .zip uzantılı olmalıdır.")
+        return value
+
+    def validate_defaultCategory(self, value):
+        request = self.context.get('request')
+        if value is not None and request is not None and value.site_id != request.user.selectedSite_id:
+            raise serializers.ValidationError("Kategori seçili siteye ait değil.")
+        return value
 
 
 class ChildCategorySerializer(serializers.ModelSerializer):
@@ -70,23 +164,45 @@ class CategorySerializer(serializers.ModelSerializer):
         fields = [
             'id', 'site', 'categoryName', 'categoryDescription', 'slug',
             'meta', 'metaDescription', 'parent', 'children', 'order',
-            'categoryImage', 'createdAt', 'updatedAt'
+            'categoryImage', 'path', 'depth', 'createdAt', 'updatedAt'
         ]
-        read_only_fields = ['id', 'children', 'createdAt', 'updatedAt', 'site']
+        read_only_fields = ['id', 'children', 'path', 'depth', 'createdAt', 'updatedAt', 'site']
+
+
+class CategoryReorderSerializer(serializers.Serializer):
+    """
+    Toplu sıralama isteği: kategori ID'leri yeni sırasıyla.
+    """
+    order = serializers.ListField(child=serializers.IntegerField(min_value=1), allow_empty=False)
+
+
+class ArticleListSerializer(serializers.ListSerializer):
+    """
+    Liste yanıtlarında tüm makalelerin bekleyen okunma sayılarını tek seferde okur.
+    """
+
+    def to_representation(self, data):
+        items = list(data.all() if hasattr(data, 'all') else data)
+        self.child.context['pending_views'] = get_pending_views([item.pk for item in items])
+        return super().to_representation(items)
 
 
 class ArticleSerializer(BaseOnlyDateSerializer):
     category_name = serializers.CharField(source='category.categoryName', read_only=True)
     category_slug = serializers.CharField(source='category.slug', read_only=True)
+    averageRating = serializers.FloatField(read_only=True)
 
     class Meta:
         model = Article
         fields = [
             'id', 'site', 'category', 'category_name', 'category_slug', 'title', 'content',
-            'featured', 'slider', 'active', 'slug', 'counter', 'meta', 'metaDescription',
-            'publicationDate', 'image', 'createdAt', 'updatedAt'
+            'featured', 'slider', 'active', 'slug', 'counter', 'approvedCommentCount', 'averageRating', 'meta',
+            'metaDescription', 'publicationDate', 'image', 'language', 'createdAt', 'updatedAt'
+        ]
+        read_only_fields = [
+            'id', 'counter', 'approvedCommentCount', 'createdAt', 'updatedAt', 'publicationDate', 'site'
         ]
-        read_only_fields = ['id', 'counter', 'createdAt', 'updatedAt', 'publicationDate', 'site']
+        list_serializer_class = ArticleListSerializer
 
     # Örnek: Alan bazlı validasyon
     def validate_title(self, value):
@@ -118,6 +234,16 @@ class ArticleSerializer(BaseOnlyDateSerializer):
             # Tarihi Python ile elle formatla (gün ve ay 2 basamak olacak)
             # representation['publicationDate'] = publication_date_value.strftime('%d.%m.%Y')
             representation['publicationDate'] = publication_date_value.isoformat()
+        if 'counter' in representation:
+            # Henüz veritabanına yazılmamış okunmalar sayaca eklenir
+            pending = self.context.get('pending_views')
+            if pending is None:
+                pending = get_pending_views([instance.pk])
+            representation['counter'] = (representation['counter'] or 0) + pending.get(instance.pk, 0)
+        if hasattr(instance, 'search_rank'):
+            # Tam metin arama sonuçlarında ilgi skoru ve vurgulanmış özet
+            representation['search_rank'] = instance.search_rank
+            representation['search_headline'] = article_headline(instance)
         return representation
 
 
@@ -4,11 +4,13 @@ from rest_framework.routers import DefaultRouter
 from soloblog.api.views import SiteDetailedReportAPIView, SiteRefererAPIView, SiteTrafficAPIView, \
     AllSitesVisitorStatsAPIView, CategoryViewSet, ArticleViewSet, ImageViewSet, CommentViewSet, PopupAdViewSet, \
     AdvertisementViewSet, VisitorAnalyticsViewSet, HomePageSettingsViewSet, FooterSettingsViewSet, MenuViewSet, \
-    SiteSettingsViewSet
+    SiteSettingsViewSet, SiteRealtimeAPIView, ArticleImportJobViewSet, SiteBootstrapAPIView, \
+    SitePageAPIView
 
 router = DefaultRouter()
 router.register(r'category', CategoryViewSet, basename='category')
 router.register(r'article', ArticleViewSet, basename='article')
+router.register(r'article-import', ArticleImportJobViewSet, basename='article-import')
 router.register(r'image', ImageViewSet, basename='image')
 router.register(r'comment', CommentViewSet, basename='comment')
 router.register(r'popupad', PopupAdViewSet, basename='popup-ad')
@@ -25,4 +27,15 @@ urlpatterns = [
     path('sites/<int:site_id>/referer-report/', SiteRefererAPIView.as_view(), name='site_referer_report'),
     path('sites/<int:site_id>/traffic-report/', SiteTrafficAPIView.as_view(), name='site_traffic_report'),
     path('sites/visitor-stats/', AllSitesVisitorStatsAPIView.as_view(), name='all_sites_visitor_stats'),
+    path('sites/<int:site_id>/realtime/', SiteRealtimeAPIView.as_view(), name='site_realtime'),
+    path('sites/<int:site_id>/bootstrap/', SiteBootstrapAPIView.as_view(), name='site_bootstrap'),
+    path('bootstrap/', SiteBootstrapAPIView.as_view(), name='bootstrap'),
+    path('sites/<int:site_id>/pages/home/', SitePageAPIView.as_view(page_type='home'), name='site_page_home'),
+    path('sites/<int:site_id>/pages/category/<str:slug>/', SitePageAPIView.as_view(page_type='category'),
+         name='site_page_category'),
+    path('sites/<int:site_id>/pages/article/<str:slug>/', SitePageAPIView.as_view(page_type='article'),
+         name='site_page_article'),
+    path('pages/home/', SitePageAPIView.as_view(page_type='home'), name='page_home'),
+    path('pages/category/<str:slug>/', SitePageAPIView.as_view(page_type='category'), name='page_category'),
+    path('pages/article/<str:slug>/', SitePageAPIView.as_view(page_type='article'), name='page_article'),
 ]
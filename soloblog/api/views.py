@@ -1,39 +1,62 @@
-from datetime import datetime, timedelta
+from datetime import timedelta
 
 from django.contrib.sites.models import Site
-from django.db.models import Count
-from django.db.models.functions import TruncDay, TruncWeek, TruncMonth, TruncYear
+from django.http import HttpResponse, HttpResponseNotModified, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from django.utils.cache import patch_cache_control
+from django.utils.dateparse import parse_date
+from django.utils.http import parse_etags
 from django_filters.rest_framework import DjangoFilterBackend
 from drf_yasg import openapi
-from drf_yasg.utils import swagger_auto_schema
+from drf_yasg.utils import no_body, swagger_auto_schema
 from rest_framework import status
+from rest_framework.decorators import action
 from rest_framework.exceptions import ValidationError
 from rest_framework.filters import SearchFilter, OrderingFilter
+from rest_framework.parsers import FormParser, MultiPartParser
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.viewsets import ModelViewSet
 
 from common.base_views import AbstractBaseViewSet
-from common.utils import paginate_or_default
-from soloblog.models import VisitorAnalytics, Category, Article, Image, Comment, PopupAd, Advertisement, SiteSettings, \
-    FooterSettings, Menu, HomePageSettings
-from .serializers import CategorySerializer, ArticleSerializer, ImageSerializer, CommentSerializer, PopupAdSerializer, \
-    AdvertisementSerializer, VisitorAnalyticsSerializer, SiteSettingsSerializer, HomePageSettingsSerializer, \
-    FooterSettingsSerializer, MenuSerializer
-
-
-class VisitorAnalyticsViewSet(ModelViewSet):
+from common.pagination import KeysetPagination, KeysetPaginationMixin
+from common.utils import paginate_or_default, UserInfoExtractor
+from soloblog.analytics.ingestion import BufferFull, record_hit
+from soloblog.analytics.export import EXPORT_FORMATS, filter_visitor_analytics, stream_export
+from soloblog.analytics.hyperloglog import STANDARD_ERROR
+from soloblog.analytics.realtime import ONLINE_WINDOW, WINDOWS as REALTIME_WINDOWS, get_realtime_stats
+from soloblog.analytics.rollups import ROLLUP_DIMENSIONS, get_referer_report, get_rollup_report, get_unique_report, \
+    get_unique_sketches
+from soloblog.analytics.uniques import period_start
+from soloblog.bootstrap import get_bootstrap_settings, get_site_bootstrap
+from soloblog.category_tree import get_ancestors, get_category_tree, get_descendants, reorder_categories
+from soloblog.importer import detect_format, is_resumable as is_import_resumable, start_import
+from soloblog.models import VisitorAnalytics, Category, Article, ArticleImportJob, Image, Comment, PopupAd, \
+    Advertisement, SiteSettings, FooterSettings, Menu, HomePageSettings
+from soloblog.moderation import approve_comments, get_moderation_settings, pending_comments, reject_comments
+from soloblog.page_cache import get_page
+from soloblog.search import search_articles
+from .serializers import ArticleImportJobSerializer, CategoryReorderSerializer, CommentBulkModerationSerializer, \
+    CategorySerializer, ArticleSerializer, ImageSerializer, CommentSerializer, PopupAdSerializer, \
+    AdvertisementSerializer, VisitorAnalyticsSerializer, VisitorHitSerializer, SiteSettingsSerializer, \
+    HomePageSettingsSerializer, FooterSettingsSerializer, MenuSerializer
+
+
+class VisitorAnalyticsViewSet(KeysetPaginationMixin, ModelViewSet):
     """
     Ziyaretçi istatistikleri için CRUD işlemleri:
 
     - Ziyaretçi kayıtlarını listele.
     - Yeni bir ziyaretçi kaydı oluştur.
     - Ziyaretçi kaydını görüntüle, güncelle veya sil.
+    - `?pagination=cursor` ile derin sayfalarda da sabit sürede çalışan keyset (cursor) sayfalama kullanılabilir.
     """
     queryset = VisitorAnalytics.objects.order_by('createdAt').all()
     serializer_class = VisitorAnalyticsSerializer
+    # Kayıtlar artan ID ile eklendiğinden ID sırası ekleme sırasıdır ve birincil anahtar indeksi kullanılır
+    keyset_ordering = ('id',)
 
     @swagger_auto_schema(
         operation_description="Site, ziyaret türü veya tarih bazında filtreleme yapmak için parametreleri kullanabilirsiniz.",
@@ -50,6 +73,15 @@ class VisitorAnalyticsViewSet(ModelViewSet):
             ),
             openapi.Parameter(
                 'end_date', openapi.IN_QUERY, description="Bitiş tarihi (YYYY-MM-DD)", type=openapi.TYPE_STRING
+            ),
+            openapi.Parameter(
+                'pagination', openapi.IN_QUERY,
+                description="'cursor' verilirse toplam sayı hesaplanmadan keyset (cursor) sayfalama kullanılır",
+                type=openapi.TYPE_STRING
+            ),
+            openapi.Parameter(
+                'cursor', openapi.IN_QUERY, description="Bir önceki yanıttaki `next` bağlantısından gelen cursor",
+                type=openapi.TYPE_STRING
             )
         ]
     )
@@ -57,19 +89,7 @@ class VisitorAnalyticsViewSet(ModelViewSet):
         """
         Ziyaretçi kayıtlarını listeleme. Opsiyonel olarak site, ziyaret türü ve tarih aralığına göre filtreleme yapılabilir.
         """
-        site_id = self.request.query_params.get('site_id')
-        visit_type = self.request.query_params.get('visit_type')
-        start_date = self.request.query_params.get('start_date')
-        end_date = self.request.query_params.get('end_date')
-
-        queryset = self.get_queryset()
-
-        if site_id:
-            queryset = queryset.filter(site_id=site_id)
-        if visit_type:
-            queryset = queryset.filter(visit_type=visit_type)
-        if start_date and end_date:
-            queryset = queryset.filter(visit_date__range=[start_date, end_date])
+        queryset = self._filter_queryset_by_params(self.get_queryset())
 
         # Sayfalama işlemi
         page = self.paginate_queryset(queryset)
@@ -87,6 +107,107 @@ class VisitorAnalyticsViewSet(ModelViewSet):
         visitor.delete()
         return Response(status=204)
 
+    def _filter_queryset_by_params(self, queryset):
+        """
+        Liste ve dışa aktarma servislerinde ortak kullanılan site, ziyaret türü ve tarih aralığı filtreleri.
+        """
+        params = self.request.query_params
+        return filter_visitor_analytics(
+            queryset,
+            site_id=params.get('site_id'),
+            visit_type=params.get('visit_type'),
+            start_date=params.get('start_date'),
+            end_date=params.get('end_date'),
+        )
+
+    @swagger_auto_schema(
+        operation_description=(
+            "Ziyaretçi kayıtlarını CSV veya NDJSON olarak akış halinde dışa aktarır. "
+            "Liste servisiyle aynı filtreler kullanılır; bellek kullanımı tarih aralığından bağımsızdır."
+        ),
+        manual_parameters=[
+            openapi.Parameter(
+                'site_id', openapi.IN_QUERY, description="Site ID'sine göre filtreleme", type=openapi.TYPE_INTEGER
+            ),
+            openapi.Parameter(
+                'visit_type', openapi.IN_QUERY,
+                description="Ziyaret türüne göre filtreleme ('homepage' veya 'article')", type=openapi.TYPE_STRING
+            ),
+            openapi.Parameter(
+                'start_date', openapi.IN_QUERY, description="Başlangıç tarihi (YYYY-MM-DD)", type=openapi.TYPE_STRING
+            ),
+            openapi.Parameter(
+                'end_date', openapi.IN_QUERY, description="Bitiş tarihi (YYYY-MM-DD)", type=openapi.TYPE_STRING
+            ),
+            openapi.Parameter(
+                'file_format', openapi.IN_QUERY, description="Dosya formatı: 'csv' (varsayılan) veya 'ndjson'",
+                type=openapi.TYPE_STRING
+            ),
+            openapi.Parameter(
+                'gzip', openapi.IN_QUERY, description="'true' ise dosya gzip ile sıkıştırılır", type=openapi.TYPE_BOOLEAN
+            ),
+        ],
+        responses={200: "Dosya akışı", 400: "Geçersiz format"}
+    )
+    @action(detail=False, methods=['get'], url_path='export')
+    def export(self, request):
+        """
+        Filtrelenmiş ziyaretçi kayıtlarını StreamingHttpResponse ile dışa aktarır.
+        """
+        file_format = request.query_params.get('file_format', 'csv')
+        if file_format not in EXPORT_FORMATS:
+            return Response(
+                {"error": "Geçersiz format. Sadece 'csv' veya 'ndjson' kabul edilir."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        use_gzip = request.query_params.get('gzip', '').lower() == 'true'
+
+        queryset = self._filter_queryset_by_params(VisitorAnalytics.objects.all())
+        filename = f"visitor-analytics-{timezone.now():%Y%m%d%H%M%S}.{file_format}"
+        content_type = 'text/csv; charset=utf-8' if file_format == 'csv' else 'application/x-ndjson; charset=utf-8'
+        if use_gzip:
+            filename += '.gz'
+            content_type = 'application/gzip'
+
+        response = StreamingHttpResponse(
+            stream_export(queryset, file_format=file_format, gzip=use_gzip),
+            content_type=content_type
+        )
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+    @swagger_auto_schema(
+        operation_description=(
+            "Ziyaret kaydını tampona ekler; kayıt arka planda toplu olarak veritabanına yazılır. "
+            "IP adresi ve tarayıcı bilgisi gönderilmezse istekten alınır."
+        ),
+        request_body=VisitorHitSerializer,
+        responses={202: "Kayıt kuyruğa alındı", 503: "Tampon dolu, daha sonra tekrar deneyin"}
+    )
+    @action(detail=False, methods=['post'], url_path='hit')
+    def hit(self, request):
+        """
+        Ziyaret kaydını tamponlu ingestion hattına ekler.
+        """
+        serializer = VisitorHitSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        hit = dict(serializer.validated_data)
+
+        if not hit.get('ip_address') or not hit.get('user_agent'):
+            user_info = UserInfoExtractor.get_user_info(request)
+            hit['ip_address'] = hit.get('ip_address') or user_info['ip_address']
+            hit['user_agent'] = hit.get('user_agent') or user_info['user_agent']
+
+        try:
+            record_hit(hit)
+        except BufferFull:
+            return Response(
+                {"detail": "Ziyaret kaydı şu anda alınamıyor, lütfen tekrar deneyin."},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+                headers={'Retry-After': '1'}
+            )
+        return Response(status=status.HTTP_202_ACCEPTED)
+
 
 class AdvertisementViewSet(ModelViewSet):
     """
@@ -226,12 +347,77 @@ class CommentViewSet(AbstractBaseViewSet):
 
     def destroy(self, request, *args, **kwargs):
         """
-        Yorum silme işlemi.
+        Yorum silme işlemi. Onaylı yorum silinirse makalenin yorum sayaçları aynı transaction içinde azaltılır.
         """
         comment = self.get_object()
         comment.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
 
+    @swagger_auto_schema(
+        operation_description=(
+            "Moderasyon kuyruğu: seçili sitenin onay bekleyen yorumları, en eskiden yeniye. "
+            "Keyset (cursor) sayfalama kullanılır; sonraki sayfa için yanıttaki `next` bağlantısı izlenir."
+        ),
+        manual_parameters=[
+            openapi.Parameter(
+                'article_id', openapi.IN_QUERY, description="Makale ID'sine göre filtreleme", type=openapi.TYPE_INTEGER
+            ),
+            openapi.Parameter(
+                'page_size', openapi.IN_QUERY, description="Sayfa başına yorum sayısı (en fazla 100)",
+                type=openapi.TYPE_INTEGER
+            ),
+        ]
+    )
+    @action(detail=False, methods=['get'])
+    def queue(self, request):
+        """
+        Onay bekleyen yorumları keyset sayfalama ile döner.
+        """
+        self.validate_user_site()
+        try:
+            article_id = int(request.query_params['article_id']) if request.query_params.get('article_id') else None
+        except ValueError:
+            raise ValidationError({'article_id': "Geçersiz makale ID'si."})
+        queryset = pending_comments(request.user.selectedSite_id, article_id=article_id)
+
+        paginator = KeysetPagination(
+            ordering=('createdAt', 'id'), page_size=get_moderation_settings()['QUEUE_PAGE_SIZE']
+        )
+        page = paginator.paginate_queryset(queryset, request, view=self)
+        return paginator.get_paginated_response(self.get_serializer(page, many=True).data)
+
+    @swagger_auto_schema(
+        operation_description=(
+            "Seçili sitenin bekleyen yorumlarını toplu olarak onaylar; makale yorum sayaçları aynı transaction "
+            "içinde güncellenir. Zaten onaylı veya bulunamayan ID'ler atlanır."
+        ),
+        request_body=CommentBulkModerationSerializer,
+        responses={200: "Onaylanan yorum sayısı", 400: "Geçersiz ID listesi"}
+    )
+    @action(detail=False, methods=['post'], url_path='bulk-approve')
+    def bulk_approve(self, request):
+        self.validate_user_site()
+        serializer = CommentBulkModerationSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        approved = approve_comments(request.user.selectedSite_id, serializer.validated_data['ids'])
+        return Response({'approved': approved})
+
+    @swagger_auto_schema(
+        operation_description=(
+            "Seçili sitenin yorumlarını toplu olarak reddeder (siler); onaylı yorumlar için makale yorum sayaçları "
+            "aynı transaction içinde azaltılır."
+        ),
+        request_body=CommentBulkModerationSerializer,
+        responses={200: "Silinen yorum sayısı", 400: "Geçersiz ID listesi"}
+    )
+    @action(detail=False, methods=['post'], url_path='bulk-reject')
+    def bulk_reject(self, request):
+        self.validate_user_site()
+        serializer = CommentBulkModerationSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        deleted = reject_comments(request.user.selectedSite_id, serializer.validated_data['ids'])
+        return Response({'deleted': deleted})
+
 
 class ImageViewSet(ModelViewSet):
     """
@@ -241,7 +427,7 @@ class ImageViewSet(ModelViewSet):
     - Yeni bir resim yükle.
     - Resim detayını görüntüle, güncelle veya sil.
     """
-    queryset = Image.objects.order_by('createdAt').all()
+    queryset = Image.objects.prefetch_related('renditions').order_by('createdAt').all()
     serializer_class = ImageSerializer
 
     @swagger_auto_schema(
@@ -280,6 +466,23 @@ class ImageViewSet(ModelViewSet):
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
+class ArticleSearchFilter(SearchFilter):
+    """
+    `?search=` parametresini ILIKE yerine tam metin arama motoruna (soloblog.search) yönlendirir.
+    Sonuçlar ilgi skoruna göre sıralanır; `?ordering=` verilirse OrderingFilter bu sırayı ezer.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        text = request.query_params.get(self.search_param, '').strip()
+        if not text:
+            return queryset
+        return search_articles(
+            queryset, text,
+            language=request.query_params.get('language') or None,
+            site_id=getattr(request.user, 'selectedSite_id', None),
+        )
+
+
 class ArticleViewSet(AbstractBaseViewSet):
     """
     Makaleler için CRUD işlemleri:
@@ -289,7 +492,7 @@ class ArticleViewSet(AbstractBaseViewSet):
     """
     queryset = Article.objects.select_related('category', 'category__parent', 'site').order_by('createdAt').all()
     serializer_class = ArticleSerializer
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filter_backends = [DjangoFilterBackend, ArticleSearchFilter, OrderingFilter]
     search_fields = ['title', 'content']
     ordering_fields = ['title', 'createdAt', 'publishedAt']
 
@@ -307,6 +510,17 @@ class ArticleViewSet(AbstractBaseViewSet):
                 'featured', openapi.IN_QUERY, description="Öne çıkan makaleleri filtrelemek için",
                 type=openapi.TYPE_BOOLEAN
             ),
+            openapi.Parameter(
+                'language', openapi.IN_QUERY, description="Dile göre filtreleme (ör. 'tr', 'en')",
+                type=openapi.TYPE_STRING
+            ),
+            openapi.Parameter(
+                'search', openapi.IN_QUERY,
+                description="Başlık, meta açıklama ve içerikte tam metin arama. Sonuçlar ilgi skoruna göre sıralanır ve "
+                            "`search_rank` ile vurgulanmış `search_headline` alanlarını içerir. "
+                            "Örn: `?search=\"yapay zeka\" -haber`",
+                type=openapi.TYPE_STRING
+            ),
             openapi.Parameter(
                 'ordering', openapi.IN_QUERY,
                 description="Makaleleri belirli alanlara göre sırala. Örneğin: `?ordering=title` ya da `?ordering=-createdAt`",
@@ -332,8 +546,8 @@ class ArticleViewSet(AbstractBaseViewSet):
     )
     def list(self, request, *args, **kwargs):
         """
-        Makaleleri listeleme. Opsiyonel olarak site, kategori ve öne çıkan durumuna göre filtreleme yapılabilir.
-        Ayrıca title veya content üzerinden belirttiğiniz filtrelerle arama yapabilirsiniz.
+        Makaleleri listeleme. Opsiyonel olarak site, kategori, dil ve öne çıkan durumuna göre filtreleme yapılabilir.
+        `?search=` ile tam metin arama yapılır; title veya content üzerinden belirttiğiniz filtreler de kullanılabilir.
 
         DİKKAT: AbstractBaseViewSet içindeki get_queryset() metodu,
         kullanıcının `selectedSite` değerine göre sorguyu zaten filtreler.
@@ -341,6 +555,7 @@ class ArticleViewSet(AbstractBaseViewSet):
         site_id = self.request.query_params.get('site_id')
         category_id = self.request.query_params.get('category_id')
         featured = self.request.query_params.get('featured')
+        language = self.request.query_params.get('language')
 
         # AbstractBaseViewSet içindeki get_queryset çağrılır:
         queryset = super().get_queryset()
@@ -356,6 +571,9 @@ class ArticleViewSet(AbstractBaseViewSet):
         if featured is not None:
             queryset = queryset.filter(featured=featured)
 
+        if language:
+            queryset = queryset.filter(language=language)
+
         # Diğer filtreleriniz varsa (title, content, vb.) DjangoFilterBackend ile de yapabilirsiniz.
         queryset = self.filter_queryset(queryset)
 
@@ -373,6 +591,51 @@ class ArticleViewSet(AbstractBaseViewSet):
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
+class ArticleImportJobViewSet(AbstractBaseViewSet):
+    """
+    Toplu makale içe aktarma işleri:
+
+    - NDJSON veya zip (NDJSON + resimler) dosyası yükleyerek yeni iş başlat (iş arka planda çalışır).
+    - İşleri listele ve ilerleme durumunu görüntüle.
+    - Hata alan veya çalıştığı süreç öldüğü için takılı kalan işi kaldığı kontrol noktasından devam ettir (`resume`).
+    """
+    queryset = ArticleImportJob.objects.select_related('defaultCategory').order_by('createdAt').all()
+    serializer_class = ArticleImportJobSerializer
+    parser_classes = [MultiPartParser, FormParser]
+    http_method_names = ['get', 'post', 'head', 'options']
+
+    def perform_create(self, serializer):
+        self.validate_user_site()
+        job = serializer.save(
+            site=self.request.user.selectedSite,
+            sourceFormat=detect_format(serializer.validated_data['sourceFile'].name),
+        )
+        start_import(job)
+
+    @swagger_auto_schema(
+        operation_description=(
+            "Hata almış, başlatılmamış veya çalıştığı süreç öldüğü için uzun süredir ilerlemeyen içe aktarma işini "
+            "kaldığı kontrol noktasından devam ettirir."
+        ),
+        request_body=no_body,
+    )
+    @action(detail=True, methods=['post'])
+    def resume(self, request, pk=None):
+        job = self.get_object()
+        if not is_import_resumable(job):
+            return Response(
+                {'detail': f"'{job.get_status_display()}' durumundaki iş devam ettirilemez."},
+                status=status.HTTP_409_CONFLICT
+            )
+        start_import(job)
+        return Response(self.get_serializer(job).data, status=status.HTTP_202_ACCEPTED)
+
+    def create(self, request, *args, **kwargs):
+        response = super().create(request, *args, **kwargs)
+        response.status_code = status.HTTP_202_ACCEPTED
+        return response
+
+
 class CategoryViewSet(AbstractBaseViewSet):
     """
     Kategoriler için CRUD işlemleri:
@@ -414,6 +677,43 @@ class CategoryViewSet(AbstractBaseViewSet):
 
         return paginate_or_default(queryset, self.get_serializer_class(), request)
 
+    @swagger_auto_schema(operation_description="Seçili sitenin tüm kategori ağacını (önbellekten) döner.")
+    @action(detail=False, methods=['get'])
+    def tree(self, request):
+        self.validate_user_site()
+        return Response(get_category_tree(request.user.selectedSite_id))
+
+    @swagger_auto_schema(operation_description="Kategorinin üst kategorilerini kökten başlayarak döner (breadcrumb).")
+    @action(detail=True, methods=['get'])
+    def ancestors(self, request, pk=None):
+        category = self.get_object()
+        include_self = request.query_params.get('include_self', '').lower() == 'true'
+        queryset = get_ancestors(category, include_self=include_self).select_related('parent')
+        return Response(CategorySerializer(queryset, many=True, context={'request': request}).data)
+
+    @swagger_auto_schema(operation_description="Kategorinin tüm alt kategorilerini (her derinlikte) döner.")
+    @action(detail=True, methods=['get'])
+    def descendants(self, request, pk=None):
+        category = self.get_object()
+        queryset = get_descendants(category).select_related('parent').prefetch_related('children')
+        return Response(CategorySerializer(queryset, many=True, context={'request': request}).data)
+
+    @swagger_auto_schema(
+        operation_description="Kategori sıralamasını tek seferde uygular. Listede olmayan kategoriler mevcut "
+                              "sıralarıyla arkaya alınır.",
+        request_body=CategoryReorderSerializer,
+    )
+    @action(detail=False, methods=['post'])
+    def reorder(self, request):
+        self.validate_user_site()
+        serializer = CategoryReorderSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            updated = reorder_categories(request.user.selectedSite_id, serializer.validated_data['order'])
+        except ValueError as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({"updated": updated})
+
 
 class SiteDetailedReportAPIView(APIView):
     """
@@ -480,27 +780,17 @@ class SiteDetailedReportAPIView(APIView):
         time_frame = request.query_params.get('time_frame', 'daily')  # 'daily', 'weekly', 'monthly', 'yearly'
         group_by = request.query_params.get('group_by')  # Örneğin 'visit_type', 'country' vb.
 
-        if group_by not in ['visit_type', 'country', 'city', 'device_type', 'operating_system', 'browser', 'is_bounce']:
+        if group_by not in ROLLUP_DIMENSIONS:
             return Response({'error': 'Geçersiz group_by parametresi.'}, status=400)
 
-        if time_frame == 'daily':
-            date_trunc = TruncDay('visit_date')
-        elif time_frame == 'weekly':
-            date_trunc = TruncWeek('visit_date')
-        elif time_frame == 'monthly':
-            date_trunc = TruncMonth('visit_date')
-        elif time_frame == 'yearly':
-            date_trunc = TruncYear('visit_date')
-        else:
+        if time_frame not in ['daily', 'weekly', 'monthly', 'yearly']:
             return Response({'error': 'Geçersiz time_frame parametresi.'}, status=400)
 
-        report = VisitorAnalytics.objects.filter(
-            site=site
-        ).annotate(
-            period=date_trunc
-        ).values('period', group_by).annotate(
-            count=Count('id')
-        ).order_by('period')
+        # Rapor önceden hesaplanmış rollup tablolarından okunur
+        report = [
+            {'period': row['period'], group_by: row['value'], 'count': row['count']}
+            for row in get_rollup_report(time_frame, dimension=group_by, site_ids=[site.id])
+        ]
 
         return paginate_or_default(report, None, request)
 
@@ -510,7 +800,9 @@ class SiteRefererAPIView(APIView):
     Belirli bir sitenin yönlendirme (referer) kayıtlarını listeler.
 
     Kullanıcı, başlangıç ve bitiş tarihlerini göndererek, bu tarih aralığında
-    en fazla ziyaretçi gönderen URL'leri görebilir.
+    en fazla ziyaretçi gönderen kaynakları görebilir. URL'ler alan adı + yol olarak gruplanır
+    (sorgu parametreleri ve "www." öneki dikkate alınmaz) ve sonuçlar günlük önceden hesaplanmış
+    listelerden okunur.
 
     Örnek Kullanımlar:
 
@@ -540,10 +832,17 @@ class SiteRefererAPIView(APIView):
             openapi.Parameter(
                 "end_date",
                 openapi.IN_QUERY,
-                description="Bitiş tarihi (YYYY-MM-DD formatında).",
+                description="Bitiş tarihi (YYYY-MM-DD formatında, dahil).",
                 type=openapi.TYPE_STRING,
                 required=False,
             ),
+            openapi.Parameter(
+                "limit",
+                openapi.IN_QUERY,
+                description="Dönecek en fazla kaynak sayısı.",
+                type=openapi.TYPE_INTEGER,
+                required=False,
+            ),
         ],
         responses={200: "Referer raporu başarıyla oluşturuldu.", 400: "Geçersiz parametreler."},
     )
@@ -555,12 +854,16 @@ class SiteRefererAPIView(APIView):
         if not start_date or not end_date:
             return Response({'error': 'Lütfen başlangıç ve bitiş tarihlerini belirtin.'}, status=400)
 
-        referers = VisitorAnalytics.objects.filter(
-            site=site,
-            visit_date__range=[start_date, end_date]
-        ).values('referer').annotate(
-            count=Count('id')
-        ).order_by('-count')
+        try:
+            start_day = parse_date(start_date)
+            end_day = parse_date(end_date)
+            limit = int(request.query_params['limit']) if request.query_params.get('limit') else None
+        except ValueError:
+            start_day = end_day = None
+        if not start_day or not end_day or start_day > end_day or (limit is not None and limit < 1):
+            return Response({'error': 'Geçersiz tarih aralığı veya limit.'}, status=400)
+
+        referers = get_referer_report(site.id, start_day, end_day, limit=limit)
 
         return paginate_or_default(referers, None, request)
 
@@ -577,6 +880,12 @@ class SiteTrafficAPIView(APIView):
 
     2. Son 6 ay için aylık trafik:
        GET /sites/1/traffic-report/?type=monthly
+
+    3. Tekil ziyaretçi sayıları ile birlikte günlük trafik:
+       GET /sites/1/traffic-report/?type=daily&unique=true
+
+    `unique=true` verildiğinde her döneme `unique_visitors` (IP + tarayıcı bazında tekil ziyaretçi) eklenir.
+    Değer HyperLogLog ile tahmin edilir; standart hata ~%0.81'dir (sonuçların ~%95'i ±%1.6 içinde).
     """
 
     @swagger_auto_schema(
@@ -588,6 +897,13 @@ class SiteTrafficAPIView(APIView):
                 type=openapi.TYPE_STRING,
                 required=False,
             ),
+            openapi.Parameter(
+                "unique",
+                openapi.IN_QUERY,
+                description="'true' ise tekil ziyaretçi tahmini (HyperLogLog, standart hata ~%0.81) eklenir.",
+                type=openapi.TYPE_BOOLEAN,
+                required=False,
+            ),
         ],
         responses={200: "Başarılı", 400: "Geçersiz parametre veya tür."},
     )
@@ -610,49 +926,53 @@ class SiteTrafficAPIView(APIView):
                 status=400
             )
 
+        unique = request.query_params.get('unique', '').lower() == 'true'
+
         # Tarih hesaplamaları
-        today = datetime.today()
+        today = timezone.now()
 
         if traffic_type == 'daily':
             last_30_days = today - timedelta(days=30)
 
-            # Günlük ziyaretçi sayıları
-            daily_visitors = VisitorAnalytics.objects.filter(
-                site=site,
-                visit_date__gte=last_30_days
-            ).annotate(
-                day=TruncDay('visit_date')
-            ).values('day').annotate(
-                count=Count('id')
-            ).order_by('day')
+            # Günlük ziyaretçi sayıları (rollup tablosundan)
+            daily_visitors = get_rollup_report('daily', site_ids=[site.id], start=last_30_days)
 
             # Dönüş formatı
             formatted_data = [
-                {"date": entry["day"].strftime('%Y-%m-%d'), "visitors": entry["count"]} for entry in daily_visitors
+                {"date": entry["period"].strftime('%Y-%m-%d'), "visitors": entry["count"]} for entry in daily_visitors
             ]
+            if unique:
+                self._add_unique_visitors(formatted_data, 'daily', site.id, last_30_days)
 
             return paginate_or_default(formatted_data, None, request)
 
         elif traffic_type == 'monthly':
             last_6_months = today - timedelta(days=180)
 
-            # Aylık ziyaretçi sayıları
-            monthly_visitors = VisitorAnalytics.objects.filter(
-                site=site,
-                visit_date__gte=last_6_months
-            ).annotate(
-                month=TruncMonth('visit_date')
-            ).values('month').annotate(
-                count=Count('id')
-            ).order_by('month')
+            # Aylık ziyaretçi sayıları (rollup tablosundan)
+            monthly_visitors = get_rollup_report('monthly', site_ids=[site.id], start=last_6_months)
 
             # Dönüş formatı
             formatted_data = [
-                {"date": entry["month"].strftime('%Y-%m-%d'), "visitors": entry["count"]} for entry in monthly_visitors
+                {"date": entry["period"].strftime('%Y-%m-%d'), "visitors": entry["count"]} for entry in monthly_visitors
             ]
+            if unique:
+                self._add_unique_visitors(formatted_data, 'monthly', site.id, last_6_months)
 
             return paginate_or_default(formatted_data, None, request)
 
+    @staticmethod
+    def _add_unique_visitors(formatted_data, time_frame, site_id, start):
+        """
+        Her döneme HyperLogLog taslaklarından hesaplanan tekil ziyaretçi tahminini ekler.
+        """
+        unique_visitors = {
+            entry["period"].strftime('%Y-%m-%d'): entry["count"]
+            for entry in get_unique_report(time_frame, site_ids=[site_id], start=start)
+        }
+        for entry in formatted_data:
+            entry["unique_visitors"] = unique_visitors.get(entry["date"], 0)
+
 
 class AllSitesVisitorStatsAPIView(APIView):
     """
@@ -661,6 +981,7 @@ class AllSitesVisitorStatsAPIView(APIView):
     Kullanıcı, aşağıdaki parametrelerle sorgu yapabilir:
     - `type`: İstatistik türü ('daily', 'weekly', 'monthly', 'yearly').
     - `site_id`: Belirli bir site için sonuç döndürmek üzere site ID'si (opsiyonel).
+    - `start_date`: Bu tarihin (YYYY-MM-DD) dahil olduğu dönemden itibaren (opsiyonel).
 
     Örnek Kullanımlar:
     1. Tüm sitelerin günlük istatistikleri:
@@ -678,6 +999,14 @@ class AllSitesVisitorStatsAPIView(APIView):
     5. Parametre olmadan tüm istatistikler:
        GET /sites/visitor-stats/
 
+    6. Tüm sitelerin aylık tekil ziyaretçi sayıları:
+       GET /sites/visitor-stats/?type=monthly&unique=true
+
+    `unique=true` verildiğinde `count` değerleri ziyaret sayısı yerine tekil ziyaretçi tahminidir (IP + tarayıcı).
+    Site filtresi yoksa siteler birleştirilerek `<tür>_all_sites` anahtarıyla tüm sitelerdeki tekil ziyaretçi de döner.
+    Tahmin HyperLogLog ile yapılır; standart hata `unique_error_bound` (~%0.81) değeridir. Günlük taslaklar istenen
+    tüm türler için bir kez okunur; `start_date` verilirse en geniş türün döneminin başından itibaren okunur.
+
     Hatalı Kullanımlar:
     1. Geçersiz `type` parametresi:
        GET /sites/visitor-stats/?type=invalid
@@ -707,6 +1036,20 @@ class AllSitesVisitorStatsAPIView(APIView):
                 type=openapi.TYPE_INTEGER,
                 required=False,
             ),
+            openapi.Parameter(
+                "unique",
+                openapi.IN_QUERY,
+                description="'true' ise ziyaret yerine tekil ziyaretçi tahmini (HyperLogLog, standart hata ~%0.81) döner.",
+                type=openapi.TYPE_BOOLEAN,
+                required=False,
+            ),
+            openapi.Parameter(
+                "start_date",
+                openapi.IN_QUERY,
+                description="Bu tarihin (YYYY-MM-DD) dahil olduğu dönemden itibaren. Verilmezse tüm geçmiş döner.",
+                type=openapi.TYPE_STRING,
+                required=False,
+            ),
         ],
         responses={200: "Başarılı", 400: "Geçersiz parametre."},
     )
@@ -714,6 +1057,8 @@ class AllSitesVisitorStatsAPIView(APIView):
         # Parametreleri al
         stats_type = request.query_params.get('type', None)
         site_id = request.query_params.get('site_id', None)
+        unique = request.query_params.get('unique', '').lower() == 'true'
+        start_date = request.query_params.get('start_date')
 
         # Geçerli 'type' kontrolü
         valid_types = ['daily', 'weekly', 'monthly', 'yearly']
@@ -722,60 +1067,147 @@ class AllSitesVisitorStatsAPIView(APIView):
                 {"error": "Geçersiz 'type' parametresi. Sadece 'daily', 'weekly', 'monthly', 'yearly' kabul edilir."},
                 status=400)
 
+        start = None
+        if start_date:
+            try:
+                start_day = parse_date(start_date)
+            except ValueError:
+                start_day = None
+            if not start_day:
+                return Response({"error": "Geçersiz 'start_date' parametresi (YYYY-MM-DD)."}, status=400)
+            start = period_start(start_day, 'daily')
+
         # Site filtreleme
-        site_filter = {}
+        site_ids = None
         if site_id:
             site = get_object_or_404(Site, id=site_id)
-            site_filter['site'] = site
+            site_ids = [site.id]
 
+        site_names = dict(Site.objects.values_list('id', 'name'))
         data = {}
 
+        # Tekil ziyaretçi taslakları istenen tüm türler için tek seferde okunur
+        sketches = None
+        if unique:
+            time_frames = [time_frame for time_frame in valid_types if not stats_type or stats_type == time_frame]
+            sketches = get_unique_sketches(time_frames, site_ids=site_ids, start=start, combined=site_ids is None)
+
         # Günlük ziyaretçi sayıları
         if not stats_type or stats_type == 'daily':
-            daily_visitors = VisitorAnalytics.objects.filter(
-                **site_filter
-            ).annotate(
-                day=TruncDay('visit_date')
-            ).values('site__name', 'day').annotate(
-                count=Count('id')
-            ).order_by('day')
+            daily_visitors = self._visitor_stats('daily', 'day', site_ids, site_names, sketches, start)
             data['daily_visitors'] = paginate_or_default(daily_visitors, None, request).data
+            if unique and site_ids is None:
+                data['daily_all_sites'] = self._all_sites_unique_stats(sketches, 'daily', 'day')
 
         # Haftalık ziyaretçi sayıları
         if not stats_type or stats_type == 'weekly':
-            weekly_visitors = VisitorAnalytics.objects.filter(
-                **site_filter
-            ).annotate(
-                week=TruncWeek('visit_date')
-            ).values('site__name', 'week').annotate(
-                count=Count('id')
-            ).order_by('week')
+            weekly_visitors = self._visitor_stats('weekly', 'week', site_ids, site_names, sketches, start)
             data['weekly_visitors'] = paginate_or_default(weekly_visitors, None, request).data
+            if unique and site_ids is None:
+                data['weekly_all_sites'] = self._all_sites_unique_stats(sketches, 'weekly', 'week')
 
         # Aylık ziyaretçi sayıları
         if not stats_type or stats_type == 'monthly':
-            monthly_visitors = VisitorAnalytics.objects.filter(
-                **site_filter
-            ).annotate(
-                month=TruncMonth('visit_date')
-            ).values('site__name', 'month').annotate(
-                count=Count('id')
-            ).order_by('month')
+            monthly_visitors = self._visitor_stats('monthly', 'month', site_ids, site_names, sketches, start)
             data['monthly_visitors'] = paginate_or_default(monthly_visitors, None, request).data
+            if unique and site_ids is None:
+                data['monthly_all_sites'] = self._all_sites_unique_stats(sketches, 'monthly', 'month')
 
         # Yıllık ziyaretçi sayıları
         if not stats_type or stats_type == 'yearly':
-            yearly_visitors = VisitorAnalytics.objects.filter(
-                **site_filter
-            ).annotate(
-                year=TruncYear('visit_date')
-            ).values('site__name', 'year').annotate(
-                count=Count('id')
-            ).order_by('year')
+            yearly_visitors = self._visitor_stats('yearly', 'year', site_ids, site_names, sketches, start)
             data['yearly_visitors'] = paginate_or_default(yearly_visitors, None, request).data
+            if unique and site_ids is None:
+                data['yearly_all_sites'] = self._all_sites_unique_stats(sketches, 'yearly', 'year')
+
+        if unique:
+            data['unique_error_bound'] = round(STANDARD_ERROR, 4)
 
         return Response(data)
 
+    @staticmethod
+    def _visitor_stats(time_frame, period_key, site_ids, site_names, sketches=None, start=None):
+        """
+        Rollup tablosundan (taslaklar verilmişse tekil ziyaretçi taslaklarından) site bazlı sayıları eski yanıt
+        formatında döner.
+        """
+        rows = sketches.report(time_frame) if sketches is not None else \
+            get_rollup_report(time_frame, site_ids=site_ids, start=start)
+        return [
+            {'site__name': site_names.get(row['site_id']), period_key: row['period'], 'count': row['count']}
+            for row in rows
+        ]
+
+    @staticmethod
+    def _all_sites_unique_stats(sketches, time_frame, period_key):
+        """
+        Tüm sitelerin taslakları birleştirilerek hesaplanan tekil ziyaretçi sayılarını döner.
+        """
+        return [
+            {period_key: row['period'], 'count': row['count']}
+            for row in sketches.report(time_frame, combined=True)
+        ]
+
+
+class SiteRealtimeAPIView(APIView):
+    """
+    Belirli bir sitenin anlık ziyaretçi istatistiklerini döner: son 1, 5 ve 60 dakikadaki ziyaret ve
+    tekil ziyaretçi sayıları, şu an çevrimiçi (son 5 dakika) ziyaretçi sayısı ve en çok okunan makaleler.
+
+    Değerler ana veritabanı yerine Redis (veya geliştirme ortamında süreç içi) halka tampon sayaçlarından okunur.
+
+    Örnek Kullanımlar:
+    1. Bir sitenin anlık istatistikleri:
+       GET /sites/1/realtime/
+
+    2. Son 60 dakikada en çok okunan 5 makale ile birlikte:
+       GET /sites/1/realtime/?window=60m&top=5
+    """
+
+    @swagger_auto_schema(
+        manual_parameters=[
+            openapi.Parameter(
+                "window",
+                openapi.IN_QUERY,
+                description="En çok okunan makaleler için pencere ('1m', '5m', '60m'). Varsayılan '5m'.",
+                type=openapi.TYPE_STRING,
+                required=False,
+            ),
+            openapi.Parameter(
+                "top",
+                openapi.IN_QUERY,
+                description="Dönecek en fazla makale sayısı (1-50). Varsayılan 10.",
+                type=openapi.TYPE_INTEGER,
+                required=False,
+            ),
+        ],
+        responses={200: "Anlık istatistikler başarıyla döndü.", 400: "Geçersiz parametreler."},
+    )
+    def get(self, request, site_id):
+        site = get_object_or_404(Site, id=site_id)
+        window = request.query_params.get('window', ONLINE_WINDOW)
+        try:
+            top = int(request.query_params.get('top', 10))
+        except ValueError:
+            top = 0
+        if window not in REALTIME_WINDOWS or not 1 <= top <= 50:
+            return Response({'error': 'Geçersiz window veya top parametresi.'}, status=400)
+
+        stats = get_realtime_stats(site.id, top_window=window, top=top)
+        titles = dict(Article.objects.filter(
+            id__in=[article_id for article_id, _ in stats['top_articles']]
+        ).values_list('id', 'title'))
+
+        return Response({
+            'site_id': site.id,
+            'windows': stats['windows'],
+            'online_visitors': stats['online_visitors'],
+            'top_articles': [
+                {'article_id': article_id, 'title': titles.get(article_id), 'hits': hits}
+                for article_id, hits in stats['top_articles']
+            ],
+        })
+
 
 # -----------------------------------------------------------------------------
 # SiteSettings ViewSet
@@ -883,3 +1315,119 @@ class MenuViewSet(AbstractBaseViewSet):
     search_fields = ["title"]
     ordering_fields = ["id", "order", "createdAt"]
     ordering = ["order"]
+
+
+def cached_json_response(request, entry, max_age=0):
+    """
+    Önbellekte render edilmiş JSON belgesini (`body`, `etag`) döner; `If-None-Match` ETag ile eşleşirse gövdesiz 304.
+    """
+    etags = parse_etags(request.headers.get('If-None-Match', ''))
+    if '*' in etags or entry['etag'] in etags or f"W/{entry['etag']}" in etags:
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(entry['body'], content_type='application/json')
+    response['ETag'] = entry['etag']
+    patch_cache_control(response, public=True, max_age=max_age)
+    return response
+
+
+class SiteBootstrapAPIView(APIView):
+    """
+    Blog ön yüzünün ihtiyaç duyduğu site bazlı yerleşim verilerini (site ayarları, anasayfa ve footer ayarları,
+    menüler, kategori ağacı, sosyal medya, Google uygulamaları, reklamlar ve aktif pop-up reklamlar) tek bir
+    sürümlü belge olarak döner.
+
+    Belge önbellekten okunur ve ETag ile birlikte gönderilir; `If-None-Match` başlığı güncel ETag ile eşleşirse
+    gövdesiz 304 döner.
+
+    Örnek Kullanımlar:
+    1. İsteğin domainine göre:
+       GET /bootstrap/
+
+    2. Site ID ile:
+       GET /sites/1/bootstrap/
+    """
+
+    @swagger_auto_schema(
+        manual_parameters=[
+            openapi.Parameter(
+                "If-None-Match",
+                openapi.IN_HEADER,
+                description="Daha önce alınan ETag değeri; belge değişmediyse 304 döner.",
+                type=openapi.TYPE_STRING,
+                required=False,
+            ),
+        ],
+        responses={200: "Bootstrap belgesi döndü.", 304: "Belge değişmedi.", 404: "Site bulunamadı."},
+    )
+    def get(self, request, site_id=None):
+        if site_id is not None:
+            site = get_object_or_404(Site, id=site_id)
+        elif getattr(request, 'site', None):
+            site = request.site
+        else:
+            return Response({'error': 'Site not found for this domain.'}, status=404)
+
+        return cached_json_response(request, get_site_bootstrap(site), get_bootstrap_settings()['MAX_AGE'])
+
+
+class SitePageAPIView(APIView):
+    """
+    Blog ön yüzünün anasayfa, kategori ve makale detay sayfaları için gereken verileri, sitenin ilgili temasıyla
+    birlikte tek bir belge olarak döner. Belgeler sayfa önbelleğinden (stale-while-revalidate) sunulur;
+    `X-Cache` başlığı sonucu (HIT, STALE, MISS) gösterir.
+
+    Örnek Kullanımlar:
+    1. İsteğin domainine göre anasayfa:
+       GET /pages/home/
+
+    2. Kategori sayfasının ikinci sayfası:
+       GET /sites/1/pages/category/teknoloji/?page=2
+
+    3. Makale detay:
+       GET /sites/1/pages/article/ornek-makale/
+    """
+    page_type = None
+
+    @swagger_auto_schema(
+        manual_parameters=[
+            openapi.Parameter(
+                "page",
+                openapi.IN_QUERY,
+                description="Kategori sayfası için sayfa numarası. Varsayılan 1.",
+                type=openapi.TYPE_INTEGER,
+                required=False,
+            ),
+            openapi.Parameter(
+                "If-None-Match",
+                openapi.IN_HEADER,
+                description="Daha önce alınan ETag değeri; sayfa değişmediyse 304 döner.",
+                type=openapi.TYPE_STRING,
+                required=False,
+            ),
+        ],
+        responses={200: "Sayfa belgesi döndü.", 304: "Sayfa değişmedi.", 400: "Geçersiz sayfa numarası.",
+                   404: "Site, kategori veya makale bulunamadı."},
+    )
+    def get(self, request, site_id=None, slug=None):
+        if site_id is not None:
+            site = get_object_or_404(Site, id=site_id)
+        elif getattr(request, 'site', None):
+            site = request.site
+        else:
+            return Response({'error': 'Site not found for this domain.'}, status=404)
+
+        try:
+            page = int(request.query_params.get('page', 1))
+        except ValueError:
+            page = 0
+        if page < 1:
+            return Response({'error': 'Geçersiz sayfa numarası.'}, status=400)
+
+        result = get_page(site.id, self.page_type, slug=slug, page=page)
+        if result is None:
+            return Response({'error': 'Sayfa bulunamadı.'}, status=404)
+        entry, outcome = result
+        response = cached_json_response(request, entry)
+        response['X-Cache'] = outcome.upper()
+        return response
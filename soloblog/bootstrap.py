@@ -0,0 +1,108 @@
+# soloblog/bootstrap.py
+"""
+Blog ön yüzünün sayfa açılışında ihtiyaç duyduğu site bazlı yerleşim verilerinin tek belge halinde sunulması.
+
+Ön yüz eskiden SiteSettings, HomePageSettings, FooterSettings, Menu, SocialMedia, GoogleApplicationsIntegration,
+Advertisement ve PopupAd için ayrı ayrı istek atıyordu. Burada:
+
+- Belge site başına bir kez kurulur, JSON olarak render edilmiş haliyle ve ETag değeriyle birlikte önbellekte tutulur;
+  önbellekten okunan bir istek veritabanına hiç gitmez.
+- `If-None-Match` başlığı ETag ile eşleşirse gövde gönderilmez (304).
+- İlgili modellerden biri kaydedildiğinde / silindiğinde (sinyaller `soloblog.models` içindedir) sitenin belgesi
+  transaction sonrasında geçersiz kılınır.
+- Belgenin yapısı değiştiğinde `SCHEMA_VERSION` artırılır; sürüm önbellek anahtarında da yer aldığından eski yapıdaki
+  belgeler sunulmaz.
+
+Ayarlar `settings.SITE_BOOTSTRAP` sözlüğünden okunur.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from common.api.serializers import GoogleApplicationsIntegrationSerializer, SocialMediaSerializer
+from common.models import GoogleApplicationsIntegration, SocialMedia
+from soloblog.api.serializers import AdvertisementSerializer, FooterSettingsSerializer, HomePageSettingsSerializer, \
+    MenuSerializer, PopupAdSerializer, SiteSettingsSerializer
+from soloblog.category_tree import get_category_tree
+from soloblog.models import Advertisement, FooterSettings, HomePageSettings, Menu, PopupAd, SiteSettings
+
+SCHEMA_VERSION = 1
+
+DEFAULTS = {
+    'CACHE_TIMEOUT': 60 * 60 * 24,  # Saniye; geçersiz kılma kaçırılırsa (ör. süreç içi önbellek) üst sınır
+    'CACHE_PREFIX': 'site_bootstrap',
+    'MAX_AGE': 0,  # Tarayıcı / CDN için Cache-Control max-age; 0 ise her istekte ETag ile doğrulanır
+}
+
+
+def get_bootstrap_settings():
+    return {**DEFAULTS, **getattr(settings, 'SITE_BOOTSTRAP', {})}
+
+
+def bootstrap_cache_key(site_id):
+    return f"{get_bootstrap_settings()['CACHE_PREFIX']}:v{SCHEMA_VERSION}:{site_id}"
+
+
+def _single(model, serializer_class, site_id):
+    instance = model.objects.filter(site_id=site_id).order_by('-createdAt').first()
+    return serializer_class(instance).data if instance is not None else None
+
+
+def build_site_bootstrap(site):
+    """
+    Sitenin yerleşim verilerini tek bir belge olarak kurar.
+
+    Dosya alanları istekten bağımsız (göreli) URL olarak serileştirilir; belge tüm istekler arasında paylaşılır.
+    """
+    site_id = site.id
+    return {
+        'version': SCHEMA_VERSION,
+        'generatedAt': timezone.now(),
+        'site': {'id': site_id, 'domain': site.domain, 'name': site.name},
+        'siteSettings': _single(SiteSettings, SiteSettingsSerializer, site_id),
+        'homePageSettings': _single(HomePageSettings, HomePageSettingsSerializer, site_id),
+        'footerSettings': _single(FooterSettings, FooterSettingsSerializer, site_id),
+        'menus': MenuSerializer(Menu.objects.filter(site_id=site_id).order_by('order', 'id'), many=True).data,
+        'categories': get_category_tree(site_id),
+        'socialMedia': SocialMediaSerializer(
+            SocialMedia.objects.filter(site_id=site_id).order_by('id'), many=True
+        ).data,
+        'googleApplications': GoogleApplicationsIntegrationSerializer(
+            GoogleApplicationsIntegration.objects.filter(site_id=site_id).order_by('id'), many=True
+        ).data,
+        'advertisements': AdvertisementSerializer(
+            Advertisement.objects.filter(site_id=site_id).order_by('createdAt'), many=True
+        ).data,
+        'popupAds': PopupAdSerializer(
+            PopupAd.objects.filter(sites=site_id, isActive=True).prefetch_related('sites'), many=True
+        ).data,
+    }
+
+
+def get_site_bootstrap(site):
+    """
+    Sitenin render edilmiş belgesini önbellekten döner; yoksa kurup önbelleğe yazar.
+
+    Returns:
+        dict: `body` (JSON baytları) ve `etag` (tırnaklı ETag değeri).
+    """
+    key = bootstrap_cache_key(site.id)
+    entry = cache.get(key)
+    if entry is None:
+        body = JSONRenderer().render(build_site_bootstrap(site))
+        entry = {'body': body, 'etag': f'"{hashlib.sha256(body).hexdigest()[:32]}"'}
+        cache.set(key, entry, get_bootstrap_settings()['CACHE_TIMEOUT'])
+    return entry
+
+
+def invalidate_site_bootstrap(*site_ids):
+    """
+    Sitelerin önbellekteki belgesini transaction tamamlandıktan sonra siler.
+    """
+    keys = [bootstrap_cache_key(site_id) for site_id in set(site_ids) if site_id]
+    if keys:
+        transaction.on_commit(lambda: cache.delete_many(keys))
@@ -0,0 +1,150 @@
+# soloblog/category_tree.py
+"""
+Site bazında kategori ağacı.
+
+Her kategori kök kategoriden kendisine kadar olan ID'leri `path` alanında (materialized path) tutar:
+`0000000003/0000000012/`. Böylece:
+
+- Üst kategoriler (breadcrumb), yoldaki ID'lerle tek sorguda okunur.
+- Alt ağaç `path LIKE '<yol>%'` ile tek sorguda okunur.
+- Sitenin tüm ağacı tek sorguyla kurulur, serileştirilmiş haliyle önbellekte tutulur ve kategori
+  kaydedildiğinde / silindiğinde (post_save / post_delete) transaction sonrasında geçersiz kılınır.
+- Sıralama değişikliği `reorder_categories` ile tek bir UPDATE ... CASE ifadesiyle uygulanır.
+
+Ayarlar `settings.CATEGORY_TREE` sözlüğünden okunur.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Case, IntegerField, Value, When
+
+from soloblog.models import Category
+
+DEFAULTS = {
+    'CACHE_TIMEOUT': 60 * 60,  # Saniye; geçersiz kılma kaçırılırsa (ör. süreç içi önbellek) üst sınır
+    'CACHE_PREFIX': 'category_tree',
+}
+
+SEGMENT_LENGTH = 11  # 10 basamaklı ID + '/'
+
+
+def get_tree_settings():
+    return {**DEFAULTS, **getattr(settings, 'CATEGORY_TREE', {})}
+
+
+def tree_cache_key(site_id):
+    return f"{get_tree_settings()['CACHE_PREFIX']}:{site_id}"
+
+
+def path_ids(path):
+    """
+    Yoldaki kategori ID'lerini kökten başlayarak döner.
+    """
+    return [int(segment) for segment in path.split('/') if segment]
+
+
+def build_category_tree(site_id):
+    """
+    Sitenin kategori ağacını tek sorguyla kurar. Kardeş kategoriler `order`, ardından ID sırasındadır.
+
+    Returns:
+        list[dict]: Kök kategoriler; her düğümün alt kategorileri `children` listesindedir.
+    """
+    storage = Category._meta.get_field('categoryImage').storage
+    rows = Category.objects.filter(site_id=site_id).order_by('depth', 'order', 'id').values(
+        'id', 'parent_id', 'categoryName', 'slug', 'order', 'depth', 'categoryImage'
+    )
+    nodes = {}
+    roots = []
+    for row in rows:
+        image = row.pop('categoryImage')
+        parent_id = row.pop('parent_id')
+        node = {**row, 'parent': parent_id, 'categoryImage': storage.url(image) if image else None, 'children': []}
+        nodes[node['id']] = node
+        parent = nodes.get(parent_id)
+        (parent['children'] if parent is not None else roots).append(node)
+    return roots
+
+
+def get_category_tree(site_id):
+    """
+    Sitenin serileştirilmiş kategori ağacını önbellekten döner; yoksa kurup önbelleğe yazar.
+    """
+    key = tree_cache_key(site_id)
+    tree = cache.get(key)
+    if tree is None:
+        tree = build_category_tree(site_id)
+        cache.set(key, tree, get_tree_settings()['CACHE_TIMEOUT'])
+    return tree
+
+
+def invalidate_category_tree(site_id):
+    """
+    Sitenin önbellekteki ağacını siler. Transaction içindeyse silme commit sonrasına bırakılır; aksi halde
+    commit öncesi başka bir istek eski ağacı yeniden önbelleğe yazabilirdi.
+    """
+    from soloblog.bootstrap import invalidate_site_bootstrap
+    from soloblog.page_cache import purge_site_pages
+    key = tree_cache_key(site_id)
+    transaction.on_commit(lambda: cache.delete(key))
+    # Site bootstrap belgesi kategori ağacını, sayfalar da breadcrumb ve kategori bilgilerini içerir
+    invalidate_site_bootstrap(site_id)
+    purge_site_pages(site_id)
+
+
+def get_ancestors(category, include_self=False):
+    """
+    Kategorinin üst kategorilerini kökten başlayarak tek sorguyla döner.
+    """
+    ids = path_ids(category.path)
+    if not include_self:
+        ids = ids[:-1]
+    return Category.objects.filter(id__in=ids).order_by('depth')
+
+
+def get_descendants(category, include_self=False):
+    """
+    Kategorinin tüm alt kategorilerini (her derinlikte) tek sorguyla döner; ağaç sırasındadır (önce ebeveyn).
+    """
+    descendants = Category.objects.filter(site_id=category.site_id, path__startswith=category.path)
+    if not include_self:
+        descendants = descendants.exclude(pk=category.pk)
+    return descendants.order_by('path')
+
+
+def reorder_categories(site_id, ordered_ids):
+    """
+    Sitenin kategorilerine verilen sırayı tek bir UPDATE ifadesiyle uygular. Listede olmayan kategoriler mevcut
+    sıralarını koruyarak listedekilerin arkasına alınır; sıra numaraları 1'den başlayarak yeniden verilir.
+
+    Args:
+        site_id (int): Site ID'si.
+        ordered_ids (list[int]): Yeni sırayla kategori ID'leri.
+
+    Returns:
+        int: Güncellenen kategori sayısı.
+
+    Raises:
+        ValueError: Listede tekrar eden veya siteye ait olmayan ID varsa.
+    """
+    ordered_ids = [int(category_id) for category_id in ordered_ids]
+    if len(set(ordered_ids)) != len(ordered_ids):
+        raise ValueError("Sıralamada aynı kategori birden fazla kez verilmiş.")
+
+    with transaction.atomic():
+        current = list(
+            Category.objects.select_for_update().filter(site_id=site_id).order_by('order', 'id').values_list('id', flat=True)
+        )
+        unknown = set(ordered_ids) - set(current)
+        if unknown:
+            raise ValueError(f"Siteye ait olmayan kategori: {', '.join(map(str, sorted(unknown)))}")
+        listed = set(ordered_ids)
+        final = ordered_ids + [category_id for category_id in current if category_id not in listed]
+        if not final:
+            return 0
+        updated = Category.objects.filter(site_id=site_id, id__in=final).update(order=Case(
+            *[When(id=category_id, then=Value(position)) for position, category_id in enumerate(final, start=1)],
+            output_field=IntegerField(),
+        ))
+        invalidate_category_tree(site_id)
+    return updated
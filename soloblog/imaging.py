@@ -0,0 +1,89 @@
+# soloblog/imaging.py
+"""
+Resim türevlerini (rendition) üreten saf PIL fonksiyonları.
+
+Bu modül Django'ya bağımlı değildir: `ProcessPoolExecutor` worker süreçlerinde içe aktarılır ve yalnızca
+bayt -> bayt dönüşüm yapar. Veritabanı ve depolama işlemleri `soloblog.renditions` modülündedir.
+"""
+from io import BytesIO
+
+from PIL import Image as PILImage
+from PIL import ImageOps
+
+# Format adı -> (PIL format adı, dosya uzantısı)
+FORMATS = {
+    'jpeg': ('JPEG', 'jpg'),
+    'webp': ('WEBP', 'webp'),
+    'avif': ('AVIF', 'avif'),
+    'png': ('PNG', 'png'),
+}
+# Saydamlık desteklemeyen formatlar
+_OPAQUE_FORMATS = ('jpeg',)
+
+
+def supported_formats():
+    """
+    Kurulu Pillow sürümünün yazabildiği formatları döner (ör. AVIF, libavif ile derlenmemiş sürümlerde yoktur).
+    """
+    PILImage.init()
+    return {name for name, (pil_format, _) in FORMATS.items() if pil_format in PILImage.SAVE}
+
+
+def extension(fmt):
+    return FORMATS[fmt][1]
+
+
+def _prepare_mode(image, fmt):
+    if fmt in _OPAQUE_FORMATS:
+        if image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info):
+            background = PILImage.new('RGB', image.size, (255, 255, 255))
+            rgba = image.convert('RGBA')
+            background.paste(rgba, mask=rgba.getchannel('A'))
+            return background
+        return image.convert('RGB') if image.mode != 'RGB' else image
+    if image.mode not in ('RGB', 'RGBA'):
+        has_alpha = image.mode in ('LA', 'PA') or 'transparency' in image.info
+        return image.convert('RGBA' if has_alpha else 'RGB')
+    return image
+
+
+def render(data, width, height, crop, fmt, quality):
+    """
+    Kaynak resim baytlarından tek bir türev üretir.
+
+    Args:
+        data (bytes): Orijinal resim.
+        width, height (int): Hedef boyut.
+        crop (bool): True ise resim hedef boyutu tam dolduracak şekilde ortadan kırpılır; False ise en-boy oranı
+            korunarak hedef kutuya sığdırılır (küçük resimler büyütülmez).
+        fmt (str): `FORMATS` anahtarlarından biri.
+        quality (int): Kodlayıcı kalitesi.
+
+    Returns:
+        tuple: (bytes, genişlik, yükseklik)
+    """
+    pil_format = FORMATS[fmt][0]
+    with PILImage.open(BytesIO(data)) as source:
+        # JPEG'lerde hedef boyuttan küçük olmayan en yakın ölçekte çözümleme (yön henüz uygulanmadığından
+        # iki kenar için de büyük olan boyut istenir)
+        side = max(width, height)
+        source.draft('RGB', (side, side))
+        # Telefonla çekilen fotoğraflarda yön bilgisi EXIF'tedir
+        image = ImageOps.exif_transpose(source)
+        image = _prepare_mode(image, fmt)
+        if crop:
+            image = ImageOps.fit(image, (width, height), method=PILImage.LANCZOS)
+        else:
+            image = image.copy()
+            image.thumbnail((width, height), PILImage.LANCZOS)
+
+        output = BytesIO()
+        params = {'quality': quality}
+        if fmt == 'jpeg':
+            params.update(optimize=True, progressive=True)
+        elif fmt == 'webp':
+            params['method'] = 4
+        elif fmt == 'png':
+            params = {'optimize': True}
+        image.save(output, format=pil_format, **params)
+        return output.getvalue(), image.width, image.height
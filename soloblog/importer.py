@@ -0,0 +1,482 @@
+# soloblog/importer.py
+"""
+NDJSON veya zip dosyasından toplu makale içe aktarma.
+
+Kaynak dosyada her satır bir makaledir:
+
+    {"title": "...", "content": "...", "category": "kategori-slug" | 12, "slug": "...", "meta": "...",
+     "metaDescription": "...", "featured": false, "slider": false, "active": true, "language": "tr",
+     "publicationDate": "2024-05-01T10:00:00+03:00",
+     "images": ["resimler/kapak.jpg", "https://..."],
+     "comments": [{"firstName": "...", "lastName": "...", "email": "...", "phoneNumber": "...",
+                   "rating": 5, "content": "...", "approved": true, "ip": "1.2.3.4"}]}
+
+Zip dosyasında kayıtlar ilk `.ndjson`/`.jsonl` dosyasından okunur; `images` içindeki göreli yollar zip içindeki
+dosyalardır. URL olarak verilen resimler olduğu gibi kaydedilir ve işlenmez.
+
+İşleyiş:
+1. Kayıtlar `CHUNK_SIZE` büyüklüğünde parçalar halinde okunur. Her parçada slug'lar toplu atanır, makaleler,
+   yorumlar ve resim satırları `bulk_create` ile eklenir ve iş kaydındaki `processedRecords` kontrol noktası aynı
+   transaction içinde güncellenir. Böylece yarıda kalan iş, yazılmış kayıtları tekrar eklemeden devam eder.
+   Zip içindeki resimler parça hazırlanırken yalnızca doğrulanır; transaction sırasında tek tek akış olarak
+   depolamaya yazılır, bir parçanın resimleri birlikte belleğe alınmaz.
+2. Kayıtlar bittiğinde resimlerin türevleri (`soloblog.renditions`) `IMAGE_WORKERS` süreçli bir process
+   havuzunda üretilir. Her grup sonrasında `imageCheckpoint` güncellenir.
+
+İş her parça ve resim grubu sonrasında `updatedAt` alanını günceller. Çalıştığı süreç öldüğü için
+`STALE_AFTER_SECONDS` süresince güncellenmeyen 'running' / 'processing_images' işler yeniden sahiplenilebilir.
+
+Ayarlar `settings.ARTICLE_IMPORT` sözlüğünden okunur.
+"""
+import io
+import json
+import logging
+import os
+import threading
+import time
+import zipfile
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.db import close_old_connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from common.storage import file_digest
+from common.utils.slug_allocator import allocate_slugs
+from soloblog.models import Article, ArticleImportJob, Category, Comment, Image, ImageRendition
+from soloblog.moderation import apply_counter_deltas, counter_deltas
+from soloblog.renditions import drain_renditions, enqueue_renditions, rendition_executor
+from soloblog.search import update_search_vectors
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'CHUNK_SIZE': 500,  # Tek transaction'da yazılacak makale sayısı
+    'IMAGE_WORKERS': 4,  # Resim türevi üreten süreç sayısı
+    'IMAGE_BATCH_SIZE': 64,  # Kontrol noktası öncesi işlenecek resim sayısı
+    'MAX_IMAGE_BYTES': 20 * 1024 * 1024,
+    'MAX_ERRORS': 100,  # İş kaydında saklanacak hatalı kayıt sayısı
+    'RUNNER': 'thread',  # API'den başlatılan işler için: 'thread' veya 'celery'
+    'STALE_AFTER_SECONDS': 15 * 60,  # Bu süredir güncellenmeyen çalışan iş çökmüş sayılır ve devralınabilir
+}
+
+RECORD_EXTENSIONS = ('.ndjson', '.jsonl')
+# Devam ettirilebilecek durumlar; çalışan bir iş yalnızca zorla (force) veya bayatladığında devralınabilir
+RESUMABLE_STATUSES = ('pending', 'failed')
+ACTIVE_STATUSES = ('running', 'processing_images')
+
+_ARTICLE_FIELDS = ('meta', 'metaDescription')
+_FLAG_FIELDS = ('featured', 'slider', 'active')
+_COMMENT_FIELDS = ('firstName', 'lastName', 'email', 'phoneNumber', 'ip')
+
+
+def get_import_settings():
+    """
+    Varsayılan değerlerle birleştirilmiş içe aktarma ayarlarını döner.
+    """
+    return {**DEFAULTS, **getattr(settings, 'ARTICLE_IMPORT', {})}
+
+
+class ImportRecordError(ValueError):
+    """
+    Kaynak dosyadaki tek bir kaydın geçersiz olduğunu belirtir; kayıt atlanır, iş devam eder.
+    """
+
+
+def detect_format(filename):
+    """
+    Dosya adından kaynak biçimini belirler; desteklenmiyorsa None döner.
+    """
+    name = (filename or '').lower()
+    if name.endswith('.zip'):
+        return 'zip'
+    if name.endswith(RECORD_EXTENSIONS):
+        return 'ndjson'
+    return None
+
+
+class ImportSource:
+    """
+    Kaynak dosyayı açar; kayıtları satır satır okur ve zip içindeki resimlere erişim sağlar.
+    """
+
+    def __init__(self, job):
+        self.job = job
+        self.file = None
+        self.archive = None
+        self.stream = None
+
+    def __enter__(self):
+        self.file = self.job.sourceFile.open('rb')
+        if self.job.sourceFormat == 'zip':
+            self.archive = zipfile.ZipFile(self.file.file)
+            members = sorted(name for name in self.archive.namelist() if name.lower().endswith(RECORD_EXTENSIONS))
+            if not members:
+                raise ValueError("Zip dosyasında .ndjson veya .jsonl uzantılı kayıt dosyası bulunamadı.")
+            self.stream = self.archive.open(members[0])
+        else:
+            self.stream = self.file.file
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.archive is not None:
+            self.archive.close()
+        self.file.close()
+
+    def records(self, skip=0):
+        """
+        `(kayıt numarası, kayıt)` çiftlerini döner. Boş satırlar kayıt sayılmaz; geçersiz JSON satırları
+        ImportRecordError olarak döner ki kayıt numaraları devam noktasıyla tutarlı kalsın.
+        """
+        number = 0
+        for line in io.TextIOWrapper(self.stream, encoding='utf-8-sig'):
+            line = line.strip()
+            if not line:
+                continue
+            number += 1
+            if number <= skip:
+                continue
+            try:
+                record = json.loads(line)
+                if not isinstance(record, dict):
+                    raise ImportRecordError("Kayıt bir JSON nesnesi olmalıdır.")
+            except (ValueError, ImportRecordError) as exc:
+                yield number, ImportRecordError(f"Geçersiz JSON: {exc}")
+                continue
+            yield number, record
+
+    def image_info(self, name, max_bytes):
+        """
+        Zip içindeki resmin kaydını (ZipInfo) doğrulayıp döner; resim okunmaz.
+        """
+        if self.archive is None:
+            raise ImportRecordError(f"Resim dosyaları yalnızca zip içinde verilebilir: {name}")
+        try:
+            info = self.archive.getinfo(name)
+        except KeyError:
+            raise ImportRecordError(f"Resim zip içinde bulunamadı: {name}") from None
+        if info.file_size > max_bytes:
+            raise ImportRecordError(f"Resim çok büyük: {name}")
+        return info
+
+    def open_image(self, info):
+        """
+        Zip içindeki resmi parça parça okunabilen bir `File` olarak açar.
+        """
+        image = File(self.archive.open(info), name=os.path.basename(info.filename))
+        image.size = info.file_size
+        return image
+
+
+def _chunks(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _is_url(value):
+    return value.startswith(('http://', 'https://'))
+
+
+class ArticleImporter:
+    """
+    Tek bir içe aktarma işini yürütür.
+    """
+
+    def __init__(self, job, options=None, progress=None):
+        self.job = job
+        self.options = options or get_import_settings()
+        self.progress = progress
+        self.categories = {}
+        for category_id, slug in Category.objects.filter(site_id=job.site_id).values_list('id', 'slug'):
+            self.categories[category_id] = category_id
+            self.categories[slug] = category_id
+
+    def run(self):
+        job = self.job
+        # Devam eden işlerde kontrol noktasına kadarki kayıtlar yalnızca okunup geçilir
+        self._set_status('running')
+        with ImportSource(job) as source:
+            records = source.records(skip=job.processedRecords)
+            for chunk in _chunks(records, self.options['CHUNK_SIZE']):
+                self._import_chunk(chunk, source)
+                if self.progress:
+                    self.progress(job)
+        self._set_status('processing_images')
+        process_import_images(job, self.options, self.progress)
+        job.finishedAt = timezone.now()
+        self._set_status('completed', 'finishedAt')
+
+    def _set_status(self, status, *fields):
+        self.job.status = status
+        self.job.save(update_fields=['status', 'updatedAt', *fields])
+
+    def _build_article(self, record):
+        title = str(record.get('title') or '').strip()
+        content = str(record.get('content') or '').strip()
+        if not title or not content:
+            raise ImportRecordError("'title' ve 'content' alanları zorunludur.")
+
+        category = record.get('category')
+        if category in (None, ''):
+            category_id = self.job.defaultCategory_id
+        else:
+            category_id = self.categories.get(category)
+        if category_id is None:
+            raise ImportRecordError(f"Kategori bulunamadı: {category}")
+
+        article = Article(
+            site_id=self.job.site_id,
+            category_id=category_id,
+            title=title[:Article._meta.get_field('title').max_length],
+            content=content,
+            slug=str(record.get('slug') or '').strip(),
+        )
+        for name in _ARTICLE_FIELDS:
+            if record.get(name) is not None:
+                setattr(article, name, str(record[name]))
+        for name in _FLAG_FIELDS:
+            if name in record:
+                setattr(article, name, bool(record[name]))
+        language = record.get('language')
+        if language:
+            if language not in dict(settings.LANGUAGES):
+                raise ImportRecordError(f"Desteklenmeyen dil: {language}")
+            article.language = language
+
+        publication_date = record.get('publicationDate')
+        if publication_date:
+            publication_date = parse_datetime(str(publication_date))
+            if publication_date is None:
+                raise ImportRecordError("'publicationDate' ISO 8601 biçiminde olmalıdır.")
+            if timezone.is_naive(publication_date):
+                publication_date = timezone.make_aware(publication_date)
+
+        images = record.get('images') or []
+        comments = record.get('comments') or []
+        if not isinstance(images, list) or not isinstance(comments, list):
+            raise ImportRecordError("'images' ve 'comments' birer liste olmalıdır.")
+        return article, publication_date, images, comments
+
+    def _build_comments(self, article, comments):
+        built = []
+        for data in comments:
+            if not isinstance(data, dict) or not str(data.get('content') or '').strip():
+                raise ImportRecordError("Yorumlarda 'content' alanı zorunludur.")
+            comment = Comment(site_id=article.site_id, article=article, content=str(data['content']))
+            for name in _COMMENT_FIELDS:
+                value = data.get(name)
+                setattr(comment, name, str(value) if value not in (None, '') else ('' if name != 'ip' else None))
+            comment.approved = bool(data.get('approved', False))
+            try:
+                comment.rating = min(5, max(1, int(data.get('rating', 1))))
+            except (TypeError, ValueError):
+                raise ImportRecordError("Yorum puanı 1-5 arasında bir sayı olmalıdır.") from None
+            built.append(comment)
+        return built
+
+    def _store_image(self, article, info, source):
+        """
+        Zip içindeki resmi akış olarak `Image.imagePath` alanının depolamasına yazar ve (yol, SHA-256) döner.
+        İçerik adresli depolamada aynı resim birden çok makalede kullanılıyorsa diske bir kez yazılır. Türevler
+        daha sonra process havuzunda üretilir.
+        """
+        storage = Image._meta.get_field('imagePath').storage
+        filename = f"{article.slug}_{os.path.basename(info.filename)}"
+        path = storage.generate_filename(f"images/site_{article.site_id}/{filename}")
+        with source.open_image(info) as image:
+            content_hash, _ = file_digest(image)
+            return storage.save(path, image), content_hash
+
+    def _import_chunk(self, chunk, source):
+        job = self.job
+        errors = []
+        prepared = []
+        for number, record in chunk:
+            try:
+                if isinstance(record, ImportRecordError):
+                    raise record
+                article, publication_date, images, comments = self._build_article(record)
+                image_refs = []
+                for ref in images:
+                    ref = str(ref).strip()
+                    if ref and not _is_url(ref):
+                        ref = source.image_info(ref, self.options['MAX_IMAGE_BYTES'])
+                    if ref:
+                        image_refs.append(ref)
+                prepared.append((article, publication_date, image_refs, self._build_comments(article, comments)))
+            except ImportRecordError as exc:
+                errors.append({'record': number, 'error': str(exc)})
+
+        articles = [item[0] for item in prepared]
+        allocate_slugs(articles, [article.title for article in articles], scope=('site',), allow_unicode=True)
+
+        with transaction.atomic():
+            Article.objects.bulk_create(articles)
+            # `publicationDate` auto_now_add olduğundan bulk_create sırasında ezilir; kaynaktaki tarih geri yazılır
+            dated = []
+            for article, publication_date, _, _ in prepared:
+                if publication_date:
+                    article.publicationDate = publication_date
+                    dated.append(article)
+            Article.objects.bulk_update(dated, ['publicationDate'])
+
+            comments = [comment for item in prepared for comment in item[3]]
+            Comment.objects.bulk_create(comments)
+            # Onaylı içe aktarılan yorumlar makale sayaçlarına aynı transaction içinde eklenir
+            apply_counter_deltas(counter_deltas(comments))
+
+            images = []
+            for article, _, image_refs, _ in prepared:
+                for ref in image_refs:
+                    image = Image(site_id=article.site_id, article=article, importJob=job)
+                    if isinstance(ref, str):
+                        image.imagePath.name = ref
+                    else:
+                        image.imagePath.name, image.contentHash = self._store_image(article, ref, source)
+                    images.append(image)
+            Image.objects.bulk_create(images)
+
+            update_search_vectors(Article.objects.filter(id__in=[article.pk for article in articles]))
+
+            room = self.options['MAX_ERRORS'] - len(job.errors)
+            if errors and room > 0:
+                job.errors = job.errors + errors[:room]
+            job.processedRecords = chunk[-1][0]
+            job.importedArticles += len(articles)
+            job.importedComments += len(comments)
+            job.importedImages += len(images)
+            job.skippedRecords += len(errors)
+            job.save(update_fields=[
+                'processedRecords', 'importedArticles', 'importedComments', 'importedImages', 'skippedRecords',
+                'errors', 'updatedAt',
+            ])
+            if articles:
+                # bulk_create sinyal üretmediğinden sitenin önbellekteki sayfaları burada geçersiz kılınır
+                from soloblog.page_cache import purge_site_pages
+                purge_site_pages(job.site_id)
+
+
+def process_import_images(job, options=None, progress=None):
+    """
+    İşin resimlerinin türevlerini `imageCheckpoint` sonrasından itibaren gruplar halinde process havuzunda üretir.
+    Bir resim, türevlerinden biri `MAX_ATTEMPTS` denemeden sonra üretilemediyse hatalı sayılır.
+    `progress` verilirse her grup sonrasında iş kaydıyla çağrılır.
+
+    Returns:
+        int: Bu çağrıda işlenen resim sayısı.
+    """
+    options = options or get_import_settings()
+    pending = Image.objects.filter(importJob=job).exclude(imagePath__startswith='http').order_by('id')
+
+    processed = 0
+    with rendition_executor(options['IMAGE_WORKERS']) as executor:
+        while True:
+            batch = list(pending.filter(id__gt=job.imageCheckpoint)[:options['IMAGE_BATCH_SIZE']])
+            if not batch:
+                break
+            rendition_ids = enqueue_renditions(batch)
+            if rendition_ids:
+                drain_renditions(executor, ids=rendition_ids)
+            failed = dict(ImageRendition.objects.filter(
+                image__in=batch, status='failed'
+            ).order_by('image_id').values_list('image_id', 'lastError'))
+            with transaction.atomic():
+                room = options['MAX_ERRORS'] - len(job.errors)
+                if failed and room > 0:
+                    job.errors = job.errors + [
+                        {'image': image_id, 'error': error} for image_id, error in failed.items()
+                    ][:room]
+                job.imageCheckpoint = batch[-1].pk
+                job.processedImages += len(batch) - len(failed)
+                job.failedImages += len(failed)
+                job.save(update_fields=['imageCheckpoint', 'processedImages', 'failedImages', 'errors', 'updatedAt'])
+            processed += len(batch) - len(failed)
+            if progress:
+                progress(job)
+    return processed
+
+
+def _claimable_q(now, options=None):
+    options = options or get_import_settings()
+    stale = now - timedelta(seconds=options['STALE_AFTER_SECONDS'])
+    return Q(status__in=RESUMABLE_STATUSES) | Q(status__in=ACTIVE_STATUSES, updatedAt__lt=stale)
+
+
+def is_resumable(job, options=None):
+    """
+    İş devam ettirilebilir mi: bekleyen / hatalı iş veya `STALE_AFTER_SECONDS` süresince güncellenmemiş
+    (çalıştığı süreç ölmüş) çalışan iş.
+    """
+    return ArticleImportJob.objects.filter(_claimable_q(timezone.now(), options), pk=job.pk).exists()
+
+
+def claim_import_job(job_id, force=False):
+    """
+    İşi çalıştırmak için sahiplenir. Aynı işin iki kez paralel çalışmaması için durum koşullu UPDATE ile
+    değiştirilir; iş başka bir süreçte çalışıyorsa (veya tamamlandıysa) None döner. Bayatlamış çalışan işler
+    zorlamadan da sahiplenilir.
+    """
+    now = timezone.now()
+    claimable = ArticleImportJob.objects.filter(pk=job_id)
+    if not force:
+        claimable = claimable.filter(_claimable_q(now))
+    if not claimable.exclude(status='completed').update(status='running', lastError=None, updatedAt=now):
+        return None
+    ArticleImportJob.objects.filter(pk=job_id, startedAt__isnull=True).update(startedAt=now)
+    return ArticleImportJob.objects.get(pk=job_id)
+
+
+def run_import(job_id, force=False, options=None, progress=None):
+    """
+    İşi sahiplenip baştan veya kaldığı yerden çalıştırır. Hata durumunda iş 'failed' olarak işaretlenir ve
+    daha sonra devam ettirilebilir. `progress` her parça ve resim grubu sonrasında iş kaydıyla çağrılır.
+
+    Returns:
+        ArticleImportJob | None: İş sahiplenilemediyse None.
+    """
+    job = claim_import_job(job_id, force=force)
+    if job is None:
+        return None
+    started = time.monotonic()
+    try:
+        ArticleImporter(job, options, progress).run()
+    except Exception as exc:
+        logger.exception("Makale içe aktarma işi #%s başarısız oldu.", job.pk)
+        ArticleImportJob.objects.filter(pk=job.pk).update(
+            status='failed', lastError=str(exc) or exc.__class__.__name__, updatedAt=timezone.now()
+        )
+        job.refresh_from_db()
+        raise
+    logger.info("Makale içe aktarma işi #%s %.1f sn'de tamamlandı.", job.pk, time.monotonic() - started)
+    return job
+
+
+def start_import(job):
+    """
+    API'den oluşturulan işi `RUNNER` ayarına göre arka planda başlatır.
+    """
+    if get_import_settings()['RUNNER'] == 'celery':
+        from soloblog.tasks import import_articles
+        import_articles.delay(job.pk)
+        return
+
+    def target():
+        try:
+            run_import(job.pk)
+        except Exception:
+            pass  # Hata iş kaydına yazıldı ve loglandı
+        finally:
+            close_old_connections()
+
+    thread = threading.Thread(target=target, name=f"article-import-{job.pk}", daemon=True)
+    # Transaction geri alınırsa olmayan bir iş için thread başlatılmaması için commit sonrasında başlatılır
+    transaction.on_commit(thread.start)
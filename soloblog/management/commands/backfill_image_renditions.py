@@ -0,0 +1,62 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from soloblog.models import Image
+from soloblog.renditions import (content_hash, drain_renditions, enqueue_renditions, get_rendition_settings,
+                                 rendition_executor)
+
+
+class Command(BaseCommand):
+    help = ('Mevcut resimlerin eksik veya ayarları değişmiş türevlerini kuyruğa ekler. İçerik özeti olmayan '
+            'resimlerin özeti hesaplanır; aynı içerikli resimlerin türevleri yeniden üretilmez. --process ile '
+            'türevler hemen process havuzunda üretilir, aksi halde process_image_renditions worker\'ına bırakılır.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--site', type=int, help='Yalnızca bu siteye ait resimler.')
+        parser.add_argument('--batch-size', type=int, default=500, help='Tek seferde okunacak resim sayısı.')
+        parser.add_argument('--process', action='store_true', help='Türevleri kuyruğa ekledikten sonra üretir.')
+        parser.add_argument('--workers', type=int, help='--process için process havuzundaki süreç sayısı.')
+
+    def handle(self, *args, **options):
+        rendition_options = get_rendition_settings()
+        images = Image.objects.exclude(imagePath='').exclude(imagePath__startswith='http').order_by('id')
+        if options['site']:
+            images = images.filter(site_id=options['site'])
+
+        started = time.monotonic()
+        last_id = 0
+        scanned = hashed = missing = 0
+        queued = []
+        while True:
+            batch = list(images.filter(id__gt=last_id)[:options['batch_size']])
+            if not batch:
+                break
+            last_id = batch[-1].pk
+            scanned += len(batch)
+
+            unhashed = []
+            for image in batch:
+                if image.contentHash:
+                    continue
+                try:
+                    image.contentHash = content_hash(image.imagePath)
+                except FileNotFoundError:
+                    missing += 1
+                    continue
+                unhashed.append(image)
+            Image.objects.bulk_update(unhashed, ['contentHash'])
+            hashed += len(unhashed)
+
+            queued += enqueue_renditions(batch, rendition_options)
+            self.stdout.write(f"  {scanned} resim tarandı, {len(queued)} türev kuyrukta")
+
+        self.stdout.write(f"Resim: {scanned}, özeti hesaplanan: {hashed}, dosyası bulunamayan: {missing}, "
+                          f"kuyruğa eklenen türev: {len(queued)} ({time.monotonic() - started:.1f} sn)")
+
+        if options['process'] and queued:
+            with rendition_executor(options['workers'] or rendition_options['WORKERS']) as executor:
+                stats = drain_renditions(executor, ids=queued, options=rendition_options)
+            self.stdout.write(f"Üretilen türev: {stats['done']}, hatalı: {stats['failed']} "
+                              f"({time.monotonic() - started:.1f} sn)")
+        self.stdout.write(self.style.SUCCESS("Tamamlandı."))
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from soloblog.analytics.geoip import DEFAULT_BACKFILL_CHUNK_SIZE, backfill_geoip, get_geoip_settings
+
+
+class Command(BaseCommand):
+    help = ('Ülke/şehir bilgisi boş olan geçmiş VisitorAnalytics kayıtlarını yerel GeoIP veritabanından doldurur. '
+            'Yarıda kesilirse kaldığı yerden devam eder.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_BACKFILL_CHUNK_SIZE,
+                            help='Her adımda okunacak kayıt sayısı.')
+        parser.add_argument('--max-rows', type=int, help='Bu çalıştırmada işlenecek en fazla kayıt sayısı.')
+        parser.add_argument('--restart', action='store_true', help='Kaldığı yeri sıfırlayıp baştan başlar.')
+
+    def handle(self, *args, **options):
+        def progress(last_id, processed, updated):
+            self.stdout.write(f"  --> son ID: {last_id}, işlenen: {processed}, güncellenen: {updated}")
+
+        try:
+            processed, updated = backfill_geoip(
+                chunk_size=options['chunk_size'],
+                max_rows=options['max_rows'],
+                restart=options['restart'],
+                progress=progress,
+            )
+        except RuntimeError as exc:
+            raise CommandError(f"{exc} Dosya yolu: {get_geoip_settings()['DATABASE_PATH']}")
+
+        self.stdout.write(self.style.SUCCESS(f"{processed} kayıt işlendi, {updated} kayda konum bilgisi eklendi."))
+        if updated:
+            self.stdout.write(self.style.WARNING(
+                "Rollup raporlarına yansıması için 'rollup_visitor_analytics --rebuild' çalıştırın."
+            ))
@@ -0,0 +1,79 @@
+import random
+import threading
+import time
+from collections import Counter
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import F
+
+from soloblog.analytics.article_counters import DEFAULTS, ArticleViewCounter, ShardedCounterStore, apply_deltas
+from soloblog.models import Article
+
+
+class Command(BaseCommand):
+    help = ('Makale okunma sayacında her okunmada satır güncellemesi (UPDATE counter = counter + 1) ile '
+            'write-behind sayacın saniyedeki okunma sayısını, yazma süresini ve çökme durumunda kayıp penceresini '
+            'ölçer. Benchmark sonunda sayaçlar eski değerlerine döndürülür.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--views', type=int, default=20000, help='Her yöntem için okunma sayısı.')
+        parser.add_argument('--articles', type=int, default=50, help='Okunmaların dağıtılacağı makale sayısı.')
+        parser.add_argument('--threads', type=int, default=8, help='Write-behind sayacına yazan thread sayısı.')
+        parser.add_argument('--shards', type=int, default=DEFAULTS['SHARDS'], help='Sayaç shard sayısı.')
+        parser.add_argument('--flush-interval-ms', type=int, default=DEFAULTS['FLUSH_INTERVAL_MS'],
+                            help='Kayıp penceresi hesabında kullanılacak yazma aralığı.')
+
+    def handle(self, *args, **options):
+        article_ids = list(Article.objects.order_by('-id').values_list('id', flat=True)[:options['articles']])
+        if not article_ids:
+            raise CommandError("Benchmark için en az bir makale bulunmalıdır.")
+
+        views = options['views']
+        # En çok okunan makalelere yoğunlaşan (sıcak satır) dağılım
+        workload = random.choices(article_ids, weights=[1 / (rank + 1) for rank in range(len(article_ids))], k=views)
+        applied = Counter()
+
+        try:
+            # 1) Her okunmada ayrı UPDATE
+            started = time.perf_counter()
+            for article_id in workload:
+                Article.objects.filter(id=article_id).update(counter=F('counter') + 1)
+            row_update_elapsed = time.perf_counter() - started
+            applied.update(workload)
+
+            # 2) Write-behind: thread'lerden sayaca artış, ardından tek toplu yazma
+            counter = ArticleViewCounter(
+                ShardedCounterStore(options['shards']), flush_interval_ms=options['flush_interval_ms']
+            )
+            chunks = [workload[index::options['threads']] for index in range(options['threads'])]
+            threads = [
+                threading.Thread(target=lambda chunk=chunk: [counter.incr(article_id) for article_id in chunk])
+                for chunk in chunks
+            ]
+            started = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            incr_elapsed = time.perf_counter() - started
+            # Yazma tek transaction'dır: ya tüm artışlar yazılır ya hiçbiri
+            if counter.flush():
+                applied.update(workload)
+            else:
+                self.stderr.write(self.style.WARNING("Uyarı: bekleyen artışlar yazılamadı."))
+            stats = counter.stats()
+        finally:
+            if applied:
+                apply_deltas({article_id: -delta for article_id, delta in applied.items()})
+
+        self.stdout.write(f"Okunma: {views}, makale: {len(article_ids)}, thread: {options['threads']}, "
+                          f"shard: {options['shards']}")
+        self.stdout.write(f"Satır başına UPDATE : {row_update_elapsed:.3f} sn, "
+                          f"{views / row_update_elapsed:,.0f} okunma/sn")
+        self.stdout.write(f"Write-behind artış  : {incr_elapsed:.3f} sn, {views / incr_elapsed:,.0f} okunma/sn")
+        self.stdout.write(f"Toplu yazma         : {stats['last_flush_ms']:.1f} ms, "
+                          f"{stats['last_flush_articles']} makale tek seferde güncellendi")
+        self.stdout.write(self.style.SUCCESS(
+            f"Çökme durumunda kayıp penceresi (memory backend): en fazla "
+            f"{stats['crash_loss_window_seconds']:.2f} sn"
+        ))
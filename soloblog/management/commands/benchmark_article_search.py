@@ -0,0 +1,96 @@
+import random
+import statistics
+import time
+from collections import Counter
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+
+from soloblog.models import Article
+from soloblog.search import fallback_indexes, search_articles, tokenize, uses_postgres_search
+
+
+class Command(BaseCommand):
+    help = ('Makale aramasında ILIKE (`icontains`, DRF SearchFilter) ile tam metin arama motorunun (PostgreSQL: '
+            'tsvector + GIN + ts_rank, diğer veritabanları: süreç içi ters indeks) sorgu sürelerini karşılaştırır. '
+            'generate_visitor_data ile üretilen site başına 5000 makalelik veri için tasarlanmıştır.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--site', type=int, default=3, help='Aramanın yapılacağı site ID\'si.')
+        parser.add_argument('--queries', help='Virgülle ayrılmış arama ifadeleri. Verilmezse makalelerden seçilir.')
+        parser.add_argument('--query-count', type=int, default=10, help='Otomatik seçilecek arama ifadesi sayısı.')
+        parser.add_argument('--limit', type=int, default=20, help='Her aramada okunacak sonuç sayısı (ilk sayfa).')
+        parser.add_argument('--repeat', type=int, default=5, help='Her ifade için tekrar sayısı.')
+
+    def handle(self, *args, **options):
+        queryset = Article.objects.filter(site_id=options['site'])
+        total = queryset.count()
+        if not total:
+            raise CommandError(f"{options['site']} ID'li sitede makale yok; önce generate_visitor_data çalıştırın.")
+
+        if options['queries']:
+            queries = [query.strip() for query in options['queries'].split(',') if query.strip()]
+        else:
+            queries = self._sample_queries(queryset, options['query_count'])
+
+        limit = options['limit']
+        engine = 'PostgreSQL tsvector + GIN' if uses_postgres_search(queryset.db) else 'Süreç içi ters indeks'
+        if not uses_postgres_search(queryset.db):
+            # İndeks kurulum süresi aramadan ayrı raporlanır
+            fallback_indexes.clear()
+            started = time.perf_counter()
+            fallback_indexes.get(options['site'], using=queryset.db)
+            self.stdout.write(f"Ters indeks kurulumu: {(time.perf_counter() - started) * 1000:.1f} ms")
+
+        ilike_times, engine_times = [], []
+        for query in queries:
+            ilike = Q()
+            for word in query.split():
+                ilike &= Q(title__icontains=word) | Q(content__icontains=word)
+            ilike_times.extend(self._measure(
+                lambda: list(queryset.filter(ilike).order_by('-createdAt')[:limit]), options['repeat']
+            ))
+            engine_times.extend(self._measure(
+                lambda: [(article.pk, article.search_rank) for article in
+                         search_articles(queryset, query, site_id=options['site'])[:limit]],
+                options['repeat'],
+            ))
+
+        self.stdout.write(f"Site: {options['site']}, makale: {total}, ifade: {len(queries)}, "
+                          f"ilk {limit} sonuç, motor: {engine}")
+        self._report('ILIKE (sırasız)', ilike_times)
+        self._report('Tam metin (sıralı)', engine_times)
+        self.stdout.write(self.style.SUCCESS(
+            f"Medyan oran (ILIKE / tam metin): {statistics.median(ilike_times) / statistics.median(engine_times):.1f}"
+        ))
+
+    @staticmethod
+    def _sample_queries(queryset, count):
+        """
+        Makale başlıklarında geçen orta sıklıktaki kelimelerden tek ve iki kelimelik ifadeler seçer.
+        """
+        words = Counter()
+        for title in queryset.values_list('title', flat=True)[:2000]:
+            words.update(token for token in tokenize(title) if len(token) > 3)
+        common = [word for word, _ in words.most_common(200)[20:]] or list(words)
+        if not common:
+            raise CommandError("Arama ifadesi üretilemedi; --queries ile ifade verin.")
+        queries = []
+        for index in range(count):
+            picked = random.sample(common, min(len(common), 1 + index % 2))
+            queries.append(' '.join(picked))
+        return queries
+
+    @staticmethod
+    def _measure(func, repeat):
+        timings = []
+        for _ in range(max(1, repeat)):
+            started = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - started) * 1000)
+        return timings
+
+    def _report(self, label, timings):
+        timings = sorted(timings)
+        p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+        self.stdout.write(f"{label:<20}: medyan {statistics.median(timings):.2f} ms, p95 {p95:.2f} ms")
@@ -0,0 +1,82 @@
+import random
+import time
+
+from django.contrib.sites.models import Site
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from soloblog.analytics.ingestion import DEFAULTS, HitIngestor, MemoryHitBuffer
+from soloblog.models import VisitorAnalytics
+
+BENCHMARK_USER_AGENT = 'soloblog-benchmark/1.0'
+
+
+class Command(BaseCommand):
+    help = ('VisitorAnalytics için kayıt başına save() ile tamponlu toplu yazmanın (bulk_create) '
+            'saniyedeki kayıt sayısını karşılaştırır. Oluşturulan kayıtlar sonunda silinir.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=5000, help='Her yöntem için yazılacak kayıt sayısı.')
+        parser.add_argument('--batch-size', type=int, default=DEFAULTS['BATCH_SIZE'],
+                            help='Toplu yazmada tek INSERT içindeki kayıt sayısı.')
+        parser.add_argument('--site', type=int, help='Kayıtların yazılacağı site ID (varsayılan: ilk site).')
+        parser.add_argument('--keep', action='store_true', help='Oluşturulan kayıtları silme.')
+
+    def handle(self, *args, **options):
+        site = Site.objects.filter(id=options['site']) if options['site'] else Site.objects.order_by('id')
+        site = site.first()
+        if site is None:
+            raise CommandError("Benchmark için en az bir site bulunmalıdır.")
+
+        rows = options['rows']
+        start_id = VisitorAnalytics.objects.order_by('-id').values_list('id', flat=True).first() or 0
+
+        # 1) Mevcut yöntem: her ziyaret için ayrı save() (ayrı INSERT ve transaction)
+        hits = self._generate_hits(site.id, rows)
+        started = time.perf_counter()
+        for hit in hits:
+            VisitorAnalytics(**hit).save()
+        per_row_elapsed = time.perf_counter() - started
+
+        # 2) Tamponlu yöntem: istek yolunda sadece tampona ekleme, ardından toplu yazma
+        hits = self._generate_hits(site.id, rows)
+        ingestor = HitIngestor(MemoryHitBuffer(rows), batch_size=options['batch_size'])
+        started = time.perf_counter()
+        for hit in hits:
+            ingestor.submit(hit)
+        submit_elapsed = time.perf_counter() - started
+        written = ingestor.drain()
+        buffered_elapsed = time.perf_counter() - started
+
+        self.stdout.write(f"Kayıt sayısı: {rows}, parça boyutu: {options['batch_size']}")
+        self.stdout.write(
+            f"save() ile tek tek : {per_row_elapsed:.3f} sn, {rows / per_row_elapsed:,.0f} kayıt/sn"
+        )
+        self.stdout.write(
+            f"Tamponlu toplu     : {buffered_elapsed:.3f} sn, {written / buffered_elapsed:,.0f} kayıt/sn "
+            f"(istek yolu başına {submit_elapsed / rows * 1e6:.1f} µs)"
+        )
+        self.stdout.write(self.style.SUCCESS(f"Hızlanma: {per_row_elapsed / buffered_elapsed:.1f}x"))
+
+        if not options['keep']:
+            deleted, _ = VisitorAnalytics.objects.filter(
+                id__gt=start_id, user_agent=BENCHMARK_USER_AGENT
+            ).delete()
+            self.stdout.write(self.style.WARNING(f"{deleted} benchmark kaydı silindi."))
+
+    @staticmethod
+    def _generate_hits(site_id, count):
+        now = timezone.now()
+        return [
+            {
+                'site_id': site_id,
+                'visit_type': 'homepage',
+                'ip_address': f"10.{random.randint(0, 255)}.{random.randint(0, 255)}.{random.randint(1, 254)}",
+                'user_agent': BENCHMARK_USER_AGENT,
+                'referer': random.choice([None, 'https://www.google.com/', 'https://t.co/abc']),
+                'visit_date': now,
+                'device_type': random.choice(['desktop', 'mobile', 'tablet']),
+                'session_duration': random.randint(0, 600),
+            }
+            for _ in range(count)
+        ]
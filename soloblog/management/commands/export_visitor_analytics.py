@@ -0,0 +1,51 @@
+import sys
+
+from django.core.management.base import BaseCommand
+
+from soloblog.analytics.export import DEFAULT_CHUNK_SIZE, EXPORT_FORMATS, filter_visitor_analytics, stream_export
+from soloblog.models import VisitorAnalytics
+
+
+class Command(BaseCommand):
+    help = ('VisitorAnalytics kayıtlarını CSV veya NDJSON olarak dışa aktarır. Kayıtlar parça parça okunup '
+            'yazıldığından bellek kullanımı tarih aralığından bağımsızdır.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--format', dest='file_format', choices=EXPORT_FORMATS, default='csv',
+                            help='Dosya formatı.')
+        parser.add_argument('--gzip', action='store_true', help='Çıktıyı gzip ile sıkıştırır.')
+        parser.add_argument('--output', '-o', help='Çıktı dosyası (verilmezse standart çıktıya yazılır).')
+        parser.add_argument('--site', type=int, help='Site ID\'sine göre filtreleme.')
+        parser.add_argument('--visit-type', choices=['homepage', 'article'], help='Ziyaret türüne göre filtreleme.')
+        parser.add_argument('--start-date', help='Başlangıç tarihi (YYYY-MM-DD). --end-date ile birlikte kullanılır.')
+        parser.add_argument('--end-date', help='Bitiş tarihi (YYYY-MM-DD). --start-date ile birlikte kullanılır.')
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                            help='Veritabanından tek seferde okunacak kayıt sayısı.')
+
+    def handle(self, *args, **options):
+        queryset = filter_visitor_analytics(
+            VisitorAnalytics.objects.all(),
+            site_id=options['site'],
+            visit_type=options['visit_type'],
+            start_date=options['start_date'],
+            end_date=options['end_date'],
+        )
+        chunks = stream_export(
+            queryset, file_format=options['file_format'], gzip=options['gzip'], chunk_size=options['chunk_size']
+        )
+
+        if options['output']:
+            mode = 'wb' if options['gzip'] else 'w'
+            encoding = None if options['gzip'] else 'utf-8'
+            with open(options['output'], mode, encoding=encoding, newline='' if encoding else None) as output:
+                for chunk in chunks:
+                    output.write(chunk)
+            self.stderr.write(self.style.SUCCESS(f"Dışa aktarma tamamlandı: {options['output']}"))
+        else:
+            output = sys.stdout.buffer if options['gzip'] else self.stdout
+            for chunk in chunks:
+                if options['gzip']:
+                    output.write(chunk)
+                else:
+                    output.write(chunk, ending='')
+            output.flush()
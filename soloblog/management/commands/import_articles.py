@@ -0,0 +1,91 @@
+import os
+import time
+
+from django.core.files import File
+from django.core.management.base import BaseCommand, CommandError
+
+from soloblog.importer import detect_format, get_import_settings, run_import
+from soloblog.models import ArticleImportJob, Category
+
+
+class Command(BaseCommand):
+    help = ('NDJSON veya zip (NDJSON + resimler) dosyasından makaleleri, yorumları ve resimleri toplu olarak içe '
+            'aktarır. Kayıtlar parçalar halinde bulk_create ile yazılır, resim türevleri process havuzunda '
+            'üretilir. Yarıda kalan işler --resume ile kaldığı kontrol noktasından devam ettirilebilir.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', nargs='?', help='İçe aktarılacak .ndjson, .jsonl veya .zip dosyası.')
+        parser.add_argument('--site', type=int, help='Makalelerin ekleneceği site ID\'si (yeni işlerde zorunlu).')
+        parser.add_argument('--category', help='Kategorisi belirtilmemiş kayıtlar için kategori slug\'ı veya ID\'si.')
+        parser.add_argument('--resume', type=int, metavar='JOB_ID', help='Yarıda kalan işi devam ettirir.')
+        parser.add_argument('--force', action='store_true',
+                            help='"Çalışıyor" görünen (ör. süreci ölmüş) bir işi devralır.')
+        parser.add_argument('--chunk-size', type=int, help='Tek transaction\'da yazılacak makale sayısı.')
+        parser.add_argument('--image-workers', type=int, help='Resim türevi üreten süreç sayısı.')
+
+    def handle(self, *args, **options):
+        if options['resume']:
+            job_id = options['resume']
+            if not ArticleImportJob.objects.filter(pk=job_id).exists():
+                raise CommandError(f"İçe aktarma işi bulunamadı: {job_id}")
+        else:
+            job_id = self._create_job(options).pk
+            self.stdout.write(f"İçe aktarma işi #{job_id} oluşturuldu.")
+
+        import_options = get_import_settings()
+        if options['chunk_size']:
+            import_options['CHUNK_SIZE'] = options['chunk_size']
+        if options['image_workers']:
+            import_options['IMAGE_WORKERS'] = options['image_workers']
+
+        started = time.monotonic()
+
+        def progress(job):
+            elapsed = max(time.monotonic() - started, 1e-6)
+            if job.status == 'processing_images':
+                self.stdout.write(f"  resim: {job.processedImages} işlendi, {job.failedImages} hatalı")
+            else:
+                self.stdout.write(f"  kayıt: {job.processedRecords}, makale: {job.importedArticles} "
+                                  f"({job.importedArticles / elapsed:,.0f}/sn), atlanan: {job.skippedRecords}")
+
+        try:
+            job = run_import(job_id, force=options['force'], options=import_options, progress=progress)
+        except Exception as exc:
+            raise CommandError(f"İçe aktarma işi #{job_id} başarısız oldu: {exc}. "
+                               f"Düzelttikten sonra --resume {job_id} ile devam ettirebilirsiniz.") from exc
+        if job is None:
+            raise CommandError(f"İçe aktarma işi #{job_id} başka bir süreçte çalışıyor veya tamamlanmış "
+                               f"(devralmak için --force).")
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"İş #{job.pk} {elapsed:.1f} sn'de tamamlandı: {job.importedArticles} makale, "
+            f"{job.importedComments} yorum, {job.importedImages} resim ({job.processedImages} işlendi, "
+            f"{job.failedImages} hatalı), {job.skippedRecords} kayıt atlandı."
+        ))
+        for error in job.errors[:10]:
+            self.stderr.write(self.style.WARNING(f"  {error}"))
+
+    @staticmethod
+    def _create_job(options):
+        path = options['path']
+        if not path or not os.path.isfile(path):
+            raise CommandError("İçe aktarılacak dosya bulunamadı.")
+        source_format = detect_format(path)
+        if source_format is None:
+            raise CommandError("Dosya .ndjson, .jsonl veya .zip uzantılı olmalıdır.")
+        if not options['site']:
+            raise CommandError("--site parametresi zorunludur.")
+
+        category = None
+        if options['category']:
+            lookup = {'id': options['category']} if options['category'].isdigit() else {'slug': options['category']}
+            category = Category.objects.filter(site_id=options['site'], **lookup).first()
+            if category is None:
+                raise CommandError(f"Kategori bulunamadı: {options['category']}")
+
+        job = ArticleImportJob(site_id=options['site'], sourceFormat=source_format, defaultCategory=category)
+        with open(path, 'rb') as source:
+            job.sourceFile.save(os.path.basename(path), File(source), save=False)
+        job.save()
+        return job
@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand
+
+from soloblog.analytics.partitions import archive_partitions, ensure_partitions, is_partitioned, list_partitions
+
+
+class Command(BaseCommand):
+    help = ('VisitorAnalytics aylık bölümlerini yönetir: gelecek aylar için bölüm oluşturur, saklama süresini '
+            'aşan bölümleri sıkıştırılmış CSV olarak arşivleyip siler.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--list', action='store_true', help='Mevcut bölümleri listeler.')
+        parser.add_argument('--skip-ensure', action='store_true', help='Yeni bölüm oluşturmayı atlar.')
+        parser.add_argument('--skip-archive', action='store_true', help='Arşivlemeyi atlar.')
+        parser.add_argument('--months-ahead', type=int, help='Önceden oluşturulacak ay sayısı.')
+        parser.add_argument('--retention-months', type=int, help='Ham verinin saklanacağı ay sayısı.')
+        parser.add_argument('--archive-dir', help='Arşiv dosyalarının yazılacağı dizin.')
+        parser.add_argument('--keep-table', action='store_true',
+                            help='Arşivlenen bölümü silmez, sadece ana tablodan ayırır.')
+        parser.add_argument('--dry-run', action='store_true', help='Arşivlenecek bölümleri sadece listeler.')
+
+    def handle(self, *args, **options):
+        if not is_partitioned():
+            self.stdout.write(self.style.WARNING(
+                "VisitorAnalytics tablosu bölümlenmemiş (PostgreSQL gerekli), işlem yapılmadı."
+            ))
+            return
+
+        if options['list']:
+            for month, name in list_partitions():
+                self.stdout.write(f"{month:%Y-%m}  {name}")
+            return
+
+        if not options['skip_ensure']:
+            created = ensure_partitions(months_ahead=options['months_ahead'])
+            self.stdout.write(self.style.SUCCESS(f"{len(created)} yeni bölüm oluşturuldu: {', '.join(created) or '-'}"))
+
+        if not options['skip_archive']:
+            archived = archive_partitions(
+                retention_months=options['retention_months'],
+                archive_dir=options['archive_dir'],
+                drop=not options['keep_table'],
+                dry_run=options['dry_run'],
+            )
+            label = "arşivlenecek" if options['dry_run'] else "arşivlendi"
+            self.stdout.write(self.style.SUCCESS(f"{len(archived)} bölüm {label}: {', '.join(archived) or '-'}"))
@@ -0,0 +1,47 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from soloblog.renditions import claim_renditions, get_rendition_settings, process_renditions, rendition_executor
+
+
+class Command(BaseCommand):
+    help = ('Resim türevi kuyruğunu (ImageRendition) işleyen worker. Bekleyen türevler sahiplenilir ve process '
+            'havuzunda üretilir. Birden fazla sunucuda paralel çalıştırılabilir; IMAGE_RENDITIONS RUNNER ayarı '
+            '"worker" olduğunda web süreçleri türev üretmez, yalnızca kuyruğa ekler.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, help='Process havuzundaki süreç sayısı.')
+        parser.add_argument('--batch-size', type=int, help='Tek seferde sahiplenilecek türev sayısı.')
+        parser.add_argument('--sleep', type=float, default=2.0, help='Kuyruk boşken bekleme süresi (saniye).')
+        parser.add_argument('--once', action='store_true', help='Kuyruk boşaldığında çıkar.')
+
+    def handle(self, *args, **options):
+        rendition_options = get_rendition_settings()
+        if options['batch_size']:
+            rendition_options['BATCH_SIZE'] = options['batch_size']
+        workers = options['workers'] or rendition_options['WORKERS']
+
+        done = failed = 0
+        self.stdout.write(f"Resim türevi worker'ı başladı ({workers} süreç).")
+        with rendition_executor(workers) as executor:
+            try:
+                while True:
+                    claimed = claim_renditions(rendition_options['BATCH_SIZE'], options=rendition_options)
+                    if not claimed:
+                        if options['once']:
+                            break
+                        close_old_connections()
+                        time.sleep(options['sleep'])
+                        continue
+                    started = time.monotonic()
+                    results = process_renditions(claimed, executor, rendition_options)
+                    errors = sum(1 for error in results.values() if error)
+                    done += len(results) - errors
+                    failed += errors
+                    self.stdout.write(f"  {len(results) - errors} türev üretildi, {errors} hatalı "
+                                      f"({time.monotonic() - started:.2f} sn)")
+            except KeyboardInterrupt:
+                self.stdout.write("Durduruluyor...")
+        self.stdout.write(self.style.SUCCESS(f"Toplam {done} türev üretildi, {failed} deneme başarısız oldu."))
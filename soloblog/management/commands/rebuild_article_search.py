@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from soloblog.models import Article
+from soloblog.search import fallback_indexes, uses_postgres_search, update_search_vectors
+
+
+class Command(BaseCommand):
+    help = ('Makalelerin tam metin arama vektörlerini yeniden üretir (ör. ARTICLE_SEARCH dil yapılandırmaları '
+            'değiştirildikten sonra). PostgreSQL dışındaki veritabanlarında süreç içi indeks önbelleğini temizler.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--site', type=int, help='Yalnızca bu site ID\'sine ait makaleler.')
+        parser.add_argument('--language', help='Yalnızca bu dildeki makaleler (ör. tr).')
+
+    def handle(self, *args, **options):
+        queryset = Article.objects.all()
+        if options['site']:
+            queryset = queryset.filter(site_id=options['site'])
+        if options['language']:
+            queryset = queryset.filter(language=options['language'])
+
+        if not uses_postgres_search(queryset.db):
+            fallback_indexes.clear()
+            self.stdout.write(self.style.WARNING(
+                "Veritabanı PostgreSQL değil; arama süreç içi indeks ile yapılır, vektör üretilmedi."
+            ))
+            return
+
+        updated = update_search_vectors(queryset)
+        self.stdout.write(self.style.SUCCESS(f"{updated} makalenin arama vektörü güncellendi."))
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from soloblog.models import Article
+from soloblog.moderation import recalculate_comment_counters
+
+
+class Command(BaseCommand):
+    help = ('Makalelerin onaylı yorum sayısı ve puan sayaçlarını yorumlardan yeniden hesaplar (ör. yorumlar '
+            'veritabanında doğrudan değiştirildikten sonra).')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--site', type=int, help='Yalnızca bu site ID\'sine ait makaleler.')
+
+    def handle(self, *args, **options):
+        queryset = Article.objects.all()
+        if options['site']:
+            queryset = queryset.filter(site_id=options['site'])
+        updated = recalculate_comment_counters(queryset)
+        self.stdout.write(self.style.SUCCESS(f"{updated} makalenin yorum sayaçları yeniden hesaplandı."))
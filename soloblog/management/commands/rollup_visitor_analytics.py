@@ -0,0 +1,35 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from soloblog.analytics.rollups import DEFAULT_BATCH_SIZE, reset_rollups, run_rollup
+
+
+class Command(BaseCommand):
+    help = 'VisitorAnalytics kayıtlarını son işlenen ID\'den itibaren saatlik/günlük/aylık rollup tablolarına işler'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                            help='Her adımda okunacak ham kayıt sayısı.')
+        parser.add_argument('--rebuild', action='store_true',
+                            help='Mevcut rollup kayıtlarını silip baştan hesaplar.')
+        parser.add_argument('--loop', action='store_true',
+                            help='Sürekli çalışan işçi (worker) olarak çalışır.')
+        parser.add_argument('--interval', type=int, default=60,
+                            help='--loop modunda iki çalışma arasındaki bekleme süresi (saniye).')
+
+    def handle(self, *args, **options):
+        if options['rebuild']:
+            reset_rollups()
+            self.stdout.write(self.style.WARNING("Mevcut rollup kayıtları silindi, baştan hesaplanıyor..."))
+
+        while True:
+            started = time.monotonic()
+            processed = run_rollup(batch_size=options['batch_size'])
+            elapsed = time.monotonic() - started
+            self.stdout.write(self.style.SUCCESS(
+                f"{processed} ziyaret kaydı {elapsed:.2f} sn içinde rollup tablolarına işlendi."
+            ))
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
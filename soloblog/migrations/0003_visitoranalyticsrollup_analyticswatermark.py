@@ -0,0 +1,49 @@
+# Generated by Django 5.1.3 on 2026-10-18 01:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sites', '0002_alter_domain_unique'),
+        ('soloblog', '0002_alter_comment_phonenumber'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AnalyticsWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True, verbose_name='İş Adı')),
+                ('lastId', models.BigIntegerField(default=0, verbose_name='Son İşlenen Kayıt ID')),
+                ('lastVisitDate', models.DateTimeField(blank=True, null=True, verbose_name='Son İşlenen Ziyaret Tarihi')),
+                ('updatedAt', models.DateTimeField(auto_now=True, verbose_name='Güncellenme Tarihi')),
+            ],
+            options={
+                'verbose_name': 'Analitik İşaretçisi',
+                'verbose_name_plural': 'Analitik İşaretçileri',
+            },
+        ),
+        migrations.CreateModel(
+            name='VisitorAnalyticsRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('createdAt', models.DateTimeField(auto_now_add=True, help_text='Oluşturulma tarihi')),
+                ('updatedAt', models.DateTimeField(auto_now=True, help_text='Son güncelleme tarihi')),
+                ('granularity', models.CharField(choices=[('hour', 'Saatlik'), ('day', 'Günlük'), ('month', 'Aylık')], max_length=10, verbose_name='Zaman Dilimi')),
+                ('period', models.DateTimeField(help_text='UTC olarak kesilmiş dönem başlangıcı.', verbose_name='Dönem Başlangıcı')),
+                ('dimension', models.CharField(choices=[('total', 'Toplam'), ('visit_type', 'Ziyaret Tipi'), ('country', 'Ülke'), ('city', 'Şehir'), ('device_type', 'Cihaz Türü'), ('operating_system', 'İşletim Sistemi'), ('browser', 'Tarayıcı'), ('is_bounce', 'Bounce Durumu')], max_length=30, verbose_name='Boyut')),
+                ('value', models.CharField(blank=True, default='', max_length=100, verbose_name='Boyut Değeri')),
+                ('count', models.PositiveBigIntegerField(default=0, verbose_name='Ziyaret Sayısı')),
+                ('site', models.ForeignKey(help_text='Bu kaydın ait olduğu siteyi belirtir.', on_delete=django.db.models.deletion.CASCADE, related_name='%(class)ss', to='sites.site')),
+            ],
+            options={
+                'verbose_name': 'Ziyaretçi İstatistiği Özeti',
+                'verbose_name_plural': 'Ziyaretçi İstatistiği Özetleri',
+                'indexes': [models.Index(fields=['site', 'granularity', 'dimension', 'period'], name='soloblog_rollup_lookup_idx')],
+                'unique_together': {('site', 'granularity', 'period', 'dimension', 'value')},
+            },
+        ),
+    ]
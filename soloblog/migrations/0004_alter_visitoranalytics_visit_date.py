@@ -0,0 +1,19 @@
+# Generated by Django 5.1.3 on 2026-10-18 01:15
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('soloblog', '0003_visitoranalyticsrollup_analyticswatermark'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='visitoranalytics',
+            name='visit_date',
+            field=models.DateTimeField(default=django.utils.timezone.now, verbose_name='Ziyaret Tarihi'),
+        ),
+    ]
@@ -0,0 +1,108 @@
+# Generated by Django 5.1.3 on 2026-10-18 01:17
+"""
+VisitorAnalytics tablosunu PostgreSQL üzerinde `visit_date` alanına göre aylık bölümlenmiş (partitioned)
+tabloya dönüştürür. Mevcut tablo yeniden adlandırılır, aynı yapıda bölümlenmiş bir ana tablo oluşturulur,
+veriler kopyalanır ve indeksler/yabancı anahtarlar yeniden tanımlanır.
+
+Bölümlenmiş tablolarda birincil anahtar bölümleme alanını içermek zorunda olduğundan PK (id, visit_date)
+olur; `id` benzersizliğini sekans sağlar. Büyük tablolarda bu migration bakım penceresinde çalıştırılmalıdır.
+PostgreSQL dışındaki veritabanlarında yalnızca bileşik indeks eklenir.
+"""
+import datetime
+
+from django.db import migrations, models
+
+PARENT = 'soloblog_visitoranalytics'
+LEGACY = 'soloblog_visitoranalytics_unpartitioned'
+SEQUENCE = 'soloblog_visitoranalytics_id_seq'
+MONTHS_AHEAD = 3
+
+
+def _add_months(value, months):
+    index = value.year * 12 + value.month - 1 + months
+    return value.replace(year=index // 12, month=index % 12 + 1)
+
+
+def _month_start(value):
+    value = value.astimezone(datetime.timezone.utc)
+    return datetime.datetime(value.year, value.month, 1, tzinfo=datetime.timezone.utc)
+
+
+def partition_visitor_analytics(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != 'postgresql':
+        return
+
+    quote = schema_editor.quote_name
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_partitioned_table pt JOIN pg_class c ON c.oid = pt.partrelid "
+            "WHERE c.relname = %s AND pg_table_is_visible(c.oid)",
+            [PARENT]
+        )
+        if cursor.fetchone():
+            return
+
+        # Yeniden oluşturulacak indeksler (PK hariç) ve yabancı anahtarlar
+        cursor.execute(
+            "SELECT indexdef FROM pg_indexes WHERE schemaname = current_schema() AND tablename = %s "
+            "AND indexname NOT IN (SELECT conname FROM pg_constraint WHERE conrelid = %s::regclass AND contype = 'p')",
+            [PARENT, PARENT]
+        )
+        index_definitions = [row[0] for row in cursor.fetchall()]
+        cursor.execute(
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint WHERE conrelid = %s::regclass AND contype = 'f'",
+            [PARENT]
+        )
+        foreign_keys = cursor.fetchall()
+        cursor.execute(f"SELECT MIN(visit_date), MAX(id) FROM {quote(PARENT)}")
+        first_visit, max_id = cursor.fetchone()
+
+        cursor.execute(f"ALTER TABLE {quote(PARENT)} RENAME TO {quote(LEGACY)}")
+        cursor.execute(
+            f"CREATE TABLE {quote(PARENT)} (LIKE {quote(LEGACY)} INCLUDING DEFAULTS INCLUDING STORAGE) "
+            f"PARTITION BY RANGE (visit_date)"
+        )
+        cursor.execute(f"ALTER TABLE {quote(PARENT)} ALTER COLUMN id DROP DEFAULT")
+
+        # İlk kayıttan itibaren aylık bölümler + ileriye dönük MONTHS_AHEAD ay + aralık dışı kayıtlar için varsayılan bölüm
+        now = datetime.datetime.now(datetime.timezone.utc)
+        month = _month_start(first_visit or now)
+        last_month = _add_months(_month_start(now), MONTHS_AHEAD)
+        while month <= last_month:
+            cursor.execute(
+                f"CREATE TABLE {quote(f'{PARENT}_p{month:%Y%m}')} PARTITION OF {quote(PARENT)} "
+                f"FOR VALUES FROM (%s) TO (%s)",
+                [month, _add_months(month, 1)]
+            )
+            month = _add_months(month, 1)
+        cursor.execute(f"CREATE TABLE {quote(f'{PARENT}_default')} PARTITION OF {quote(PARENT)} DEFAULT")
+
+        cursor.execute(f"INSERT INTO {quote(PARENT)} SELECT * FROM {quote(LEGACY)}")
+        cursor.execute(f"DROP TABLE {quote(LEGACY)}")
+
+        cursor.execute(f"ALTER TABLE {quote(PARENT)} ADD CONSTRAINT {quote(f'{PARENT}_pkey')} PRIMARY KEY (id, visit_date)")
+        for definition in index_definitions:
+            cursor.execute(definition)
+        for name, definition in foreign_keys:
+            cursor.execute(f"ALTER TABLE {quote(PARENT)} ADD CONSTRAINT {quote(name)} {definition}")
+
+        cursor.execute(f"CREATE SEQUENCE {quote(SEQUENCE)} OWNED BY {quote(PARENT)}.id")
+        cursor.execute(f"ALTER TABLE {quote(PARENT)} ALTER COLUMN id SET DEFAULT nextval('{SEQUENCE}'::regclass)")
+        cursor.execute("SELECT setval(%s, %s, %s)", [SEQUENCE, max_id or 1, max_id is not None])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('soloblog', '0004_alter_visitoranalytics_visit_date'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='visitoranalytics',
+            index=models.Index(fields=['site', 'visit_date'], name='soloblog_va_site_date_idx'),
+        ),
+        # Geri alma işleminde tablo bölümlenmiş olarak kalır; Django modeli her iki yapıyla da çalışır.
+        migrations.RunPython(partition_visitor_analytics, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.1.3 on 2026-10-18 01:21
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sites', '0002_alter_domain_unique'),
+        ('soloblog', '0005_visitoranalytics_partitioning'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VisitorUniqueSketch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('createdAt', models.DateTimeField(auto_now_add=True, help_text='Oluşturulma tarihi')),
+                ('updatedAt', models.DateTimeField(auto_now=True, help_text='Son güncelleme tarihi')),
+                ('day', models.DateField(help_text='UTC olarak ziyaret günü.', verbose_name='Gün')),
+                ('registers', models.BinaryField(help_text='zlib ile sıkıştırılmış.', verbose_name="HyperLogLog Register'ları")),
+                ('site', models.ForeignKey(help_text='Bu kaydın ait olduğu siteyi belirtir.', on_delete=django.db.models.deletion.CASCADE, related_name='%(class)ss', to='sites.site')),
+            ],
+            options={
+                'verbose_name': 'Tekil Ziyaretçi Taslağı',
+                'verbose_name_plural': 'Tekil Ziyaretçi Taslakları',
+                'indexes': [models.Index(fields=['day', 'site'], name='soloblog_sketch_day_idx')],
+                'unique_together': {('site', 'day')},
+            },
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.1.3 on 2026-10-18 01:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('soloblog', '0006_visitoruniquesketch'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(fields=['site', 'createdAt', 'id'], name='soloblog_article_site_cr_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['site', 'createdAt', 'id'], name='soloblog_comment_site_cr_idx'),
+        ),
+    ]
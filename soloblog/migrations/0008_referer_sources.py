@@ -0,0 +1,52 @@
+# Generated by Django 5.1.3 on 2026-10-18 01:29
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sites', '0002_alter_domain_unique'),
+        ('soloblog', '0007_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RefererSource',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('domain', models.CharField(help_text='Küçük harfli, "www." öneki olmadan.', max_length=255, verbose_name='Alan Adı')),
+                ('path', models.CharField(blank=True, default='', help_text='Sorgu parametreleri ve parça (#) olmadan, sondaki "/" silinmiş yol.', max_length=255, verbose_name='Yol')),
+                ('createdAt', models.DateTimeField(auto_now_add=True, verbose_name='Oluşturulma Tarihi')),
+            ],
+            options={
+                'verbose_name': 'Yönlendiren Kaynak',
+                'verbose_name_plural': 'Yönlendiren Kaynaklar',
+                'unique_together': {('domain', 'path')},
+            },
+        ),
+        migrations.AddField(
+            model_name='visitoranalytics',
+            name='referer_source',
+            field=models.ForeignKey(blank=True, db_index=False, help_text="Yönlendiren URL'nin normalize edilmiş (alan adı + yol) karşılığı.", null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='visitor_analytics', to='soloblog.referersource', verbose_name='Yönlendiren Kaynak'),
+        ),
+        migrations.CreateModel(
+            name='RefererDailyCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('createdAt', models.DateTimeField(auto_now_add=True, help_text='Oluşturulma tarihi')),
+                ('updatedAt', models.DateTimeField(auto_now=True, help_text='Son güncelleme tarihi')),
+                ('day', models.DateField(help_text='UTC olarak ziyaret günü.', verbose_name='Gün')),
+                ('count', models.PositiveIntegerField(default=0, verbose_name='Ziyaret Sayısı')),
+                ('site', models.ForeignKey(help_text='Bu kaydın ait olduğu siteyi belirtir.', on_delete=django.db.models.deletion.CASCADE, related_name='%(class)ss', to='sites.site')),
+                ('source', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='daily_counts', to='soloblog.referersource', verbose_name='Yönlendiren Kaynak')),
+            ],
+            options={
+                'verbose_name': 'Günlük Yönlendiren Sayısı',
+                'verbose_name_plural': 'Günlük Yönlendiren Sayıları',
+                'indexes': [models.Index(fields=['site', 'day'], name='soloblog_refcount_site_day_idx')],
+                'unique_together': {('site', 'day', 'source')},
+            },
+        ),
+    ]
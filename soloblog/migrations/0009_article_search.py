@@ -0,0 +1,56 @@
+# Generated by Django 5.1.3 on 2026-10-18 01:36
+"""
+Makalelere dil ve tam metin arama vektörü alanlarını ekler. PostgreSQL üzerinde mevcut makalelerin vektörleri
+dil bazında üretilir ve `searchVector` alanına GIN indeksi eklenir; diğer veritabanlarında yalnızca alanlar eklenir.
+"""
+import django.contrib.postgres.search
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations, models
+
+INDEX_NAME = 'soloblog_article_search_gin'
+
+# Migration anındaki dil -> metin arama yapılandırması eşleşmesi (bkz. soloblog.search.DEFAULTS)
+CONFIGS = {'en': 'english', 'tr': 'turkish', 'de': 'german', 'fr': 'french', 'nl': 'dutch', 'ar': 'arabic'}
+
+
+def build_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    Article = apps.get_model('soloblog', 'Article')
+    for language in Article.objects.order_by().values_list('language', flat=True).distinct():
+        config = CONFIGS.get(language, 'simple')
+        Article.objects.filter(language=language).update(
+            searchVector=SearchVector('title', weight='A', config=config)
+            + SearchVector('metaDescription', weight='B', config=config)
+            + SearchVector('content', weight='C', config=config)
+        )
+    schema_editor.execute(
+        f"CREATE INDEX IF NOT EXISTS {INDEX_NAME} ON soloblog_article USING gin (\"searchVector\")"
+    )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(f"DROP INDEX IF EXISTS {INDEX_NAME}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('soloblog', '0008_referer_sources'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='language',
+            field=models.CharField(choices=[('en', 'English'), ('tr', 'Türkçe'), ('de', 'Deutsch'), ('fr', 'Français'), ('nl', 'Nederlands (Hollanda Felemenkçesi)'), ('ar', 'العربية')], default='en', help_text='Tam metin aramada kullanılacak dil yapılandırmasını belirler.', max_length=7, verbose_name='Dil'),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='searchVector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, help_text='Başlık, meta açıklama ve içerikten üretilen tsvector (yalnızca PostgreSQL). GIN indeksi migration ile eklenir.', null=True, verbose_name='Arama Vektörü'),
+        ),
+        migrations.RunPython(build_search_index, drop_search_index),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.1.3 on 2026-10-18 01:44
+
+import django.db.models.deletion
+import soloblog.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sites', '0002_alter_domain_unique'),
+        ('soloblog', '0009_article_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArticleImportJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('createdAt', models.DateTimeField(auto_now_add=True, help_text='Oluşturulma tarihi')),
+                ('updatedAt', models.DateTimeField(auto_now=True, help_text='Son güncelleme tarihi')),
+                ('sourceFile', models.FileField(upload_to=soloblog.models.import_upload_path, verbose_name='Kaynak Dosya')),
+                ('sourceFormat', models.CharField(choices=[('ndjson', 'NDJSON'), ('zip', 'Zip (NDJSON + resimler)')], max_length=10, verbose_name='Dosya Biçimi')),
+                ('status', models.CharField(choices=[('pending', 'Bekliyor'), ('running', 'Kayıtlar Aktarılıyor'), ('processing_images', 'Resimler İşleniyor'), ('completed', 'Tamamlandı'), ('failed', 'Hata')], default='pending', max_length=20, verbose_name='Durum')),
+                ('processedRecords', models.PositiveIntegerField(default=0, help_text='Kaynak dosyada işlenen kayıt sayısı (devam noktası).', verbose_name='İşlenen Kayıt')),
+                ('importedArticles', models.PositiveIntegerField(default=0, verbose_name='Eklenen Makale')),
+                ('importedComments', models.PositiveIntegerField(default=0, verbose_name='Eklenen Yorum')),
+                ('importedImages', models.PositiveIntegerField(default=0, verbose_name='Eklenen Resim')),
+                ('skippedRecords', models.PositiveIntegerField(default=0, verbose_name='Atlanan Kayıt')),
+                ('imageCheckpoint', models.BigIntegerField(default=0, help_text="Bu ID'ye kadar olan resimler işlendi.", verbose_name='Resim Kontrol Noktası')),
+                ('processedImages', models.PositiveIntegerField(default=0, verbose_name='İşlenen Resim')),
+                ('failedImages', models.PositiveIntegerField(default=0, verbose_name='Hatalı Resim')),
+                ('errors', models.JSONField(blank=True, default=list, help_text='İlk hatalı kayıtlar.', verbose_name='Hatalar')),
+                ('lastError', models.TextField(blank=True, null=True, verbose_name='Son Hata')),
+                ('startedAt', models.DateTimeField(blank=True, null=True, verbose_name='Başlangıç')),
+                ('finishedAt', models.DateTimeField(blank=True, null=True, verbose_name='Bitiş')),
+                ('defaultCategory', models.ForeignKey(blank=True, help_text='Kategorisi belirtilmemiş kayıtlar bu kategoriye eklenir.', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='soloblog.category', verbose_name='Varsayılan Kategori')),
+                ('site', models.ForeignKey(help_text='Bu kaydın ait olduğu siteyi belirtir.', on_delete=django.db.models.deletion.CASCADE, related_name='%(class)ss', to='sites.site')),
+            ],
+            options={
+                'verbose_name': 'Makale İçe Aktarma İşi',
+                'verbose_name_plural': 'Makale İçe Aktarma İşleri',
+            },
+        ),
+        migrations.AddField(
+            model_name='image',
+            name='importJob',
+            field=models.ForeignKey(blank=True, help_text='Resim toplu içe aktarma ile eklendiyse, sıkıştırma/boyutlandırma işlemini yapacak iş.', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='images', to='soloblog.articleimportjob', verbose_name='İçe Aktarma İşi'),
+        ),
+        migrations.AddIndex(
+            model_name='articleimportjob',
+            index=models.Index(fields=['site', 'createdAt', 'id'], name='soloblog_import_site_cr_idx'),
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.1.3 on 2026-10-18 01:49
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sites', '0002_alter_domain_unique'),
+        ('soloblog', '0010_article_import_jobs'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='image',
+            name='contentHash',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, help_text='Orijinal dosyanın SHA-256 özeti; aynı içerikli resimlerin türevleri bir kez üretilir.', max_length=64, verbose_name='İçerik Özeti'),
+        ),
+        migrations.CreateModel(
+            name='ImageRendition',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('createdAt', models.DateTimeField(auto_now_add=True, help_text='Oluşturulma tarihi')),
+                ('updatedAt', models.DateTimeField(auto_now=True, help_text='Son güncelleme tarihi')),
+                ('name', models.CharField(help_text='Ör. thumb, card, hero.', max_length=30, verbose_name='Türev Adı')),
+                ('format', models.CharField(help_text='Ör. webp, avif, jpeg.', max_length=10, verbose_name='Format')),
+                ('specHash', models.CharField(help_text='Boyut, kırpma ve kalite ayarlarının özeti.', max_length=16, verbose_name='Ayar Özeti')),
+                ('sourceHash', models.CharField(max_length=64, verbose_name='Kaynak Özeti')),
+                ('file', models.FileField(blank=True, max_length=255, upload_to='', verbose_name='Dosya')),
+                ('width', models.PositiveIntegerField(blank=True, null=True, verbose_name='Genişlik')),
+                ('height', models.PositiveIntegerField(blank=True, null=True, verbose_name='Yükseklik')),
+                ('status', models.CharField(choices=[('pending', 'Bekliyor'), ('processing', 'İşleniyor'), ('done', 'Hazır'), ('failed', 'Hata')], default='pending', max_length=20, verbose_name='Durum')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='Deneme Sayısı')),
+                ('lastError', models.TextField(blank=True, null=True, verbose_name='Son Hata')),
+                ('image', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='renditions', to='soloblog.image', verbose_name='Resim')),
+                ('site', models.ForeignKey(help_text='Bu kaydın ait olduğu siteyi belirtir.', on_delete=django.db.models.deletion.CASCADE, related_name='%(class)ss', to='sites.site')),
+            ],
+            options={
+                'verbose_name': 'Resim Türevi',
+                'verbose_name_plural': 'Resim Türevleri',
+                'indexes': [models.Index(fields=['status', 'id'], name='soloblog_rendition_queue_idx'), models.Index(fields=['sourceHash', 'specHash'], name='soloblog_rendition_src_idx')],
+                'unique_together': {('image', 'name', 'format')},
+            },
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.1.3 on 2026-10-18 01:52
+
+import common.storage
+import soloblog.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('soloblog', '0011_image_renditions'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='advertisement',
+            name='image',
+            field=models.ImageField(help_text='Bu alana reklam görselini yükleyin.', storage=common.storage.content_storage, upload_to='advertisements/', verbose_name='Reklam Görseli'),
+        ),
+        migrations.AlterField(
+            model_name='article',
+            name='image',
+            field=models.ImageField(blank=True, null=True, storage=common.storage.content_storage, upload_to='article_images/', verbose_name='Makale Resmi'),
+        ),
+        migrations.AlterField(
+            model_name='category',
+            name='categoryImage',
+            field=models.ImageField(blank=True, null=True, storage=common.storage.content_storage, upload_to='category_images/', verbose_name='Kategori Görseli'),
+        ),
+        migrations.AlterField(
+            model_name='image',
+            name='imagePath',
+            field=models.ImageField(storage=common.storage.content_storage, upload_to=soloblog.models.get_image_upload_path, verbose_name='Resim Yolu'),
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.1.3 on 2026-10-18 01:54
+
+from django.db import migrations, models
+
+
+def build_category_paths(apps, schema_editor):
+    """
+    Mevcut kategorilerin ağaç yolunu ve derinliğini üst kategori zincirinden hesaplar.
+    """
+    Category = apps.get_model('soloblog', 'Category')
+    parents = dict(Category.objects.values_list('id', 'parent_id'))
+    paths = {}
+
+    def resolve(category_id):
+        chain = []
+        current = category_id
+        # Döngüsel ebeveyn zincirlerine karşı ziyaret edilenler sınırı
+        while current is not None and current not in paths and current not in chain:
+            chain.append(current)
+            current = parents.get(current)
+        prefix, depth = paths.get(current, ('', -1))
+        for node in reversed(chain):
+            depth += 1
+            prefix = f"{prefix}{node:010d}/"
+            paths[node] = (prefix, depth)
+        return paths[category_id]
+
+    categories = list(Category.objects.only('id'))
+    for category in categories:
+        category.path, category.depth = resolve(category.id)
+    Category.objects.bulk_update(categories, ['path', 'depth'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('soloblog', '0012_content_storage'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='depth',
+            field=models.PositiveSmallIntegerField(default=0, editable=False, verbose_name='Derinlik'),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='path',
+            field=models.CharField(blank=True, default='', editable=False, help_text="Kök kategoriden bu kategoriye kadar ID'ler, ör. '0000000003/0000000012/'.", max_length=255, verbose_name='Ağaç Yolu'),
+        ),
+        migrations.RunPython(build_category_paths, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='category',
+            index=models.Index(fields=['path'], name='soloblog_category_path_idx', opclasses=['varchar_pattern_ops']),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.1.3 on 2026-10-18 02:01
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sites', '0002_alter_domain_unique'),
+        ('soloblog', '0013_category_tree'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PageCacheStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('createdAt', models.DateTimeField(auto_now_add=True, help_text='Oluşturulma tarihi')),
+                ('updatedAt', models.DateTimeField(auto_now=True, help_text='Son güncelleme tarihi')),
+                ('pageType', models.CharField(choices=[('home', 'Anasayfa'), ('category', 'Kategori'), ('article', 'Makale Detay')], max_length=20, verbose_name='Sayfa Türü')),
+                ('day', models.DateField(verbose_name='Gün')),
+                ('hits', models.PositiveBigIntegerField(default=0, verbose_name='İsabet')),
+                ('staleHits', models.PositiveBigIntegerField(default=0, help_text='Süresi geçmiş kopyanın sunulup arka planda yenilendiği istekler.', verbose_name='Bayat İsabet')),
+                ('misses', models.PositiveBigIntegerField(default=0, verbose_name='Iskalama')),
+                ('site', models.ForeignKey(help_text='Bu kaydın ait olduğu siteyi belirtir.', on_delete=django.db.models.deletion.CASCADE, related_name='%(class)ss', to='sites.site')),
+            ],
+            options={
+                'verbose_name': 'Sayfa Önbelleği İstatistiği',
+                'verbose_name_plural': 'Sayfa Önbelleği İstatistikleri',
+                'indexes': [models.Index(fields=['day', 'site'], name='soloblog_pagecache_day_idx')],
+                'unique_together': {('site', 'pageType', 'day')},
+            },
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.1.3 on 2026-10-18 02:03
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def count_approved_comments(apps, schema_editor):
+    """
+    Mevcut makalelerin onaylı yorum sayısını ve puan toplamını yorumlardan tek bir UPDATE ile hesaplar.
+    """
+    Article = apps.get_model('soloblog', 'Article')
+    Comment = apps.get_model('soloblog', 'Comment')
+    approved = Comment.objects.filter(article=OuterRef('pk'), approved=True).order_by().values('article')
+    Article.objects.update(
+        approvedCommentCount=Coalesce(Subquery(approved.annotate(total=Count('id')).values('total')), 0),
+        ratingCount=Coalesce(Subquery(approved.annotate(total=Count('rating')).values('total')), 0),
+        ratingSum=Coalesce(Subquery(approved.annotate(total=Sum('rating')).values('total')), 0),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('soloblog', '0014_page_cache_stat'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='approvedCommentCount',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Onaylı Yorum Sayısı'),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='ratingCount',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Puan Sayısı'),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='ratingSum',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Puan Toplamı'),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['site', 'approved', 'createdAt', 'id'], name='soloblog_comment_queue_idx'),
+        ),
+        migrations.RunPython(count_approved_comments, migrations.RunPython.noop),
+    ]
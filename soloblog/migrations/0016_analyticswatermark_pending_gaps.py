@@ -0,0 +1,18 @@
+# Generated by Django 5.1.3 on 2026-10-18 02:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('soloblog', '0015_comment_moderation'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='analyticswatermark',
+            name='pendingGaps',
+            field=models.JSONField(blank=True, default=list, help_text='`lastId` altında kalan ama işlenirken henüz commit edilmemiş ID aralıkları: [başlangıç, bitiş, ilk görülme zamanı (epoch)].', verbose_name='Bekleyen ID Boşlukları'),
+        ),
+    ]
@@ -19,21 +19,23 @@
 #         return self.name
 
 import os
-from io import BytesIO
 
-from PIL import Image as PILImage
+from django.conf import settings
 from django.contrib.auth.models import User
+from django.contrib.postgres.search import SearchVectorField
 from django.contrib.sites.models import Site
 from django.contrib.sites.models import Site
 from django.core.exceptions import ValidationError
-from django.core.files.base import ContentFile
 from django.db import models, transaction
-from django.db.models import F, Max
-from django.db.models.signals import post_delete, pre_save
+from django.db.models import F, Max, Value
+from django.db.models.functions import Concat, Substr
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
 from django.dispatch import receiver
-from django.utils.text import slugify
+from django.utils import timezone
 
 from common.models import AbstractBaseModel
+from common.storage import content_storage
+from common.utils.slug_allocator import allocate_slug
 
 # Eğer Django 3.1+'sa JSONField'i kullanabilirsiniz:
 try:
@@ -59,10 +61,20 @@ class Category(AbstractBaseModel):
     order = models.IntegerField(default=0, verbose_name="Sıra")
     categoryImage = models.ImageField(
         upload_to='category_images/',
+        storage=content_storage,
         blank=True,
         null=True,
         verbose_name="Kategori Görseli"
     )
+    path = models.CharField(
+        max_length=255,
+        blank=True,
+        default='',
+        editable=False,
+        verbose_name="Ağaç Yolu",
+        help_text="Kök kategoriden bu kategoriye kadar ID'ler, ör. '0000000003/0000000012/'."
+    )
+    depth = models.PositiveSmallIntegerField(default=0, editable=False, verbose_name="Derinlik")
 
     class Meta:
         ordering = ['order']
@@ -70,17 +82,38 @@ class Category(AbstractBaseModel):
         verbose_name_plural = "Kategoriler"
         indexes = [
             models.Index(fields=["site"]),  # Site bazlı sorgular
+            # Alt ağaç sorguları: path LIKE '0000000003/%'
+            models.Index(fields=["path"], name="soloblog_category_path_idx", opclasses=["varchar_pattern_ops"]),
         ]
 
     def clean(self):
         if self.parent and self.parent == self:
             raise ValidationError("Kategori kendi kendisinin ebeveyni olamaz.")
+        if self.pk and self.parent_id and self.path and self.parent.path.startswith(self.path):
+            raise ValidationError("Kategori kendi alt kategorisinin altına taşınamaz.")
+
+    def _tree_position(self):
+        """
+        Üst kategorinin yoluna göre (path öneki, derinlik) döner.
+        """
+        if not self.parent_id:
+            return '', 0
+        parent_path, parent_depth = Category.objects.filter(pk=self.parent_id).values_list('path', 'depth').get()
+        if self.pk and parent_path.startswith(self.path or f"{self.pk:010d}/"):
+            raise ValidationError("Kategori kendi alt kategorisinin altına taşınamaz.")
+        return parent_path, parent_depth + 1
 
     def save(self, *args, **kwargs):
+        # Slug tüm sitelerde benzersizdir; boşsa kategori adından oluşturulur
+        self.slug = allocate_slug(self, self.categoryName, allow_unicode=True)
         with transaction.atomic():
+            parent_path, self.depth = self._tree_position()
+            old_path = None
             if self.pk:
                 # Güncelleme işlemi
                 old_category = Category.objects.get(pk=self.pk)
+                old_path, old_depth = old_category.path, old_category.depth
+                self.path = f"{parent_path}{self.pk:010d}/"
                 old_order = old_category.order
                 new_order = self.order
                 if old_order != new_order:
@@ -110,6 +143,16 @@ class Category(AbstractBaseModel):
                         order__gte=self.order
                     ).update(order=F('order') + 1)
             super().save(*args, **kwargs)
+            if old_path is None:
+                # Yol ID içerdiğinden yeni kayıtta insert sonrasında yazılır
+                self.path = f"{parent_path}{self.pk:010d}/"
+                Category.objects.filter(pk=self.pk).update(path=self.path)
+            elif old_path and old_path != self.path:
+                # Taşınan kategorinin tüm alt ağacı tek sorguyla yeni yola alınır
+                Category.objects.filter(path__startswith=old_path).exclude(pk=self.pk).update(
+                    path=Concat(Value(self.path), Substr('path', len(old_path) + 1)),
+                    depth=F('depth') + (self.depth - old_depth),
+                )
 
     def delete(self, *args, **kwargs):
         # Alt kategoriler varsa silme
@@ -133,6 +176,16 @@ def delete_category_image(sender, instance, **kwargs):
         instance.categoryImage.delete(False)
 
 
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_category_tree_cache(sender, instance, **kwargs):
+    """
+    Kategori eklendiğinde, değiştiğinde veya silindiğinde sitenin önbellekteki kategori ağacını geçersiz kılar.
+    """
+    from soloblog.category_tree import invalidate_category_tree
+    invalidate_category_tree(instance.site_id)
+
+
 # Güncelleme sırasında eski resmi silmek için pre_save sinyali
 @receiver(pre_save, sender=Category)
 def delete_old_category_image(sender, instance, **kwargs):
@@ -158,15 +211,33 @@ class Article(AbstractBaseModel):
     active = models.BooleanField(default=True, verbose_name="Aktif")
     slug = models.SlugField(max_length=255, verbose_name="URL Yolu")
     counter = models.IntegerField(default=0, verbose_name="Sayaç")
+    # Yorum sayaçları yalnızca `soloblog.moderation` tarafından `F()` artışlarıyla güncellenir
+    approvedCommentCount = models.PositiveIntegerField(default=0, editable=False, verbose_name="Onaylı Yorum Sayısı")
+    ratingSum = models.PositiveIntegerField(default=0, editable=False, verbose_name="Puan Toplamı")
+    ratingCount = models.PositiveIntegerField(default=0, editable=False, verbose_name="Puan Sayısı")
     meta = models.TextField(blank=True, null=True, verbose_name="Meta Veriler")
     metaDescription = models.TextField(blank=True, null=True, verbose_name="Meta Açıklaması")
     publicationDate = models.DateTimeField(auto_now_add=True, verbose_name="Yayınlanma Tarihi")
     image = models.ImageField(
         upload_to='article_images/',
+        storage=content_storage,
         blank=True,
         null=True,
         verbose_name="Makale Resmi"
     )
+    language = models.CharField(
+        max_length=7,
+        choices=settings.LANGUAGES,
+        default=settings.LANGUAGE_CODE,
+        verbose_name="Dil",
+        help_text="Tam metin aramada kullanılacak dil yapılandırmasını belirler."
+    )
+    searchVector = SearchVectorField(
+        null=True,
+        editable=False,
+        verbose_name="Arama Vektörü",
+        help_text="Başlık, meta açıklama ve içerikten üretilen tsvector (yalnızca PostgreSQL). GIN indeksi migration ile eklenir."
+    )
 
     class Meta:
         verbose_name = "Makale"
@@ -179,21 +250,29 @@ class Article(AbstractBaseModel):
             models.Index(fields=["title"]),  # Başlığa göre aramalar için
             models.Index(fields=["publicationDate"]),  # Tarih sıralama ve sorguları için
             models.Index(fields=["site", "category"]),
+            # Liste servisindeki keyset (cursor) sayfalama: site içinde (createdAt, id) sırası
+            models.Index(fields=["site", "createdAt", "id"], name="soloblog_article_site_cr_idx"),
         ]
 
+    # Kayıt sırasında bellekteki değeri yazılmayan alanlar (bkz. save)
+    DEFERRED_WRITE_FIELDS = ('counter', 'searchVector', 'approvedCommentCount', 'ratingSum', 'ratingCount')
+
+    @property
+    def averageRating(self):
+        return round(self.ratingSum / self.ratingCount, 2) if self.ratingCount else None
+
     def save(self, *args, **kwargs):
-        # Eğer slug boşsa title'dan otomatik oluştur
-        if not self.slug:
-            # allow_unicode=True diyerek UTF-8 desteğini etkinleştiriyoruz.
-            self.slug = slugify(self.title, allow_unicode=True)
-
-        # Eğer oluşan slug database'de varsa, sonuna sayı ekleyerek unique hale getirebilirsiniz.
-        # Basit bir örnek:
-        original_slug = self.slug
-        counter = 1
-        while Article.objects.filter(slug=self.slug).exclude(pk=self.pk).exists():
-            self.slug = f"{original_slug}-{counter}"
-            counter += 1
+        # Slug boşsa title'dan (UTF-8 destekli) oluşturulur; site içinde kullanılıyorsa sonuna sayı eki verilir.
+        self.slug = allocate_slug(self, self.title, scope=('site',), allow_unicode=True)
+
+        # Okunma ve yorum sayaçları yalnızca ilgili servisler tarafından `alan + delta` ile güncellenir;
+        # mevcut kaydı kaydederken bellekteki eski değerin yazılan artışların üzerine yazılmasını önle.
+        # Arama vektörü de kayıt sonrasında veritabanında üretildiğinden bellekteki değer yazılmaz.
+        if not self._state.adding and kwargs.get('update_fields') is None and not kwargs.get('force_insert'):
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.DEFERRED_WRITE_FIELDS
+            ]
 
         super().save(*args, **kwargs)
 
@@ -217,6 +296,8 @@ def delete_old_article_image(sender, instance, **kwargs):
     if instance.pk:
         try:
             old_instance = Article.objects.get(pk=instance.pk)
+            # Kategori değiştiyse eski kategorinin sayfa önbelleği de temizlenir (bkz. purge_article_page_cache)
+            instance._previous_category_id = old_instance.category_id
             # Yeni resim ile eski resim farklı ise eskiyi sil
             if old_instance.image and old_instance.image != instance.image:
                 old_instance.image.delete(False)
@@ -224,6 +305,17 @@ def delete_old_article_image(sender, instance, **kwargs):
             pass
 
 
+@receiver(post_save, sender=Article)
+def update_article_search_vector(sender, instance, using=None, update_fields=None, **kwargs):
+    """
+    Aranan alanlardan biri değiştiyse makalenin tam metin arama vektörünü yeniden üretir (yalnızca PostgreSQL).
+    """
+    from soloblog.search import SEARCH_FIELD_NAMES, update_search_vectors
+    if update_fields is not None and not SEARCH_FIELD_NAMES.intersection(update_fields):
+        return
+    update_search_vectors(Article.objects.using(using or 'default').filter(pk=instance.pk))
+
+
 @receiver(post_delete, sender='soloblog.Article')
 def delete_article_images(sender, instance, **kwargs):
     """
@@ -261,6 +353,7 @@ class Image(AbstractBaseModel):
     )
     imagePath = models.ImageField(
         upload_to=get_image_upload_path,
+        storage=content_storage,
         verbose_name="Resim Yolu"
     )
     resizedImage = models.ImageField(
@@ -269,70 +362,41 @@ class Image(AbstractBaseModel):
         null=True,
         verbose_name="Boyutlandırılmış Resim"
     )
+    importJob = models.ForeignKey(
+        'ArticleImportJob',
+        on_delete=models.SET_NULL,
+        blank=True,
+        null=True,
+        related_name='images',
+        verbose_name="İçe Aktarma İşi",
+        help_text="Resim toplu içe aktarma ile eklendiyse, sıkıştırma/boyutlandırma işlemini yapacak iş."
+    )
+    contentHash = models.CharField(
+        max_length=64,
+        blank=True,
+        default='',
+        db_index=True,
+        editable=False,
+        verbose_name="İçerik Özeti",
+        help_text="Orijinal dosyanın SHA-256 özeti; aynı içerikli resimlerin türevleri bir kez üretilir."
+    )
 
     def save(self, *args, **kwargs):
-        if self.imagePath:
-            self.compress_original_image()
-            if not self.resizedImage:
-                self.create_resized_image()
+        """
+        Orijinal dosyayı olduğu gibi kaydeder. Türevler (thumb, card, hero ...) istek içinde üretilmez;
+        transaction tamamlandıktan sonra `soloblog.renditions` kuyruğuna eklenir.
+        """
+        from soloblog.renditions import content_hash, schedule_renditions
+
+        uploaded = bool(self.imagePath) and not self.imagePath.name.startswith("http") and (
+            not self.imagePath._committed or not self.contentHash
+        )
+        if uploaded:
+            self.contentHash = content_hash(self.imagePath)
         super().save(*args, **kwargs)
-
-    def compress_original_image(self):
-        # eğer field boşsa veya path özelliği yoksa => placeholder olabilir
-        if not self.imagePath or not hasattr(self.imagePath, 'path'):
-            return
-
-        # eğer "http" ile başlıyorsa => yine placeholder
-        if self.imagePath.name.startswith("http"):
-            return
-        """Orijinal resmi sıkıştırarak JPEG formatında kaydet ve orijinal dosyayı sil"""
-        with PILImage.open(self.imagePath) as image:
-            if image.mode in ("RGBA", "P"):
-                image = image.convert("RGB")
-            output = BytesIO()
-            image.save(output, format='JPEG', quality=75)  # Sıkıştırma kalitesini ayarlayabilirsiniz
-            output.seek(0)
-            originalPath = self.imagePath.path
-            self.imagePath.save(self.get_filename('compressed', 'jpg'), ContentFile(output.read()), save=False)
-            if os.path.exists(originalPath):
-                os.remove(originalPath)
-
-    def create_resized_image(self):
-        # eğer URL ise atla
-        if not self.imagePath or not hasattr(self.imagePath, 'path'):
-            return
-        if self.imagePath.name.startswith("http"):
-            return
-        """Resmi kare kırpıp WEBP formatında kaydet"""
-        if not self.imagePath:
-            return
-
-        with PILImage.open(self.imagePath) as image:
-            resizedSize = (543, 543)
-            croppedImage = self.make_square(image, resizedSize)
-            self.resizedImage.save(self.get_filename('resized', 'webp'), ContentFile(croppedImage.read()), save=False)
-
-    def make_square(self, image, size):
-        width, height = image.size
-        newWidth, newHeight = size
-
-        left = (width - newWidth) / 2
-        top = (height - newHeight) / 2
-        right = (width + newWidth) / 2
-        bottom = (height + newHeight) / 2
-
-        croppedImage = image.crop((left, top, right, bottom))
-
-        if croppedImage.size[0] > size[0] or croppedImage.size[1] > size[1]:
-            croppedImage.thumbnail(size, PILImage.LANCZOS)
-
-        output = BytesIO()
-        croppedImage.save(output, format='WEBP')
-        output.seek(0)
-        return output
-
-    def get_filename(self, prefix, extension):
-        return f"{prefix}_{self.pk}.{extension}"
+        if uploaded:
+            image_id = self.pk
+            transaction.on_commit(lambda: schedule_renditions([image_id]))
 
     def delete(self, *args, **kwargs):
         if self.imagePath:
@@ -358,6 +422,57 @@ def delete_image_files(sender, instance, **kwargs):
         instance.resizedImage.delete(save=False)
 
 
+class ImageRendition(AbstractBaseModel):
+    """
+    Bir resmin adlandırılmış türevi (ör. `card` / `webp`). Satırlar aynı zamanda türev üretim kuyruğudur:
+    `pending` durumundaki satırlar worker tarafından sahiplenilip işlenir.
+
+    Türev dosyaları kaynak içeriğin özeti ve türev ayarlarının özetinden türetilen yola yazılır; aynı içerikli
+    resimler aynı dosyayı paylaşır. Dosya, onu kullanan son satır silindiğinde silinir.
+    """
+    STATUS_CHOICES = [
+        ('pending', 'Bekliyor'),
+        ('processing', 'İşleniyor'),
+        ('done', 'Hazır'),
+        ('failed', 'Hata'),
+    ]
+
+    image = models.ForeignKey(Image, on_delete=models.CASCADE, related_name='renditions', verbose_name="Resim")
+    name = models.CharField(max_length=30, verbose_name="Türev Adı", help_text="Ör. thumb, card, hero.")
+    format = models.CharField(max_length=10, verbose_name="Format", help_text="Ör. webp, avif, jpeg.")
+    specHash = models.CharField(
+        max_length=16, verbose_name="Ayar Özeti", help_text="Boyut, kırpma ve kalite ayarlarının özeti."
+    )
+    sourceHash = models.CharField(max_length=64, verbose_name="Kaynak Özeti")
+    file = models.FileField(max_length=255, blank=True, verbose_name="Dosya")
+    width = models.PositiveIntegerField(blank=True, null=True, verbose_name="Genişlik")
+    height = models.PositiveIntegerField(blank=True, null=True, verbose_name="Yükseklik")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending', verbose_name="Durum")
+    attempts = models.PositiveSmallIntegerField(default=0, verbose_name="Deneme Sayısı")
+    lastError = models.TextField(blank=True, null=True, verbose_name="Son Hata")
+
+    class Meta:
+        verbose_name = "Resim Türevi"
+        verbose_name_plural = "Resim Türevleri"
+        unique_together = ('image', 'name', 'format')
+        indexes = [
+            # Worker kuyruğu: bekleyen satırlar ID sırasıyla sahiplenilir
+            models.Index(fields=["status", "id"], name="soloblog_rendition_queue_idx"),
+            # Aynı içerik ve ayarla daha önce üretilmiş türevin bulunması
+            models.Index(fields=["sourceHash", "specHash"], name="soloblog_rendition_src_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.image_id} / {self.name}.{self.format}"
+
+
+@receiver(post_delete, sender=ImageRendition)
+def delete_rendition_file(sender, instance, **kwargs):
+    # Aynı içerikli başka resimler dosyayı kullanmaya devam ediyorsa silinmez
+    if instance.file and not ImageRendition.objects.filter(file=instance.file.name).exists():
+        instance.file.delete(save=False)
+
+
 # Comment Model
 class Comment(AbstractBaseModel):
     """
@@ -376,11 +491,107 @@ class Comment(AbstractBaseModel):
     class Meta:
         verbose_name = "Yorum"
         verbose_name_plural = "Yorumlar"
+        indexes = [
+            # Liste servisindeki keyset (cursor) sayfalama: site içinde (createdAt, id) sırası
+            models.Index(fields=["site", "createdAt", "id"], name="soloblog_comment_site_cr_idx"),
+            # Moderasyon kuyruğu: site içinde bekleyen yorumlar (createdAt, id) sırasıyla
+            models.Index(fields=["site", "approved", "createdAt", "id"], name="soloblog_comment_queue_idx"),
+        ]
+
+    def _counter_state(self):
+        return self.approved, self.article_id, self.rating
+
+    def save(self, *args, **kwargs):
+        # Onay durumu, puan veya makale değişirse makale sayaçları aynı transaction içinde güncellenir
+        from soloblog.moderation import record_comment_change
+        with transaction.atomic():
+            before = None
+            if not self._state.adding:
+                before = Comment.objects.select_for_update().filter(pk=self.pk).values_list(
+                    'approved', 'article_id', 'rating'
+                ).first()
+            super().save(*args, **kwargs)
+            record_comment_change(before, self._counter_state())
+
+    def delete(self, *args, **kwargs):
+        from soloblog.moderation import record_comment_change
+        with transaction.atomic():
+            before = Comment.objects.select_for_update().filter(pk=self.pk).values_list(
+                'approved', 'article_id', 'rating'
+            ).first()
+            result = super().delete(*args, **kwargs)
+            record_comment_change(before, None)
+        return result
 
     def __str__(self):
         return f"{self.firstName} {self.lastName}"
 
 
+def import_upload_path(instance, filename):
+    return f'imports/site_{instance.site_id}/{filename}'
+
+
+class ArticleImportJob(AbstractBaseModel):
+    """
+    NDJSON veya zip dosyasından toplu makale içe aktarma işi.
+
+    Kaynak dosyadaki kayıtlar parçalar (chunk) halinde işlenir; her parçanın makale, yorum ve resim satırları ile
+    `processedRecords` kontrol noktası aynı transaction içinde yazılır. İş yarıda kalırsa kaldığı kayıttan devam eder.
+    Resim türevleri kayıtlar yazıldıktan sonra process havuzunda üretilir; kontrol noktası `imageCheckpoint`
+    (son işlenen resim ID) alanıdır.
+    """
+    FORMAT_CHOICES = [
+        ('ndjson', 'NDJSON'),
+        ('zip', 'Zip (NDJSON + resimler)'),
+    ]
+    STATUS_CHOICES = [
+        ('pending', 'Bekliyor'),
+        ('running', 'Kayıtlar Aktarılıyor'),
+        ('processing_images', 'Resimler İşleniyor'),
+        ('completed', 'Tamamlandı'),
+        ('failed', 'Hata'),
+    ]
+
+    sourceFile = models.FileField(upload_to=import_upload_path, verbose_name="Kaynak Dosya")
+    sourceFormat = models.CharField(max_length=10, choices=FORMAT_CHOICES, verbose_name="Dosya Biçimi")
+    defaultCategory = models.ForeignKey(
+        'Category',
+        on_delete=models.SET_NULL,
+        blank=True,
+        null=True,
+        related_name='+',
+        verbose_name="Varsayılan Kategori",
+        help_text="Kategorisi belirtilmemiş kayıtlar bu kategoriye eklenir."
+    )
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending', verbose_name="Durum")
+    processedRecords = models.PositiveIntegerField(
+        default=0, verbose_name="İşlenen Kayıt", help_text="Kaynak dosyada işlenen kayıt sayısı (devam noktası)."
+    )
+    importedArticles = models.PositiveIntegerField(default=0, verbose_name="Eklenen Makale")
+    importedComments = models.PositiveIntegerField(default=0, verbose_name="Eklenen Yorum")
+    importedImages = models.PositiveIntegerField(default=0, verbose_name="Eklenen Resim")
+    skippedRecords = models.PositiveIntegerField(default=0, verbose_name="Atlanan Kayıt")
+    imageCheckpoint = models.BigIntegerField(
+        default=0, verbose_name="Resim Kontrol Noktası", help_text="Bu ID'ye kadar olan resimler işlendi."
+    )
+    processedImages = models.PositiveIntegerField(default=0, verbose_name="İşlenen Resim")
+    failedImages = models.PositiveIntegerField(default=0, verbose_name="Hatalı Resim")
+    errors = models.JSONField(default=list, blank=True, verbose_name="Hatalar", help_text="İlk hatalı kayıtlar.")
+    lastError = models.TextField(blank=True, null=True, verbose_name="Son Hata")
+    startedAt = models.DateTimeField(blank=True, null=True, verbose_name="Başlangıç")
+    finishedAt = models.DateTimeField(blank=True, null=True, verbose_name="Bitiş")
+
+    class Meta:
+        verbose_name = "Makale İçe Aktarma İşi"
+        verbose_name_plural = "Makale İçe Aktarma İşleri"
+        indexes = [
+            models.Index(fields=["site", "createdAt", "id"], name="soloblog_import_site_cr_idx"),
+        ]
+
+    def __str__(self):
+        return f"İçe aktarma #{self.pk} ({self.get_status_display()})"
+
+
 class PopupAd(models.Model):
     content = models.TextField(
         verbose_name="Reklam İçeriği",
@@ -432,6 +643,7 @@ class Advertisement(AbstractBaseModel):
     )
     image = models.ImageField(
         upload_to='advertisements/',
+        storage=content_storage,
         verbose_name="Reklam Görseli",
         help_text="Bu alana reklam görselini yükleyin."
     )
@@ -473,6 +685,8 @@ class VisitorAnalytics(AbstractBaseModel):
         ('homepage', 'Ana Sayfa'),
         ('article', 'Makale')
     ]
+    # Oturum süresi bu değerin (saniye) altındaysa ziyaret bounce kabul edilir
+    BOUNCE_THRESHOLD_SECONDS = 15
 
     visit_type = models.CharField(
         max_length=20,
@@ -491,7 +705,17 @@ class VisitorAnalytics(AbstractBaseModel):
     ip_address = models.GenericIPAddressField(verbose_name='IP Adresi')
     user_agent = models.TextField(verbose_name='Kullanıcı Tarayıcısı')
     referer = models.URLField(blank=True, null=True, verbose_name='Yönlendiren URL')
-    visit_date = models.DateTimeField(auto_now_add=True, verbose_name='Ziyaret Tarihi')
+    referer_source = models.ForeignKey(
+        'RefererSource',
+        on_delete=models.SET_NULL,
+        related_name='visitor_analytics',
+        verbose_name='Yönlendiren Kaynak',
+        help_text='Yönlendiren URL\'nin normalize edilmiş (alan adı + yol) karşılığı.',
+        blank=True,
+        null=True,
+        db_index=False,  # Sadece rollup sırasında okunur; yazma maliyetini artırmamak için indekslenmez
+    )
+    visit_date = models.DateTimeField(default=timezone.now, verbose_name='Ziyaret Tarihi')
     country = models.CharField(max_length=100, blank=True, null=True, verbose_name='Ülke')
     city = models.CharField(max_length=100, blank=True, null=True, verbose_name='Şehir')
     device_type = models.CharField(max_length=50, blank=True, null=True, verbose_name='Cihaz Türü')
@@ -507,14 +731,20 @@ class VisitorAnalytics(AbstractBaseModel):
             models.Index(fields=["site"]),  # site_id alanına indeks
             models.Index(fields=["article"]),  # article_id alanına indeks
             models.Index(fields=["visit_date"]),  # Zaman bazlı sorgular için
+            # Raporlar önce siteye, sonra tarih aralığına göre filtreler
+            models.Index(fields=["site", "visit_date"], name="soloblog_va_site_date_idx"),
         ]
 
+    @classmethod
+    def compute_bounce(cls, session_duration):
+        """
+        Oturum süresine göre ziyaretin bounce olup olmadığını döner.
+        """
+        return session_duration is not None and session_duration < cls.BOUNCE_THRESHOLD_SECONDS
+
     def save(self, *args, **kwargs):
-        # Oturum süresi 15 saniyeden azsa bounce olarak kabul et
-        if self.session_duration is not None and self.session_duration < 15:
-            self.is_bounce = True
-        else:
-            self.is_bounce = False
+        # Oturum süresi eşik değerinden azsa bounce olarak kabul et
+        self.is_bounce = self.compute_bounce(self.session_duration)
         super().save(*args, **kwargs)
 
     def __str__(self):
@@ -522,6 +752,172 @@ class VisitorAnalytics(AbstractBaseModel):
         return f"{visit_target} - {self.ip_address} - {self.visit_date}"
 
 
+class VisitorAnalyticsRollup(AbstractBaseModel):
+    """
+    VisitorAnalytics kayıtlarının önceden hesaplanmış (rollup) özetleri.
+    Her satır; site, zaman dilimi (saatlik/günlük/aylık), boyut ve boyut değeri için ziyaret sayısını tutar.
+    Raporlar ham tablo yerine bu tablodan okunur.
+    """
+    GRANULARITY_CHOICES = [
+        ('hour', 'Saatlik'),
+        ('day', 'Günlük'),
+        ('month', 'Aylık'),
+    ]
+    DIMENSION_CHOICES = [
+        ('total', 'Toplam'),
+        ('visit_type', 'Ziyaret Tipi'),
+        ('country', 'Ülke'),
+        ('city', 'Şehir'),
+        ('device_type', 'Cihaz Türü'),
+        ('operating_system', 'İşletim Sistemi'),
+        ('browser', 'Tarayıcı'),
+        ('is_bounce', 'Bounce Durumu'),
+    ]
+
+    granularity = models.CharField(max_length=10, choices=GRANULARITY_CHOICES, verbose_name='Zaman Dilimi')
+    period = models.DateTimeField(verbose_name='Dönem Başlangıcı', help_text='UTC olarak kesilmiş dönem başlangıcı.')
+    dimension = models.CharField(max_length=30, choices=DIMENSION_CHOICES, verbose_name='Boyut')
+    value = models.CharField(max_length=100, blank=True, default='', verbose_name='Boyut Değeri')
+    count = models.PositiveBigIntegerField(default=0, verbose_name='Ziyaret Sayısı')
+
+    class Meta:
+        verbose_name = "Ziyaretçi İstatistiği Özeti"
+        verbose_name_plural = "Ziyaretçi İstatistiği Özetleri"
+        unique_together = ('site', 'granularity', 'period', 'dimension', 'value')
+        indexes = [
+            models.Index(fields=["site", "granularity", "dimension", "period"], name="soloblog_rollup_lookup_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.site_id} - {self.granularity} - {self.period} - {self.dimension}={self.value}: {self.count}"
+
+
+class VisitorUniqueSketch(AbstractBaseModel):
+    """
+    Site başına günlük tekil ziyaretçi HyperLogLog taslağı (IP + tarayıcı bilgisine göre).
+    Haftalık/aylık/yıllık ve tüm siteler için tekil ziyaretçi sayıları bu taslaklar birleştirilerek hesaplanır.
+    """
+    day = models.DateField(verbose_name='Gün', help_text='UTC olarak ziyaret günü.')
+    registers = models.BinaryField(verbose_name='HyperLogLog Register\'ları', help_text='zlib ile sıkıştırılmış.')
+
+    class Meta:
+        verbose_name = "Tekil Ziyaretçi Taslağı"
+        verbose_name_plural = "Tekil Ziyaretçi Taslakları"
+        unique_together = ('site', 'day')
+        indexes = [
+            models.Index(fields=["day", "site"], name="soloblog_sketch_day_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.site_id} - {self.day}"
+
+
+class RefererSource(models.Model):
+    """
+    Normalize edilmiş yönlendiren kaynak (alan adı + yol) sözlüğü.
+    Aynı URL metni her ziyarette tekrar saklanmak yerine bu tabloya bir kez yazılır ve ID ile referans verilir.
+    """
+    domain = models.CharField(max_length=255, verbose_name='Alan Adı', help_text='Küçük harfli, "www." öneki olmadan.')
+    path = models.CharField(max_length=255, blank=True, default='', verbose_name='Yol',
+                            help_text='Sorgu parametreleri ve parça (#) olmadan, sondaki "/" silinmiş yol.')
+    createdAt = models.DateTimeField(auto_now_add=True, verbose_name='Oluşturulma Tarihi')
+
+    class Meta:
+        verbose_name = "Yönlendiren Kaynak"
+        verbose_name_plural = "Yönlendiren Kaynaklar"
+        unique_together = ('domain', 'path')
+
+    def __str__(self):
+        return f"{self.domain}{self.path}"
+
+
+class RefererDailyCount(AbstractBaseModel):
+    """
+    Site başına günlük yönlendiren kaynak sayıları. Rollup işlemiyle artımlı olarak güncellenir;
+    kapanan günlerde yalnızca en çok ziyaret getiren K kaynak saklanır. `source` boş ise doğrudan ziyarettir.
+    """
+    day = models.DateField(verbose_name='Gün', help_text='UTC olarak ziyaret günü.')
+    source = models.ForeignKey(
+        RefererSource,
+        on_delete=models.CASCADE,
+        related_name='daily_counts',
+        verbose_name='Yönlendiren Kaynak',
+        blank=True,
+        null=True
+    )
+    count = models.PositiveIntegerField(default=0, verbose_name='Ziyaret Sayısı')
+
+    class Meta:
+        verbose_name = "Günlük Yönlendiren Sayısı"
+        verbose_name_plural = "Günlük Yönlendiren Sayıları"
+        unique_together = ('site', 'day', 'source')
+        indexes = [
+            models.Index(fields=["site", "day"], name="soloblog_refcount_site_day_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.site_id} - {self.day} - {self.source_id}: {self.count}"
+
+
+class AnalyticsWatermark(models.Model):
+    """
+    Artımlı (incremental) analitik işlerinin kaldığı yeri tutar.
+    `lastId` değerine kadar olan VisitorAnalytics kayıtları, `pendingGaps` aralıkları dışında ilgili iş tarafından
+    işlenmiştir.
+    """
+    name = models.CharField(max_length=100, unique=True, verbose_name='İş Adı')
+    lastId = models.BigIntegerField(default=0, verbose_name='Son İşlenen Kayıt ID')
+    lastVisitDate = models.DateTimeField(blank=True, null=True, verbose_name='Son İşlenen Ziyaret Tarihi')
+    pendingGaps = models.JSONField(
+        default=list,
+        blank=True,
+        verbose_name='Bekleyen ID Boşlukları',
+        help_text='`lastId` altında kalan ama işlenirken henüz commit edilmemiş ID aralıkları: '
+                  '[başlangıç, bitiş, ilk görülme zamanı (epoch)].'
+    )
+    updatedAt = models.DateTimeField(auto_now=True, verbose_name='Güncellenme Tarihi')
+
+    class Meta:
+        verbose_name = "Analitik İşaretçisi"
+        verbose_name_plural = "Analitik İşaretçileri"
+
+    def __str__(self):
+        return f"{self.name} - {self.lastId}"
+
+
+class PageCacheStat(AbstractBaseModel):
+    """
+    Sayfa önbelleğinin site, sayfa türü ve gün bazında isabet (hit) / bayat isabet (stale) / ıskalama (miss)
+    sayıları. Sayaçlar süreç içinde biriktirilip periyodik olarak `F()` artışlarıyla yazılır.
+    """
+    PAGE_TYPE_CHOICES = [
+        ('home', 'Anasayfa'),
+        ('category', 'Kategori'),
+        ('article', 'Makale Detay'),
+    ]
+
+    pageType = models.CharField(max_length=20, choices=PAGE_TYPE_CHOICES, verbose_name='Sayfa Türü')
+    day = models.DateField(verbose_name='Gün')
+    hits = models.PositiveBigIntegerField(default=0, verbose_name='İsabet')
+    staleHits = models.PositiveBigIntegerField(
+        default=0,
+        verbose_name='Bayat İsabet',
+        help_text='Süresi geçmiş kopyanın sunulup arka planda yenilendiği istekler.'
+    )
+    misses = models.PositiveBigIntegerField(default=0, verbose_name='Iskalama')
+
+    class Meta:
+        verbose_name = "Sayfa Önbelleği İstatistiği"
+        verbose_name_plural = "Sayfa Önbelleği İstatistikleri"
+        unique_together = ('site', 'pageType', 'day')
+        indexes = [
+            models.Index(fields=["day", "site"], name="soloblog_pagecache_day_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.site_id} - {self.pageType} - {self.day}"
+
+
 class SiteSettings(AbstractBaseModel):
     """
     Site ile ilgili temel ayarları ve meta bilgileri tutar.
@@ -859,4 +1255,97 @@ class Menu(AbstractBaseModel):
 
     class Meta:
         verbose_name = "Menü"
-        verbose_name_plural = "Menüler"
\ No newline at end of file
+        verbose_name_plural = "Menüler"
+
+
+# -----------------------------------------------------------------------------
+# Site bootstrap belgesinin geçersiz kılınması
+# -----------------------------------------------------------------------------
+@receiver(post_save, sender=SiteSettings)
+@receiver(post_delete, sender=SiteSettings)
+@receiver(post_save, sender=HomePageSettings)
+@receiver(post_delete, sender=HomePageSettings)
+@receiver(post_save, sender=FooterSettings)
+@receiver(post_delete, sender=FooterSettings)
+@receiver(post_save, sender=Menu)
+@receiver(post_delete, sender=Menu)
+@receiver(post_save, sender=Advertisement)
+@receiver(post_delete, sender=Advertisement)
+@receiver(post_save, sender='common.SocialMedia')
+@receiver(post_delete, sender='common.SocialMedia')
+@receiver(post_save, sender='common.GoogleApplicationsIntegration')
+@receiver(post_delete, sender='common.GoogleApplicationsIntegration')
+def invalidate_site_bootstrap_cache(sender, instance, **kwargs):
+    """
+    Site bazlı yerleşim verilerinden biri değiştiğinde sitenin önbellekteki bootstrap belgesini geçersiz kılar.
+    """
+    from soloblog.bootstrap import invalidate_site_bootstrap
+    invalidate_site_bootstrap(instance.site_id)
+
+
+@receiver(post_save, sender=Site)
+def invalidate_site_bootstrap_on_site_change(sender, instance, **kwargs):
+    from soloblog.bootstrap import invalidate_site_bootstrap
+    invalidate_site_bootstrap(instance.pk)
+
+
+@receiver(post_save, sender=PopupAd)
+@receiver(pre_delete, sender=PopupAd)
+def invalidate_popup_ad_sites_bootstrap(sender, instance, **kwargs):
+    """
+    Pop-up reklam birden fazla siteye bağlı olabilir; bağlı tüm sitelerin belgesi geçersiz kılınır. Silmede
+    site bağlantıları kayıttan önce silindiğinden pre_delete kullanılır.
+    """
+    if instance.pk is None:
+        return
+    from soloblog.bootstrap import invalidate_site_bootstrap
+    invalidate_site_bootstrap(*instance.sites.values_list('id', flat=True))
+
+
+@receiver(m2m_changed, sender=PopupAd.sites.through)
+def invalidate_popup_ad_m2m_bootstrap(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Pop-up reklamın site bağlantıları değiştiğinde eklenen / çıkarılan sitelerin belgesini geçersiz kılar.
+    """
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+    from soloblog.bootstrap import invalidate_site_bootstrap
+    if reverse:
+        # Site tarafından değiştirildi (site.popup_ads.add(...))
+        invalidate_site_bootstrap(instance.pk)
+    elif action == 'pre_clear':
+        invalidate_site_bootstrap(*instance.sites.values_list('id', flat=True))
+    else:
+        invalidate_site_bootstrap(*(pk_set or ()))
+
+
+# -----------------------------------------------------------------------------
+# Sayfa önbelleğinin bağımlılık takibi
+# -----------------------------------------------------------------------------
+@receiver(post_save, sender=SiteSettings)
+@receiver(post_delete, sender=SiteSettings)
+@receiver(post_save, sender=HomePageSettings)
+@receiver(post_delete, sender=HomePageSettings)
+@receiver(post_save, sender=FooterSettings)
+@receiver(post_delete, sender=FooterSettings)
+@receiver(post_save, sender=Menu)
+@receiver(post_delete, sender=Menu)
+def purge_site_page_cache(sender, instance, **kwargs):
+    """
+    Tema, menü veya site ayarları değiştiğinde sitenin tüm önbellekli sayfalarını geçersiz kılar.
+    Kategori değişiklikleri `invalidate_category_tree` üzerinden aynı şekilde işlenir.
+    """
+    from soloblog.page_cache import purge_site_pages
+    purge_site_pages(instance.site_id)
+
+
+@receiver(post_save, sender=Article)
+@receiver(post_delete, sender=Article)
+def purge_article_page_cache(sender, instance, **kwargs):
+    """
+    Makale değiştiğinde anasayfayı ve makalenin (taşındıysa eski ve yeni) kategori sayfalarını üst kategorileriyle
+    birlikte geçersiz kılar. Makalenin kendi sayfası anahtardaki `updatedAt` sürümüyle yenilenir.
+    """
+    from soloblog.page_cache import purge_article_pages
+    category_ids = {instance.category_id, getattr(instance, '_previous_category_id', None)}
+    purge_article_pages(instance.site_id, category_ids - {None})
@@ -0,0 +1,189 @@
+# soloblog/moderation.py
+"""
+Yorum moderasyonu ve makale başına yorum sayaçları.
+
+Makale listelerinde onaylı yorum sayısını ve ortalama puanı göstermek için her seferinde tüm yorumlar üzerinde
+toplama yapmak yerine `Article` üzerinde denormalize sayaçlar tutulur: `approvedCommentCount`, `ratingSum` ve
+`ratingCount` (ortalama = ratingSum / ratingCount).
+
+- Sayaçlar, yorumun onaylandığı / silindiği transaction içinde `F()` artışlarıyla güncellenir; yorum satırları
+  `SELECT ... FOR UPDATE` ile kilitlendiğinden aynı yorum iki kez sayılamaz.
+- Toplu onay / ret işlemleri ID'leri `BATCH_SIZE` büyüklüğünde gruplar; her grup için yorumları kilitleyen bir
+  SELECT, yorumları güncelleyen / silen bir ifade ve makale sayaçlarını `CASE` ile güncelleyen tek bir UPDATE çalışır.
+- Tekil kayıt / silme işlemleri (`Comment.save` / `Comment.delete`) aynı sayaç güncellemesini kullanır.
+- Sayaçlar bozulursa `recalculate_comment_counters` ile yorumlardan yeniden hesaplanabilir.
+
+Ayarlar `settings.COMMENT_MODERATION` sözlüğünden okunur.
+"""
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, Count, F, IntegerField, OuterRef, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from soloblog.models import Article, Comment
+
+DEFAULTS = {
+    'BATCH_SIZE': 2000,  # Tek grupta işlenecek yorum sayısı
+    'MAX_BULK_IDS': 10000,  # Toplu onay / ret isteğinde kabul edilen en fazla ID
+    'QUEUE_PAGE_SIZE': 50,
+}
+
+
+def get_moderation_settings():
+    return {**DEFAULTS, **getattr(settings, 'COMMENT_MODERATION', {})}
+
+
+def _add_delta(deltas, state, sign):
+    """
+    `state` = (approved, article_id, rating). Yalnızca onaylı yorumlar sayaçlara katkı verir.
+    """
+    if state is None or not state[0]:
+        return
+    count, total = deltas.get(state[1], (0, 0))
+    deltas[state[1]] = (count + sign, total + sign * state[2])
+
+
+def apply_counter_deltas(deltas, batch_size=None):
+    """
+    Makale sayaçlarına `article_id -> (onaylı yorum farkı, puan toplamı farkı)` farklarını her grup için tek bir
+    UPDATE ile uygular. Kilitlerin her zaman aynı sırayla alınması için makaleler ID sırasıyla güncellenir.
+
+    Returns:
+        int: Güncellenen makale sayısı.
+    """
+    batch_size = batch_size or get_moderation_settings()['BATCH_SIZE']
+    article_ids = sorted(article_id for article_id, delta in deltas.items() if any(delta))
+    updated = 0
+    for start in range(0, len(article_ids), batch_size):
+        chunk = article_ids[start:start + batch_size]
+        count_delta = Case(
+            *[When(id=article_id, then=Value(deltas[article_id][0])) for article_id in chunk],
+            default=Value(0),
+            output_field=IntegerField(),
+        )
+        rating_delta = Case(
+            *[When(id=article_id, then=Value(deltas[article_id][1])) for article_id in chunk],
+            default=Value(0),
+            output_field=IntegerField(),
+        )
+        updated += Article.objects.filter(id__in=chunk).update(
+            approvedCommentCount=F('approvedCommentCount') + count_delta,
+            ratingCount=F('ratingCount') + count_delta,
+            ratingSum=F('ratingSum') + rating_delta,
+        )
+    return updated
+
+
+def record_comment_change(before, after):
+    """
+    Tek bir yorumun kaydedilmesi / silinmesi sonrasında sayaçları günceller. Çağıran taraf transaction içinde olmalıdır.
+
+    Args:
+        before (tuple | None): Değişiklikten önceki (approved, article_id, rating); yeni kayıtta None.
+        after (tuple | None): Değişiklikten sonraki durum; silmede None.
+    """
+    deltas = {}
+    _add_delta(deltas, before, -1)
+    _add_delta(deltas, after, 1)
+    apply_counter_deltas(deltas)
+
+
+def counter_deltas(comments):
+    """
+    Henüz sayaçlara yansıtılmamış yorumların (ör. `bulk_create` ile eklenenler) sayaç farklarını döner.
+    """
+    deltas = {}
+    for comment in comments:
+        _add_delta(deltas, (comment.approved, comment.article_id, comment.rating), 1)
+    return deltas
+
+
+def _batches(comment_ids, batch_size):
+    comment_ids = sorted({int(comment_id) for comment_id in comment_ids})
+    for start in range(0, len(comment_ids), batch_size):
+        yield comment_ids[start:start + batch_size]
+
+
+def _lock(site_id, comment_ids, **filters):
+    return list(
+        Comment.objects.select_for_update().filter(site_id=site_id, id__in=comment_ids, **filters)
+        .order_by('id').values_list('id', 'approved', 'article_id', 'rating')
+    )
+
+
+def approve_comments(site_id, comment_ids):
+    """
+    Sitenin bekleyen yorumlarını toplu olarak onaylar ve makale sayaçlarını aynı transaction içinde artırır.
+    Zaten onaylı, başka siteye ait veya bulunamayan ID'ler atlanır.
+
+    Returns:
+        int: Onaylanan yorum sayısı.
+    """
+    options = get_moderation_settings()
+    approved = 0
+    with transaction.atomic():
+        for chunk in _batches(comment_ids, options['BATCH_SIZE']):
+            rows = _lock(site_id, chunk, approved=False)
+            if not rows:
+                continue
+            Comment.objects.filter(id__in=[row[0] for row in rows]).update(approved=True, updatedAt=timezone.now())
+            deltas = {}
+            for _, _, article_id, rating in rows:
+                _add_delta(deltas, (True, article_id, rating), 1)
+            apply_counter_deltas(deltas, options['BATCH_SIZE'])
+            approved += len(rows)
+    return approved
+
+
+def reject_comments(site_id, comment_ids):
+    """
+    Sitenin yorumlarını toplu olarak siler (ret). Onaylı yorumlar silinirken makale sayaçları aynı transaction
+    içinde azaltılır.
+
+    Returns:
+        int: Silinen yorum sayısı.
+    """
+    options = get_moderation_settings()
+    deleted = 0
+    with transaction.atomic():
+        for chunk in _batches(comment_ids, options['BATCH_SIZE']):
+            rows = _lock(site_id, chunk)
+            if not rows:
+                continue
+            deltas = {}
+            for _, approved, article_id, rating in rows:
+                _add_delta(deltas, (approved, article_id, rating), -1)
+            apply_counter_deltas(deltas, options['BATCH_SIZE'])
+            # Comment'e bağlı kayıt ve silme sinyali olmadığından tek bir DELETE ifadesi çalışır
+            deleted += Comment.objects.filter(id__in=[row[0] for row in rows]).delete()[0]
+    return deleted
+
+
+def pending_comments(site_id, article_id=None):
+    """
+    Moderasyon kuyruğu: sitenin onay bekleyen yorumları, en eskiden yeniye.
+    """
+    queryset = Comment.objects.filter(site_id=site_id, approved=False)
+    if article_id is not None:
+        queryset = queryset.filter(article_id=article_id)
+    return queryset.order_by('createdAt', 'id')
+
+
+def recalculate_comment_counters(articles=None):
+    """
+    Makale sayaçlarını yorumlardan tek bir UPDATE ile yeniden hesaplar.
+
+    Args:
+        articles (QuerySet): Hesaplanacak makaleler; verilmezse tüm makaleler.
+
+    Returns:
+        int: Güncellenen makale sayısı.
+    """
+    articles = Article.objects.all() if articles is None else articles
+    approved = Comment.objects.filter(article=OuterRef('pk'), approved=True).order_by().values('article')
+    return articles.update(
+        approvedCommentCount=Coalesce(Subquery(approved.annotate(total=Count('id')).values('total')), 0),
+        ratingCount=Coalesce(Subquery(approved.annotate(total=Count('rating')).values('total')), 0),
+        ratingSum=Coalesce(Subquery(approved.annotate(total=Sum('rating')).values('total')), 0),
+    )
@@ -0,0 +1,375 @@
+# soloblog/page_cache.py
+"""
+Blog ön yüzü sayfaları (anasayfa, kategori, makale detay) için render edilmiş sayfa önbelleği.
+
+Ön yüz temayı `SiteSettings` üzerindeki `homeTheme`, `categoryTheme` ve `articleDetailTheme` alanlarına göre seçer;
+burada her sayfa türü için gereken veriler tek bir JSON belgesi olarak kurulur ve önbellekte tutulur.
+
+- Anahtar: site, sayfa türü, tema, dil, nesne (kategori / makale ID'si ve sayfa numarası), nesnenin sürümü
+  (`updatedAt`) ve sayfanın bağlı olduğu etiketlerin nesil (generation) numaraları.
+- Bağımlılık takibi: her sayfa bir dizi etikete bağlıdır. Etiketin nesli artırıldığında ona bağlı tüm sayfaların
+  anahtarı değişir ve eski kopyalar TTL ile düşer (tek tek silmek gerekmez):
+    - `site:<id>`: sitenin tüm sayfaları (site ayarları, menüler, kategoriler),
+    - `home:<id>`: anasayfa (sitedeki herhangi bir makale),
+    - `category:<id>`: kategori sayfası ve o kategorideki makale sayfaları (kategori veya alt kategorilerindeki
+      makaleler).
+- Stale-while-revalidate: `FRESH_SECONDS` süresi dolan kopya `STALE_SECONDS` boyunca sunulmaya devam eder, aynı anda
+  tek bir arka plan thread'i sayfayı yeniden kurar. Sinyal üretmeyen değişiklikler (ör. write-behind okunma
+  sayaçları) sayfaya bu yolla yansır.
+- İsabet / bayat isabet / ıskalama sayıları süreç içinde biriktirilir ve `PageCacheStat` tablosuna periyodik olarak
+  yazılır (admin panelinde görüntülenir).
+
+Ayarlar `settings.PAGE_CACHE` sözlüğünden okunur.
+"""
+import atexit
+import hashlib
+import logging
+import threading
+import time
+from collections import Counter
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, close_old_connections, transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.translation import get_language
+from rest_framework.renderers import JSONRenderer
+
+from soloblog.api.serializers import ArticleSerializer
+from soloblog.category_tree import get_ancestors, get_descendants, path_ids
+from soloblog.models import Article, Category, PageCacheStat, SiteSettings
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'ENABLED': True,
+    'FRESH_SECONDS': 5 * 60,
+    'STALE_SECONDS': 60 * 60,  # Tazelik süresinden sonra bayat kopyanın sunulabileceği ek süre
+    'REVALIDATE_LOCK_SECONDS': 30,
+    'CACHE_PREFIX': 'page_cache',
+    'PAGE_SIZE': 20,  # Anasayfa listeleri ve kategori sayfası başına makale sayısı
+    'RELATED_ARTICLES': 6,
+    'STATS_FLUSH_SECONDS': 60,
+}
+
+PAGE_TYPES = ('home', 'category', 'article')
+HIT, STALE, MISS = 'hit', 'stale', 'miss'
+
+
+def get_page_cache_settings():
+    return {**DEFAULTS, **getattr(settings, 'PAGE_CACHE', {})}
+
+
+# -----------------------------------------------------------------------------
+# Etiket nesilleri
+# -----------------------------------------------------------------------------
+def _tag_key(tag):
+    return f"{get_page_cache_settings()['CACHE_PREFIX']}:tag:{tag}"
+
+
+def get_generations(tags):
+    """
+    Etiketlerin güncel nesil numaralarını tek bir `get_many` ile döner. Önbellekte olmayan etiket zaman damgasıyla
+    başlatılır; böylece önbellekten düşen bir etiket eski nesillerle çakışmaz.
+    """
+    keys = {tag: _tag_key(tag) for tag in tags}
+    values = cache.get_many(list(keys.values()))
+    generations = {}
+    for tag, key in keys.items():
+        value = values.get(key)
+        if value is None:
+            cache.add(key, time.time_ns(), None)
+            value = cache.get(key)
+        generations[tag] = value
+    return generations
+
+
+def _bump(keys):
+    for key in keys:
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns(), None)
+
+
+def purge_tags(*tags):
+    """
+    Etiketlere bağlı tüm sayfaları geçersiz kılar. Transaction içindeyse commit sonrasına bırakılır.
+    """
+    keys = [_tag_key(tag) for tag in set(tags)]
+    if keys:
+        transaction.on_commit(lambda: _bump(keys))
+
+
+def purge_site_pages(site_id):
+    """
+    Sitenin önbellekteki tüm sayfalarını geçersiz kılar (tema, menü, site ayarları, kategoriler, toplu içe aktarma).
+    """
+    purge_tags(f"site:{site_id}")
+
+
+def purge_article_pages(site_id, category_ids):
+    """
+    Anasayfayı ve verilen kategorilerin (üst kategorileriyle birlikte) sayfalarını geçersiz kılar.
+    """
+    tags = [f"home:{site_id}"]
+    for path in Category.objects.filter(id__in=category_ids).values_list('path', flat=True):
+        tags.extend(f"category:{category_id}" for category_id in path_ids(path))
+    purge_tags(*tags)
+
+
+# -----------------------------------------------------------------------------
+# Sayfa belgeleri
+# -----------------------------------------------------------------------------
+def _article_items(queryset):
+    storage = Article._meta.get_field('image').storage
+    rows = queryset.values(
+        'id', 'title', 'slug', 'category_id', 'metaDescription', 'publicationDate', 'image', 'counter',
+        'featured', 'slider', 'approvedCommentCount', 'ratingSum', 'ratingCount'
+    )
+    items = []
+    for row in rows:
+        row['category'] = row.pop('category_id')
+        row['image'] = storage.url(row['image']) if row['image'] else None
+        rating_sum, rating_count = row.pop('ratingSum'), row.pop('ratingCount')
+        row['averageRating'] = round(rating_sum / rating_count, 2) if rating_count else None
+        items.append(row)
+    return items
+
+
+def _breadcrumb(category, include_self=True):
+    return list(get_ancestors(category, include_self=include_self).values('id', 'categoryName', 'slug'))
+
+
+def _published(site_id):
+    return Article.objects.filter(site_id=site_id, active=True).order_by('-publicationDate', '-id')
+
+
+def build_home_page(site_id, size):
+    articles = _published(site_id)
+    return {
+        'slider': _article_items(articles.filter(slider=True)[:size]),
+        'featured': _article_items(articles.filter(featured=True)[:size]),
+        'latest': _article_items(articles[:size]),
+    }
+
+
+def build_category_page(category_id, page, size):
+    """
+    Kategori sayfası: kategori bilgileri, breadcrumb ve kategori ile alt kategorilerindeki makaleler.
+    """
+    category = Category.objects.get(pk=category_id)
+    category_ids = get_descendants(category, include_self=True).values('id')
+    offset = (page - 1) * size
+    items = _article_items(_published(category.site_id).filter(category_id__in=category_ids)[offset:offset + size + 1])
+    storage = Category._meta.get_field('categoryImage').storage
+    return {
+        'category': {
+            'id': category.id,
+            'categoryName': category.categoryName,
+            'categoryDescription': category.categoryDescription,
+            'slug': category.slug,
+            'meta': category.meta,
+            'metaDescription': category.metaDescription,
+            'categoryImage': storage.url(category.categoryImage.name) if category.categoryImage else None,
+        },
+        'breadcrumb': _breadcrumb(category),
+        'page': page,
+        'hasNext': len(items) > size,
+        'articles': items[:size],
+    }
+
+
+def build_article_page(article_id, related):
+    """
+    Makale detay sayfası: makale, breadcrumb ve aynı kategorideki son makaleler.
+    """
+    article = Article.objects.select_related('category').get(pk=article_id)
+    return {
+        'article': ArticleSerializer(article).data,
+        'breadcrumb': _breadcrumb(article.category),
+        'related': _article_items(
+            _published(article.site_id).filter(category_id=article.category_id).exclude(pk=article.pk)[:related]
+        ),
+    }
+
+
+def get_site_themes(site_id, generation):
+    """
+    Sitenin sayfa türü -> tema eşlemesini döner. Site etiketinin nesline bağlı olarak önbelleğe alınır; site ayarları
+    değiştiğinde yeni nesille yeniden okunur.
+    """
+    options = get_page_cache_settings()
+    key = f"{options['CACHE_PREFIX']}:{site_id}:themes:{generation}"
+    themes = cache.get(key)
+    if themes is None:
+        fields = ('homeTheme', 'categoryTheme', 'articleDetailTheme')
+        row = SiteSettings.objects.filter(site_id=site_id).order_by('-createdAt').values_list(*fields).first()
+        if row is None:
+            row = [SiteSettings._meta.get_field(field).default for field in fields]
+        themes = dict(zip(PAGE_TYPES, row))
+        cache.set(key, themes, options['FRESH_SECONDS'] + options['STALE_SECONDS'])
+    return themes
+
+
+# -----------------------------------------------------------------------------
+# Önbellek
+# -----------------------------------------------------------------------------
+def _render(build, meta):
+    body = JSONRenderer().render({**meta, 'generatedAt': timezone.now(), 'data': build()})
+    return {'body': body, 'etag': f'"{hashlib.sha256(body).hexdigest()[:32]}"'}
+
+
+def _store(key, build, meta, options):
+    entry = {**_render(build, meta), 'freshUntil': time.time() + options['FRESH_SECONDS']}
+    cache.set(key, entry, options['FRESH_SECONDS'] + options['STALE_SECONDS'])
+    return entry
+
+
+def _revalidate(key, build, meta, options):
+    try:
+        _store(key, build, meta, options)
+    except Exception:
+        logger.exception("Önbellekteki sayfa yenilenemedi: %s", key)
+    finally:
+        cache.delete(f"{key}:lock")
+        close_old_connections()
+
+
+def _get_or_build(key, build, meta, options):
+    entry = cache.get(key)
+    if entry is not None:
+        if entry['freshUntil'] > time.time():
+            return entry, HIT
+        # Bayat kopya sunulur; aynı sayfayı yalnızca bir süreç / thread yeniler
+        if cache.add(f"{key}:lock", 1, options['REVALIDATE_LOCK_SECONDS']):
+            threading.Thread(
+                target=_revalidate, args=(key, build, meta, options), name='page-cache-revalidate', daemon=True
+            ).start()
+        return entry, STALE
+    return _store(key, build, meta, options), MISS
+
+
+def get_page(site_id, page_type, slug=None, page=1, language=None):
+    """
+    Sayfa belgesini önbellekten döner; yoksa kurar.
+
+    Args:
+        site_id (int): Site ID'si.
+        page_type (str): 'home', 'category' veya 'article'.
+        slug (str): Kategori veya makale slug'ı (anasayfa için kullanılmaz).
+        page (int): Kategori sayfası için sayfa numarası.
+        language (str): Dil kodu; verilmezse aktif dil.
+
+    Returns:
+        tuple: (entry, outcome) - `entry` içinde `body` (JSON baytları) ve `etag` bulunur; `outcome` 'hit', 'stale'
+        veya 'miss'dir. Kategori / makale bulunamazsa None.
+    """
+    options = get_page_cache_settings()
+    language = language or get_language() or settings.LANGUAGE_CODE
+    site_tag = f"site:{site_id}"
+    if page_type == 'home':
+        ident, version, tags = 'home', '', [site_tag, f"home:{site_id}"]
+        build = partial(build_home_page, site_id, options['PAGE_SIZE'])
+    elif page_type == 'category':
+        row = Category.objects.filter(site_id=site_id, slug=slug).order_by('id').values_list('id', 'updatedAt').first()
+        if row is None:
+            return None
+        ident, version, tags = f"{row[0]}:{page}", row[1].timestamp(), [site_tag, f"category:{row[0]}"]
+        build = partial(build_category_page, row[0], page, options['PAGE_SIZE'])
+    elif page_type == 'article':
+        row = Article.objects.filter(site_id=site_id, slug=slug, active=True).values_list(
+            'id', 'updatedAt', 'category_id'
+        ).first()
+        if row is None:
+            return None
+        ident, version, tags = str(row[0]), row[1].timestamp(), [site_tag, f"category:{row[2]}"]
+        build = partial(build_article_page, row[0], options['RELATED_ARTICLES'])
+    else:
+        raise ValueError(f"Geçersiz sayfa türü: {page_type}")
+
+    generations = get_generations(tags)
+    theme = get_site_themes(site_id, generations[site_tag])[page_type]
+    meta = {'pageType': page_type, 'theme': theme, 'language': language}
+    if not options['ENABLED']:
+        return _render(build, meta), MISS
+
+    key = ':'.join([
+        options['CACHE_PREFIX'], str(site_id), page_type, f"t{theme}", language, ident, str(version),
+        '-'.join(str(generations[tag]) for tag in tags),
+    ])
+    entry, outcome = _get_or_build(key, build, meta, options)
+    record_outcome(site_id, page_type, outcome)
+    return entry, outcome
+
+
+# -----------------------------------------------------------------------------
+# İsabet / ıskalama sayaçları
+# -----------------------------------------------------------------------------
+_STAT_FIELDS = {HIT: 'hits', STALE: 'staleHits', MISS: 'misses'}
+_stats = Counter()
+_stats_lock = threading.Lock()
+_last_stats_flush = time.monotonic()
+
+
+def record_outcome(site_id, page_type, outcome):
+    """
+    Sonucu süreç içi sayaca ekler; son yazmanın üzerinden `STATS_FLUSH_SECONDS` geçtiyse sayaçları yazar.
+    """
+    global _last_stats_flush
+    now = time.monotonic()
+    with _stats_lock:
+        _stats[(site_id, page_type, timezone.localdate(), outcome)] += 1
+        due = now - _last_stats_flush >= get_page_cache_settings()['STATS_FLUSH_SECONDS']
+        if due:
+            _last_stats_flush = now
+    if due:
+        flush_page_cache_stats()
+
+
+def _apply_stats(site_id, page_type, day, counts):
+    lookup = {'site_id': site_id, 'pageType': page_type, 'day': day}
+    updates = {field: F(field) + amount for field, amount in counts.items()}
+    if PageCacheStat.objects.filter(**lookup).update(**updates):
+        return
+    try:
+        with transaction.atomic():
+            PageCacheStat.objects.create(**lookup, **counts)
+    except IntegrityError:
+        # Aynı satırı başka bir süreç oluşturdu
+        PageCacheStat.objects.filter(**lookup).update(**updates)
+
+
+def flush_page_cache_stats():
+    """
+    Biriken isabet / ıskalama sayılarını site, sayfa türü ve gün başına tek UPDATE ile yazar. Yazılamayan satırların
+    sayıları sayaca geri konur.
+
+    Returns:
+        int: Yazılan toplam istek sayısı.
+    """
+    with _stats_lock:
+        pending = _stats.copy()
+        _stats.clear()
+    if not pending:
+        return 0
+
+    rows = {}
+    for (site_id, page_type, day, outcome), amount in pending.items():
+        rows.setdefault((site_id, page_type, day), Counter())[outcome] += amount
+    written = 0
+    for (site_id, page_type, day), outcomes in rows.items():
+        try:
+            _apply_stats(site_id, page_type, day, {_STAT_FIELDS[outcome]: n for outcome, n in outcomes.items()})
+        except Exception:
+            with _stats_lock:
+                _stats.update({(site_id, page_type, day, outcome): n for outcome, n in outcomes.items()})
+            logger.exception("Sayfa önbelleği istatistikleri yazılamadı: site %s, %s.", site_id, page_type)
+            continue
+        written += sum(outcomes.values())
+    return written
+
+
+atexit.register(flush_page_cache_stats)
@@ -0,0 +1,437 @@
+# soloblog/renditions.py
+"""
+Asenkron resim türevi (rendition) üretimi.
+
+Resim yüklendiğinde istek içinde yalnızca orijinal dosya kaydedilir ve içeriğin SHA-256 özeti (`Image.contentHash`)
+hesaplanır. Transaction tamamlandıktan sonra resmin sitesi için tanımlı her türev (ör. thumb/card/hero) ve format
+(webp/avif/jpeg) için bir `ImageRendition` satırı `pending` durumunda eklenir. Bu tablo aynı zamanda iş kuyruğudur:
+
+- `RUNNER = 'pool'`: Web sürecindeki tek bir dağıtıcı thread bekleyen satırları sahiplenir ve süreç başına bir
+  `ProcessPoolExecutor` içinde üretir. PIL işlemleri ayrı süreçlerde çalıştığından istek thread'leri ve GIL
+  etkilenmez.
+- `RUNNER = 'worker'`: Satırlar yalnızca kuyruğa eklenir; `process_image_renditions` yönetim komutu (bir veya
+  daha fazla sunucuda) kuyruğu işler. Satırlar `SELECT ... FOR UPDATE SKIP LOCKED` ile sahiplenildiğinden birden
+  çok worker aynı satırı almaz; çöken worker'ın `processing` durumunda kalan satırları `STALE_AFTER_SECONDS`
+  sonra yeniden sahiplenilir.
+
+Türev dosyası kaynak özeti ve türev ayarlarının özetinden türetilen yola yazılır
+(`renditions/ab/cd/<kaynak özeti>/<ayar özeti>.webp`). Aynı içerikli resimler için türev bir kez üretilir;
+sonraki resimler mevcut dosyayı kullanır. Ayarlar değiştiğinde ayar özeti de değiştiğinden eski türevler
+`backfill_image_renditions` komutuyla yeniden üretilebilir.
+
+Ayarlar `settings.IMAGE_RENDITIONS` sözlüğünden okunur; site bazında türevler `SITE_RENDITIONS` ile
+değiştirilebilir veya kapatılabilir:
+
+    'SITE_RENDITIONS': {3: {'hero': {'SIZE': (1920, 1080), 'CROP': False, 'FORMATS': ('avif', 'jpeg')},
+                            'thumb': None}}
+"""
+import atexit
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import threading
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import timedelta
+
+from PIL import Image as PILImage
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import close_old_connections, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from soloblog import imaging
+from soloblog.models import Image, ImageRendition
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'RENDITIONS': {
+        'thumb': {'SIZE': (160, 160), 'CROP': True, 'FORMATS': ('webp',)},
+        'card': {'SIZE': (543, 543), 'CROP': True, 'FORMATS': ('webp', 'avif')},
+        'hero': {'SIZE': (1600, 900), 'CROP': False, 'FORMATS': ('webp', 'avif', 'jpeg')},
+    },
+    'SITE_RENDITIONS': {},  # site_id -> {türev adı: tanım veya None (kapalı)}
+    'QUALITY': {'jpeg': 82, 'webp': 80, 'avif': 55, 'png': 0},
+    # API'de boş `resizedImage` alanı yerine döndürülen türev
+    'LEGACY_RENDITION': ('card', 'webp'),
+    'RUNNER': 'pool',  # 'pool' (web sürecinde process havuzu) veya 'worker' (yalnızca kuyruk)
+    'WORKERS': 2,  # Process havuzundaki süreç sayısı
+    'BATCH_SIZE': 32,  # Tek seferde sahiplenilen satır sayısı
+    'MAX_ATTEMPTS': 3,
+    'STALE_AFTER_SECONDS': 600,  # Bu süreden uzun 'processing' kalan satırlar yeniden sahiplenilir
+}
+
+RenditionSpec = namedtuple('RenditionSpec', 'name format width height crop quality hash')
+
+_unsupported_warned = set()
+
+
+def get_rendition_settings():
+    return {**DEFAULTS, **getattr(settings, 'IMAGE_RENDITIONS', {})}
+
+
+def _spec_hash(fmt, width, height, crop, quality):
+    payload = json.dumps([fmt, width, height, bool(crop), quality])
+    return hashlib.sha1(payload.encode()).hexdigest()[:16]
+
+
+def rendition_specs(site_id, options=None):
+    """
+    Sitede üretilecek türevleri döner. Kurulu Pillow'un yazamadığı formatlar (ör. AVIF) uyarı verilerek atlanır.
+
+    Returns:
+        list[RenditionSpec]
+    """
+    options = options or get_rendition_settings()
+    overrides = options['SITE_RENDITIONS']
+    definitions = {**options['RENDITIONS'], **overrides.get(site_id, overrides.get(str(site_id), {}))}
+    supported = imaging.supported_formats()
+
+    specs = []
+    for name, definition in sorted(definitions.items()):
+        if not definition:
+            continue
+        width, height = definition['SIZE']
+        crop = definition.get('CROP', False)
+        for fmt in definition.get('FORMATS', ('webp',)):
+            if fmt not in supported:
+                if fmt not in _unsupported_warned:
+                    _unsupported_warned.add(fmt)
+                    logger.warning("Pillow '%s' formatını yazamıyor; bu formattaki türevler atlanıyor.", fmt)
+                continue
+            quality = definition.get('QUALITY', {}).get(fmt, options['QUALITY'].get(fmt, 80))
+            specs.append(RenditionSpec(
+                name, fmt, width, height, crop, quality, _spec_hash(fmt, width, height, crop, quality)
+            ))
+    return specs
+
+
+def rendition_path(source_hash, spec):
+    return (f"renditions/{source_hash[:2]}/{source_hash[2:4]}/{source_hash}/"
+            f"{spec.hash}.{imaging.extension(spec.format)}")
+
+
+def content_hash(field_file):
+    """
+    Dosya alanındaki içeriğin SHA-256 özetini parça parça okuyarak hesaplar. Henüz kaydedilmemiş yüklemelerde
+    dosya konumu başa alınır; depolamadan açılan dosyalar kapatılır.
+    """
+    digest = hashlib.sha256()
+    committed = field_file._committed
+    field_file.open('rb')
+    try:
+        for chunk in field_file.chunks():
+            digest.update(chunk)
+    finally:
+        if committed:
+            field_file.close()
+        else:
+            field_file.seek(0)
+    return digest.hexdigest()
+
+
+def _rendition_storage():
+    return ImageRendition._meta.get_field('file').storage
+
+
+def _delete_orphaned_files(names):
+    storage = _rendition_storage()
+    used = set(ImageRendition.objects.filter(file__in=names).values_list('file', flat=True))
+    for name in set(names) - used:
+        storage.delete(name)
+
+
+def enqueue_renditions(images, options=None):
+    """
+    Resimlerin eksik veya ayarları değişmiş türevlerini kuyruğa ekler. Aynı içerik ve ayarla daha önce üretilmiş
+    bir türev varsa satır doğrudan o dosyayla `done` olarak eklenir.
+
+    Returns:
+        list[int]: İşlenmeyi bekleyen türev satırlarının ID'leri.
+    """
+    options = options or get_rendition_settings()
+    images = [image for image in images if image.contentHash and not image.imagePath.name.startswith('http')]
+    if not images:
+        return []
+
+    wanted = {}
+    specs_by_site = {}
+    for image in images:
+        if image.site_id not in specs_by_site:
+            specs_by_site[image.site_id] = rendition_specs(image.site_id, options)
+        for spec in specs_by_site[image.site_id]:
+            wanted[(image.pk, spec.name, spec.format)] = (image, spec)
+    if not wanted:
+        return []
+
+    existing = {
+        (rendition.image_id, rendition.name, rendition.format): rendition
+        for rendition in ImageRendition.objects.filter(image__in=[image.pk for image in images])
+    }
+    produced = {}
+    for rendition in ImageRendition.objects.filter(
+        status='done',
+        sourceHash__in={image.contentHash for image in images},
+        specHash__in={spec.hash for specs in specs_by_site.values() for spec in specs},
+    ).exclude(file=''):
+        produced[(rendition.sourceHash, rendition.specHash)] = rendition
+
+    now = timezone.now()
+    created, changed, replaced = [], [], []
+    for key, (image, spec) in wanted.items():
+        rendition = existing.get(key)
+        if rendition is not None and rendition.sourceHash == image.contentHash and rendition.specHash == spec.hash:
+            continue
+        if rendition is None:
+            rendition = ImageRendition(site_id=image.site_id, image=image, name=spec.name, format=spec.format)
+            created.append(rendition)
+        else:
+            if rendition.file:
+                replaced.append(rendition.file.name)
+            changed.append(rendition)
+        rendition.sourceHash = image.contentHash
+        rendition.specHash = spec.hash
+        rendition.attempts = 0
+        rendition.lastError = None
+        rendition.updatedAt = now
+        source = produced.get((image.contentHash, spec.hash))
+        if source is not None:
+            rendition.file.name = source.file.name
+            rendition.width, rendition.height = source.width, source.height
+            rendition.status = 'done'
+        else:
+            rendition.file.name = ''
+            rendition.width = rendition.height = None
+            rendition.status = 'pending'
+
+    with transaction.atomic():
+        ImageRendition.objects.bulk_create(created, ignore_conflicts=True)
+        ImageRendition.objects.bulk_update(changed, [
+            'sourceHash', 'specHash', 'file', 'width', 'height', 'status', 'attempts', 'lastError', 'updatedAt',
+        ])
+    if replaced:
+        _delete_orphaned_files(replaced)
+
+    # ignore_conflicts ile eklenen satırların ID'si dönmediğinden bekleyenler yeniden okunur
+    return list(ImageRendition.objects.filter(
+        image__in=[image.pk for image in images], status='pending'
+    ).order_by('id').values_list('id', flat=True))
+
+
+def claim_renditions(limit, ids=None, options=None):
+    """
+    Bekleyen türev satırlarını sahiplenip `processing` durumuna alır. Satırlar kilitli olanlar atlanarak
+    seçildiğinden paralel worker'lar aynı satırı almaz.
+    """
+    options = options or get_rendition_settings()
+    now = timezone.now()
+    stale = now - timedelta(seconds=options['STALE_AFTER_SECONDS'])
+    claimable = ImageRendition.objects.filter(
+        Q(status='pending') | Q(status='processing', updatedAt__lt=stale),
+        attempts__lt=options['MAX_ATTEMPTS'],
+    )
+    if ids is not None:
+        claimable = claimable.filter(id__in=ids)
+    with transaction.atomic():
+        claimed = list(claimable.select_for_update(skip_locked=True).order_by('id').values_list('id', flat=True)[:limit])
+        ImageRendition.objects.filter(id__in=claimed).update(
+            status='processing', attempts=F('attempts') + 1, updatedAt=now
+        )
+    return list(ImageRendition.objects.select_related('image').filter(id__in=claimed).order_by('id'))
+
+
+def _read_source(image):
+    with image.imagePath.storage.open(image.imagePath.name, 'rb') as source:
+        return source.read()
+
+
+def _stored_size(storage, name):
+    with storage.open(name, 'rb') as stored, PILImage.open(stored) as image:
+        return image.size
+
+
+def process_renditions(renditions, executor, options=None):
+    """
+    Sahiplenilmiş türev satırlarını üretir. Aynı kaynak ve ayarla üretilecek satırlar tek iş olarak gönderilir;
+    kaynak dosya her resim için bir kez okunur. PIL işlemleri `executor` (process havuzu) içinde yapılır,
+    dosya ve veritabanı yazma işlemleri çağıran süreçte kalır.
+
+    Returns:
+        dict: Satır ID'si -> hata mesajı (başarılıysa None).
+    """
+    options = options or get_rendition_settings()
+    storage = _rendition_storage()
+    results = {}
+    specs_by_site = {}
+    groups = {}
+    obsolete = []
+    for rendition in renditions:
+        image = rendition.image
+        if image.site_id not in specs_by_site:
+            specs_by_site[image.site_id] = {
+                (spec.name, spec.format): spec for spec in rendition_specs(image.site_id, options)
+            }
+        spec = specs_by_site[image.site_id].get((rendition.name, rendition.format))
+        if spec is None or not image.contentHash:
+            # Türev ayarlardan kaldırılmış veya resim değişmiş
+            obsolete.append(rendition.pk)
+            continue
+        rendition.sourceHash, rendition.specHash = image.contentHash, spec.hash
+        groups.setdefault((image.contentHash, spec.hash), (spec, []))[1].append(rendition)
+
+    futures = {}
+    sources = {}
+    for (source_hash, _), (spec, members) in groups.items():
+        path = rendition_path(source_hash, spec)
+        try:
+            if storage.exists(path):
+                # Aynı içerikli başka bir resim için daha önce üretilmiş
+                futures[path] = (members, None, _stored_size(storage, path))
+                continue
+            if source_hash not in sources:
+                sources[source_hash] = _read_source(members[0].image)
+            future = executor.submit(
+                imaging.render, sources[source_hash], spec.width, spec.height, spec.crop, spec.format, spec.quality
+            )
+            futures[path] = (members, future, None)
+        except Exception as exc:
+            for rendition in members:
+                results[rendition.pk] = str(exc) or exc.__class__.__name__
+
+    updated = []
+    now = timezone.now()
+    for path, (members, future, size) in futures.items():
+        try:
+            if future is not None:
+                data, width, height = future.result()
+                path = storage.save(path, ContentFile(data))
+                size = (width, height)
+        except Exception as exc:
+            for rendition in members:
+                results[rendition.pk] = str(exc) or exc.__class__.__name__
+            continue
+        for rendition in members:
+            rendition.file.name = path
+            rendition.width, rendition.height = size
+            rendition.status = 'done'
+            rendition.lastError = None
+            rendition.updatedAt = now
+            results[rendition.pk] = None
+            updated.append(rendition)
+
+    for rendition in renditions:
+        error = results.get(rendition.pk)
+        if error is not None:
+            rendition.status = 'failed' if rendition.attempts >= options['MAX_ATTEMPTS'] else 'pending'
+            rendition.lastError = error
+            rendition.updatedAt = now
+            updated.append(rendition)
+            logger.warning("Resim türevi #%s üretilemedi: %s", rendition.pk, error)
+
+    with transaction.atomic():
+        ImageRendition.objects.bulk_update(updated, [
+            'sourceHash', 'specHash', 'file', 'width', 'height', 'status', 'lastError', 'updatedAt',
+        ])
+        if obsolete:
+            ImageRendition.objects.filter(id__in=obsolete).delete()
+    return results
+
+
+def drain_renditions(executor, ids=None, options=None):
+    """
+    Bekleyen satırları (verilirse yalnızca `ids` içindekileri) kuyruk boşalana kadar işler; hatalı satırlar
+    `MAX_ATTEMPTS` dolana kadar yeniden denenir.
+
+    Returns:
+        dict: {'done': int, 'failed': int}
+    """
+    options = options or get_rendition_settings()
+    stats = {'done': 0, 'failed': 0}
+    while True:
+        claimed = claim_renditions(options['BATCH_SIZE'], ids=ids, options=options)
+        if not claimed:
+            return stats
+        results = process_renditions(claimed, executor, options)
+        for rendition in claimed:
+            if rendition.pk not in results:
+                continue
+            if results[rendition.pk] is None:
+                stats['done'] += 1
+            elif rendition.status == 'failed':
+                stats['failed'] += 1
+
+
+def rendition_executor(workers=None):
+    """
+    Türev üretimi için process havuzu. Süreçler 'spawn' ile başlatılır: web sürecindeki thread'lerin tuttuğu
+    kilitler ve veritabanı bağlantıları worker'lara kopyalanmaz.
+    """
+    workers = workers or get_rendition_settings()['WORKERS']
+    return ProcessPoolExecutor(max_workers=max(1, workers), mp_context=multiprocessing.get_context('spawn'))
+
+
+_dispatcher = None
+_executor = None
+_dispatcher_pid = None
+_dispatcher_lock = threading.Lock()
+
+
+def _shutdown_dispatcher():
+    if _dispatcher is not None:
+        _dispatcher.shutdown(wait=True)
+    if _executor is not None:
+        _executor.shutdown(wait=True)
+
+
+def _get_dispatcher():
+    """
+    Süreç başına tek dağıtıcı thread ve process havuzu. Fork sonrası her süreç kendi havuzunu oluşturur.
+    """
+    global _dispatcher, _executor, _dispatcher_pid
+    pid = os.getpid()
+    if _dispatcher is None or _dispatcher_pid != pid:
+        with _dispatcher_lock:
+            if _dispatcher is None or _dispatcher_pid != pid:
+                _executor = rendition_executor()
+                _dispatcher = ThreadPoolExecutor(max_workers=1, thread_name_prefix='image-renditions')
+                _dispatcher_pid = pid
+                atexit.register(_shutdown_dispatcher)
+    return _dispatcher, _executor
+
+
+def _drain_in_background(ids):
+    try:
+        drain_renditions(_get_dispatcher()[1], ids=ids)
+    except Exception:
+        logger.exception("Resim türevleri üretilemedi.")
+    finally:
+        close_old_connections()
+
+
+def schedule_renditions(image_ids):
+    """
+    Resimlerin türevlerini kuyruğa ekler; `RUNNER = 'pool'` ise arka planda üretimini başlatır.
+    """
+    options = get_rendition_settings()
+    pending = enqueue_renditions(Image.objects.filter(id__in=image_ids), options)
+    if pending and options['RUNNER'] == 'pool':
+        _get_dispatcher()[0].submit(_drain_in_background, pending)
+    return pending
+
+
+def rendition_urls(image):
+    """
+    Resmin hazır türevlerini `{ad: {format: {'url', 'width', 'height'}}}` biçiminde döner.
+    `image.renditions` önceden yüklendiyse (prefetch_related) ek sorgu yapılmaz.
+    """
+    urls = {}
+    for rendition in image.renditions.all():
+        if rendition.status == 'done' and rendition.file:
+            urls.setdefault(rendition.name, {})[rendition.format] = {
+                'url': rendition.file.url, 'width': rendition.width, 'height': rendition.height,
+            }
+    return urls
@@ -0,0 +1,381 @@
+# soloblog/search.py
+"""
+Makaleler için sıralı (ranked) tam metin arama.
+
+- PostgreSQL'de her makalenin başlık (A), meta açıklama (B) ve içerik (C) ağırlıklı `tsvector` değeri
+  `Article.searchVector` alanında tutulur ve kayıt sırasında güncellenir. Vektör, makalenin diline (`language`)
+  karşılık gelen metin arama yapılandırması (ör. `tr` -> `turkish`) ile üretilir; sorgu da aynı yapılandırma ile
+  çözülür. Arama GIN indeksi üzerinden yapılır, sonuçlar `ts_rank` ile sıralanır ve `ts_headline` ile
+  vurgulanmış özetler üretilir.
+- Diğer veritabanlarında (test/geliştirme) site başına süreç içi bir ters indeks (inverted index) kullanılır.
+  İndeks ilk aramada kurulur; makale sayısı veya son güncelleme zamanı değiştiğinde yeniden kurulur.
+  Bu modda kök bulma (stemming) yapılmaz ve en fazla `FALLBACK_MAX_RESULTS` sonuç döner.
+
+Sorgu sözdizimi her iki modda da `websearch` biçimindedir: kelimeler VE ile bağlanır, `-kelime` hariç tutar,
+tırnak içindeki ifadeler (PostgreSQL'de sıralı, yedek indekste sırasız) birlikte aranır.
+
+Ayarlar `settings.ARTICLE_SEARCH` sözlüğünden okunur.
+"""
+import html
+import math
+import re
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank, SearchVector
+from django.db import connections
+from django.db.models import Case, CharField, Count, Expression, F, FloatField, Max, Q, Value, When
+
+from soloblog.models import Article
+
+DEFAULTS = {
+    # Dil kodu -> PostgreSQL metin arama yapılandırması
+    'CONFIGS': {
+        'en': 'english',
+        'tr': 'turkish',
+        'de': 'german',
+        'fr': 'french',
+        'nl': 'dutch',
+        'ar': 'arabic',
+    },
+    'DEFAULT_CONFIG': 'simple',  # Eşleşmeyen diller için (kök bulma yapılmaz)
+    'HEADLINE_MAX_WORDS': 35,
+    'HEADLINE_MIN_WORDS': 15,
+    'HEADLINE_MAX_FRAGMENTS': 2,
+    'FALLBACK_MAX_RESULTS': 500,
+}
+
+# `tsvector` içine giren alanlar ve ağırlıkları; bu alanlardan biri değişince vektör yeniden üretilir
+SEARCH_FIELDS = (('title', 'A'), ('metaDescription', 'B'), ('content', 'C'))
+SEARCH_FIELD_NAMES = frozenset(['language'] + [name for name, _ in SEARCH_FIELDS])
+
+# PostgreSQL'in varsayılan ağırlıkları (A, B, C); yedek indeks sıralaması için de kullanılır
+FIELD_WEIGHTS = {'title': 1.0, 'metaDescription': 0.4, 'content': 0.2}
+
+HIGHLIGHT_START = '<mark>'
+HIGHLIGHT_STOP = '</mark>'
+
+_TOKEN = re.compile(r'\w+', re.UNICODE)
+_QUERY_PART = re.compile(r'(-?)"([^"]*)"|(\S+)')
+# Türkçe noktalı/noktasız "i" harfleri dil bağımsız eşleşme için tek biçime indirgenir
+_FOLD = str.maketrans({'İ': 'i', 'I': 'i', 'ı': 'i'})
+
+
+def get_search_settings():
+    """
+    Varsayılan değerlerle birleştirilmiş arama ayarlarını döner.
+    """
+    return {**DEFAULTS, **getattr(settings, 'ARTICLE_SEARCH', {})}
+
+
+def search_config(language, options=None):
+    """
+    Dil koduna karşılık gelen PostgreSQL metin arama yapılandırmasını döner.
+    """
+    options = options or get_search_settings()
+    return options['CONFIGS'].get(language, options['DEFAULT_CONFIG'])
+
+
+def uses_postgres_search(using='default'):
+    return connections[using].vendor == 'postgresql'
+
+
+def build_search_vector(config):
+    """
+    Başlık, meta açıklama ve içerikten ağırlıklı `tsvector` ifadesi üretir.
+    """
+    vector = None
+    for name, weight in SEARCH_FIELDS:
+        part = SearchVector(name, weight=weight, config=config)
+        vector = part if vector is None else vector + part
+    return vector
+
+
+def update_search_vectors(queryset):
+    """
+    Sorgu setindeki makalelerin arama vektörlerini dil bazında toplu UPDATE ile yeniden üretir.
+    PostgreSQL dışındaki veritabanlarında hiçbir şey yapmaz.
+
+    Returns:
+        int: Güncellenen makale sayısı.
+    """
+    if not uses_postgres_search(queryset.db):
+        return 0
+    options = get_search_settings()
+    updated = 0
+    languages = list(queryset.order_by().values_list('language', flat=True).distinct())
+    for language in languages:
+        updated += queryset.filter(language=language).update(
+            searchVector=build_search_vector(search_config(language, options))
+        )
+    return updated
+
+
+def fold(text):
+    return text.translate(_FOLD).casefold()
+
+
+def tokenize(text):
+    return _TOKEN.findall(fold(text or ''))
+
+
+def parse_query(text):
+    """
+    `websearch` sözdizimindeki sorguyu aranacak ve hariç tutulacak terimlere ayırır.
+
+    Returns:
+        tuple: `(terimler, hariç tutulan terimler)`.
+    """
+    include, exclude = [], []
+    for match in _QUERY_PART.finditer(text or ''):
+        negated, phrase, word = match.groups()
+        if word is not None:
+            negated, phrase = word.startswith('-'), word.lstrip('-')
+        tokens = tokenize(phrase)
+        if not tokens or (word is not None and tokens == ['or']):
+            continue
+        (exclude if negated else include).extend(tokens)
+    return list(dict.fromkeys(include)), list(dict.fromkeys(exclude))
+
+
+def highlight(text, terms, max_words=DEFAULTS['HEADLINE_MAX_WORDS']):
+    """
+    Metinde terimlerin en yoğun geçtiği `max_words` kelimelik bölümü, eşleşen kelimeleri
+    `<mark>` ile işaretleyerek döner. `ts_headline` çıktısıyla aynı biçimdedir.
+    """
+    text = text or ''
+    terms = set(terms)
+    words = list(_TOKEN.finditer(text))
+    if not words:
+        return ''
+    hits = [index for index, word in enumerate(words) if fold(word.group()) in terms]
+    matched = set(hits)
+
+    start = 0
+    if hits:
+        # Pencere içinde en çok eşleşme barındıran başlangıç noktası
+        best = -1
+        for first in hits:
+            covered = sum(1 for index in hits if first <= index < first + max_words)
+            if covered > best:
+                best, start = covered, max(0, first - 2)
+    end = min(len(words), start + max_words)
+
+    parts = []
+    cursor = words[start].start()
+    for index in range(start, end):
+        word = words[index]
+        parts.append(html.escape(text[cursor:word.start()]))
+        if index in matched:
+            parts.append(f"{HIGHLIGHT_START}{html.escape(word.group())}{HIGHLIGHT_STOP}")
+        else:
+            parts.append(html.escape(word.group()))
+        cursor = word.end()
+    return ''.join(parts).strip()
+
+
+class InvertedIndex:
+    """
+    Makaleler için süreç içi ters indeks. Her terim için `makale ID -> ağırlıklı terim frekansı` tutulur.
+    """
+
+    def __init__(self):
+        self.postings = defaultdict(dict)
+        self.lengths = {}
+        self.languages = {}
+
+    def add(self, article_id, language, fields):
+        length = 0
+        for name, text in fields.items():
+            weight = FIELD_WEIGHTS[name]
+            tokens = tokenize(text)
+            length += len(tokens)
+            for token in tokens:
+                postings = self.postings[token]
+                postings[article_id] = postings.get(article_id, 0.0) + weight
+        self.lengths[article_id] = length
+        self.languages[article_id] = language
+
+    def search(self, terms, excluded=(), language=None, limit=None):
+        """
+        Tüm terimleri içeren makaleleri skorlarına göre sıralı döner.
+
+        Skor `ts_rank` (normalizasyon 1) ile aynı mantıktadır: terimlerin ağırlıklı frekansları IDF ile çarpılıp
+        toplanır ve belge uzunluğunun logaritmasına bölünür.
+
+        Returns:
+            list: `(makale ID, skor)` çiftleri.
+        """
+        if not terms:
+            return []
+        postings = [self.postings.get(term) for term in terms]
+        if not all(postings):
+            return []
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates.intersection_update(posting)
+        for term in excluded:
+            candidates.difference_update(self.postings.get(term, ()))
+        if language is not None:
+            candidates = {article_id for article_id in candidates if self.languages[article_id] == language}
+
+        total = len(self.lengths)
+        idfs = [math.log(1 + total / len(posting)) for posting in postings]
+        scored = []
+        for article_id in candidates:
+            score = sum(idf * posting[article_id] for idf, posting in zip(idfs, postings))
+            scored.append((article_id, score / (1 + math.log(1 + self.lengths[article_id]))))
+        scored.sort(key=lambda item: (-item[1], -item[0]))
+        return scored[:limit] if limit else scored
+
+
+class _IndexCache:
+    """
+    Site başına ters indeksleri tutar. İndeks, sitenin makale sayısı ve son güncelleme zamanından oluşan
+    parmak izi değişene kadar yeniden kullanılır; böylece diğer süreçlerdeki değişiklikler de fark edilir.
+    """
+
+    def __init__(self):
+        self._indexes = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _scope(site_id, using):
+        queryset = Article.objects.using(using)
+        return queryset.filter(site_id=site_id) if site_id is not None else queryset
+
+    def get(self, site_id=None, using='default'):
+        scope = self._scope(site_id, using)
+        fingerprint = tuple(scope.aggregate(total=Count('id'), changed=Max('updatedAt')).values())
+        key = (using, site_id)
+        cached = self._indexes.get(key)
+        if cached is not None and cached[0] == fingerprint:
+            return cached[1]
+        with self._lock:
+            cached = self._indexes.get(key)
+            if cached is not None and cached[0] == fingerprint:
+                return cached[1]
+            index = InvertedIndex()
+            rows = scope.values_list('id', 'language', *[name for name, _ in SEARCH_FIELDS])
+            for article_id, language, *texts in rows.iterator(chunk_size=1000):
+                index.add(article_id, language, dict(zip(FIELD_WEIGHTS, texts)))
+            self._indexes[key] = (fingerprint, index)
+            return index
+
+    def clear(self):
+        with self._lock:
+            self._indexes.clear()
+
+
+fallback_indexes = _IndexCache()
+
+
+def _postgres_search(queryset, text, language, options):
+    languages = [language] if language else list(options['CONFIGS']) + [None]
+    condition = Q()
+    ranks, headlines = [], []
+    for code in languages:
+        config = search_config(code, options)
+        query = SearchQuery(text, config=config, search_type='websearch')
+        if code is None:
+            # Yapılandırması tanımlanmamış diller varsayılan yapılandırma ile indekslenir
+            scope = ~Q(language__in=list(options['CONFIGS']))
+        else:
+            scope = Q(language=code)
+        condition |= scope & Q(searchVector=query)
+        ranks.append(When(scope, then=SearchRank(F('searchVector'), query, normalization=1)))
+        headlines.append(When(scope, then=SearchHeadline(
+            'content', query, config=config,
+            start_sel=HIGHLIGHT_START, stop_sel=HIGHLIGHT_STOP,
+            max_words=options['HEADLINE_MAX_WORDS'], min_words=options['HEADLINE_MIN_WORDS'],
+            max_fragments=options['HEADLINE_MAX_FRAGMENTS'],
+        )))
+    return queryset.filter(condition).annotate(
+        search_rank=Case(*ranks, output_field=FloatField()),
+        search_headline=Case(*headlines, output_field=CharField()),
+    ).order_by('-search_rank', '-id')
+
+
+def _fallback_search(queryset, text, language, site_id, options):
+    terms, excluded = parse_query(text)
+    index = fallback_indexes.get(site_id, using=queryset.db)
+    results = index.search(terms, excluded, language=language)
+    limit = options['FALLBACK_MAX_RESULTS']
+    if len(results) > limit:
+        # Sınır, sorgu kümesinin filtreleri (yayın durumu, kategori vb.) uygulandıktan sonra uygulanır;
+        # aksi halde filtrelerden geçen sonuçlar ilk `limit` adayın dışında kalabilir
+        allowed = set(queryset.order_by().values_list('id', flat=True))
+        results = [item for item in results if item[0] in allowed][:limit]
+    if not results:
+        return queryset.none()
+    return queryset.filter(id__in=[article_id for article_id, _ in results]).annotate(
+        search_rank=ScoreLookup(results),
+        search_terms=Value(' '.join(terms), output_field=CharField()),
+    ).order_by('-search_rank', '-id')
+
+
+class ScoreLookup(Expression):
+    """
+    `(makale ID, skor)` listesinden satırın skorunu seçen SQL ifadesi. Düz bir `CASE WHEN id = ...` satır başına
+    N karşılaştırma yaparken bu ifade ID'ye göre sıralı listede ikili arama yapan iç içe CASE üretir (log2(N)).
+    SQL metni tek seferde üretildiğinden yüzlerce When() nesnesinin ORM derleme maliyeti de oluşmaz.
+    """
+    output_field = FloatField()
+
+    def __init__(self, results, key='id'):
+        super().__init__()
+        self.results = sorted(results)
+        self.key = F(key)
+
+    def get_source_expressions(self):
+        return [self.key]
+
+    def set_source_expressions(self, exprs):
+        self.key, = exprs
+
+    def as_sql(self, compiler, connection):
+        column, column_params = compiler.compile(self.key)
+
+        def build(items):
+            if len(items) == 1:
+                return '%s', [items[0][1]]
+            middle = len(items) // 2
+            left_sql, left_params = build(items[:middle])
+            right_sql, right_params = build(items[middle:])
+            return (
+                f"CASE WHEN {column} < %s THEN {left_sql} ELSE {right_sql} END",
+                [*column_params, items[middle][0], *left_params, *right_params],
+            )
+
+        return build(self.results)
+
+
+def search_articles(queryset, text, language=None, site_id=None):
+    """
+    Makale sorgu setini tam metin aramaya göre filtreler ve ilgi skoruna göre sıralar.
+
+    Dönen kayıtlarda `search_rank` alanı bulunur. PostgreSQL'de `search_headline` alanı vurgulanmış özeti içerir;
+    yedek modda özet `search_terms` alanındaki terimlerle serileştirme sırasında (yalnızca dönen sayfa için) üretilir.
+
+    Args:
+        queryset (QuerySet): Makale sorgu seti (site, kategori vb. filtreleri uygulanmış olabilir).
+        text (str): `websearch` sözdiziminde arama ifadesi.
+        language (str | None): Yalnızca bu dildeki makalelerde ara.
+        site_id (int | None): Yedek modda kullanılacak site indeksi; verilmezse tüm makalelerin indeksi kullanılır.
+    """
+    options = get_search_settings()
+    if uses_postgres_search(queryset.db):
+        return _postgres_search(queryset, text, language, options)
+    return _fallback_search(queryset, text, language, site_id, options)
+
+
+def article_headline(article):
+    """
+    Arama sonucu olarak dönen makalenin vurgulanmış özetini döner; arama sonucu değilse None.
+    """
+    headline = getattr(article, 'search_headline', None)
+    if headline is None and hasattr(article, 'search_terms'):
+        headline = highlight(article.content, article.search_terms.split(), get_search_settings()['HEADLINE_MAX_WORDS'])
+    return headline
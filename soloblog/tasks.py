@@ -0,0 +1,69 @@
+from celery import shared_task
+
+from soloblog.analytics.article_counters import flush_article_views
+from soloblog.analytics.ingestion import flush_pending
+from soloblog.analytics.partitions import archive_partitions, ensure_partitions
+from soloblog.analytics.rollups import run_rollup
+from soloblog.importer import run_import
+
+
+@shared_task
+def rollup_visitor_analytics():
+    """
+    Ziyaretçi istatistiklerini artımlı olarak rollup tablolarına işleyen Celery görevi.
+    Periyodik olarak (ör. 5 dakikada bir) çalıştırılmalıdır.
+    """
+    processed = run_rollup()
+    print(f"Rollup tamamlandı: {processed} ziyaret kaydı işlendi.")
+    return processed
+
+
+@shared_task
+def flush_visitor_hits():
+    """
+    Tamponda bekleyen ziyaret kayıtlarını veritabanına yazan Celery görevi.
+    Özellikle Redis tamponu kullanılıp web süreçlerinde flusher thread'i kapatıldığında (AUTOSTART=False)
+    periyodik olarak çalıştırılmalıdır.
+    """
+    written = flush_pending()
+    print(f"Tampon boşaltıldı: {written} ziyaret kaydı yazıldı.")
+    return written
+
+
+@shared_task
+def maintain_visitor_partitions():
+    """
+    VisitorAnalytics için gelecek ayların bölümlerini oluşturan ve saklama süresini aşan bölümleri
+    arşivleyen Celery görevi. Günde bir kez çalıştırılması yeterlidir.
+    """
+    created = ensure_partitions()
+    archived = archive_partitions()
+    print(f"Bölüm bakımı tamamlandı: {len(created)} bölüm oluşturuldu, {len(archived)} bölüm arşivlendi.")
+    return {'created': created, 'archived': archived}
+
+
+@shared_task
+def flush_article_view_counts():
+    """
+    Bekleyen makale okunma sayılarını veritabanına yazan Celery görevi.
+    Redis deposu kullanılıp web süreçlerinde yazma thread'i kapatıldığında (AUTOSTART=False)
+    periyodik olarak çalıştırılmalıdır.
+    """
+    views = flush_article_views()
+    print(f"Makale okunma sayıları yazıldı: {views} okunma.")
+    return views
+
+
+@shared_task
+def import_articles(job_id, force=False):
+    """
+    Toplu makale içe aktarma işini baştan veya kaldığı kontrol noktasından çalıştıran Celery görevi.
+    `ARTICLE_IMPORT['RUNNER'] = 'celery'` ayarında API üzerinden oluşturulan işler bu görevle başlatılır.
+    """
+    job = run_import(job_id, force=force)
+    if job is None:
+        print(f"İçe aktarma işi #{job_id} başka bir süreçte çalışıyor veya tamamlanmış.")
+        return None
+    print(f"İçe aktarma işi #{job_id} tamamlandı: {job.importedArticles} makale, {job.importedComments} yorum, "
+          f"{job.processedImages} resim işlendi, {job.skippedRecords} kayıt atlandı.")
+    return job.status
@@ -1,3 +1,56 @@
+import datetime
+
+from django.contrib.sites.models import Site
 from django.test import TestCase
+from django.utils import timezone
+
+from soloblog.analytics.rollups import GAP_TIMEOUT, get_watermark, run_rollup
+from soloblog.models import AnalyticsWatermark, VisitorAnalytics, VisitorAnalyticsRollup
+
+
+class VisitorRollupWatermarkTests(TestCase):
+    """
+    İşaretçi geçtikten sonra commit edilen küçük ID'li kayıtların rollup'a eklenmesi.
+    """
+
+    def setUp(self):
+        self.site = Site.objects.get_current()
+        self.visit_date = timezone.now() - datetime.timedelta(hours=1)
+
+    def create_visit(self, pk):
+        return VisitorAnalytics.objects.create(
+            pk=pk, site=self.site, visit_type='homepage', ip_address='10.0.0.1', user_agent='test',
+            visit_date=self.visit_date,
+        )
+
+    def total_count(self):
+        rollup = VisitorAnalyticsRollup.objects.get(site=self.site, granularity='day', dimension='total')
+        return rollup.count
+
+    def test_late_commit_below_watermark_is_rolled_up(self):
+        self.create_visit(1)
+        self.create_visit(3)
+        self.assertEqual(run_rollup(), 2)
+        last_id, _, gaps = get_watermark()
+        self.assertEqual(last_id, 3)
+        self.assertEqual([gap[:2] for gap in gaps], [[2, 2]])
+
+        # ID 2, işaretçi 3'e ilerledikten sonra commit edilir
+        self.create_visit(2)
+        self.assertEqual(run_rollup(), 1)
+        self.assertEqual(self.total_count(), 3)
+        self.assertEqual(get_watermark()[2], [])
+
+        # Aynı kayıt ikinci kez sayılmaz
+        self.assertEqual(run_rollup(), 0)
+        self.assertEqual(self.total_count(), 3)
+
+    def test_expired_gap_is_dropped(self):
+        self.create_visit(1)
+        self.create_visit(3)
+        run_rollup()
+        expired_at = (timezone.now() - GAP_TIMEOUT - datetime.timedelta(minutes=1)).timestamp()
+        AnalyticsWatermark.objects.update(pendingGaps=[[2, 2, expired_at]])
 
-# Create your tests here.
+        self.assertEqual(run_rollup(), 0)
+        self.assertEqual(get_watermark()[2], [])